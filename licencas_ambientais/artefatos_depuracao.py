@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Artefatos de depuração (screenshots) da coleta Ecosistemas.
+Os screenshots vão para um buffer circular em memória e só são gravados em disco quando
+ocorre um erro (nível "on-error"), a cada captura (nível "always") ou nunca (nível "off").
+A gravação é feita por uma thread separada, fora do caminho da coleta, e o espaço em disco
+usado em cada execução tem um limite.
+"""
+
+import base64
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+
+logger = logging.getLogger("coletor_ecosistemas.artefatos")
+
+DESLIGADO = "off"
+EM_ERRO = "on-error"
+SEMPRE = "always"
+NIVEIS = [DESLIGADO, EM_ERRO, SEMPRE]
+
+_FIM = object()
+
+
+class ArtefatosDepuracao:
+    def __init__(self, nivel=EM_ERRO, diretorio="depuracao", capacidade=10, limite_mb=50):
+        """
+        Inicializa a política de artefatos de depuração
+
+        Args:
+            nivel (str): "off", "on-error" (padrão) ou "always"
+            diretorio (str): Diretório base; cada execução grava em um subdiretório com data e hora
+            capacidade (int): Screenshots mantidos no buffer circular em memória
+            limite_mb (float): Espaço máximo em disco usado pelos artefatos da execução
+        """
+        if nivel not in NIVEIS:
+            raise ValueError(f"Nível de artefatos desconhecido: {nivel} (use {', '.join(NIVEIS)})")
+        self.nivel = nivel
+        self.diretorio = os.path.join(diretorio, datetime.now().strftime('%Y%m%d_%H%M%S'))
+        self.limite_bytes = int(limite_mb * 1024 * 1024)
+        self.bytes_gravados = 0
+        self.arquivos_gravados = 0
+        self.descartados = 0
+        self._buffer = deque(maxlen=max(1, capacidade))
+        self._lock = threading.Lock()
+        self._fila = queue.Queue()
+        self._thread = None
+
+    @property
+    def ativo(self):
+        return self.nivel != DESLIGADO
+
+    def capturar(self, driver, nome):
+        """
+        Captura um screenshot da página atual
+
+        No nível "always" o screenshot é enviado para gravação; no nível "on-error" fica no
+        buffer circular até o próximo erro. A captura devolve a imagem em base64, que só é
+        decodificada e gravada pela thread de gravação.
+
+        Args:
+            driver: WebDriver do Selenium
+            nome (str): Prefixo do arquivo (ex: "paginacao")
+        """
+        if not self.ativo:
+            return
+        try:
+            imagem = driver.get_screenshot_as_base64()
+        except Exception as e:
+            logger.debug(f"Não foi possível capturar o screenshot {nome}: {str(e)}")
+            return
+
+        artefato = (f"{nome}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.png", imagem)
+        if self.nivel == SEMPRE:
+            self._enviar([artefato])
+        else:
+            with self._lock:
+                self._buffer.append(artefato)
+
+    def registrar_erro(self, driver, motivo):
+        """
+        Registra um erro: captura a página atual e grava em disco o conteúdo do buffer circular
+
+        Args:
+            driver: WebDriver do Selenium (None para gravar apenas o buffer)
+            motivo (str): Prefixo do screenshot do erro (ex: "erro_tabela")
+        """
+        if not self.ativo:
+            return
+        if driver is not None:
+            self.capturar(driver, motivo)
+        with self._lock:
+            artefatos = list(self._buffer)
+            self._buffer.clear()
+        if artefatos:
+            logger.info(f"Erro '{motivo}': gravando {len(artefatos)} screenshots de depuração em {self.diretorio}")
+            self._enviar(artefatos)
+
+    def _enviar(self, artefatos):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._gravar, name="artefatos-depuracao", daemon=True)
+                self._thread.start()
+        for artefato in artefatos:
+            self._fila.put(artefato)
+
+    def _gravar(self):
+        """Thread de gravação: decodifica e grava os screenshots respeitando o limite de disco"""
+        while True:
+            artefato = self._fila.get()
+            if artefato is _FIM:
+                break
+            nome, imagem = artefato
+            try:
+                conteudo = base64.b64decode(imagem)
+                if self.bytes_gravados + len(conteudo) > self.limite_bytes:
+                    self.descartados += 1
+                    if self.descartados == 1:
+                        logger.warning(f"Limite de {self.limite_bytes // (1024 * 1024)} MB de artefatos de depuração "
+                                       f"atingido; novos screenshots serão descartados")
+                    continue
+                os.makedirs(self.diretorio, exist_ok=True)
+                caminho = os.path.join(self.diretorio, nome)
+                with open(caminho, 'wb') as arquivo:
+                    arquivo.write(conteudo)
+                self.bytes_gravados += len(conteudo)
+                self.arquivos_gravados += 1
+                logger.debug(f"Screenshot de depuração salvo em {caminho}")
+            except Exception as e:
+                logger.warning(f"Erro ao gravar o screenshot {nome}: {str(e)}")
+
+    def fechar(self):
+        """Aguarda a gravação dos screenshots pendentes e encerra a thread de gravação"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._fila.put(_FIM)
+        thread.join()
+        logger.info(f"Artefatos de depuração: {self.arquivos_gravados} screenshots "
+                    f"({self.bytes_gravados / (1024 * 1024):.1f} MB) em {self.diretorio}"
+                    + (f", {self.descartados} descartados pelo limite de disco" if self.descartados else ""))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark dos motores de análise HTML (motores_html) nas páginas de resultados e de detalhes.
+Mede o tempo por página de cada motor (análise + extração) e confere se os resultados
+são iguais aos do motor padrão (BeautifulSoup com html.parser).
+
+Uso:
+    python licencas_ambientais/benchmark_motores.py --tabelas paginas/tabela_*.html --detalhes paginas/detalhe_*.html
+    python licencas_ambientais/benchmark_motores.py --sinteticas 50
+"""
+
+import argparse
+import logging
+
+from benchmark_parser import carregar_paginas, medir
+from motores_html import MOTORES, MOTOR_PADRAO, obter_motor
+from portal_simulado import gerar_processos, gerar_html_detalhe, gerar_html_tabela
+
+logger = logging.getLogger("coletor_ecosistemas.benchmark")
+
+
+def comparar_motores(paginas_tabela, paginas_detalhe, nomes=None, repeticoes=5):
+    """
+    Executa o benchmark de cada motor
+
+    Args:
+        paginas_tabela (list): (nome, html) das páginas de resultados
+        paginas_detalhe (list): (nome, html) das páginas de detalhes
+        nomes (list): Motores a comparar (padrão: todos os disponíveis)
+        repeticoes (int): Repetições de cada medição; vale o melhor tempo
+
+    Returns:
+        list: Um dict por motor com tempos por página (ms) e páginas divergentes
+    """
+    referencia = obter_motor(MOTOR_PADRAO)
+    esperado_tabela = [referencia.estrutura_tabela(html) for _, html in paginas_tabela]
+    esperado_detalhe = [referencia.analisar_detalhes(html) for _, html in paginas_detalhe]
+
+    resultados = []
+    for nome in nomes or list(MOTORES):
+        motor = obter_motor(nome)
+        if motor.nome != nome:
+            logger.warning(f"Motor {nome} indisponível; ignorado no benchmark")
+            continue
+
+        divergentes = [
+            pagina for (pagina, html), esperado in zip(paginas_tabela, esperado_tabela)
+            if motor.estrutura_tabela(html) != esperado
+        ] + [
+            pagina for (pagina, html), esperado in zip(paginas_detalhe, esperado_detalhe)
+            if motor.analisar_detalhes(html) != esperado
+        ]
+
+        tempo_tabela = medir(motor.estrutura_tabela, [html for _, html in paginas_tabela], repeticoes)
+        tempo_detalhe = medir(motor.analisar_detalhes, [html for _, html in paginas_detalhe], repeticoes)
+
+        resultados.append({
+            "motor": nome,
+            "ms_tabela": tempo_tabela * 1000 / len(paginas_tabela) if paginas_tabela else None,
+            "ms_detalhe": tempo_detalhe * 1000 / len(paginas_detalhe) if paginas_detalhe else None,
+            "divergentes": divergentes,
+        })
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark dos motores de análise HTML')
+    parser.add_argument('--tabelas', nargs='*', default=[],
+                        help='Páginas de resultados salvas (arquivos .html, diretórios ou padrões glob)')
+    parser.add_argument('--detalhes', nargs='*', default=[],
+                        help='Páginas de detalhes salvas (arquivos .html, diretórios ou padrões glob)')
+    parser.add_argument('--motores', nargs='*', choices=list(MOTORES), default=None,
+                        help='Motores a comparar (padrão: todos)')
+    parser.add_argument('--sinteticas', type=int, default=30,
+                        help='Número de processos sintéticos usados quando nenhuma página é informada (padrão: 30)')
+    parser.add_argument('--repeticoes', type=int, default=5,
+                        help='Repetições de cada medição; vale o melhor tempo (padrão: 5)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    paginas_tabela = carregar_paginas(args.tabelas) if args.tabelas else []
+    paginas_detalhe = carregar_paginas(args.detalhes) if args.detalhes else []
+    if not args.tabelas and not args.detalhes:
+        processos = gerar_processos(args.sinteticas)
+        paginas_tabela = [
+            (f"tabela_sintetica_{i // 10 + 1}", gerar_html_tabela(processos[i:i + 10], i, len(processos)))
+            for i in range(0, len(processos), 10)
+        ]
+        paginas_detalhe = [
+            (f"detalhe_sintetico_{processo['id']}", gerar_html_detalhe(processo, 100)) for processo in processos
+        ]
+
+    resultados = comparar_motores(paginas_tabela, paginas_detalhe, args.motores, args.repeticoes)
+
+    def formatar(valor):
+        return f"{valor:10.3f}" if valor is not None else f"{'-':>10}"
+
+    print(f"\nPáginas: {len(paginas_tabela)} de resultados, {len(paginas_detalhe)} de detalhes")
+    print(f"{'Motor':<14}{'ms/tabela':>10}{'ms/detalhe':>12}  Resultados")
+    for resultado in resultados:
+        situacao = "idênticos" if not resultado["divergentes"] else f"{len(resultado['divergentes'])} páginas diferentes"
+        print(f"{resultado['motor']:<14}{formatar(resultado['ms_tabela'])}  {formatar(resultado['ms_detalhe'])}  {situacao}")
+
+    validos = [r for r in resultados if not r["divergentes"]]
+    if validos:
+        chave = "ms_detalhe" if paginas_detalhe else "ms_tabela"
+        mais_rapido = min(validos, key=lambda r: r[chave])
+        print(f"\nMotor mais rápido com resultados idênticos: {mais_rapido['motor']} (use --parser {mais_rapido['motor']})")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark da extração de rótulos da página de detalhes.
+Compara a busca antiga (até três soup.find por rótulo) com o índice de passagem única
+(extracao_html.indexar_rotulos) e confere se os dois produzem o mesmo resultado.
+
+Uso:
+    python licencas_ambientais/benchmark_parser.py paginas_detalhe/*.html
+    python licencas_ambientais/benchmark_parser.py --sinteticas 50 --linhas-extras 200
+"""
+
+import argparse
+import glob
+import logging
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from extracao_html import LABELS_DETALHE, indexar_rotulos
+from portal_simulado import gerar_processos, gerar_html_detalhe
+
+logger = logging.getLogger("coletor_ecosistemas.benchmark")
+
+
+def buscar_rotulos_por_label(soup, labels=LABELS_DETALHE):
+    """
+    Implementação de referência: busca cada rótulo com varreduras completas do documento
+    (mesma lógica usada antes em ColetorEcosistemas.extrair_dados_detalhados)
+    """
+    dados = {}
+    for label in labels:
+        strong_elem = soup.find('strong', string=lambda t: label in t if t else False)
+        if strong_elem and strong_elem.next_sibling:
+            try:
+                valor = strong_elem.next_sibling.strip()
+            except TypeError:
+                valor = ""
+            if valor:
+                dados[label] = valor
+                continue
+
+        th_elem = soup.find('th', string=lambda t: label in t if t else False)
+        if th_elem and th_elem.find_next('td'):
+            valor = th_elem.find_next('td').get_text(strip=True)
+            if valor:
+                dados[label] = valor
+                continue
+
+        elem = soup.find(string=lambda t: f"{label}:" in t if t else False)
+        if elem:
+            partes = elem.strip().split(':', 1)
+            if len(partes) > 1:
+                valor = partes[1].strip()
+                if valor:
+                    dados[label] = valor
+    return dados
+
+
+def carregar_paginas(padroes):
+    """Lê os arquivos HTML indicados (arquivos, diretórios ou padrões glob)"""
+    arquivos = []
+    for padrao in padroes:
+        if os.path.isdir(padrao):
+            arquivos.extend(sorted(glob.glob(os.path.join(padrao, "*.html"))))
+        else:
+            arquivos.extend(sorted(glob.glob(padrao)))
+
+    paginas = []
+    for arquivo in arquivos:
+        with open(arquivo, encoding='utf-8', errors='replace') as f:
+            paginas.append((arquivo, f.read()))
+    return paginas
+
+
+def medir(funcao, soups, repeticoes):
+    """Retorna o melhor tempo total, em segundos, entre as repetições"""
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for soup in soups:
+            funcao(soup)
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return melhor
+
+
+def executar_benchmark(paginas, repeticoes=5, parser='html.parser'):
+    """
+    Executa o benchmark sobre uma lista de (nome, html)
+
+    Returns:
+        dict: Tempos de cada abordagem, ganho e páginas com resultados divergentes
+    """
+    soups = [BeautifulSoup(html, parser) for _, html in paginas]
+
+    divergentes = []
+    for (nome, _), soup in zip(paginas, soups):
+        if buscar_rotulos_por_label(soup) != indexar_rotulos(soup):
+            divergentes.append(nome)
+
+    tempo_antigo = medir(buscar_rotulos_por_label, soups, repeticoes)
+    tempo_indice = medir(indexar_rotulos, soups, repeticoes)
+
+    return {
+        "paginas": len(paginas),
+        "tempo_por_label": tempo_antigo,
+        "tempo_indice": tempo_indice,
+        "ganho": tempo_antigo / tempo_indice if tempo_indice else float("inf"),
+        "divergentes": divergentes,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark da extração de rótulos das páginas de detalhes')
+    parser.add_argument('arquivos', nargs='*',
+                        help='Páginas de detalhe salvas (arquivos .html, diretórios ou padrões glob)')
+    parser.add_argument('--sinteticas', type=int, default=30,
+                        help='Número de páginas sintéticas usadas quando nenhum arquivo é informado (padrão: 30)')
+    parser.add_argument('--linhas-extras', type=int, default=100,
+                        help='Linhas de histórico adicionadas a cada página sintética (padrão: 100)')
+    parser.add_argument('--repeticoes', type=int, default=5,
+                        help='Repetições de cada medição; vale o melhor tempo (padrão: 5)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.arquivos:
+        paginas = carregar_paginas(args.arquivos)
+        if not paginas:
+            parser.error("Nenhuma página HTML encontrada nos caminhos informados")
+    else:
+        paginas = [
+            (f"sintetica_{processo['id']}", gerar_html_detalhe(processo, args.linhas_extras))
+            for processo in gerar_processos(args.sinteticas)
+        ]
+
+    resultado = executar_benchmark(paginas, args.repeticoes)
+
+    print(f"\nPáginas analisadas: {resultado['paginas']}")
+    print(f"Busca por rótulo (soup.find): {resultado['tempo_por_label'] * 1000:.1f} ms")
+    print(f"Índice em passagem única:     {resultado['tempo_indice'] * 1000:.1f} ms")
+    print(f"Ganho: {resultado['ganho']:.1f}x")
+    if resultado['divergentes']:
+        print(f"ATENÇÃO: {len(resultado['divergentes'])} páginas com resultados diferentes:")
+        for nome in resultado['divergentes']:
+            print(f"  - {nome}")
+    else:
+        print("Resultados idênticos nas duas abordagens")
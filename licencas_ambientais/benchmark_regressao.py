@@ -0,0 +1,454 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Suíte de micro-benchmarks da extração e do pós-processamento da coleta, com verificação de
+regressão contra uma referência gravada (benchmark_referencia.json).
+
+Casos medidos, sobre páginas sintéticas (portal_simulado) e, opcionalmente, páginas gravadas
+(gravacao_paginas.py) ou salvas em arquivos:
+
+- ColetorEcosistemas.extrair_dados_tabela: tabelas de 10, 100 e 10.000 linhas, com linhas
+  irregulares de célula única (classe predominante e link) intercaladas;
+- ColetorEcosistemas.extrair_dados_detalhados: páginas de detalhes de vários tamanhos;
+- classificação do tipo de estudo: identificar_tipo_estudo (documentos e texto de cada página
+  de detalhes) e tipo_estudo_registro (registros de cada tabela);
+- ColetorEcosistemas.salvar_resultados: CSV e Excel de 100 e 1.000 registros.
+
+Os métodos medidos são os do coletor, executados sem navegador pelo ColetorReproducao sobre uma
+gravação montada com as páginas dos casos (a tabela é lida pelo page_source com o motor HTML).
+Cada caso guarda também uma assinatura do resultado, para que uma mudança de comportamento do
+parser apareça junto com a de tempo. A saída do script é 1 se algum caso ficou mais lento que a
+tolerância ou mudou de resultado em relação à referência.
+
+Uso:
+    python licencas_ambientais/benchmark_regressao.py
+    python licencas_ambientais/benchmark_regressao.py --salvar-referencia
+    python licencas_ambientais/benchmark_regressao.py --gravacao gravacao/ --parser lxml --tolerancia 0.1
+"""
+
+import argparse
+import gc
+import glob
+import hashlib
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from html.parser import HTMLParser
+
+from benchmark_parser import carregar_paginas, medir
+from classificacao_estudos import identificar_tipo_estudo, tipo_estudo_registro
+from gravacao_paginas import ColetorReproducao, GravacaoPaginas, GravadorPaginas
+from metricas import MetricasColeta
+from motores_html import MOTORES, MOTOR_PADRAO
+from portal_simulado import gerar_processos, gerar_html_detalhe, gerar_html_tabela
+
+logger = logging.getLogger("coletor_ecosistemas.benchmark")
+
+ARQUIVO_REFERENCIA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_referencia.json")
+
+LINHAS_TABELA = (10, 100, 10000)
+LINHAS_EXTRAS_DETALHE = (0, 100, 1000)
+REGISTROS_SALVAMENTO = (100, 1000)
+# A cada N linhas da tabela sintética, uma linha irregular de célula única
+INTERVALO_IRREGULAR = 10
+URL_DETALHE = "https://benchmark.local/sla/#/acesso-visitante/processo/{id}"
+HTML_CALIBRACAO = ("<table>" + "<tr><td class='celula'>texto da célula</td><td><a href='#/processo/1'>ver</a></td></tr>"
+                   * 500 + "</table>")
+
+# Casos rápidos são repetidos em sequência até cada medição durar pelo menos isto (segundos)
+DURACAO_MINIMA = 0.2
+TOLERANCIA = 0.25
+# Diferenças menores que esta (em ms) são ruído de medição, mesmo acima da tolerância
+DIFERENCA_MINIMA_MS = 0.5
+
+OK = "ok"
+REGRESSAO = "REGRESSÃO"
+MELHORA = "melhora"
+RESULTADO_DIFERENTE = "RESULTADO DIFERENTE"
+NOVO = "novo"
+
+
+def assinatura(resultado):
+    """Resumo curto e determinístico de um resultado (listas, dicts, tuplas ou texto)"""
+    serializado = resultado if isinstance(resultado, str) else json.dumps(resultado, sort_keys=True,
+                                                                           ensure_ascii=False, default=str)
+    return hashlib.sha1(serializado.encode("utf-8")).hexdigest()[:12]
+
+
+def _carga_calibracao(_=None):
+    analisador = HTMLParser()
+    analisador.feed(HTML_CALIBRACAO)
+    analisador.close()
+
+
+def _passagens(funcao, itens, duracao_minima):
+    """Passagens por todos os itens necessárias para uma medição durar duracao_minima"""
+    inicio = time.perf_counter()
+    for item in itens:
+        funcao(item)
+    return max(1, int(duracao_minima / max(time.perf_counter() - inicio, 1e-6)))
+
+
+def medir_passagem(funcao, itens, repeticoes, duracao_minima=DURACAO_MINIMA):
+    """
+    Melhor tempo de uma passagem de `funcao` por todos os itens, com a calibração da máquina
+
+    Como no timeit, a coleta de lixo fica desligada durante as medições e casos rápidos são
+    repetidos em sequência até a medição durar duracao_minima. A cada repetição, logo antes do
+    caso, é medida também uma carga fixa que não depende do código da coleta (análise de um HTML
+    fixo com o HTMLParser da biblioteca padrão): as duas medições ficam sujeitas à mesma carga da
+    máquina, e a razão entre elas é comparável entre execuções e entre máquinas.
+
+    Returns:
+        tuple: (melhor tempo do caso, melhor tempo da calibração), em segundos
+    """
+    passagens = _passagens(funcao, itens, duracao_minima)
+    passagens_calibracao = _passagens(_carga_calibracao, [None], duracao_minima / 4)
+
+    def passagem(_):
+        for _ in range(passagens):
+            for item in itens:
+                funcao(item)
+
+    def calibracao(_):
+        for _ in range(passagens_calibracao):
+            _carga_calibracao()
+
+    melhor = melhor_calibracao = None
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeticoes):
+            tempo_calibracao = medir(calibracao, [None], 1) / passagens_calibracao
+            tempo = medir(passagem, [None], 1) / passagens
+            melhor = tempo if melhor is None else min(melhor, tempo)
+            melhor_calibracao = (tempo_calibracao if melhor_calibracao is None
+                                 else min(melhor_calibracao, tempo_calibracao))
+    finally:
+        gc.enable()
+    return melhor, melhor_calibracao
+
+
+@contextmanager
+def sem_logs():
+    """Silencia os logs durante as medições (os métodos do coletor registram cada página)"""
+    logging.disable(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def montar_gravacao(diretorio, sinteticas=True, gravacoes=(), arquivos_tabela=(), arquivos_detalhe=()):
+    """
+    Grava as páginas dos casos em uma gravação de GravadorPaginas
+
+    Args:
+        diretorio (str): Diretório da gravação montada
+        sinteticas (bool): Se True, inclui as tabelas (LINHAS_TABELA) e detalhes (LINHAS_EXTRAS_DETALHE)
+            sintéticos
+        gravacoes (list): Diretórios de gravações da coleta (opção --gravar de executar_ecosistemas.py)
+        arquivos_tabela (list): (nome, html) de páginas de resultados salvas
+        arquivos_detalhe (list): (nome, html) de páginas de detalhes salvas
+
+    Returns:
+        tuple: (tabelas, detalhes), listas de (nome do caso, páginas), em que cada página é o HTML
+            (tabelas) ou (url, HTML) (detalhes)
+    """
+    with sem_logs():
+        gravador = GravadorPaginas(diretorio)
+    tabelas = []
+    detalhes = []
+
+    def gravar_tabela(html):
+        gravador.gravar_tabela(None, html)
+        return html
+
+    def gravar_detalhe(url, html):
+        gravador.gravar_detalhe(url, html)
+        return url, html
+
+    if sinteticas:
+        processos = gerar_processos(max(LINHAS_TABELA))
+        for linhas in LINHAS_TABELA:
+            html = gerar_html_tabela(processos[:linhas], rota_detalhes=URL_DETALHE,
+                                     linhas_irregulares=INTERVALO_IRREGULAR)
+            tabelas.append((f"tabela_{linhas}_linhas", [gravar_tabela(html)]))
+        # Processo com EIA/RIMA nos documentos, para a classificação percorrer documentos e texto
+        processo = next(p for p in processos if len(p["documentos"]) > 1)
+        for linhas_extras in LINHAS_EXTRAS_DETALHE:
+            url = URL_DETALHE.format(id=f"{processo['id']}-{linhas_extras}")
+            detalhes.append((f"detalhe_{linhas_extras}_linhas_extras",
+                             [gravar_detalhe(url, gerar_html_detalhe(processo, linhas_extras))]))
+
+    gravadas_tabela = [gravar_tabela(html) for _, html in arquivos_tabela]
+    gravados_detalhe = [gravar_detalhe(f"arquivo://{nome}", html) for nome, html in arquivos_detalhe]
+    for caminho in gravacoes:
+        gravacao = GravacaoPaginas(caminho)
+        for pagina in sorted(gravacao.tabelas):
+            gravadas_tabela.append(gravar_tabela(gravacao.tabela(pagina)[0]))
+        for url in gravacao.detalhes:
+            gravados_detalhe.append(gravar_detalhe(url, gravacao.detalhe(url)))
+    if gravadas_tabela:
+        tabelas.append(("tabelas_gravadas", gravadas_tabela))
+    if gravados_detalhe:
+        detalhes.append(("detalhes_gravados", gravados_detalhe))
+    return tabelas, detalhes
+
+
+def executar_suite(tabelas, detalhes, diretorio, parser_html=MOTOR_PADRAO, repeticoes=5, filtro=None):
+    """
+    Mede cada caso com os métodos do coletor
+
+    Args:
+        tabelas (list): Casos de tabela de montar_gravacao
+        detalhes (list): Casos de detalhes de montar_gravacao
+        diretorio (str): Diretório da gravação montada (também recebe os arquivos de salvar_resultados)
+        parser_html (str): Motor de análise HTML do coletor
+        repeticoes (int): Repetições de cada medição; vale o melhor tempo
+        filtro (list): Se informado, mede apenas os casos cujo nome contém algum destes textos
+
+    Returns:
+        dict: Nome do caso -> {"ms": melhor tempo de uma passagem por todas as páginas do caso,
+            "calibracao_ms": melhor tempo da calibração medida junto com o caso, "itens": páginas
+            ou registros do caso, "resultado": assinatura do resultado}
+    """
+    with sem_logs():
+        coletor = ColetorReproducao(diretorio, usar_estrutura_gravada=False, paginas_comparacao=0,
+                                    parser_html=parser_html, metricas=MetricasColeta(),
+                                    prefixo_saida=os.path.join(diretorio, "benchmark"),
+                                    arquivo_incremental=os.path.join(diretorio, "benchmark_incremental.csv"))
+    if coletor.motor_html.nome != parser_html:
+        logger.warning(f"Motor {parser_html} indisponível; medindo com {coletor.motor_html.nome}")
+    driver = coletor.driver
+    casos = {}
+
+    def medir_caso(nome, funcao, itens):
+        if filtro and not any(texto in nome for texto in filtro):
+            return
+        logger.info(f"Medindo {nome} ({len(itens)} itens)")
+        with sem_logs():
+            resultado = [funcao(item) for item in itens]
+            tempo, calibracao = medir_passagem(funcao, itens, repeticoes)
+        casos[nome] = {"ms": round(tempo * 1000, 4), "calibracao_ms": round(calibracao * 1000, 4),
+                       "itens": len(itens), "resultado": assinatura(resultado)}
+
+    def extrair_tabela(html):
+        driver.page_source, driver.estrutura = html, None
+        return coletor.extrair_dados_tabela()
+
+    def extrair_detalhe(pagina):
+        driver.current_url, driver.page_source = pagina
+        return coletor.extrair_dados_detalhados()
+
+    registros_por_tabela = {}
+    for nome, paginas in tabelas:
+        medir_caso(f"extrair_dados_tabela:{nome}", extrair_tabela, paginas)
+        with sem_logs():
+            registros = [registro for html in paginas for registro in extrair_tabela(html)]
+        # Sem o tipo já atribuído na extração, para a classificação ser executada de fato
+        registros_por_tabela[nome] = [{chave: valor for chave, valor in registro.items() if chave != "tipo_de_estudo"}
+                                      for registro in registros]
+        medir_caso(f"tipo_estudo_registro:{nome}", tipo_estudo_registro, registros_por_tabela[nome])
+
+    detalhes_extraidos = []
+    for nome, paginas in detalhes:
+        medir_caso(f"extrair_dados_detalhados:{nome}", extrair_detalhe, paginas)
+        with sem_logs():
+            analisados = [coletor.motor_html.analisar_detalhes(html) for _, html in paginas]
+        entradas = [(dados["Documentos"], texto, dados.get("Atividade Principal", ""),
+                     dados.get("Classe predominante", "")) for dados, texto in analisados]
+        medir_caso(f"identificar_tipo_estudo:{nome}", lambda entrada: identificar_tipo_estudo(*entrada), entradas)
+        with sem_logs():
+            detalhes_extraidos.extend(extrair_detalhe(pagina) for pagina in paginas)
+
+    # Registros completos, como os de coletar_dados: linha da tabela + dados da página de detalhes
+    registros = max(registros_por_tabela.values(), key=len, default=[])
+    for quantidade in REGISTROS_SALVAMENTO:
+        nome = f"salvar_resultados:{quantidade}_registros"
+        if len(registros) < quantidade or (filtro and not any(texto in nome for texto in filtro)):
+            continue
+        completos = [{**registro, **detalhes_extraidos[i % len(detalhes_extraidos)]} if detalhes_extraidos
+                     else dict(registro) for i, registro in enumerate(registros[:quantidade])]
+        prefixo = os.path.join(diretorio, f"salvamento_{quantidade}")
+        logger.info(f"Medindo {nome} (CSV e Excel)")
+        with sem_logs():
+            tempo, calibracao = medir_passagem(lambda lote: coletor.salvar_resultados(lote, prefixo=prefixo),
+                                               [completos], repeticoes)
+        # Assinatura pelo CSV gravado (o Excel traz a data de criação nos metadados)
+        with open(sorted(glob.glob(f"{prefixo}_*.csv"))[-1], encoding="utf-8-sig") as arquivo:
+            casos[nome] = {"ms": round(tempo * 1000, 4), "calibracao_ms": round(calibracao * 1000, 4),
+                           "itens": quantidade, "resultado": assinatura(arquivo.read())}
+
+    return casos
+
+
+def comparar_com_referencia(casos, referencia, tolerancia=TOLERANCIA, diferenca_minima_ms=DIFERENCA_MINIMA_MS,
+                            calibrar=True):
+    """
+    Compara os tempos e resultados da execução com os da referência
+
+    O tempo da referência de cada caso é ajustado pela razão entre a calibração medida junto com
+    o caso agora e na referência (velocidade da máquina). Um caso é regressão se ficou mais de
+    `tolerancia` mais lento que esse tempo esperado e a diferença passa de diferenca_minima_ms;
+    com o mesmo critério no sentido contrário, é melhora.
+
+    Args:
+        casos (dict): Saída de executar_suite
+        referencia (dict): Referência gravada (ver montar_referencia), ou None
+        tolerancia (float): Aumento relativo de tempo aceito (0.25 = 25%)
+        diferenca_minima_ms (float): Diferença absoluta abaixo da qual não há regressão nem melhora
+        calibrar (bool): Se False, compara os tempos sem o ajuste pela calibração
+
+    Returns:
+        list: Um dict por caso com nome, ms, ms_referencia (já ajustado), fator da calibração,
+            variacao e situacao
+    """
+    casos_referencia = (referencia or {}).get("casos", {})
+    comparacao = []
+    for nome, caso in casos.items():
+        anterior = casos_referencia.get(nome)
+        linha = {"nome": nome, "ms": caso["ms"], "itens": caso["itens"], "ms_referencia": None, "fator": None,
+                 "variacao": None}
+        if anterior is None:
+            linha["situacao"] = NOVO
+        else:
+            fator = 1.0
+            if calibrar and anterior.get("calibracao_ms") and caso.get("calibracao_ms"):
+                fator = caso["calibracao_ms"] / anterior["calibracao_ms"]
+            esperado = anterior["ms"] * fator
+            linha["ms_referencia"] = round(esperado, 4)
+            linha["fator"] = round(fator, 3)
+            linha["variacao"] = caso["ms"] / esperado - 1 if esperado else None
+            diferenca = caso["ms"] - esperado
+            if anterior.get("resultado") != caso["resultado"] or anterior.get("itens") != caso["itens"]:
+                linha["situacao"] = RESULTADO_DIFERENTE
+            elif diferenca > diferenca_minima_ms and caso["ms"] > esperado * (1 + tolerancia):
+                linha["situacao"] = REGRESSAO
+            elif -diferenca > diferenca_minima_ms and esperado > caso["ms"] * (1 + tolerancia):
+                linha["situacao"] = MELHORA
+            else:
+                linha["situacao"] = OK
+        comparacao.append(linha)
+    return comparacao
+
+
+def montar_referencia(casos, parser_html, repeticoes):
+    """Monta o conteúdo do arquivo de referência, com o ambiente da medição"""
+    return {
+        "gerada_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "parser_html": parser_html,
+        "repeticoes": repeticoes,
+        "casos": casos,
+    }
+
+
+def carregar_referencia(caminho):
+    """Lê o arquivo de referência; retorna None se ele não existir"""
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Micro-benchmarks da extração e do salvamento, com '
+                                                 'verificação de regressão contra uma referência')
+    parser.add_argument('--gravacao', nargs='*', default=[],
+                        help='Gravações da coleta (opção --gravar) incluídas como casos "gravados"')
+    parser.add_argument('--tabelas', nargs='*', default=[],
+                        help='Páginas de resultados salvas (arquivos .html, diretórios ou padrões glob)')
+    parser.add_argument('--detalhes', nargs='*', default=[],
+                        help='Páginas de detalhes salvas (arquivos .html, diretórios ou padrões glob)')
+    parser.add_argument('--sem-sinteticas', action='store_true',
+                        help='Mede apenas as páginas gravadas ou salvas')
+    parser.add_argument('--casos', nargs='*', default=None,
+                        help='Mede apenas os casos cujo nome contém algum destes textos (ex: tabela_10000 salvar)')
+    parser.add_argument('--parser', choices=list(MOTORES), default=MOTOR_PADRAO,
+                        help=f'Motor de análise HTML do coletor (padrão: {MOTOR_PADRAO})')
+    parser.add_argument('--repeticoes', type=int, default=5,
+                        help='Repetições de cada medição; vale o melhor tempo (padrão: 5)')
+    parser.add_argument('--referencia', type=str, default=ARQUIVO_REFERENCIA,
+                        help='Arquivo JSON de referência (padrão: benchmark_referencia.json ao lado do script)')
+    parser.add_argument('--salvar-referencia', action='store_true',
+                        help='Grava os tempos desta execução como a nova referência')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help=f'Aumento de tempo aceito antes de acusar regressão (padrão: {TOLERANCIA:g} = '
+                             f'{TOLERANCIA * 100:.0f}%%)')
+    parser.add_argument('--diferenca-minima', type=float, default=DIFERENCA_MINIMA_MS,
+                        help=f'Diferença em ms abaixo da qual não há regressão (padrão: {DIFERENCA_MINIMA_MS:g})')
+    parser.add_argument('--sem-calibracao', action='store_true',
+                        help='Compara os tempos sem descontar a diferença de velocidade da máquina '
+                             '(calibração medida junto com cada caso)')
+    parser.add_argument('--saida-json', type=str, default=None,
+                        help='Arquivo JSON onde gravar os tempos e a comparação')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    arquivos_tabela = carregar_paginas(args.tabelas) if args.tabelas else []
+    arquivos_detalhe = carregar_paginas(args.detalhes) if args.detalhes else []
+    if (args.tabelas or args.detalhes) and not (arquivos_tabela or arquivos_detalhe):
+        parser.error("Nenhuma página HTML encontrada nos caminhos informados")
+    if args.sem_sinteticas and not (args.gravacao or arquivos_tabela or arquivos_detalhe):
+        parser.error("--sem-sinteticas exige --gravacao, --tabelas ou --detalhes")
+
+    with tempfile.TemporaryDirectory(prefix="benchmark_regressao_") as diretorio:
+        tabelas, detalhes = montar_gravacao(diretorio, not args.sem_sinteticas, args.gravacao,
+                                            arquivos_tabela, arquivos_detalhe)
+        casos = executar_suite(tabelas, detalhes, diretorio, args.parser, args.repeticoes, args.casos)
+
+    referencia = carregar_referencia(args.referencia)
+    comparacao = comparar_com_referencia(casos, referencia, args.tolerancia, args.diferenca_minima,
+                                         not args.sem_calibracao)
+
+    if referencia is None:
+        print(f"\nReferência {args.referencia} não encontrada; gere com --salvar-referencia")
+    else:
+        print(f"\nReferência de {referencia.get('gerada_em')} (Python {referencia.get('python')}, "
+              f"{referencia.get('parser_html')}, {referencia.get('processador')})")
+        if (referencia.get("python"), referencia.get("parser_html")) != (platform.python_version(), args.parser):
+            print(f"ATENÇÃO: referência medida com outro Python ou motor HTML (agora: Python "
+                  f"{platform.python_version()}, {args.parser}); os tempos podem não ser comparáveis")
+
+    def formatar(valor, formato):
+        return format(valor, formato) if valor is not None else "-"
+
+    # "referência" já vem ajustada pela velocidade da máquina ("máquina": calibração atual / da referência)
+    print(f"{'Caso':<54}{'itens':>7}{'ms':>11}{'referência':>12}{'máquina':>9}{'variação':>10}  Situação")
+    for linha in comparacao:
+        print(f"{linha['nome']:<54}{linha['itens']:>7}{linha['ms']:>11.3f}{formatar(linha['ms_referencia'], '.3f'):>12}"
+              f"{formatar(linha['fator'], '.2f'):>9}{formatar(linha['variacao'], '+.0%'):>10}  {linha['situacao']}")
+    ausentes = sorted(set((referencia or {}).get("casos", {})) - set(casos))
+    if ausentes and not args.casos:
+        print(f"Casos da referência não medidos nesta execução: {', '.join(ausentes)}")
+
+    if args.saida_json:
+        with open(args.saida_json, "w", encoding="utf-8") as arquivo:
+            json.dump({"referencia": args.referencia, "tolerancia": args.tolerancia, "comparacao": comparacao,
+                       **montar_referencia(casos, args.parser, args.repeticoes)}, arquivo, ensure_ascii=False, indent=2)
+        print(f"Resultados salvos em {args.saida_json}")
+
+    if args.salvar_referencia:
+        with open(args.referencia, "w", encoding="utf-8") as arquivo:
+            json.dump(montar_referencia(casos, args.parser, args.repeticoes), arquivo, ensure_ascii=False, indent=2)
+            arquivo.write("\n")
+        print(f"Referência gravada em {args.referencia}")
+        sys.exit(0)
+
+    problemas = [linha for linha in comparacao if linha["situacao"] in (REGRESSAO, RESULTADO_DIFERENTE)]
+    if problemas:
+        print(f"\n{len(problemas)} casos com regressão de tempo ou resultado diferente da referência")
+        sys.exit(1)
+    if referencia is not None:
+        print("\nSem regressões em relação à referência")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Checkpoint persistente da coleta Ecosistemas em SQLite.
+Guarda, por filtro, a última página concluída e os registros já enriquecidos,
+permitindo retomar uma coleta interrompida sem refazer trabalho.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+
+logger = logging.getLogger("coletor_ecosistemas.checkpoint")
+
+FILTRO_PADRAO = "classe_predominante=6"
+
+
+def chave_registro(resultado, pagina, i):
+    """
+    Retorna a chave de um registro no checkpoint: o número do processo ou,
+    na falta dele, a posição do registro na pesquisa
+    """
+    return resultado.get("processo") or f"pagina{pagina}-linha{i + 1}"
+
+
+class CheckpointColeta:
+    def __init__(self, caminho="ecosistemas_checkpoint.db", filtro=FILTRO_PADRAO):
+        """
+        Abre (ou cria) o banco de checkpoint
+
+        Args:
+            caminho (str): Arquivo SQLite do checkpoint
+            filtro (str): Identificação do filtro aplicado na pesquisa
+        """
+        self.caminho = caminho
+        self.filtro = filtro
+        # check_same_thread=False: workers de detalhes registram a partir de outras threads
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS coletas (
+                filtro TEXT PRIMARY KEY,
+                ultima_pagina INTEGER NOT NULL DEFAULT 0,
+                tamanho_pagina INTEGER,
+                atualizado_em TEXT
+            );
+            CREATE TABLE IF NOT EXISTS registros (
+                filtro TEXT NOT NULL,
+                processo TEXT NOT NULL,
+                pagina INTEGER NOT NULL,
+                dados TEXT NOT NULL,
+                PRIMARY KEY (filtro, processo)
+            );
+        """)
+        colunas = {linha[1] for linha in self.conexao.execute("PRAGMA table_info(coletas)")}
+        if "tamanho_pagina" not in colunas:
+            # Checkpoints criados antes do registro do tamanho de página
+            self.conexao.execute("ALTER TABLE coletas ADD COLUMN tamanho_pagina INTEGER")
+        self.conexao.commit()
+
+    def ultima_pagina(self):
+        """Retorna a última página concluída para o filtro (0 se nenhuma)"""
+        linha = self.conexao.execute(
+            "SELECT ultima_pagina FROM coletas WHERE filtro = ?", (self.filtro,)
+        ).fetchone()
+        return linha[0] if linha else 0
+
+    def tamanho_pagina(self):
+        """Retorna o número de registros por página usado na coleta (None se desconhecido)"""
+        linha = self.conexao.execute(
+            "SELECT tamanho_pagina FROM coletas WHERE filtro = ?", (self.filtro,)
+        ).fetchone()
+        return linha[0] if linha else None
+
+    def registrar_pagina(self, pagina, tamanho_pagina=None):
+        """Marca a página como concluída, com o número de registros por página usado"""
+        with self._lock, self.conexao:
+            self.conexao.execute(
+                "INSERT INTO coletas (filtro, ultima_pagina, tamanho_pagina, atualizado_em) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(filtro) DO UPDATE SET ultima_pagina = excluded.ultima_pagina, "
+                "tamanho_pagina = COALESCE(excluded.tamanho_pagina, tamanho_pagina), "
+                "atualizado_em = excluded.atualizado_em",
+                (self.filtro, pagina, tamanho_pagina, datetime.now().isoformat(timespec="seconds"))
+            )
+
+    def registrar_registro(self, processo, pagina, dados):
+        """Guarda um registro enriquecido"""
+        with self._lock, self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO registros (filtro, processo, pagina, dados) VALUES (?, ?, ?, ?)",
+                (self.filtro, processo, pagina, json.dumps(dados, ensure_ascii=False, default=str))
+            )
+
+    def processos_concluidos(self):
+        """Retorna o conjunto de processos já enriquecidos para o filtro"""
+        return {
+            linha[0] for linha in
+            self.conexao.execute("SELECT processo FROM registros WHERE filtro = ?", (self.filtro,))
+        }
+
+    def carregar_resultados(self):
+        """Retorna os registros já coletados, na ordem em que foram gravados"""
+        return [
+            json.loads(linha[0]) for linha in
+            self.conexao.execute(
+                "SELECT dados FROM registros WHERE filtro = ? ORDER BY pagina, rowid", (self.filtro,)
+            )
+        ]
+
+    def limpar(self):
+        """Descarta o checkpoint do filtro (início de uma nova coleta)"""
+        with self._lock, self.conexao:
+            self.conexao.execute("DELETE FROM coletas WHERE filtro = ?", (self.filtro,))
+            self.conexao.execute("DELETE FROM registros WHERE filtro = ?", (self.filtro,))
+        logger.info(f"Checkpoint do filtro '{self.filtro}' reiniciado em {self.caminho}")
+
+    def fechar(self):
+        self.conexao.close()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Identificação do tipo de estudo ambiental (EIA/RIMA ou RCA) exigido em um processo.
+Compartilhado por todas as etapas da coleta (tabela, detalhes, salvamento e resumo),
+tanto no coletor Selenium quanto no coletor HTTP do sistema Ecosistemas MG.
+
+Os termos procurados são compilados em uma única expressão regular, de modo que cada
+texto é percorrido uma só vez; o motivo entre parênteses é lido apenas nas posições encontradas.
+"""
+
+import logging
+import re
+from collections import namedtuple
+
+from regras_atividades import RegrasAtividades
+
+logger = logging.getLogger("coletor_ecosistemas")
+
+# Lista expandida de termos para busca no texto da página
+TERMOS_EIA_RIMA = [
+    'EIA/RIMA', 'EIA / RIMA', 'EIA-RIMA', 'ESTUDO DE IMPACTO AMBIENTAL',
+    'RELATÓRIO DE IMPACTO AMBIENTAL', 'RIMA', 'EIA', 'IMPACTO AMBIENTAL'
+]
+
+TERMOS_RCA = [
+    'RCA COM ART', 'RCA/PCA', 'RCA / PCA', 'RCA-PCA',
+    'RELATÓRIO DE CONTROLE AMBIENTAL', 'RELATORIO DE CONTROLE AMBIENTAL',
+    'RCA', 'CONTROLE AMBIENTAL'
+]
+
+# Termos que identificam o tipo de estudo pelo nome de um documento
+TERMOS_DOCUMENTO_EIA_RIMA = ['ESTUDO DE IMPACTO AMBIENTAL', 'ESTUDO DE IMPACTO', 'IMPACTO AMBIENTAL', 'EIA', 'RIMA']
+TERMOS_DOCUMENTO_RCA = ['RELATÓRIO DE CONTROLE AMBIENTAL', 'RELATÓRIO DE CONTROLE', 'RELATORIO DE CONTROLE', 'RCA']
+
+EIA_RIMA = "EIA/RIMA"
+RCA = "RCA"
+EIA_RIMA_E_RCA = "EIA/RIMA e RCA"
+EIA_RIMA_INFERIDO = "EIA/RIMA (inferido pela atividade)"
+RCA_INFERIDO = "RCA (inferido pela atividade)"
+A_DETERMINAR = "A determinar"
+NAO_IDENTIFICADO = "Não identificado"
+
+# Tipos que dispensam a consulta à página de detalhes
+TIPOS_CONFIRMADOS = (EIA_RIMA, RCA)
+
+# Categorias usadas nos resumos, na ordem de exibição
+CATEGORIAS_ESTUDO = [
+    EIA_RIMA, RCA, EIA_RIMA_E_RCA, EIA_RIMA_INFERIDO, RCA_INFERIDO, A_DETERMINAR, NAO_IDENTIFICADO
+]
+
+# Ocorrência de um termo no texto: categoria (EIA/RIMA ou RCA), termo encontrado,
+# posição inicial e final, e o motivo entre parênteses, quando houver
+Ocorrencia = namedtuple("Ocorrencia", ["categoria", "termo", "inicio", "fim", "motivo"])
+
+ResultadoClassificacao = namedtuple("ResultadoClassificacao", ["tipo_estudo", "motivo_estudo", "ocorrencias"])
+
+
+def _regex_trie(termos):
+    """
+    Monta uma expressão regular a partir da árvore de prefixos dos termos
+
+    Prefixos comuns são fatorados (ex: EIA, EIA/RIMA e EIA-RIMA viram EIA(?:/RIMA|-RIMA)?),
+    o que evita testar cada termo em cada posição; a continuação mais longa tem prioridade.
+    """
+    arvore = {}
+    for termo in termos:
+        no = arvore
+        for caractere in termo:
+            no = no.setdefault(caractere, {})
+        no[""] = {}
+
+    def converter(no):
+        alternativas = [re.escape(caractere) + converter(filho) for caractere, filho in sorted(no.items()) if caractere]
+        if not alternativas:
+            return ""
+        if len(alternativas) == 1 and "" not in no:
+            return alternativas[0]
+        corpo = f"(?:{'|'.join(alternativas)})"
+        return f"{corpo}?" if "" in no else corpo
+
+    return converter(arvore)
+
+
+def _compilar_termos(termos_por_categoria):
+    """
+    Compila os termos em uma única expressão regular e o mapa termo -> categoria
+    """
+    categorias = {}
+    for categoria, termos in termos_por_categoria:
+        for termo in termos:
+            categorias.setdefault(termo, categoria)
+    return re.compile(_regex_trie(categorias)), categorias
+
+
+class ClassificadorEstudos:
+    # Motivo entre parênteses, lido a partir da posição de cada ocorrência no texto da página
+    PADRAO_MOTIVO_PAGINA = {
+        EIA_RIMA: re.compile(r'EIA/RIMA\s*-\s*[^(]*\(([^)]+)\)'),
+        RCA: re.compile(r'RCA\s*-\s*[^(]*\(([^)]+)\)'),
+    }
+
+    # Motivo entre parênteses no nome de um documento
+    PADRAO_MOTIVO_DOCUMENTO = {
+        EIA_RIMA: re.compile(r'EIA/RIMA -.*?\((.*?)\)'),
+        RCA: re.compile(r'RCA -.*?\((.*?)\)'),
+    }
+
+    # Termo do nome do documento a partir do qual o motivo é procurado
+    TERMO_MOTIVO_DOCUMENTO = {
+        EIA_RIMA: 'ESTUDO DE IMPACTO AMBIENTAL',
+        RCA: 'RELATÓRIO DE CONTROLE AMBIENTAL',
+    }
+
+    def __init__(self, termos_eia_rima=TERMOS_EIA_RIMA, termos_rca=TERMOS_RCA,
+                 termos_documento_eia_rima=TERMOS_DOCUMENTO_EIA_RIMA, termos_documento_rca=TERMOS_DOCUMENTO_RCA,
+                 regras=None):
+        """
+        Compila os padrões de busca
+
+        Args:
+            termos_eia_rima (list): Termos que indicam EIA/RIMA no texto da página
+            termos_rca (list): Termos que indicam RCA no texto da página
+            termos_documento_eia_rima (list): Termos que indicam EIA/RIMA no nome de um documento
+            termos_documento_rca (list): Termos que indicam RCA no nome de um documento
+            regras (RegrasAtividades): Regras de atividades da DN 217 (padrão: regras_dn217.json)
+        """
+        self.regras = regras if regras is not None else RegrasAtividades.carregar()
+        self.padrao_pagina, self.categorias_pagina = _compilar_termos(
+            [(EIA_RIMA, termos_eia_rima), (RCA, termos_rca)]
+        )
+        self.padrao_documento, self.categorias_documento = _compilar_termos(
+            [(EIA_RIMA, termos_documento_eia_rima), (RCA, termos_documento_rca)]
+        )
+
+    def encontrar(self, texto):
+        """
+        Localiza todos os termos de EIA/RIMA e RCA em uma única passagem pelo texto
+
+        Args:
+            texto (str): Texto a examinar (a busca não diferencia maiúsculas)
+
+        Returns:
+            list: Ocorrências na ordem em que aparecem no texto
+        """
+        texto = texto.upper()
+        ocorrencias = []
+        for match in self.padrao_pagina.finditer(texto):
+            termo = match.group(0)
+            categoria = self.categorias_pagina[termo]
+            motivo = ""
+            padrao_motivo = self.PADRAO_MOTIVO_PAGINA[categoria]
+            if termo.startswith(categoria):
+                match_motivo = padrao_motivo.match(texto, match.start())
+                if match_motivo:
+                    motivo = match_motivo.group(1).strip()
+            ocorrencias.append(Ocorrencia(categoria, termo, match.start(), match.end(), motivo))
+        return ocorrencias
+
+    def _examinar_documento(self, texto):
+        """Retorna as categorias encontradas no nome de um documento e o motivo de cada uma"""
+        texto_upper = texto.upper()
+        encontrados = {}
+        for match in self.padrao_documento.finditer(texto_upper):
+            categoria = self.categorias_documento[match.group(0)]
+            if match.group(0) == self.TERMO_MOTIVO_DOCUMENTO[categoria] or categoria not in encontrados:
+                encontrados[categoria] = match.group(0)
+
+        motivos = {}
+        for categoria, termo in encontrados.items():
+            motivos[categoria] = None
+            if termo == self.TERMO_MOTIVO_DOCUMENTO[categoria]:
+                match_motivo = self.PADRAO_MOTIVO_DOCUMENTO[categoria].search(texto)
+                motivos[categoria] = match_motivo.group(1).strip() if match_motivo else texto
+        return motivos
+
+    def inferir_por_atividade(self, atividade_principal="", classe_predominante=""):
+        """
+        Infere o tipo de estudo pela tabela de regras da DN 217 (atividade e, opcionalmente, classe)
+
+        Returns:
+            str: EIA_RIMA_INFERIDO, RCA_INFERIDO ou None quando não há inferência
+        """
+        tipo = self.regras.inferir(atividade_principal, classe_predominante)
+        return f"{tipo} (inferido pela atividade)" if tipo else None
+
+    def classificar(self, documentos, texto_pagina, atividade_principal="", classe_predominante=""):
+        """
+        Identifica o tipo de estudo exigido a partir dos documentos e do texto da página
+
+        Args:
+            documentos (list): Nomes dos documentos associados ao processo
+            texto_pagina (str): Texto completo da página (ou resposta) do processo
+            atividade_principal (str): Atividade principal, usada para inferência
+            classe_predominante (str): Classe predominante, usada para inferência
+
+        Returns:
+            ResultadoClassificacao: tipo de estudo, motivo e ocorrências encontradas no texto da página
+        """
+        tem = {EIA_RIMA: False, RCA: False}
+        motivos = {EIA_RIMA: "", RCA: ""}
+
+        for texto in documentos:
+            for categoria, motivo in self._examinar_documento(texto).items():
+                tem[categoria] = True
+                if motivo is not None:
+                    motivos[categoria] = motivo
+                logger.debug("Documento %s encontrado: %s", categoria, texto)
+
+        ocorrencias = self.encontrar(texto_pagina)
+        for ocorrencia in ocorrencias:
+            categoria = ocorrencia.categoria
+            if ocorrencia.motivo and not motivos[categoria]:
+                motivos[categoria] = ocorrencia.motivo
+                logger.debug("Motivo %s encontrado: %s", categoria, ocorrencia.motivo)
+            if not tem[categoria]:
+                tem[categoria] = True
+                logger.debug("Referência a %s encontrada no texto da página", categoria)
+
+        # Determinar o tipo de estudo, incluindo o motivo quando disponível
+        if tem[EIA_RIMA] and tem[RCA]:
+            tipo_estudo = EIA_RIMA_E_RCA
+            if motivos[EIA_RIMA]:
+                tipo_estudo += f" (EIA/RIMA: {motivos[EIA_RIMA]})"
+            if motivos[RCA]:
+                tipo_estudo += f" (RCA: {motivos[RCA]})"
+        elif tem[EIA_RIMA]:
+            tipo_estudo = EIA_RIMA
+            if motivos[EIA_RIMA]:
+                tipo_estudo += f" ({motivos[EIA_RIMA]})"
+        elif tem[RCA]:
+            tipo_estudo = RCA
+            if motivos[RCA]:
+                tipo_estudo += f" ({motivos[RCA]})"
+        else:
+            # Inferir pelo tipo de atividade se não encontrou nos documentos
+            tipo_estudo = self.inferir_por_atividade(atividade_principal, classe_predominante) or A_DETERMINAR
+
+        motivo_estudo = motivos[EIA_RIMA] if tem[EIA_RIMA] else motivos[RCA]
+        return ResultadoClassificacao(tipo_estudo, motivo_estudo, ocorrencias)
+
+    def classificar_registro(self, registro):
+        """
+        Tipo de estudo de um registro da tabela de resultados (sem acessar a página de detalhes)
+
+        Usa os termos presentes na coluna de classe/estudo e, na falta deles, a atividade principal.
+        """
+        categorias = {ocorrencia.categoria for ocorrencia in self.encontrar(registro.get("classe_predominante") or "")}
+        if len(categorias) == 2:
+            return EIA_RIMA_E_RCA
+        if categorias:
+            return categorias.pop()
+        return self.inferir_por_atividade(registro.get("atividade_principal", "")) or A_DETERMINAR
+
+    def reclassificar_registros(self, registros):
+        """
+        Refaz a inferência pela atividade em registros já coletados (ex: após atualizar as regras)
+
+        Só são alterados registros cujo tipo foi inferido ou ainda está indefinido; tipos
+        identificados pelos documentos ou pelo texto da página são mantidos.
+
+        Args:
+            registros (list): Registros (dicts) de uma saída anterior, alterados no lugar
+
+        Returns:
+            int: Número de registros cujo tipo de estudo mudou
+        """
+        alterados = 0
+        for registro in registros:
+            tipo_anterior = registro.get("tipo_de_estudo") or ""
+            if categoria_estudo(tipo_anterior) not in (EIA_RIMA_INFERIDO, RCA_INFERIDO, A_DETERMINAR, NAO_IDENTIFICADO):
+                continue
+
+            atividade = registro.get("atividade_principal") or registro.get("Atividade Principal") or ""
+            # A classe só entra na inferência quando a página de detalhes foi consultada, como na coleta
+            novo_tipo = self.inferir_por_atividade(atividade, registro.get("Classe predominante") or "") or A_DETERMINAR
+            if novo_tipo != tipo_anterior:
+                registro["tipo_de_estudo"] = novo_tipo
+                if registro.get("Tipo de Estudo") == tipo_anterior:
+                    registro["Tipo de Estudo"] = novo_tipo
+                alterados += 1
+        return alterados
+
+
+CLASSIFICADOR = ClassificadorEstudos()
+
+
+def identificar_tipo_estudo(documentos, texto_pagina, atividade_principal="", classe_predominante=""):
+    """
+    Identifica o tipo de estudo exigido a partir dos documentos e do texto da página
+
+    Returns:
+        tuple: (tipo_estudo, motivo_estudo)
+    """
+    resultado = CLASSIFICADOR.classificar(documentos, texto_pagina, atividade_principal, classe_predominante)
+    return resultado.tipo_estudo, resultado.motivo_estudo
+
+
+def tipo_estudo_registro(registro):
+    """
+    Retorna o tipo de estudo já atribuído ao registro ou, se ainda indefinido, o classifica pela tabela
+    """
+    tipo_estudo = registro.get("tipo_de_estudo")
+    if tipo_estudo and tipo_estudo != A_DETERMINAR:
+        return tipo_estudo
+    return CLASSIFICADOR.classificar_registro(registro)
+
+
+def categoria_estudo(tipo_estudo):
+    """
+    Agrupa um tipo de estudo (com ou sem motivo) em uma das CATEGORIAS_ESTUDO
+    """
+    if not tipo_estudo:
+        return NAO_IDENTIFICADO
+    if tipo_estudo in (EIA_RIMA_INFERIDO, RCA_INFERIDO, A_DETERMINAR):
+        return tipo_estudo
+    for categoria in (EIA_RIMA_E_RCA, EIA_RIMA, RCA):
+        if tipo_estudo == categoria or tipo_estudo.startswith(f"{categoria} ("):
+            return categoria
+    return NAO_IDENTIFICADO
+
+
+def resumo_estudos(registros):
+    """
+    Conta os registros por categoria de tipo de estudo
+
+    Returns:
+        dict: Categoria -> quantidade, na ordem de CATEGORIAS_ESTUDO
+    """
+    estudos = {categoria: 0 for categoria in CATEGORIAS_ESTUDO}
+    for registro in registros:
+        estudos[categoria_estudo(registro.get("tipo_de_estudo"))] += 1
+    return estudos
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Coleta distribuída da Ecosistemas: coordenador e workers ligados por uma fila de tarefas
+(ver fila_distribuida.py).
+
+O coordenador descobre quantas páginas tem cada partição do filtro e enfileira faixas de
+páginas. Cada worker arrenda uma faixa, extrai a tabela de cada página e enfileira um detalhe
+por processo ainda sem tipo de estudo confirmado; a chave do detalhe é o número do processo,
+então um processo listado em várias faixas, partições ou máquinas é detalhado uma única vez.
+Ao final, o coordenador une as tabelas e os detalhes confirmados na fila.
+"""
+
+import logging
+import os
+import socket
+import time
+
+from classificacao_estudos import TIPOS_CONFIRMADOS
+from coleta_particionada import mesclar_resultados
+from filtros import FiltroPesquisa
+from fila_distribuida import PAGINAS, DETALHE, DURACAO_ARRENDAMENTO, PENDENTE, ARRENDADA, CONCLUIDA, FALHOU
+
+logger = logging.getLogger("coletor_ecosistemas.distribuida")
+
+
+def chave_detalhe(registro):
+    """Chave da tarefa de detalhe: o número do processo ou, na falta dele, o link de detalhes"""
+    return f"{DETALHE}:{(registro.get('processo') or '').strip() or registro.get('link_detalhes', '')}"
+
+
+class ExecutorNavegador:
+    """Executa as tarefas com um ColetorEcosistemas (Selenium), mantendo a pesquisa aberta entre faixas"""
+
+    def __init__(self, coletor):
+        self.coletor = coletor
+        self.filtro_atual = None
+        self.pagina_atual = None
+
+    def _pesquisar(self, filtro):
+        if not self.coletor.acessar_site() or not self.coletor.aplicar_filtro(filtro):
+            raise RuntimeError(f"Não foi possível pesquisar com o filtro ({filtro.descrever()})")
+        self.coletor.preparar_paginacao()
+        self.filtro_atual = filtro
+        self.pagina_atual = 1
+
+    def contar_paginas(self, filtro):
+        """Número de páginas da pesquisa (None se o indicador de registros não for encontrado)"""
+        self._pesquisar(filtro)
+        return self.coletor.plano.total_paginas if self.coletor.plano else None
+
+    def paginas(self, filtro, inicio, fim):
+        """
+        Percorre as páginas da faixa
+
+        Reaproveita a pesquisa aberta quando a faixa continua a anterior do mesmo filtro;
+        caso contrário, pesquisa de novo e salta para a página inicial.
+
+        Yields:
+            tuple: (número da página, registros da tabela)
+        """
+        if self.filtro_atual != filtro or self.pagina_atual != inicio - 1:
+            self._pesquisar(filtro)
+            if inicio > 1:
+                if self.coletor.plano and inicio > self.coletor.plano.total_paginas:
+                    return
+                if not self.coletor.ir_para_pagina(inicio):
+                    raise RuntimeError(f"Não foi possível chegar à página {inicio}")
+                self.pagina_atual = inicio
+
+        for pagina in range(inicio, fim + 1):
+            if pagina > self.pagina_atual:
+                if self.coletor.plano and pagina > self.coletor.plano.total_paginas:
+                    return
+                if not self.coletor.avancar_pagina(pagina):
+                    raise RuntimeError(f"Não foi possível avançar para a página {pagina}")
+                self.pagina_atual = pagina
+                self.coletor.esperas.pagina_ociosa()
+            registros = self.coletor.extrair_dados_tabela(pagina)
+            if not registros:
+                return
+            yield pagina, registros
+
+    def detalhar(self, registro, pagina):
+        return self.coletor.enriquecer_registro(registro, 0, pagina)
+
+    def fechar(self):
+        self.coletor.fechar_saidas_incrementais()
+        self.coletor.artefatos.fechar()
+        self.coletor.registrar_resumo_paginacao()
+        try:
+            self.coletor.driver.quit()
+        except Exception:
+            pass
+
+
+class ExecutorHTTP:
+    """Executa as tarefas com um ColetorEcosistemasHTTP (API JSON do portal)"""
+
+    def __init__(self, coletor):
+        self.coletor = coletor
+
+    def contar_paginas(self, filtro):
+        _, total = self.coletor.pesquisar(pagina=0, filtro=filtro)
+        return max(1, -(-total // self.coletor.tamanho_pagina))
+
+    def paginas(self, filtro, inicio, fim):
+        for pagina in range(inicio, fim + 1):
+            registros, _ = self.coletor.pesquisar(pagina=pagina - 1, filtro=filtro)
+            if not registros:
+                return
+            yield pagina, [self.coletor.converter_registro_tabela(registro) for registro in registros]
+
+    def detalhar(self, registro, pagina):
+        return self.coletor.enriquecer_registro(registro)
+
+    def fechar(self):
+        self.coletor.fechar()
+
+
+def enfileirar_coleta(fila, particoes, executor=None, max_paginas=100, paginas_por_tarefa=5):
+    """
+    Coordenador: enfileira as faixas de páginas de cada partição e fecha o enfileiramento
+
+    Args:
+        fila: Fila de tarefas (FilaSQLite ou FilaTCP)
+        particoes (list): Filtros (FiltroPesquisa) das partições
+        executor: ExecutorNavegador ou ExecutorHTTP usado para contar as páginas de cada partição
+            (None enfileira até max_paginas; os workers param na primeira página vazia). As páginas
+            dependem do tamanho de página, então o executor deve usar as mesmas opções dos workers
+        max_paginas (int): Número máximo de páginas por partição
+        paginas_por_tarefa (int): Páginas em cada faixa arrendada por um worker
+
+    Returns:
+        int: Número de faixas enfileiradas (faixas já presentes na fila não são repetidas)
+    """
+    enfileiradas = 0
+    for particao in particoes:
+        total = max_paginas
+        if executor is not None:
+            try:
+                total = min(max_paginas, executor.contar_paginas(particao) or max_paginas)
+            except Exception as e:
+                logger.warning(f"Não foi possível contar as páginas de {particao.descrever()}: {str(e)}. "
+                               f"Enfileirando até {max_paginas} páginas.")
+        for inicio in range(1, total + 1, paginas_por_tarefa):
+            fim = min(total, inicio + paginas_por_tarefa - 1)
+            carga = {"filtro": particao.como_dicionario(), "inicio": inicio, "fim": fim}
+            if fila.enfileirar(PAGINAS, f"{PAGINAS}:{particao.identificacao()}:{inicio}-{fim}", carga):
+                enfileiradas += 1
+        logger.info(f"Partição {particao.descrever()}: {total} páginas em faixas de até {paginas_por_tarefa}")
+    fila.fechar_enfileiramento()
+    logger.info(f"{enfileiradas} faixas de páginas enfileiradas")
+    return enfileiradas
+
+
+def aguardar_conclusao(fila, intervalo=10):
+    """
+    Coordenador: aguarda os workers esvaziarem a fila, registrando o progresso
+
+    Returns:
+        dict: Contagem final de tarefas por estado
+    """
+    while True:
+        contagem = fila.contagem()
+        logger.info(f"Fila: {contagem[PENDENTE]} pendentes, {contagem[ARRENDADA]} arrendadas, "
+                    f"{contagem[CONCLUIDA]} concluídas, {contagem[FALHOU]} com falha")
+        if fila.concluida():
+            return contagem
+        time.sleep(intervalo)
+
+
+def reunir_resultados(fila):
+    """
+    Coordenador: une os registros das tabelas aos detalhes concluídos, sem repetir processos
+
+    Returns:
+        list: Registros coletados, na ordem das faixas de páginas
+    """
+    detalhes = {chave_detalhe(carga["registro"]): resultado for carga, resultado in fila.resultados(DETALHE)}
+    registros = []
+    for _, resultado in fila.resultados(PAGINAS):
+        for registro in resultado["registros"]:
+            registros.append(detalhes.get(chave_detalhe(registro), registro))
+    for chave, erro in fila.falhas():
+        logger.warning(f"Tarefa {chave} falhou: {erro}")
+    return mesclar_resultados([registros])
+
+
+class WorkerColeta:
+    def __init__(self, fila, executor, nome=None, duracao_arrendamento=DURACAO_ARRENDAMENTO, intervalo_espera=5):
+        """
+        Worker da coleta distribuída
+
+        Args:
+            fila: Fila de tarefas (FilaSQLite ou FilaTCP)
+            executor: ExecutorNavegador ou ExecutorHTTP
+            nome (str): Identificação do worker nos arrendamentos (padrão: "host:pid")
+            duracao_arrendamento (float): Segundos de cada arrendamento, renovado a cada página
+            intervalo_espera (float): Espera, em segundos, quando a fila está vazia mas não concluída
+        """
+        self.fila = fila
+        self.executor = executor
+        self.nome = nome or f"{socket.gethostname()}:{os.getpid()}"
+        self.duracao_arrendamento = duracao_arrendamento
+        self.intervalo_espera = intervalo_espera
+        self.tarefas_concluidas = 0
+        self.tarefas_com_falha = 0
+
+    def executar(self, max_tarefas=None):
+        """
+        Arrenda e processa tarefas até a fila ser concluída (ou até max_tarefas)
+
+        Returns:
+            int: Número de tarefas concluídas por este worker
+        """
+        logger.info(f"Worker {self.nome} iniciado")
+        while max_tarefas is None or self.tarefas_concluidas + self.tarefas_com_falha < max_tarefas:
+            tarefa = self.fila.arrendar(self.nome, self.duracao_arrendamento)
+            if tarefa is None:
+                if self.fila.concluida():
+                    break
+                time.sleep(self.intervalo_espera)
+                continue
+
+            logger.info(f"Worker {self.nome}: tarefa {tarefa.chave} (tentativa {tarefa.tentativas})")
+            try:
+                if tarefa.tipo == PAGINAS:
+                    resultado = self._processar_paginas(tarefa)
+                else:
+                    resultado = self.executor.detalhar(tarefa.carga["registro"], tarefa.carga.get("pagina", 0))
+                if resultado is not None and self.fila.confirmar(tarefa.id, self.nome, resultado):
+                    self.tarefas_concluidas += 1
+            except Exception as e:
+                logger.error(f"Erro na tarefa {tarefa.chave}: {str(e)}")
+                self.fila.falhar(tarefa.id, self.nome, str(e))
+                self.tarefas_com_falha += 1
+
+        logger.info(f"Worker {self.nome} encerrado: {self.tarefas_concluidas} tarefas concluídas, "
+                    f"{self.tarefas_com_falha} com falha")
+        return self.tarefas_concluidas
+
+    def _processar_paginas(self, tarefa):
+        """
+        Extrai as páginas da faixa e enfileira os detalhes dos registros
+
+        Returns:
+            dict: Registros e páginas lidas, ou None se o arrendamento foi perdido
+        """
+        filtro = FiltroPesquisa.de_dicionario(tarefa.carga["filtro"])
+        registros = []
+        paginas = []
+        for pagina, registros_pagina in self.executor.paginas(filtro, tarefa.carga["inicio"], tarefa.carga["fim"]):
+            novos_detalhes = 0
+            for registro in registros_pagina:
+                if registro.get("tipo_de_estudo", "") not in TIPOS_CONFIRMADOS and registro.get("link_detalhes"):
+                    novos_detalhes += self.fila.enfileirar(DETALHE, chave_detalhe(registro),
+                                                           {"registro": registro, "pagina": pagina})
+            registros.extend(registros_pagina)
+            paginas.append(pagina)
+            logger.info(f"Página {pagina}: {len(registros_pagina)} registros, {novos_detalhes} detalhes enfileirados")
+            if not self.fila.renovar(tarefa.id, self.nome, self.duracao_arrendamento):
+                logger.warning(f"Arrendamento da tarefa {tarefa.chave} perdido. Abandonando a faixa.")
+                return None
+        return {"registros": registros, "paginas": paginas}
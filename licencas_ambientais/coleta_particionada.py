@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Coleta particionada da Ecosistemas.
+Cada partição do filtro (ver filtros.planejar_particoes) é coletada em um processo separado,
+com seu próprio navegador (ou sessão HTTP), suas próprias saídas e sua entrada no checkpoint.
+Ao final, as saídas das partições são mescladas e os processos repetidos são removidos.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from logs_estruturados import configurar_no_processo, configuracao_logs
+
+logger = logging.getLogger("coletor_ecosistemas.particoes")
+
+SELENIUM = "selenium"
+HTTP = "http"
+
+
+def _coletar_particao(backend, particao, opcoes_coletor, opcoes_coleta, opcoes_artefatos, opcoes_limitador,
+                      opcoes_logs=None):
+    """
+    Coleta uma partição (executada em um processo do pool)
+
+    Returns:
+        tuple: (registros coletados da partição, métricas do processo em MetricasColeta.como_dicionario)
+    """
+    # Mesmos logs (execução, arquivo e níveis) do processo principal
+    configurar_no_processo(opcoes_logs)
+    sufixo = particao.sufixo_arquivo()
+    logger.info(f"[{sufixo}] Processo {os.getpid()} iniciando a coleta: {particao.descrever()}")
+
+    from limitador_taxa import LimitadorTaxa
+    from metricas import MetricasColeta
+    limitador = LimitadorTaxa(**opcoes_limitador)
+    metricas = MetricasColeta()
+
+    if backend == HTTP:
+        from coletor_http import ColetorEcosistemasHTTP
+        coletor = ColetorEcosistemasHTTP(limitador=limitador, metricas=metricas, **opcoes_coletor)
+        try:
+            return coletor.coletar_dados(filtro=particao, **opcoes_coleta), metricas.como_dicionario()
+        finally:
+            coletor.fechar()
+
+    from coletor_ecosistemas import ColetorEcosistemas
+    from checkpoint import CheckpointColeta
+    from artefatos_depuracao import ArtefatosDepuracao
+
+    opcoes_coleta = dict(opcoes_coleta)
+    caminho_checkpoint = opcoes_coleta.pop("checkpoint", None)
+    checkpoint = CheckpointColeta(caminho_checkpoint, filtro=particao.identificacao()) if caminho_checkpoint else None
+
+    opcoes_coletor = dict(opcoes_coletor)
+    prefixo = opcoes_coletor.pop("prefixo_saida", "licencas_ecosistemas")
+    coletor = ColetorEcosistemas(
+        artefatos=ArtefatosDepuracao(**opcoes_artefatos),
+        prefixo_saida=f"{prefixo}_{sufixo}",
+        arquivo_incremental=f"ecosistemas_resultados_incrementais_{sufixo}.csv",
+        limitador=limitador,
+        metricas=metricas,
+        **opcoes_coletor
+    )
+    try:
+        return coletor.coletar_dados(filtro=particao, checkpoint=checkpoint, **opcoes_coleta), metricas.como_dicionario()
+    finally:
+        if checkpoint:
+            checkpoint.fechar()
+
+
+def mesclar_resultados(resultados_particoes):
+    """
+    Mescla os registros das partições, sem repetir processos
+
+    Um processo encontrado em mais de uma partição aparece uma vez, na posição da primeira
+    ocorrência; campos vazios nessa ocorrência são completados pelas seguintes. Registros sem
+    número de processo são mantidos.
+
+    Args:
+        resultados_particoes (list): Listas de registros, uma por partição, na ordem das partições
+
+    Returns:
+        list: Registros mesclados
+    """
+    mesclados = []
+    por_processo = {}
+    repetidos = 0
+    for resultados in resultados_particoes:
+        for registro in resultados:
+            processo = (registro.get("processo") or "").strip()
+            if not processo:
+                mesclados.append(registro)
+                continue
+            existente = por_processo.get(processo)
+            if existente is None:
+                por_processo[processo] = registro
+                mesclados.append(registro)
+                continue
+            repetidos += 1
+            for campo, valor in registro.items():
+                if valor not in (None, "", []) and existente.get(campo) in (None, "", []):
+                    existente[campo] = valor
+    if repetidos:
+        logger.info(f"Mescla das partições: {repetidos} processos repetidos removidos")
+    return mesclados
+
+
+def coletar_particoes(particoes, num_processos=2, backend=SELENIUM, opcoes_coletor=None, opcoes_coleta=None,
+                      opcoes_artefatos=None, opcoes_limitador=None, metricas=None):
+    """
+    Coleta as partições em processos paralelos e mescla os resultados
+
+    Args:
+        particoes (list): Filtros (FiltroPesquisa) das partições, com no máximo um valor por campo
+        num_processos (int): Número de processos (navegadores ou sessões HTTP) simultâneos
+        backend (str): "selenium" (ColetorEcosistemas) ou "http" (ColetorEcosistemasHTTP)
+        opcoes_coletor (dict): Argumentos do construtor do coletor; no backend selenium,
+            prefixo_saida é complementado pelo sufixo de cada partição (o backend http não grava
+            saídas por partição e não aceita prefixo_saida)
+        opcoes_coleta (dict): Argumentos de coletar_dados (ex: max_paginas, conhecidos); no backend
+            selenium, checkpoint é o caminho do banco SQLite, compartilhado com uma entrada por partição
+            (o backend http não usa checkpoint e não aceita checkpoint nem retomar)
+        opcoes_artefatos (dict): Argumentos de ArtefatosDepuracao de cada processo (backend selenium)
+        opcoes_limitador (dict): Argumentos do LimitadorTaxa de cada processo (cada processo adapta
+            a própria taxa)
+        metricas (MetricasColeta): Onde somar as métricas dos processos das partições
+
+    Returns:
+        list: Registros de todas as partições, sem processos repetidos
+
+    Raises:
+        ValueError: Se o backend é desconhecido ou se o backend http recebe opções do selenium
+            (checkpoint, retomar ou prefixo_saida)
+    """
+    if backend not in (SELENIUM, HTTP):
+        raise ValueError(f"Backend desconhecido: {backend} (use {SELENIUM} ou {HTTP})")
+    if backend == HTTP:
+        nao_suportadas = sorted(({"checkpoint", "retomar"} & set(opcoes_coleta or {}))
+                                | ({"prefixo_saida"} & set(opcoes_coletor or {})))
+        if nao_suportadas:
+            raise ValueError(f"Opções sem suporte no backend {HTTP}: {', '.join(nao_suportadas)}")
+    num_processos = max(1, min(num_processos, len(particoes)))
+    logger.info(f"Coletando {len(particoes)} partições em {num_processos} processos ({backend})")
+    inicio = time.perf_counter()
+
+    resultados_particoes = []
+    falhas = []
+    with ProcessPoolExecutor(max_workers=num_processos) as executor:
+        futuros = [
+            executor.submit(_coletar_particao, backend, particao, opcoes_coletor or {}, opcoes_coleta or {},
+                            opcoes_artefatos or {}, opcoes_limitador or {}, configuracao_logs())
+            for particao in particoes
+        ]
+        # Resultados na ordem das partições, para uma mescla determinística
+        for particao, futuro in zip(particoes, futuros):
+            try:
+                resultados, metricas_particao = futuro.result()
+                resultados = resultados or []
+                if metricas is not None:
+                    metricas.combinar(metricas_particao)
+                logger.info(f"Partição {particao.descrever()}: {len(resultados)} registros")
+                resultados_particoes.append(resultados)
+            except Exception as e:
+                logger.error(f"Erro na coleta da partição {particao.descrever()}: {str(e)}")
+                falhas.append(particao)
+
+    todos_resultados = mesclar_resultados(resultados_particoes)
+    logger.info(f"Coleta particionada concluída em {time.perf_counter() - inicio:.2f}s: "
+                f"{len(todos_resultados)} registros de {len(particoes) - len(falhas)} partições")
+    if falhas:
+        logger.warning(f"{len(falhas)} partições falharam e podem ser coletadas novamente: "
+                       f"{'; '.join(particao.descrever() for particao in falhas)}")
+    return todos_resultados
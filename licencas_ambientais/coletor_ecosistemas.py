@@ -3,22 +3,21 @@
 
 """
 Coletor de dados do sistema de licenciamento ambiental Ecosistemas MG.
-Permite a coleta de processos de licenciamento ambiental com foco em Classe 6.
+Permite a coleta de processos de licenciamento ambiental com foco em Classe 6
+(ou com outros filtros de classe, município, regional, modalidade e período).
 
 Versão: 2.0 - Melhoria na navegação entre páginas
 Data de atualização: 09/05/2024
 """
 
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
-import os
 import logging
 from datetime import datetime
-import csv
 import re
 import json
+import threading
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -30,27 +29,95 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 import traceback
 
-# Configuração de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f"ecosistemas_coleta_{datetime.now().strftime('%Y%m%d_%H%M')}.log"),
-        logging.StreamHandler()
-    ]
-)
+from extracao_html import extrair_detalhes_html, registros_tabela, JS_EXTRAIR_TABELA
+from motores_html import obter_motor, MOTOR_PADRAO
+from classificacao_estudos import tipo_estudo_registro, resumo_estudos
+from esperas import MotorEspera
+from artefatos_depuracao import ArtefatosDepuracao
+from limitador_taxa import LimitadorTaxa
+from logs_estruturados import configurar_logs, definir_contexto, contexto_log, registrando
+from metricas import (MetricasColeta, cronometrar, ACESSO, FILTRO, TABELA, NAVEGACAO_DETALHES, PARSE_DETALHES,
+                      PAGINACAO, SALVAMENTO, SALVAMENTO_INCREMENTAL, ESPERA_TAXA, REGISTROS, TENTATIVAS, FALLBACKS)
+from perfil_navegador import configurar_opcoes, aplicar_bloqueios, MedidorRede, PADRAO as PERFIL_PADRAO
+from paginacao import (interpretar_indicador, url_da_pagina, JS_MAIOR_TAMANHO_PAGINA,
+                       JS_ESCOLHER_MAIOR_OPCAO, JS_IR_PARA_PAGINA, SELETORES_PAGINACAO, ORIGEM_JS,
+                       JS_BOTOES_PAGINACAO, JS_ELEMENTOS_VISIVEIS, JS_INJETAR_BOTAO)
+from estrategias_paginacao import (CacheEstrategias, ARQUIVO_PADRAO as ARQUIVO_ESTRATEGIAS, ESTRATEGIAS, SALTO_DIRETO, TEXTO_PROXIMA, REGIAO_VISIVEL,
+                                   HREF_PAGINA, CANDIDATO, INJECAO, URL_PAGINA, TECLADO)
+from checkpoint import CheckpointColeta, chave_registro
+from filtros import (FILTRO_CLASSE_6, CAMPOS_FORMULARIO, JS_CAMPO_FILTRO, JS_ESCOLHER_OPCAO_SELECT,
+                     JS_SELECIONAR_OPCAO)
+from saida_incremental import SaidaIncremental
+from processos_conhecidos import NOVO, ALTERADO, CONHECIDO
+
+# Os logs são configurados por quem executa a coleta (logs_estruturados.configurar_logs)
 logger = logging.getLogger("coletor_ecosistemas")
 
+# Protege a criação das saídas incrementais quando há vários workers de detalhes
+_lock_incremental = threading.Lock()
+
 class ColetorEcosistemas:
-    def __init__(self, modo_headless=True):
+    def __init__(self, modo_headless=True, flush_incremental=1, fsync_incremental=False, paginas_comparacao=1,
+                 parser_html=MOTOR_PADRAO, maximizar_pagina=True, arquivo_estrategias=ARQUIVO_ESTRATEGIAS,
+                 artefatos=None, perfil_navegador=PERFIL_PADRAO, medir_rede=True,
+                 prefixo_saida="licencas_ecosistemas", arquivo_incremental="ecosistemas_resultados_incrementais.csv",
+                 limitador=None, metricas=None, gravador=None,
+                 base_url="https://ecosistemas.meioambiente.mg.gov.br/sla/#/acesso-visitante"):
         """
         Inicializa o coletor para o sistema ecosistemas
         
         Args:
             modo_headless (bool): Se True, executa o navegador sem interface gráfica
+            flush_incremental (int): Registros gravados entre cada flush do CSV incremental (0 = só ao final)
+            fsync_incremental (bool): Se True, força a gravação do CSV incremental em disco a cada flush
+            paginas_comparacao (int): Páginas em que a extração da tabela no navegador é comparada
+                (tempo e resultado) com a extração pelo page_source
+            parser_html (str): Motor de análise HTML (motores_html.MOTORES) das páginas de detalhes
+                e da extração da tabela pelo page_source
+            maximizar_pagina (bool): Se True, ajusta a grade de resultados para o maior tamanho de
+                página oferecido pelo portal antes de paginar
+            arquivo_estrategias (str): Arquivo JSON com as estratégias de paginação que funcionaram
+                (None mantém o aprendizado apenas em memória)
+            artefatos (ArtefatosDepuracao): Política de screenshots de depuração (padrão: buffer em
+                memória gravado apenas em caso de erro); pode ser compartilhada entre coletores
+            perfil_navegador (str): "padrao" ou "enxuto" (bloqueia imagens, fontes, mídia e hosts
+                de terceiros e desativa extensões; ver perfil_navegador.py)
+            medir_rede (bool): Se True, registra bytes transferidos e tempo de carga de cada página
+            prefixo_saida (str): Prefixo dos arquivos Excel e CSV gravados ao final de coletar_dados
+            arquivo_incremental (str): CSV incremental gravado a cada registro em coletar_dados
+                (coletas em paralelo precisam de arquivos distintos)
+            limitador (LimitadorTaxa): Limitador de taxa das páginas de detalhes e de resultados
+                (padrão: 1 página por segundo, ajustada conforme as respostas do portal); pode ser
+                compartilhado entre coletores
+            metricas (MetricasColeta): Onde registrar a duração de cada etapa e os contadores de
+                registros, novas tentativas e fallbacks; pode ser compartilhado entre coletores
+            gravador (GravadorPaginas): Se informado, arquiva cada página de resultados e de detalhes
+                vista pelo coletor, para reprodução sem rede (ver gravacao_paginas.py)
+            base_url (str): Página de acesso de visitante (ou a de um portal simulado local, ver
+                portal_simulado.PortalSimulado.url_visitante)
         """
-        self.base_url = "https://ecosistemas.meioambiente.mg.gov.br/sla/#/acesso-visitante"
+        self.base_url = base_url
         self.modo_headless = modo_headless
+        self.flush_incremental = flush_incremental
+        self.fsync_incremental = fsync_incremental
+        self.paginas_comparacao = paginas_comparacao
+        self.parser_html = parser_html
+        self.motor_html = obter_motor(parser_html)
+        self.maximizar_pagina = maximizar_pagina
+        self.plano = None
+        self.estrategias = CacheEstrategias(arquivo_estrategias)
+        self.artefatos = artefatos or ArtefatosDepuracao()
+        self.perfil_navegador = perfil_navegador
+        self.medir_rede = medir_rede
+        self.prefixo_saida = prefixo_saida
+        self.arquivo_incremental = arquivo_incremental
+        self.limitador = limitador or LimitadorTaxa()
+        self.metricas = metricas or MetricasColeta()
+        self.gravador = gravador
+        self.saidas_incrementais = {}
+        self.aba_principal = None
+        self.aba_detalhes = None
+        self.rotas_spa = True
         self.setup_driver()
         
     def setup_driver(self):
@@ -59,11 +126,11 @@ class ColetorEcosistemas:
         """
         try:
             chrome_options = Options()
+            configurar_opcoes(chrome_options, self.perfil_navegador, self.modo_headless, self.medir_rede)
             if self.modo_headless:
-                chrome_options.add_argument("--headless")  # Executar em modo headless (sem interface gráfica)
-                logger.info("Executando em modo headless")
+                logger.info(f"Executando em modo headless (perfil {self.perfil_navegador})")
             else:
-                logger.info("Executando com interface gráfica")
+                logger.info(f"Executando com interface gráfica (perfil {self.perfil_navegador})")
                 
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--window-size=1920,1080")
@@ -72,16 +139,21 @@ class ColetorEcosistemas:
             
             # Usar Chrome padrão sem webdriver-manager
             self.driver = webdriver.Chrome(options=chrome_options)
+            aplicar_bloqueios(self.driver, self.perfil_navegador)
+            self.aba_principal = self.driver.current_window_handle
+            self.rede = MedidorRede(self.driver, ativo=self.medir_rede)
             
             # Configurar timeouts
             self.driver.set_page_load_timeout(30)
             self.wait = WebDriverWait(self.driver, 15)
+            self.esperas = MotorEspera(self.driver, timeout_padrao=15)
             
             logger.info("Driver Selenium configurado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao configurar driver: {str(e)}")
             raise
     
+    @cronometrar(ACESSO)
     def acessar_site(self):
         """
         Acessa o site inicial do sistema
@@ -92,7 +164,8 @@ class ColetorEcosistemas:
             
             # Aguardar carregamento completo da página
             self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(3)  # Aguardar carregamento de elementos dinâmicos
+            self.esperas.pagina_ociosa()  # Aguardar carregamento de elementos dinâmicos
+            self.rede.medir("página inicial", carga_completa=True)
             
             logger.info("Página inicial carregada com sucesso")
             return True
@@ -100,66 +173,32 @@ class ColetorEcosistemas:
             logger.error(f"Erro ao acessar site: {str(e)}")
             return False
     
-    def aplicar_filtro_classe_6(self):
+    @cronometrar(FILTRO)
+    def aplicar_filtro(self, filtro=None):
         """
-        Aplica o filtro para selecionar apenas empreendimentos de Classe 6
+        Preenche o formulário de pesquisa com o filtro e pesquisa
+        
+        Args:
+            filtro (FiltroPesquisa): Filtro com no máximo um valor por campo (padrão: Classe 6);
+                filtros com vários valores devem ser divididos com filtros.planejar_particoes
+        
+        Returns:
+            bool: True se a pesquisa retornou resultados
         """
+        filtro = filtro or FILTRO_CLASSE_6
+        descricao = filtro.descrever()
+        inicio = time.perf_counter()
         try:
-            logger.info("Aplicando filtro para Classe 6")
-            
-            # Aguardar carregamento completo da página
-            time.sleep(5)  # Aumentar tempo de espera para garantir carregamento
-            
-            # Tentar diferentes abordagens para encontrar o campo de classe predominante
-            try:
-                # Primeira abordagem: Direto pelo XPath relacionado ao label
-                classe_input_container = self.driver.find_element(By.XPATH, "//label[contains(text(), 'Classe predominante')]/following-sibling::div//input")
-            except:
-                try:
-                    # Segunda abordagem: Encontrar todos os inputs e procurar pelo placeholder ou name relacionado
-                    inputs = self.driver.find_elements(By.TAG_NAME, "input")
-                    classe_input_container = None
-                    for input_elem in inputs:
-                        if input_elem.get_attribute("placeholder") and "classe" in input_elem.get_attribute("placeholder").lower():
-                            classe_input_container = input_elem
-                            break
-                        if input_elem.get_attribute("name") and "classe" in input_elem.get_attribute("name").lower():
-                            classe_input_container = input_elem
-                            break
-                except:
-                    # Terceira abordagem: JavaScript para encontrar o elemento
-                    logger.info("Tentando encontrar o campo de classe com JavaScript")
-                    classe_input_container = self.driver.execute_script("""
-                        return Array.from(document.querySelectorAll('input')).find(el => 
-                            (el.placeholder && el.placeholder.toLowerCase().includes('classe')) || 
-                            (el.name && el.name.toLowerCase().includes('classe')) ||
-                            (el.id && el.id.toLowerCase().includes('classe'))
-                        );
-                    """)
-            
-            if not classe_input_container:
-                logger.error("Não foi possível encontrar o campo de classe predominante")
-                return False
-                
-            # Tentar clicar com várias abordagens
-            try:
-                # Abordagem 1: Clique normal
-                classe_input_container.click()
-            except:
-                try:
-                    # Abordagem 2: JavaScript click
-                    self.driver.execute_script("arguments[0].click();", classe_input_container)
-                except:
-                    # Abordagem 3: Actions
-                    from selenium.webdriver.common.action_chains import ActionChains
-                    actions = ActionChains(self.driver)
-                    actions.move_to_element(classe_input_container).click().perform()
+            logger.info(f"Aplicando filtro: {descricao}")
+            campos = filtro.campos_formulario()
             
-            time.sleep(2)  # Aguardar após o clique
+            # Aguardar o formulário de pesquisa ser renderizado pelo Angular
+            self.esperas.elemento_presente(By.TAG_NAME, "input", descricao="formulário de pesquisa")
+            self.esperas.pagina_ociosa()
             
-            # Enviar valor '6'
-            classe_input_container.send_keys("6")
-            time.sleep(2)
+            for campo, valor in campos:
+                if not self._preencher_campo_filtro(campo, valor):
+                    return False
             
             # Encontrar e clicar no botão de pesquisar usando abordagens diferentes
             try:
@@ -193,23 +232,23 @@ class ColetorEcosistemas:
                     self.driver.execute_script("arguments[0].click();", botao_pesquisar)
                 except:
                     # Abordagem 3: Actions
-                    from selenium.webdriver.common.action_chains import ActionChains
                     actions = ActionChains(self.driver)
                     actions.move_to_element(botao_pesquisar).click().perform()
             
-            # Aguardar carregamento dos resultados com tempo maior
-            time.sleep(5)
+            # Aguardar a tabela de resultados ou a mensagem de nenhum resultado
+            self.esperas.resultados_pesquisa(timeout=30)
             
             # Verificar se há resultados (tabela ou mensagem de nenhum resultado)
             try:
                 self.driver.find_element(By.XPATH, "//table//tr")
-                logger.info("Filtro de Classe 6 aplicado com sucesso")
+                logger.info(f"Filtro aplicado com sucesso: {descricao}")
+                self.rede.medir(f"pesquisa com filtro ({descricao})", time.perf_counter() - inicio)
                 return True
             except:
                 # Verificar se há mensagem de "nenhum resultado"
                 try:
                     mensagem = self.driver.find_element(By.XPATH, "//*[contains(text(), 'Nenhum resultado')]")
-                    logger.warning("Filtro aplicado, mas nenhum resultado encontrado")
+                    logger.warning(f"Filtro aplicado, mas nenhum resultado encontrado ({descricao})")
                     return False
                 except:
                     # Se não tem tabela e nem mensagem, algo deu errado
@@ -217,191 +256,218 @@ class ColetorEcosistemas:
                     return False
                 
         except Exception as e:
-            logger.error(f"Erro ao aplicar filtro de Classe 6: {str(e)}")
+            logger.error(f"Erro ao aplicar filtro ({descricao}): {str(e)}")
+            self.artefatos.registrar_erro(self.driver, "erro_filtro")
             return False
     
-    def extrair_dados_tabela(self):
+    def _preencher_campo_filtro(self, campo, valor):
+        """
+        Preenche um campo do formulário de pesquisa
+        
+        O campo é localizado pelo rótulo ou pelos atributos (CAMPOS_FORMULARIO). Em um <select>
+        nativo a opção é escolhida pelo texto; nos demais campos o valor é digitado e, se abrir
+        uma lista de sugestões (autocomplete), a opção correspondente é escolhida.
+        
+        Args:
+            campo (str): Campo de filtros.CAMPOS_FORMULARIO (ex: "classe", "municipio")
+            valor (str): Texto a digitar ou opção a escolher
+        
+        Returns:
+            bool: True se o campo foi preenchido
+        """
+        rotulos, chaves = CAMPOS_FORMULARIO[campo]
+        elemento = self.driver.execute_script(JS_CAMPO_FILTRO, rotulos, chaves)
+        if not elemento:
+            logger.error(f"Não foi possível encontrar o campo '{rotulos[0]}' do formulário de pesquisa")
+            return False
+        
+        if elemento.tag_name.lower() == "select":
+            if not self.driver.execute_script(JS_ESCOLHER_OPCAO_SELECT, elemento, valor):
+                logger.error(f"Opção '{valor}' não encontrada no campo '{rotulos[0]}'")
+                return False
+            self.esperas.pagina_ociosa(timeout=5)
+            return True
+        
+        self._clicar(elemento)
+        self.esperas.pagina_ociosa(timeout=5)  # Aguardar após o clique
+        
+        elemento.send_keys(valor)
+        self.esperas.pagina_ociosa(timeout=5)
+        
+        # Autocomplete: escolher a sugestão correspondente ao valor digitado, se houver
+        if self.driver.execute_script(JS_SELECIONAR_OPCAO, valor):
+            logger.info(f"Opção '{valor}' escolhida no campo '{rotulos[0]}'")
+            self.esperas.pagina_ociosa(timeout=5)
+        elif campo.startswith("data"):
+            # Fechar o calendário aberto pelo campo de data
+            elemento.send_keys(Keys.TAB)
+        return True
+    
+    def aplicar_filtro_classe_6(self):
+        """
+        Aplica o filtro para selecionar apenas empreendimentos de Classe 6
+        """
+        return self.aplicar_filtro(FILTRO_CLASSE_6)
+    
+    def estrutura_tabela_page_source(self):
+        """
+        Extrai a estrutura da tabela serializando a página (page_source) e analisando com o motor HTML
+        """
+        return self.motor_html.estrutura_tabela(self.driver.page_source)
+    
+    @cronometrar(TABELA)
+    def extrair_dados_tabela(self, pagina=None):
         """
         Extrai dados da tabela de resultados
+        
+        A tabela é lida direto do DOM com um único execute_script, que devolve cabeçalhos,
+        textos e links das células; se o script falhar, a página é serializada e analisada
+        pelo motor HTML (BeautifulSoup por padrão). Nas primeiras páginas (paginas_comparacao) as duas abordagens são
+        executadas e o tempo de cada uma é registrado no log.
+        
+        Args:
+            pagina (int): Número da página, usado na gravação das páginas (ver gravacao_paginas.py)
         """
         resultados = []
         
-        logger.info("Extraindo dados da tabela de resultados")
+        logger.debug("Extraindo dados da tabela de resultados")
         
         try:
-            # NOVA ABORDAGEM: Usar o HTML diretamente para extrair a tabela
-            # Isso pode resolver problemas de detecção incorreta dos elementos
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
+            inicio = time.perf_counter()
+            try:
+                estrutura = self.driver.execute_script(JS_EXTRAIR_TABELA)
+                tempo_navegador = time.perf_counter() - inicio
+                logger.info(f"Tabela extraída no navegador em {tempo_navegador:.3f}s")
+            except Exception as e:
+                logger.warning(f"Falha na extração da tabela no navegador ({str(e)}). Usando {self.motor_html.nome}.")
+                self.metricas.incrementar(FALLBACKS, tipo="tabela_page_source")
+                inicio = time.perf_counter()
+                estrutura = self.estrutura_tabela_page_source()
+                tempo_navegador = None
+                logger.info(f"Tabela extraída com {self.motor_html.nome} em {time.perf_counter() - inicio:.3f}s")
+            
+            if tempo_navegador is not None and self.paginas_comparacao > 0:
+                self.paginas_comparacao -= 1
+                inicio = time.perf_counter()
+                estrutura_bs = self.estrutura_tabela_page_source()
+                tempo_bs = time.perf_counter() - inicio
+                logger.info(
+                    f"Comparação da extração da tabela: navegador {tempo_navegador:.3f}s, "
+                    f"page_source + {self.motor_html.nome} {tempo_bs:.3f}s "
+                    f"({tempo_bs / tempo_navegador if tempo_navegador else 0:.1f}x) - "
+                    f"{'resultados idênticos' if estrutura == estrutura_bs else 'RESULTADOS DIFERENTES'}"
+                )
             
             # Verificar se a tabela está presente
-            tabela = soup.find('table')
-            if not tabela:
+            if not estrutura:
                 logger.error("Tabela de resultados não encontrada")
-                # Salvar screenshot para debugging
-                screenshot_path = f"tabela_nao_encontrada_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-                self.driver.save_screenshot(screenshot_path)
-                logger.info(f"Screenshot salvo em {screenshot_path}")
+                self.limitador.registrar_falha("tabela de resultados vazia")
+                # Salvar screenshots para debugging
+                self.artefatos.registrar_erro(self.driver, "tabela_nao_encontrada")
                 return []
             
-            # Extrair cabeçalhos corretamente
-            cabecalhos_elem = tabela.find_all('th')
-            if not cabecalhos_elem:
-                # Tentar encontrar cabeçalhos na primeira linha
-                primeira_linha = tabela.find('tr')
-                if primeira_linha:
-                    cabecalhos_elem = primeira_linha.find_all(['th', 'td'])
-            
-            cabecalhos = []
-            for elem in cabecalhos_elem:
-                texto = elem.get_text(strip=True)
-                cabecalhos.append(texto if texto else f"coluna_{len(cabecalhos)}")
-            
-            # Se não encontrou cabeçalhos, criar genéricos
-            if not cabecalhos:
-                logger.warning("Cabeçalhos não encontrados, criando genéricos")
-                # Contar o número máximo de colunas nas linhas
-                linhas = tabela.find_all('tr')
-                max_cols = 0
-                for linha in linhas:
-                    cols = len(linha.find_all(['td', 'th']))
-                    max_cols = max(max_cols, cols)
-                
-                # Criar cabeçalhos genéricos
-                cabecalhos = [f"coluna_{i}" for i in range(max_cols)]
-            
-            logger.info(f"Cabeçalhos extraídos: {cabecalhos}")
-            
-            # Extrair linhas da tabela (excluindo a linha de cabeçalho se houver)
-            linhas = tabela.find_all('tr')
-            tem_cabecalho = False
-            
-            # Verificar se a primeira linha é cabeçalho
-            if len(linhas) > 0:
-                primeira_linha = linhas[0]
-                if primeira_linha.find_all('th'):
-                    tem_cabecalho = True
-            
-            # Determinar qual linha começar (pular cabeçalho se existir)
-            inicio = 1 if tem_cabecalho else 0
-            
-            # Verificar se há linhas de dados
-            if len(linhas) <= inicio:
-                logger.warning("Nenhuma linha de dados encontrada na tabela")
-                return []
-            
-            # Processar linhas de dados
-            for i, linha in enumerate(linhas[inicio:], 1):
-                colunas = linha.find_all(['td', 'th'])
-                
-                # Se a linha não tem colunas, pular
-                if not colunas:
-                    continue
-                
-                # Verificar formato especial onde tipo_de_estudo e classe_predominante estão em uma só célula
-                if len(colunas) == 1 and len(cabecalhos) > 1:
-                    # Esta é uma situação especial onde a tabela tem formato irregular
-                    # Provavelmente cada célula única contém informações que precisam ser mapeadas
-                    texto_celula = colunas[0].get_text(strip=True)
-                    
-                    # Criar resultado com esta informação
-                    resultado = {
-                        "classe_predominante": texto_celula,
-                        "tipo_de_estudo": "A determinar"  # Valor padrão
-                    }
-                    
-                    # Tentar identificar tipo de estudo baseado no texto
-                    if "EIA" in texto_celula.upper() or "RIMA" in texto_celula.upper():
-                        resultado["tipo_de_estudo"] = "EIA/RIMA"
-                    elif "RCA" in texto_celula.upper():
-                        resultado["tipo_de_estudo"] = "RCA"
-                    
-                    # Verificar se há links para detalhes
-                    links = colunas[0].find_all('a')
-                    for link in links:
-                        href = link.get('href')
-                        if href:
-                            resultado["link_detalhes"] = href
-                            break
-                else:
-                    # Formato regular - extrair células normalmente
-                    resultado = {}
-                    
-                    # Extrair dados das colunas
-                    for j, coluna in enumerate(colunas):
-                        # Obter chave do cabeçalho (ou usar índice se não houver chave correspondente)
-                        chave = cabecalhos[j].replace(' ', '_').lower() if j < len(cabecalhos) else f"coluna_{j}"
-                        
-                        # Extrair texto da coluna
-                        texto = coluna.get_text(strip=True)
-                        resultado[chave] = texto
-                        
-                        # Verificar se há links na coluna
-                        links = coluna.find_all('a')
-                        for link in links:
-                            href = link.get('href')
-                            if href:
-                                resultado["link_detalhes"] = href
-                                break
-                    
-                    # Verificar se a atividade principal contém códigos que exigem EIA/RIMA
-                    atividade_principal = resultado.get("atividade_principal", "")
-                    # Adicionar o campo tipo_de_estudo se não existir
-                    if 'tipo_de_estudo' not in resultado:
-                        # Verificar se a atividade está entre as que exigem EIA/RIMA
-                        if any(cod in atividade_principal for cod in ["A-05-02-0", "A-05-03-7", "A-05-04-5", "A-05-05-3"]):
-                            resultado["tipo_de_estudo"] = "EIA/RIMA (inferido pela atividade)"
-                        else:
-                            resultado["tipo_de_estudo"] = "A determinar"
-                
-                # Tentar identificar o tipo de estudo pelo texto do documento
-                classe_texto = resultado.get("classe_predominante", "").upper()
-                if 'tipo_de_estudo' in resultado and resultado['tipo_de_estudo'] == "A determinar":
-                    if "RCA" in classe_texto or "RELATÓRIO DE CONTROLE AMBIENTAL" in classe_texto:
-                        resultado["tipo_de_estudo"] = "RCA"
-                    elif "EIA" in classe_texto or "RIMA" in classe_texto or "ESTUDO DE IMPACTO" in classe_texto:
-                        resultado["tipo_de_estudo"] = "EIA/RIMA"
-                
-                logger.info(f"Dados extraídos da linha {i}: {list(resultado.keys())}")
-                resultados.append(resultado)
+            if self.gravador:
+                self.gravador.gravar_tabela(pagina, self.driver.page_source,
+                                            estrutura if tempo_navegador is not None else None, self.driver.current_url)
             
+            resultados = registros_tabela(estrutura)
             logger.info(f"Total de {len(resultados)} resultados extraídos da tabela")
         except Exception as e:
-            # Capturar screenshot do erro
-            screenshot_path = f"erro_tabela_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            try:
-                self.driver.save_screenshot(screenshot_path)
-                logger.info(f"Screenshot do erro salvo em {screenshot_path}")
-            except:
-                pass
+            # Capturar screenshots do erro
+            self.artefatos.registrar_erro(self.driver, "erro_tabela")
             
             logger.error(f"Erro ao extrair dados da tabela: {str(e)}")
         
         return resultados
     
+    def aguardar_vez(self):
+        """
+        Aguarda a vez no limitador de taxa (compartilhado pelos workers de detalhes), com a espera
+        cronometrada à parte (ESPERA_TAXA) para não inflar as etapas de navegação e paginação
+        
+        Returns:
+            float: Tempo aguardado, em segundos
+        """
+        with self.metricas.medir(ESPERA_TAXA):
+            return self.limitador.aguardar()
+    
     def acessar_proximo_registro(self, link_detalhes):
         """
         Acessa a página de detalhes de um registro específico
+        
+        Usa uma única aba de detalhes, aberta no primeiro registro e reaproveitada nos seguintes.
+        Se o link é uma rota do mesmo documento (parte após '#'), apenas a rota do Angular é
+        trocada, sem recarregar a aplicação; caso contrário, ou se a troca de rota não atualizar
+        o conteúdo, a aba recarrega a página.
         """
+        self.aguardar_vez()
+        return self._carregar_detalhes(link_detalhes)
+    
+    @cronometrar(NAVEGACAO_DETALHES)
+    def _carregar_detalhes(self, link_detalhes):
         try:
-            logger.info(f"Acessando página de detalhes: {link_detalhes}")
-            
-            # Abrir o link em uma nova aba
-            self.driver.execute_script(f"window.open('{link_detalhes}');")
+            logger.debug("Acessando página de detalhes: %s", link_detalhes)
+            inicio = time.perf_counter()
             
-            # Mudar para a nova aba
-            self.driver.switch_to.window(self.driver.window_handles[1])
+            # Mudar para a aba de detalhes (criada no primeiro registro ou se tiver sido fechada)
+            if self.aba_detalhes and self.aba_detalhes in self.driver.window_handles:
+                self.driver.switch_to.window(self.aba_detalhes)
+                modo = self._navegar_aba_detalhes(link_detalhes)
+            else:
+                self.driver.switch_to.new_window('tab')
+                self.aba_detalhes = self.driver.current_window_handle
+                self.driver.get(link_detalhes)
+                modo = "nova aba"
             
             # Aguardar carregamento da página
             self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(3)  # Aguardar carregamento de elementos dinâmicos
+            self.esperas.pagina_ociosa()  # Aguardar carregamento de elementos dinâmicos
+            self.rede.medir(f"detalhes {link_detalhes}", time.perf_counter() - inicio)
+            self.limitador.registrar_sucesso(time.perf_counter() - inicio)
             
-            logger.info("Página de detalhes carregada com sucesso")
+            logger.debug("Página de detalhes carregada com sucesso (%s)", modo)
             return True
         except Exception as e:
             logger.error(f"Erro ao acessar página de detalhes: {str(e)}")
+            self.limitador.registrar_falha(f"erro ao carregar a página de detalhes ({type(e).__name__})")
+            self.descartar_aba_detalhes()
             return False
     
+    def _navegar_aba_detalhes(self, link_detalhes):
+        """
+        Leva a aba de detalhes (já selecionada) ao link indicado
+        
+        Returns:
+            str: "rota" se apenas a rota do Angular foi trocada, "carga" se a página foi recarregada
+                ou "mesma página" se a aba já exibia o link
+        """
+        url_atual = self.driver.current_url
+        if url_atual == link_detalhes:
+            return "mesma página"
+        
+        documento_atual = url_atual.partition("#")[0]
+        documento_link, separador, rota = link_detalhes.partition("#")
+        if separador and documento_link == documento_atual:
+            assinatura_anterior = self.esperas.assinatura_conteudo()
+            if self.rotas_spa:
+                # Mesma aplicação: trocar só a rota, sem recarregar o Angular
+                self.driver.execute_script("window.location.hash = arguments[0];", rota)
+                if self.esperas.conteudo_mudou(assinatura_anterior, timeout=10):
+                    return "rota"
+                # O componente não recarregou os dados com a nova rota: recarregar a partir de agora
+                logger.warning("A troca de rota não atualizou a página de detalhes. Usando recarga completa.")
+                self.metricas.incrementar(FALLBACKS, tipo="recarga_detalhes")
+                self.rotas_spa = False
+            else:
+                self.driver.execute_script("window.location.hash = arguments[0];", rota)
+            # Uma troca só do fragmento não recarrega o documento
+            self.driver.refresh()
+            return "carga"
+        
+        self.driver.get(link_detalhes)
+        return "carga"
+    
+    @cronometrar(PARSE_DETALHES)
     def extrair_dados_detalhados(self):
         """
         Extrai dados detalhados da página de um processo específico
@@ -409,203 +475,16 @@ class ColetorEcosistemas:
         dados_detalhados = {}
         
         try:
-            logger.info("Extraindo dados detalhados do processo")
+            logger.debug("Extraindo dados detalhados do processo")
             
-            # NOVA ABORDAGEM: Usar BeautifulSoup para processar o HTML
+            # Analisar o HTML da página (rótulos indexados em uma única passagem pelo documento)
             html = self.driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Extrair dados básicos do processo a partir do HTML
-            # Tentar extrair campos comuns usando diferentes abordagens
-            
-            # 1. Buscar seções com rótulos específicos
-            labels_interesse = [
-                'CPF/CNPJ', 'Pessoa Física/Jurídica', 'Nome Fantasia', 
-                'Empreendimento', 'Município da Solicitação', 'Número do Processo',
-                'Classe predominante', 'Fator locacional', 'Modalidade licenciamento',
-                'Fase do licenciamento', 'Tipo solicitação', 'Atividade Principal'
-            ]
-            
-            # Procurar rótulos (em elementos strong, th, label ou span)
-            for label in labels_interesse:
-                # Abordagem 1: Procurar rótulos em elementos strong
-                strong_elem = soup.find('strong', text=lambda t: label in t if t else False)
-                if strong_elem and strong_elem.next_sibling:
-                    valor = strong_elem.next_sibling.strip()
-                    if valor:
-                        dados_detalhados[label] = valor
-                        continue
-                
-                # Abordagem 2: Procurar em células de tabela th
-                th_elem = soup.find('th', text=lambda t: label in t if t else False)
-                if th_elem and th_elem.find_next('td'):
-                    valor = th_elem.find_next('td').get_text(strip=True)
-                    if valor:
-                        dados_detalhados[label] = valor
-                        continue
-                
-                # Abordagem 3: Procurar por padrões comuns de layout (label: valor)
-                # Isto busca qualquer elemento contendo o texto do rótulo seguido por ":"
-                elem = soup.find(text=lambda t: f"{label}:" in t if t else False)
-                if elem:
-                    # Tentar extrair o valor que vem após o rótulo
-                    texto_completo = elem.strip()
-                    partes = texto_completo.split(':', 1)
-                    if len(partes) > 1:
-                        valor = partes[1].strip()
-                        if valor:
-                            dados_detalhados[label] = valor
-            
-            # 2. Buscar atividade principal especificamente (comum em processos de licenciamento)
-            if 'Atividade Principal' not in dados_detalhados:
-                # Procurar em tabelas de atividades
-                tabela_atividades = soup.find('table', class_=lambda c: 'atividade' in c.lower() if c else False)
-                if not tabela_atividades:
-                    # Tentar encontrar qualquer tabela que pareça conter atividades
-                    tabelas = soup.find_all('table')
-                    for tabela in tabelas:
-                        if tabela.find(text=lambda t: 'atividade' in t.lower() if t else False):
-                            tabela_atividades = tabela
-                            break
-                
-                if tabela_atividades:
-                    # Pegar a primeira linha de dados (presumindo que a primeira é cabeçalho)
-                    linhas = tabela_atividades.find_all('tr')
-                    if len(linhas) > 1:
-                        colunas = linhas[1].find_all('td')
-                        if colunas:
-                            # Geralmente a primeira coluna contém a descrição da atividade
-                            dados_detalhados['Atividade Principal'] = colunas[0].get_text(strip=True)
-            
-            # 3. Extrair documentos (para avaliar EIA/RIMA ou RCA)
-            tem_eia_rima = False
-            tem_rca = False
-            documentos = []
-            links_documentos = []
-            motivo_eia_rima = ""
-            motivo_rca = ""
-            
-            # Procurar seção de documentos
-            secao_documentos = None
-            
-            # Abordagem 1: Procurar título explícito
-            titulo_docs = soup.find(['h2', 'h3', 'h4', 'div'], text=lambda t: 'documentos' in t.lower() if t else False)
-            if titulo_docs:
-                # Pegar o elemento pai ou seguinte como seção de documentos
-                secao_documentos = titulo_docs.parent
-            
-            # Abordagem 2: Procurar links que pareçam ser documentos
-            if not secao_documentos:
-                # Considerar todos os links na página
-                secao_documentos = soup
-            
-            # Extrair links de documentos
-            for link in secao_documentos.find_all('a'):
-                href = link.get('href')
-                texto = link.get_text(strip=True)
-                
-                if texto and href:
-                    documentos.append(texto)
-                    links_documentos.append(href)
-                    
-                    # Verificar tipo de documento pelo nome
-                    texto_upper = texto.upper()
-                    if any(termo in texto_upper for termo in ['EIA', 'RIMA', 'ESTUDO DE IMPACTO', 'IMPACTO AMBIENTAL']):
-                        tem_eia_rima = True
-                        # Extrair o motivo entre parênteses, se houver
-                        if 'ESTUDO DE IMPACTO AMBIENTAL' in texto_upper:
-                            matches = re.search(r'EIA/RIMA -.*?\((.*?)\)', texto)
-                            if matches:
-                                motivo_eia_rima = matches.group(1).strip()
-                            else:
-                                motivo_eia_rima = texto
-                        logger.info(f"Documento EIA/RIMA encontrado: {texto}")
-                    
-                    if any(termo in texto_upper for termo in ['RCA', 'RELATÓRIO DE CONTROLE', 'RELATORIO DE CONTROLE']):
-                        tem_rca = True
-                        # Extrair o motivo entre parênteses, se houver
-                        if 'RELATÓRIO DE CONTROLE AMBIENTAL' in texto_upper:
-                            matches = re.search(r'RCA -.*?\((.*?)\)', texto)
-                            if matches:
-                                motivo_rca = matches.group(1).strip()
-                            else:
-                                motivo_rca = texto
-                        logger.info(f"Documento RCA encontrado: {texto}")
-            
-            # Verificar no conteúdo completo da página
-            texto_pagina = soup.get_text().upper()
-            
-            # Busca específica para EIA/RIMA com motivo entre parênteses
-            match_eia_rima = re.search(r'EIA/RIMA\s*-\s*[^(]*\(([^)]+)\)', texto_pagina)
-            if match_eia_rima and not motivo_eia_rima:
-                motivo_eia_rima = match_eia_rima.group(1).strip()
-                tem_eia_rima = True
-                logger.info(f"Motivo EIA/RIMA encontrado: {motivo_eia_rima}")
-            
-            # Busca específica para RCA com motivo entre parênteses
-            match_rca = re.search(r'RCA\s*-\s*[^(]*\(([^)]+)\)', texto_pagina)
-            if match_rca and not motivo_rca:
-                motivo_rca = match_rca.group(1).strip()
-                tem_rca = True
-                logger.info(f"Motivo RCA encontrado: {motivo_rca}")
-            
-            # Lista expandida de termos para busca
-            termos_eia_rima = [
-                'EIA/RIMA', 'EIA / RIMA', 'EIA-RIMA', 'ESTUDO DE IMPACTO AMBIENTAL',
-                'RELATÓRIO DE IMPACTO AMBIENTAL', 'RIMA', 'EIA', 'IMPACTO AMBIENTAL'
-            ]
-            
-            termos_rca = [
-                'RCA COM ART', 'RCA/PCA', 'RCA / PCA', 'RCA-PCA',
-                'RELATÓRIO DE CONTROLE AMBIENTAL', 'RELATORIO DE CONTROLE AMBIENTAL',
-                'RCA', 'CONTROLE AMBIENTAL'
-            ]
-            
-            if not tem_eia_rima and any(termo in texto_pagina for termo in termos_eia_rima):
-                tem_eia_rima = True
-                logger.info("Referência a EIA/RIMA encontrada no texto da página")
-            
-            if not tem_rca and any(termo in texto_pagina for termo in termos_rca):
-                tem_rca = True
-                logger.info("Referência a RCA encontrada no texto da página")
-            
-            # Armazenar documentos encontrados
-            dados_detalhados["Documentos"] = documentos
-            dados_detalhados["Links_Documentos"] = links_documentos
-            
-            # Determinar o tipo de estudo, incluindo o motivo quando disponível
-            if tem_eia_rima and tem_rca:
-                tipo_estudo = "EIA/RIMA e RCA"
-                if motivo_eia_rima:
-                    tipo_estudo += f" (EIA/RIMA: {motivo_eia_rima})"
-                if motivo_rca:
-                    tipo_estudo += f" (RCA: {motivo_rca})"
-            elif tem_eia_rima:
-                tipo_estudo = "EIA/RIMA"
-                if motivo_eia_rima:
-                    tipo_estudo += f" ({motivo_eia_rima})"
-            elif tem_rca:
-                tipo_estudo = "RCA"
-                if motivo_rca:
-                    tipo_estudo += f" ({motivo_rca})"
-            else:
-                # Inferir pelo tipo de atividade se não encontrou nos documentos
-                atividade_principal = dados_detalhados.get("Atividade Principal", "")
-                classe_predominante = dados_detalhados.get("Classe predominante", "")
-                
-                # Códigos que geralmente requerem EIA/RIMA (mineração, grandes empreendimentos)
-                if "6" in classe_predominante or any(cod in atividade_principal for cod in ["A-05-02-0", "A-05-03-7", "A-05-04-5", "A-05-05-3"]):
-                    tipo_estudo = "EIA/RIMA (inferido pela atividade)"
-                elif any(cod in atividade_principal for cod in ["A-01-03-1", "A-04-01-4", "E-04-01-4"]):
-                    tipo_estudo = "RCA (inferido pela atividade)"
-                else:
-                    tipo_estudo = "A determinar"
-            
-            dados_detalhados["Tipo de Estudo"] = tipo_estudo
-            dados_detalhados["motivo_estudo"] = motivo_eia_rima if tem_eia_rima else motivo_rca
+            if self.gravador:
+                self.gravador.gravar_detalhe(self.driver.current_url, html)
+            dados_detalhados = extrair_detalhes_html(html, motor=self.motor_html)
             
             logger.info(f"Tipo de Estudo identificado: {dados_detalhados.get('Tipo de Estudo', 'Não identificado')}")
-            logger.info("Dados detalhados extraídos com sucesso")
+            logger.debug("Dados detalhados extraídos com sucesso")
             return dados_detalhados
         except Exception as e:
             logger.error(f"Erro ao extrair dados detalhados: {str(e)}")
@@ -613,21 +492,36 @@ class ColetorEcosistemas:
     
     def fechar_aba_detalhes(self):
         """
-        Fecha a aba de detalhes e volta para a aba principal
+        Volta para a aba principal; a aba de detalhes continua aberta para o próximo registro
         """
         try:
-            # Fechar a aba atual
-            self.driver.close()
-            
             # Voltar para a aba principal
-            self.driver.switch_to.window(self.driver.window_handles[0])
+            self.driver.switch_to.window(self.aba_principal)
             
-            logger.info("Retornado para a aba principal")
+            logger.debug("Retornado para a aba principal")
             return True
         except Exception as e:
-            logger.error(f"Erro ao fechar aba de detalhes: {str(e)}")
+            logger.error(f"Erro ao voltar para a aba principal: {str(e)}")
             return False
     
+    def descartar_aba_detalhes(self):
+        """
+        Fecha a aba de detalhes (ex: após um erro) e volta para a aba principal; o próximo
+        registro abre uma aba nova
+        """
+        try:
+            if self.aba_detalhes and self.aba_detalhes in self.driver.window_handles:
+                self.driver.switch_to.window(self.aba_detalhes)
+                self.driver.close()
+        except Exception as e:
+            logger.debug(f"Erro ao fechar a aba de detalhes: {str(e)}")
+        finally:
+            self.aba_detalhes = None
+        try:
+            self.driver.switch_to.window(self.aba_principal)
+        except Exception as e:
+            logger.error(f"Erro ao voltar para a aba principal: {str(e)}")
+    
     def navegar_proxima_pagina(self):
         """
         Navega para a próxima página de resultados
@@ -635,8 +529,10 @@ class ColetorEcosistemas:
         Esta função utiliza várias estratégias para encontrar e interagir com os controles de paginação:
         1. Rola até o final da página para garantir que os controles estejam visíveis
         2. Identifica o indicador de páginas (ex: "1 - 10 de 137 Registros")
-        3. Busca elementos interativos que possam ser botões de paginação
-        4. Tenta clicar nos botões encontrados usando diferentes abordagens
+        3. Tenta primeiro a estratégia (e o seletor) que funcionou por último, guardada em
+           cache no disco (estrategias_paginacao.py)
+        4. Se ela falhar, busca elementos interativos que possam ser botões de paginação e tenta
+           as estratégias na ordem de estrategias_paginacao.ESTRATEGIAS
         
         Returns:
             bool: True se conseguiu navegar para a próxima página, False caso contrário
@@ -647,7 +543,6 @@ class ColetorEcosistemas:
             # MELHORADO: Rolar até o final da página para garantir que os controles de paginação sejam visíveis
             logger.info("Rolando até o final da página para encontrar controles de paginação")
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)  # Aguardar a rolagem
             
             # Tentar encontrar e rolar até a tabela e depois um pouco mais para garantir que a paginação fique visível
             try:
@@ -655,17 +550,16 @@ class ColetorEcosistemas:
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'end'});", tabela)
                 # Rolar um pouco mais para garantir que os controles abaixo da tabela sejam visíveis
                 self.driver.execute_script("window.scrollBy(0, 200);")
-                time.sleep(1)  # Aguardar a rolagem
             except:
                 logger.warning("Não foi possível encontrar a tabela para rolar")
             
-            # Aguardar para garantir que a paginação esteja visível
-            time.sleep(2)
+            # Aguardar o indicador de registros, que fica junto aos controles de paginação
+            self.esperas.elemento_presente(By.XPATH, "//*[contains(text(), 'Registros')]", timeout=5,
+                                           descricao="indicador de registros")
+            assinatura_anterior = self.esperas.assinatura_tabela()
             
             # Capturar screenshot para depuração
-            screenshot_path = f"paginacao_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            self.driver.save_screenshot(screenshot_path)
-            logger.info(f"Screenshot da paginação salvo em {screenshot_path}")
+            self.artefatos.capturar(self.driver, "paginacao")
             
             # Procurar pelo indicador de páginas primeiro para confirmar que há mais páginas
             indicador_paginas = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Registros')]")
@@ -713,519 +607,393 @@ class ColetorEcosistemas:
                         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", indicador)
                         # Rolar um pouco mais para baixo para garantir que os controles abaixo do indicador estejam visíveis
                         self.driver.execute_script("window.scrollBy(0, 100);")
-                        time.sleep(1)  # Aguardar a rolagem
                         break
             except:
                 logger.warning("Não foi possível rolar até o indicador de páginas")
-                
-            # Capturar novo screenshot após rolagem adicional
-            post_scroll_screenshot = f"paginacao_apos_rolagem_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            self.driver.save_screenshot(post_scroll_screenshot)
-            logger.info(f"Screenshot após rolagem adicional salvo em {post_scroll_screenshot}")
             
-            # Tentar localizar os botões de paginação com diferentes seletores
-            botoes_paginacao = []
-            
-            # MELHORADO: Seletores mais específicos, priorizando elementos abaixo da tabela
-            seletores = [
-                # Seletores específicos para paginação após a tabela
-                "//table/following-sibling::*//a[contains(text(), '>')]",  # Links com '>' após a tabela
-                "//table/following-sibling::*//button[contains(text(), '>')]",  # Botões com '>' após a tabela
-                "//table/following-sibling::*//*[contains(text(), '>')]",  # Qualquer elemento com '>' após a tabela
-                "//table/following-sibling::*//*[contains(@class, 'pagination')]//a",  # Links de paginação após a tabela
-                
-                # Seletores específicos para a página 2
-                "//table/following-sibling::*//a[contains(text(), '2')]",  # Link para página 2 após a tabela
-                "//table/following-sibling::*//*[contains(text(), '2')]",  # Qualquer elemento com '2' após a tabela
-                
-                # Seletores específicos para "próximo"
-                "//table/following-sibling::*//a[contains(text(), 'Próximo') or contains(text(), 'próximo') or contains(text(), 'Next')]",
-                
-                # Seletores gerais para paginação em qualquer lugar
-                "//ul[contains(@class, 'pagination')]/li/a",  # Bootstrap padrão
-                "//div[contains(@class, 'pagination')]//a",   # Outro padrão comum
-                "//*[contains(@class, 'pagination')]//a",     # Genérico
-                "//a[contains(@class, 'page-link')]",         # Links de página
-                "//a[contains(@href, 'page=')]",              # Links com parâmetro page
-                "//a[contains(text(), '>')]",                 # Seta para direita
-                "//button[contains(text(), '>')]",           # Botão seta para direita
-                "//i[contains(@class, 'fa-chevron-right')]",  # Ícone FontAwesome
-                "//i[contains(@class, 'fa-arrow-right')]",    # Ícone FontAwesome
-                "//span[contains(@class, 'icon') and contains(text(), '>')]", # Ícones em spans
-                "//a[contains(text(), '2')]",                 # Número 2 (próxima página)
-                "//a[contains(text(), 'Próximo') or contains(text(), 'próximo') or contains(text(), 'Next')]", # Texto indicando próximo
-                "//button[contains(@aria-label, 'Next') or contains(@aria-label, 'Próximo')]", # Botões com aria-label
-                "//div[contains(@class, 'next') or contains(@class, 'proximo')]", # Divs com classe next
-                "//li[contains(@class, 'next') or contains(@class, 'pagination-next')]//a", # Elementos li com classe next
-                "//img[contains(@src, 'next') or contains(@src, 'arrow')]", # Imagens de seta
-                "//a/img[contains(@src, 'arrow') or contains(@src, 'next')]/parent::a" # Links com imagens de setas
-            ]
-            
-            for seletor in seletores:
-                try:
-                    elementos = self.driver.find_elements(By.XPATH, seletor)
-                    if elementos:
-                        logger.info(f"Encontrados {len(elementos)} botões com o seletor: {seletor}")
-                        botoes_paginacao.extend(elementos)
-                except Exception as e:
-                    logger.debug(f"Erro ao buscar seletor {seletor}: {str(e)}")
-            
-            logger.info(f"Total de {len(botoes_paginacao)} possíveis botões de paginação encontrados")
+            # Capturar novo screenshot após rolagem adicional
+            self.artefatos.capturar(self.driver, "paginacao_apos_rolagem")
             
-            # MELHORADO: JavaScript mais preciso para encontrar elementos clicáveis relacionados à paginação
-            js_script_botoes = """
-            function encontrarBotoesPaginacao() {
-                const candidatos = [];
-                
-                // Buscar elementos com características visuais de paginação
-                document.querySelectorAll('a, button, span, div, li').forEach(el => {
-                    // Verificar se o elemento é visível
-                    const rect = el.getBoundingClientRect();
-                    if (rect.width === 0 || rect.height === 0) return;
-                    
-                    const texto = el.textContent.trim();
-                    const classes = (el.className || '').toLowerCase();
-                    
-                    // Verificar texto que indica próxima página
-                    if (texto === '>' || texto === '>>' || texto === '→' || texto === '2' ||
-                        texto === 'Next' || texto === 'Próximo' || texto === 'próximo') {
-                        candidatos.push(el);
-                    }
-                    
-                    // Verificar classes que sugerem paginação
-                    if (classes.includes('next') || classes.includes('proximo') || 
-                        classes.includes('próximo') || classes.includes('pagination')) {
-                        candidatos.push(el);
-                    }
-                    
-                    // Verificar se é um elemento clicável (elemento a com href ou button)
-                    if ((el.tagName === 'A' && el.hasAttribute('href')) || 
-                        el.tagName === 'BUTTON' || 
-                        el.onclick || 
-                        el.getAttribute('role') === 'button') {
-                        
-                        // Verificar se parece ser relacionado à paginação
-                        if (texto.match(/^\\d+$/) || // Números isolados
-                            texto.match(/[>»→]/) ||  // Símbolos de seta
-                            classes.includes('page') || 
-                            classes.includes('nav')) {
-                            candidatos.push(el);
-                        }
-                    }
-                    
-                    // Verificar se tem filhos que podem ser ícones
-                    if (el.children.length > 0) {
-                        for (const child of el.children) {
-                            const childClasses = (child.className || '').toLowerCase();
-                            if (childClasses.includes('icon') || childClasses.includes('fa-') || 
-                                childClasses.includes('arrow') || childClasses.includes('next')) {
-                                candidatos.push(el);
-                                break;
-                            }
-                        }
-                    }
-                });
-                
-                return candidatos;
+            contexto = {
+                "pagina_atual": pagina_atual,
+                "texto_indicador": texto_indicador,
+                "assinatura_anterior": assinatura_anterior,
+                "candidatos": None,
             }
             
-            return encontrarBotoesPaginacao();
-            """
+            # Primeiro a estratégia que funcionou por último (nesta ou em execuções anteriores)
+            preferida = self.estrategias.preferida
+            if preferida and preferida[0] in ESTRATEGIAS:
+                estrategia, seletor = preferida
+                logger.info(f"Tentando a estratégia em cache: {CacheEstrategias.descrever(estrategia, seletor)}")
+                inicio_tentativa = time.perf_counter()
+                usado = self._executar_estrategia(estrategia, contexto, seletor)
+                if usado:
+                    navegou, mudou = self._confirmar_navegacao(contexto)
+                    sem_efeito = False
+                    if not mudou:
+                        # Um indicador lento para atualizar não prova que o clique falhou: um novo
+                        # clique em "próxima" pularia uma página
+                        mudanca = self._conferir_mudanca(contexto)
+                        if mudanca:
+                            navegou = mudou = True
+                        sem_efeito = mudanca is False
+                    self.estrategias.registrar(estrategia, usado, mudou, time.perf_counter() - inicio_tentativa,
+                                               do_cache=True)
+                    if not sem_efeito:
+                        return navegou
+                else:
+                    self.estrategias.registrar(estrategia, seletor, False, time.perf_counter() - inicio_tentativa,
+                                               do_cache=True)
+                logger.info("A estratégia em cache falhou. Usando a busca completa.")
+                self.metricas.incrementar(FALLBACKS, tipo="busca_completa_paginacao")
+            
+            # Busca completa: estratégias na ordem, até a primeira que conseguir clicar
+            for estrategia in ESTRATEGIAS:
+                inicio_tentativa = time.perf_counter()
+                usado = self._executar_estrategia(estrategia, contexto)
+                if not usado:
+                    continue
+                navegou, mudou = self._confirmar_navegacao(contexto)
+                self.estrategias.registrar(estrategia, usado, mudou, time.perf_counter() - inicio_tentativa)
+                return navegou
             
+            # Se chegamos aqui é porque não conseguimos clicar em nenhum botão ou falhou a navegação
+            logger.warning("Não foi possível navegar para a próxima página após múltiplas tentativas")
+            self.artefatos.registrar_erro(self.driver, "erro_paginacao")
+            return False
+        
+        except Exception as e:
+            logger.error(f"Erro ao navegar para próxima página: {str(e)}")
+            self.artefatos.registrar_erro(self.driver, "erro_paginacao")
+            return False
+    
+    def _executar_estrategia(self, estrategia, contexto, seletor=None):
+        """
+        Executa uma estratégia de paginação
+        
+        Args:
+            estrategia (str): Nome da estratégia (estrategias_paginacao.ESTRATEGIAS)
+            contexto (dict): Situação da página antes da navegação
+            seletor (str): Seletor da estratégia em cache; se informado, apenas os candidatos
+                desse seletor são considerados
+        
+        Returns:
+            str: O seletor ou a variante usada (verdadeiro se algo foi clicado), ou None
+        """
+        try:
+            if estrategia in (TEXTO_PROXIMA, HREF_PAGINA, CANDIDATO):
+                if seletor:
+                    candidatos = self._candidatos_do_seletor(seletor)
+                else:
+                    candidatos = self._candidatos_paginacao(contexto)
+                if estrategia == TEXTO_PROXIMA:
+                    return self._clicar_texto_proxima(candidatos)
+                if estrategia == HREF_PAGINA:
+                    return self._clicar_href_pagina(candidatos)
+                return self._clicar_candidato(candidatos)
+            if estrategia == REGIAO_VISIVEL:
+                return self._clicar_regiao_visivel(contexto)
+            if estrategia == INJECAO:
+                return self._injetar_botao_paginacao(contexto)
+            if estrategia == URL_PAGINA:
+                return self._navegar_url_pagina(contexto)
+            if estrategia == TECLADO:
+                return self._navegar_teclado()
+        except Exception as e:
+            logger.warning(f"Erro na estratégia de paginação {estrategia}: {str(e)}")
+        return None
+    
+    def _candidatos_do_seletor(self, seletor):
+        """Retorna (elemento, origem) dos elementos de um único seletor XPath (ou da busca em JavaScript)"""
+        if seletor == ORIGEM_JS:
+            elementos = self.driver.execute_script(JS_BOTOES_PAGINACAO) or []
+        else:
+            elementos = self.driver.find_elements(By.XPATH, seletor)
+        return [(elemento, seletor) for elemento in elementos]
+    
+    def _candidatos_paginacao(self, contexto):
+        """
+        Busca (uma vez por navegação) os possíveis botões de paginação com os seletores XPath
+        e a varredura em JavaScript, sem duplicados
+        
+        Returns:
+            list: Tuplas (elemento, origem), em que origem é o seletor que encontrou o elemento
+        """
+        if contexto["candidatos"] is not None:
+            return contexto["candidatos"]
+        
+        # Tentar localizar os botões de paginação com diferentes seletores
+        botoes_paginacao = []
+        for seletor in SELETORES_PAGINACAO:
             try:
-                js_botoes = self.driver.execute_script(js_script_botoes)
-                if js_botoes and len(js_botoes) > 0:
-                    logger.info(f"Encontrados {len(js_botoes)} botões adicionais via JavaScript")
-                    botoes_paginacao.extend(js_botoes)
+                elementos = self.driver.find_elements(By.XPATH, seletor)
+                if elementos:
+                    logger.debug("Encontrados %d botões com o seletor: %s", len(elementos), seletor)
+                    botoes_paginacao.extend((elemento, seletor) for elemento in elementos)
             except Exception as e:
-                logger.warning(f"Erro ao executar JavaScript para encontrar botões: {str(e)}")
-            
-            # Remover duplicados
-            botoes_unicos = []
-            for botao in botoes_paginacao:
-                if botao not in botoes_unicos:
-                    botoes_unicos.append(botao)
-            
-            botoes_paginacao = botoes_unicos
-            logger.info(f"Total de {len(botoes_paginacao)} botões únicos após remoção de duplicados")
-            
-            # Exibir informações sobre os botões encontrados
-            for i, botao in enumerate(botoes_paginacao):
+                logger.debug("Erro ao buscar seletor %s: %s", seletor, e)
+        
+        logger.info(f"Total de {len(botoes_paginacao)} possíveis botões de paginação encontrados")
+        
+        # MELHORADO: JavaScript mais preciso para encontrar elementos clicáveis relacionados à paginação
+        try:
+            js_botoes = self.driver.execute_script(JS_BOTOES_PAGINACAO)
+            if js_botoes and len(js_botoes) > 0:
+                logger.info(f"Encontrados {len(js_botoes)} botões adicionais via JavaScript")
+                botoes_paginacao.extend((elemento, ORIGEM_JS) for elemento in js_botoes)
+        except Exception as e:
+            logger.warning(f"Erro ao executar JavaScript para encontrar botões: {str(e)}")
+        
+        # Remover duplicados (vale a origem do primeiro seletor que encontrou o elemento)
+        botoes_unicos = []
+        vistos = []
+        for botao, origem in botoes_paginacao:
+            if botao not in vistos:
+                vistos.append(botao)
+                botoes_unicos.append((botao, origem))
+        
+        logger.info(f"Total de {len(botoes_unicos)} botões únicos após remoção de duplicados")
+        
+        # Exibir informações sobre os botões encontrados (4 consultas ao navegador por botão,
+        # feitas apenas quando o DEBUG da paginação está ativo)
+        if registrando(logger):
+            for i, (botao, origem) in enumerate(botoes_unicos):
                 try:
                     texto = botao.text.strip()
-                    href = botao.get_attribute("href") if hasattr(botao, "get_attribute") else None
-                    onclick = botao.get_attribute("onclick") if hasattr(botao, "get_attribute") else None
-                    classes = botao.get_attribute("class") if hasattr(botao, "get_attribute") else None
-                    logger.info(f"Botão {i+1}: texto='{texto}', href='{href}', onclick='{onclick}', classes='{classes}'")
+                    href = botao.get_attribute("href")
+                    onclick = botao.get_attribute("onclick")
+                    classes = botao.get_attribute("class")
+                    logger.debug("Botão %d: texto='%s', href='%s', onclick='%s', classes='%s', origem='%s'",
+                                 i + 1, texto, href, onclick, classes, origem)
                 except:
                     pass
-            
-            # Tentar diferentes estratégias para clicar no botão de próxima página
-            clicou = False
-            
-            # Estratégia 1: Priorizar botões com texto '>' ou '2' ou 'próximo'
-            logger.info("Tentativa 1: Clicando em botões com texto de próxima página")
-            for botao in botoes_paginacao:
-                try:
-                    texto = botao.text.strip()
-                    if texto in ['>', '>>', '→', '2', 'Next', 'Próximo', 'próximo', 'Próxima']:
-                        logger.info(f"Tentando clicar no botão com texto '{texto}'")
-                        # Rolar até o botão
-                        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", botao)
-                        time.sleep(0.5)
-                        
-                        try:
-                            # Tentar clique normal
-                            botao.click()
-                            logger.info(f"Clicou com sucesso no botão '{texto}'")
-                            clicou = True
-                            break
-                        except:
-                            # Se falhar, tentar com JavaScript
-                            self.driver.execute_script("arguments[0].click();", botao)
-                            logger.info(f"Clicou com JavaScript no botão '{texto}'")
-                            clicou = True
-                            break
-                except Exception as e:
-                    logger.debug(f"Erro ao clicar: {str(e)}")
-            
-            # NOVA ESTRATÉGIA: Inspecionar elementos visíveis na parte inferior da página que parecem controles de paginação
-            if not clicou:
-                logger.info("Tentativa especial: Localizando elementos visíveis na região de paginação")
-                try:
-                    elemento_visivel_js = """
-                    function encontrarElementosClicaveisVisiveis() {
-                        // Obter as dimensões da janela
-                        const windowHeight = window.innerHeight;
-                        const windowWidth = window.innerWidth;
-                        
-                        // Região onde provavelmente estão os controles de paginação (parte inferior da página)
-                        const areaPaginacao = {
-                            top: windowHeight * 0.7,  // Últimos 30% da altura da janela
-                            bottom: windowHeight,
-                            left: 0,
-                            right: windowWidth
-                        };
-                        
-                        // Elementos a considerar
-                        const elementos = document.querySelectorAll('a, button, span[role="button"], div[role="button"]');
-                        const elementosVisiveis = [];
-                        
-                        for (const el of elementos) {
-                            const rect = el.getBoundingClientRect();
-                            
-                            // Verificar se o elemento está visível
-                            if (rect.width > 0 && rect.height > 0) {
-                                // Verificar se o elemento está na região de paginação
-                                const centro = {
-                                    x: rect.left + rect.width / 2,
-                                    y: rect.top + rect.height / 2
-                                };
-                                
-                                if (centro.y > areaPaginacao.top && centro.y < areaPaginacao.bottom &&
-                                    centro.x > areaPaginacao.left && centro.x < areaPaginacao.right) {
-                                    
-                                    // Coletar informações sobre o elemento
-                                    elementosVisiveis.push({
-                                        elemento: el,
-                                        texto: el.textContent.trim(),
-                                        x: centro.x,
-                                        y: centro.y,
-                                        width: rect.width,
-                                        height: rect.height,
-                                        tag: el.tagName.toLowerCase()
-                                    });
-                                }
-                            }
-                        }
-                        
-                        // Ordenar elementos da esquerda para a direita (para pegar o "próximo" que normalmente está à direita)
-                        elementosVisiveis.sort((a, b) => a.x - b.x);
-                        
-                        return elementosVisiveis;
-                    }
-                    
-                    return encontrarElementosClicaveisVisiveis();
-                    """
-                    
-                    elementos_visiveis = self.driver.execute_script(elemento_visivel_js)
-                    logger.info(f"Encontrados {len(elementos_visiveis)} elementos visíveis na região de paginação")
-                    
-                    # Registrar informações para depuração
-                    for i, el in enumerate(elementos_visiveis):
-                        logger.info(f"Elemento visível {i+1}: tag={el.get('tag', '')}, texto='{el.get('texto', '')}', posição=({el.get('x', 0)}, {el.get('y', 0)})")
-                    
-                    # Tentar clicar no elemento mais à direita (geralmente o "próximo")
-                    if elementos_visiveis:
-                        # Separar os elementos por tipo
-                        elementos_numericos = [el for el in elementos_visiveis if el.get('texto', '').strip() == str(pagina_atual + 1)]
-                        elementos_seta = [el for el in elementos_visiveis if '>' in el.get('texto', '')]
-                        elementos_proximos = [el for el in elementos_visiveis if 'próximo' in el.get('texto', '').lower()]
-                        
-                        # Priorizar elementos na ordem: "próximo" > seta > número da próxima página > último elemento
-                        elemento_alvo = None
-                        
-                        if elementos_proximos:
-                            elemento_alvo = elementos_proximos[0]
-                            logger.info(f"Selecionado elemento 'próximo': {elemento_alvo.get('texto', '')}")
-                        elif elementos_seta:
-                            elemento_alvo = elementos_seta[0]
-                            logger.info(f"Selecionado elemento seta: {elemento_alvo.get('texto', '')}")
-                        elif elementos_numericos:
-                            elemento_alvo = elementos_numericos[0]
-                            logger.info(f"Selecionado elemento numérico: {elemento_alvo.get('texto', '')}")
-                        else:
-                            # Se nenhum elemento específico, pegar o mais à direita
-                            # (último após ordenação por posição X)
-                            elemento_alvo = elementos_visiveis[-1]
-                            logger.info(f"Selecionado último elemento à direita: {elemento_alvo.get('texto', '')}")
-                        
-                        # Tentar clicar no elemento selecionado
-                        try:
-                            el = elemento_alvo.get('elemento')
-                            self.driver.execute_script("arguments[0].click();", el)
-                            logger.info(f"Clicou com sucesso no elemento visível: {elemento_alvo.get('texto', '')}")
-                            clicou = True
-                        except Exception as e:
-                            logger.warning(f"Erro ao clicar no elemento visível: {str(e)}")
-                    
-                except Exception as e:
-                    logger.warning(f"Erro ao localizar elementos visíveis: {str(e)}")
-            
-            # Estratégia anterior: Tentar botões com href contendo 'page='
-            if not clicou:
-                logger.info("Tentativa 2: Clicando em links com href de paginação")
-                for botao in botoes_paginacao:
-                    try:
-                        href = botao.get_attribute("href")
-                        if href and ('page=' in href.lower() or 'pagina=' in href.lower()):
-                            logger.info(f"Tentando clicar no link com href '{href}'")
-                            
-                            try:
-                                botao.click()
-                                logger.info(f"Clicou com sucesso no link com href '{href}'")
-                                clicou = True
-                                break
-                            except:
-                                # Se falhar, navegar diretamente para o href
-                                self.driver.get(href)
-                                logger.info(f"Navegou diretamente para '{href}'")
-                                clicou = True
-                                break
-                    except Exception as e:
-                        logger.debug(f"Erro ao acessar href: {str(e)}")
-            
-            # Estratégia 3: Tentar qualquer botão de paginação
-            if not clicou:
-                logger.info("Tentativa 3: Tentando qualquer botão candidato de paginação")
-                for botao in botoes_paginacao:
+        
+        contexto["candidatos"] = botoes_unicos
+        return botoes_unicos
+    
+    def _clicar(self, botao):
+        """Clica no elemento (clique normal e, se falhar, via JavaScript)"""
+        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", botao)
+        try:
+            botao.click()
+        except:
+            self.driver.execute_script("arguments[0].click();", botao)
+    
+    def _clicar_texto_proxima(self, candidatos):
+        """Estratégia 1: botões com texto '>', '2', 'Próximo' e similares"""
+        logger.info("Tentativa 1: Clicando em botões com texto de próxima página")
+        for botao, origem in candidatos:
+            try:
+                texto = botao.text.strip()
+                if texto in ['>', '>>', '→', '2', 'Next', 'Próximo', 'próximo', 'Próxima']:
+                    logger.debug("Tentando clicar no botão com texto '%s'", texto)
+                    self._clicar(botao)
+                    logger.info(f"Clicou com sucesso no botão '{texto}'")
+                    return origem
+            except Exception as e:
+                logger.debug(f"Erro ao clicar: {str(e)}")
+        return None
+    
+    def _clicar_regiao_visivel(self, contexto):
+        """Estratégia especial: elementos visíveis na região de paginação (parte inferior da janela)"""
+        logger.info("Tentativa especial: Localizando elementos visíveis na região de paginação")
+        elementos_visiveis = self.driver.execute_script(JS_ELEMENTOS_VISIVEIS) or []
+        logger.info(f"Encontrados {len(elementos_visiveis)} elementos visíveis na região de paginação")
+        
+        # Registrar informações para depuração
+        for i, el in enumerate(elementos_visiveis):
+            logger.debug("Elemento visível %d: tag=%s, texto='%s', posição=(%s, %s)",
+                         i + 1, el.get('tag', ''), el.get('texto', ''), el.get('x', 0), el.get('y', 0))
+        
+        if not elementos_visiveis:
+            return None
+        
+        # Separar os elementos por tipo
+        elementos_numericos = [el for el in elementos_visiveis if el.get('texto', '').strip() == str(contexto["pagina_atual"] + 1)]
+        elementos_seta = [el for el in elementos_visiveis if '>' in el.get('texto', '')]
+        elementos_proximos = [el for el in elementos_visiveis if 'próximo' in el.get('texto', '').lower()]
+        
+        # Priorizar elementos na ordem: "próximo" > seta > número da próxima página > último elemento
+        if elementos_proximos:
+            elemento_alvo, variante = elementos_proximos[0], "proximo"
+        elif elementos_seta:
+            elemento_alvo, variante = elementos_seta[0], "seta"
+        elif elementos_numericos:
+            elemento_alvo, variante = elementos_numericos[0], "numero"
+        else:
+            # Se nenhum elemento específico, pegar o mais à direita (último após ordenação por posição X)
+            elemento_alvo, variante = elementos_visiveis[-1], "direita"
+        logger.info(f"Selecionado elemento {variante}: {elemento_alvo.get('texto', '')}")
+        
+        self.driver.execute_script("arguments[0].click();", elemento_alvo.get('elemento'))
+        logger.info(f"Clicou com sucesso no elemento visível: {elemento_alvo.get('texto', '')}")
+        return variante
+    
+    def _clicar_href_pagina(self, candidatos):
+        """Estratégia 2: links com href contendo 'page=' ou 'pagina='"""
+        logger.info("Tentativa 2: Clicando em links com href de paginação")
+        for botao, origem in candidatos:
+            try:
+                href = botao.get_attribute("href")
+                if href and ('page=' in href.lower() or 'pagina=' in href.lower()):
+                    logger.debug("Tentando clicar no link com href '%s'", href)
                     try:
-                        try:
-                            # Rolar até o botão
-                            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", botao)
-                            time.sleep(0.5)
-                            
-                            botao.click()
-                            logger.info("Clicou com sucesso em um botão candidato")
-                            clicou = True
-                        except:
-                            # Se falhar, tentar com JavaScript
-                            self.driver.execute_script("arguments[0].click();", botao)
-                            logger.info("Clicou com JavaScript em um botão candidato")
-                            clicou = True
-                            break
-                    except Exception as e:
-                        logger.debug(f"Erro ao clicar em candidato: {str(e)}")
-            
-            # Estratégia 4: Tentar injetar botão de paginação personalizado
-            if not clicou:
-                logger.info("Tentativa 4: Injetando botão de paginação personalizado")
-                try:
-                    # Injetar um botão personalizado para navegar para a próxima página
-                    inject_js = """
-                    function injetarBotaoPaginacao() {
-                        // Verificar se já existe o botão personalizado
-                        if (document.getElementById('botao-pagina-injetado')) {
-                            document.getElementById('botao-pagina-injetado').remove();
-                        }
-                        
-                        // Encontrar a tabela
-                        const tabela = document.querySelector('table');
-                        if (!tabela) return false;
-                        
-                        // Criar o botão
-                        const botao = document.createElement('button');
-                        botao.id = 'botao-pagina-injetado';
-                        botao.textContent = 'Próxima Página →';
-                        botao.style.cssText = 'margin: 20px; padding: 10px 20px; background-color: #4CAF50; color: white; border: none; cursor: pointer; font-size: 16px;';
-                        
-                        // Adicionar após a tabela
-                        tabela.parentNode.insertBefore(botao, tabela.nextSibling);
-                        
-                        // Configurar ação do botão para navegar para a próxima página
-                        const proximaPagina = """ + str(pagina_atual + 1) + """;
-                        botao.onclick = function() {
-                            let url = window.location.href;
-                            
-                            if (url.includes('page=')) {
-                                url = url.replace(/page=\\d+/, 'page=' + proximaPagina);
-                            } else if (url.includes('?')) {
-                                url += '&page=' + proximaPagina;
-                            } else {
-                                url += '?page=' + proximaPagina;
-                            }
-                            
-                            console.log('Navegando para:', url);
-                            window.location.href = url;
-                        };
-                        
-                        return true;
-                    }
-                    
-                    return injetarBotaoPaginacao();
-                    """
-                    
-                    sucesso_injecao = self.driver.execute_script(inject_js)
-                    if sucesso_injecao:
-                        logger.info("Botão de paginação personalizado injetado com sucesso")
-                        
-                        # Capturar screenshot do botão injetado
-                        inj_screenshot = f"botao_injetado_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-                        self.driver.save_screenshot(inj_screenshot)
-                        logger.info(f"Screenshot do botão injetado salvo em {inj_screenshot}")
-                        
-                        # Clicar no botão injetado
-                        try:
-                            botao_injetado = self.driver.find_element(By.ID, "botao-pagina-injetado")
-                            botao_injetado.click()
-                            logger.info("Clicou no botão injetado")
-                            clicou = True
-                        except Exception as e:
-                            logger.warning(f"Erro ao clicar no botão injetado: {str(e)}")
-                            
-                            # Tentar clicar com JavaScript
-                            try:
-                                self.driver.execute_script("document.getElementById('botao-pagina-injetado').click();")
-                                logger.info("Clicou no botão injetado via JavaScript")
-                                clicou = True
-                            except Exception as e2:
-                                logger.warning(f"Erro ao clicar no botão injetado via JavaScript: {str(e2)}")
-                except Exception as e:
-                    logger.warning(f"Erro ao injetar botão de paginação: {str(e)}")
-            
-            # Estratégia 5: Navegar diretamente para a URL com parâmetro de página
-            if not clicou:
-                logger.info("Tentativa 5: Navegando diretamente para URL com parâmetro de página")
-                try:
-                    url_atual = self.driver.current_url
-                    proxima_pagina = pagina_atual + 1
-                    
-                    nova_url = url_atual
-                    if "page=" in url_atual:
-                        nova_url = re.sub(r'page=\d+', f'page={proxima_pagina}', url_atual)
-                    elif "?" in url_atual:
-                        nova_url = f"{url_atual}&page={proxima_pagina}"
-                    else:
-                        nova_url = f"{url_atual}?page={proxima_pagina}"
-                    
-                    if nova_url != url_atual:
-                        logger.info(f"Navegando diretamente para: {nova_url}")
-                        self.driver.get(nova_url)
-                        clicou = True
-                except Exception as e:
-                    logger.warning(f"Erro ao navegar diretamente para a próxima página: {str(e)}")
-            
-            # ESTRATÉGIA 6 (NOVA): Tentar simular a tecla Tab para navegar até o botão de próxima página e pressionar Enter
-            if not clicou:
-                logger.info("Tentativa 6: Simulando navegação por teclado")
-                try:
-                    # Primeiro rolar até o fim da página
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(1)
-                    
-                    actions = ActionChains(self.driver)
-                    # Tentar pressionar Tab várias vezes para chegar aos controles de paginação
-                    for _ in range(5):  # Simular 5 pressionamentos de Tab
-                        actions.send_keys(Keys.TAB)
-                        actions.perform()
-                        time.sleep(0.5)
-                    
-                    # Tentar pressionar Enter para clicar no controle selecionado
-                    actions.send_keys(Keys.ENTER)
-                    actions.perform()
-                    
-                    # Capturar screenshot após tentativa de teclado
-                    keyboard_screenshot = f"teclado_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-                    self.driver.save_screenshot(keyboard_screenshot)
-                    logger.info(f"Screenshot após simulação de teclado salvo em {keyboard_screenshot}")
-                    
-                    # Verificar se a navegação parece ter funcionado
-                    # Assumir que funcionou e verificar posteriormente
-                    clicou = True
-                    logger.info("Simulação de teclado executada, verificando resultado posteriormente")
-                except Exception as e:
-                    logger.warning(f"Erro ao simular navegação por teclado: {str(e)}")
-            
-            # Verificar se a navegação foi bem-sucedida
-            if clicou:
-                # Aguardar carregamento da nova página
-                time.sleep(5)
-                
-                # Tirar screenshot da nova página 
-                nova_screenshot = f"nova_pagina_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-                self.driver.save_screenshot(nova_screenshot)
-                logger.info(f"Screenshot da nova página salvo em {nova_screenshot}")
+                        botao.click()
+                        logger.info(f"Clicou com sucesso no link com href '{href}'")
+                    except:
+                        # Se falhar, navegar diretamente para o href
+                        self.driver.get(href)
+                        logger.info(f"Navegou diretamente para '{href}'")
+                    return origem
+            except Exception as e:
+                logger.debug(f"Erro ao acessar href: {str(e)}")
+        return None
+    
+    def _clicar_candidato(self, candidatos):
+        """Estratégia 3: o primeiro candidato de paginação que aceitar o clique"""
+        logger.info("Tentativa 3: Tentando qualquer botão candidato de paginação")
+        for botao, origem in candidatos:
+            try:
+                self._clicar(botao)
+                logger.info("Clicou com sucesso em um botão candidato")
+                return origem
+            except Exception as e:
+                logger.debug(f"Erro ao clicar em candidato: {str(e)}")
+        return None
+    
+    def _injetar_botao_paginacao(self, contexto):
+        """Estratégia 4: injeta um botão que navega pelo parâmetro page= da URL e clica nele"""
+        logger.info("Tentativa 4: Injetando botão de paginação personalizado")
+        if not self.driver.execute_script(JS_INJETAR_BOTAO, contexto["pagina_atual"] + 1):
+            return None
+        logger.info("Botão de paginação personalizado injetado com sucesso")
+        
+        # Capturar screenshot do botão injetado
+        self.artefatos.capturar(self.driver, "botao_injetado")
+        
+        try:
+            self.driver.find_element(By.ID, "botao-pagina-injetado").click()
+            logger.info("Clicou no botão injetado")
+        except Exception as e:
+            logger.warning(f"Erro ao clicar no botão injetado: {str(e)}")
+            self.driver.execute_script("document.getElementById('botao-pagina-injetado').click();")
+            logger.info("Clicou no botão injetado via JavaScript")
+        return "botao-pagina-injetado"
+    
+    def _navegar_url_pagina(self, contexto):
+        """Estratégia 5: navega diretamente para a URL com o parâmetro page= da próxima página"""
+        logger.info("Tentativa 5: Navegando diretamente para URL com parâmetro de página")
+        url_atual = self.driver.current_url
+        proxima_pagina = contexto["pagina_atual"] + 1
+        
+        if "page=" in url_atual:
+            nova_url = re.sub(r'page=\d+', f'page={proxima_pagina}', url_atual)
+        elif "?" in url_atual:
+            nova_url = f"{url_atual}&page={proxima_pagina}"
+        else:
+            nova_url = f"{url_atual}?page={proxima_pagina}"
+        
+        if nova_url == url_atual:
+            return None
+        logger.info(f"Navegando diretamente para: {nova_url}")
+        self.driver.get(nova_url)
+        return "page="
+    
+    def _navegar_teclado(self):
+        """Estratégia 6: Tab até os controles de paginação e Enter"""
+        logger.info("Tentativa 6: Simulando navegação por teclado")
+        # Primeiro rolar até o fim da página
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        
+        actions = ActionChains(self.driver)
+        # Tentar pressionar Tab várias vezes para chegar aos controles de paginação
+        for _ in range(5):  # Simular 5 pressionamentos de Tab
+            actions.send_keys(Keys.TAB)
+            actions.perform()
+        
+        # Tentar pressionar Enter para clicar no controle selecionado
+        actions.send_keys(Keys.ENTER)
+        actions.perform()
+        
+        # Capturar screenshot após tentativa de teclado
+        self.artefatos.capturar(self.driver, "teclado")
+        
+        # Assumir que funcionou e verificar na confirmação
+        logger.info("Simulação de teclado executada, verificando resultado posteriormente")
+        return "tab+enter"
+    
+    def _confirmar_navegacao(self, contexto):
+        """
+        Verifica se a navegação foi bem-sucedida depois de um clique
+        
+        Returns:
+            tuple: (navegou, mudou) - navegou segue o critério da coleta (indicador mudou ou há
+                tabela com conteúdo); mudou indica que o indicador ou a tabela realmente mudaram,
+                critério usado no cache de estratégias
+        """
+        # Aguardar o indicador de registros ou o conteúdo da tabela mudar
+        mudou = bool(self.esperas.nova_pagina(contexto["texto_indicador"], contexto["assinatura_anterior"]))
+        self.esperas.pagina_ociosa(timeout=5)
+        
+        # Tirar screenshot da nova página
+        self.artefatos.capturar(self.driver, "nova_pagina")
+        
+        try:
+            # Verificar pelo indicador de páginas para confirmar que mudou
+            novo_indicador = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Registros')]")
+            if novo_indicador:
+                novo_texto = novo_indicador[0].text.strip()
+                logger.info(f"Novo indicador de páginas: {novo_texto}")
                 
-                try:
-                    # Verificar pelo indicador de páginas para confirmar que mudou
-                    novo_indicador = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Registros')]")
-                    if novo_indicador:
-                        novo_texto = novo_indicador[0].text.strip()
-                        logger.info(f"Novo indicador de páginas: {novo_texto}")
-                        
-                        # Verificar se o texto do indicador mudou
-                        if novo_texto != texto_indicador:
-                            logger.info("Indicador de páginas mudou, navegação bem-sucedida")
-                            return True
-                        else:
-                            logger.warning("O indicador de páginas não mudou. Pode não ter navegado corretamente.")
-                    
-                    # Se chegamos aqui, o indicador não mudou ou não foi encontrado
-                    # Vamos verificar a tabela para confirmar que estamos em uma página válida
-                    table_rows = self.driver.find_elements(By.XPATH, "//table//tr")
-                    
-                    if table_rows and len(table_rows) > 1:  # Se tem tabela com pelo menos uma linha além do cabeçalho
-                        # Verificar se parece conteúdo diferente comparando com o primeiro texto da tabela anterior
-                        logger.info("Tabela encontrada com conteúdo. Verificando se é uma nova página...")
-                        
-                        # Por enquanto, confiar que a página mudou se temos uma tabela válida
-                        # Para implementação futura: comparar conteúdo da tabela com a página anterior
-                        logger.info("Tabela encontrada com conteúdo, considerando navegação bem-sucedida")
-                        return True
-                    else:
-                        logger.warning("Tabela não encontrada ou sem conteúdo após navegação")
-                        return False
-                    
-                except NoSuchElementException:
-                    logger.warning("Tabela não encontrada após navegação, possível página em branco ou erro")
-                    return False
-                except Exception as e:
-                    logger.error(f"Erro ao verificar resultado da navegação: {str(e)}")
-                    # Como já clicamos e possivelmente navegamos, vamos retornar True e ver o que acontece na próxima iteração
-                    return True
-            
-            # Se chegamos aqui é porque não conseguimos clicar em nenhum botão ou falhou a navegação
-            logger.warning("Não foi possível navegar para a próxima página após múltiplas tentativas")
-            return False
-            
+                # Verificar se o texto do indicador mudou
+                if novo_texto != contexto["texto_indicador"]:
+                    logger.info("Indicador de páginas mudou, navegação bem-sucedida")
+                    return True, True
+                else:
+                    logger.warning("O indicador de páginas não mudou. Pode não ter navegado corretamente.")
+            
+            # Se chegamos aqui, o indicador não mudou ou não foi encontrado
+            # Vamos verificar a tabela para confirmar que estamos em uma página válida
+            if self.esperas.contagem_linhas() > 1:  # Se tem tabela com pelo menos uma linha além do cabeçalho
+                # Por enquanto, confiar que a página mudou se temos uma tabela válida
+                logger.info("Tabela encontrada com conteúdo, considerando navegação bem-sucedida")
+                return True, mudou
+            else:
+                logger.warning("Tabela não encontrada ou sem conteúdo após navegação")
+                return False, False
+        
+        except NoSuchElementException:
+            logger.warning("Tabela não encontrada após navegação, possível página em branco ou erro")
+            return False, False
         except Exception as e:
-            logger.error(f"Erro ao navegar para próxima página: {str(e)}")
-            return False
+            logger.error(f"Erro ao verificar resultado da navegação: {str(e)}")
+            # Como já clicamos e possivelmente navegamos, vamos retornar True e ver o que acontece na próxima iteração
+            return True, mudou
     
-    def salvar_resultados(self, resultados, prefixo="licencas_ecosistemas"):
+    def _conferir_mudanca(self, contexto, timeout=5):
         """
-        Salva os resultados em Excel e CSV
+        Confere de novo, depois de um clique sem mudança confirmada, se a pesquisa saiu da página
+        de antes: indicador de registros e primeira linha da tabela
+        
+        Returns:
+            bool: True se a página mudou, False se o indicador ainda mostra a página de antes e a
+                tabela não mudou (o clique não teve efeito), ou None se o indicador não pôde ser lido
         """
+        if self.esperas.nova_pagina(contexto["texto_indicador"], contexto["assinatura_anterior"], timeout=timeout):
+            logger.info("A página mudou depois da confirmação da navegação")
+            return True
+        plano = interpretar_indicador(self.esperas.texto_indicador())
+        if not plano:
+            return None
+        return plano.pagina_atual != contexto["pagina_atual"]
+    
+    @cronometrar(SALVAMENTO)
+    def salvar_resultados(self, resultados, prefixo=None):
+        """
+        Salva os resultados em Excel e CSV (prefixo padrão: prefixo_saida)
+        """
+        prefixo = prefixo or self.prefixo_saida
         if not resultados:
             logger.warning("Nenhum resultado para salvar")
             return
@@ -1233,11 +1001,7 @@ class ColetorEcosistemas:
         # Garantir que todos os resultados tenham tipo_de_estudo
         for resultado in resultados:
             if 'tipo_de_estudo' not in resultado:
-                atividade_principal = resultado.get('atividade_principal', '')
-                if any(cod in atividade_principal for cod in ["A-05-02-0", "A-05-03-7", "A-05-04-5", "A-05-05-3"]):
-                    resultado['tipo_de_estudo'] = "EIA/RIMA (inferido pela atividade)"
-                else:
-                    resultado['tipo_de_estudo'] = "A determinar"
+                resultado['tipo_de_estudo'] = tipo_estudo_registro(resultado)
                     
             # Garantir que tenha o campo motivo_estudo
             if 'motivo_estudo' not in resultado:
@@ -1306,22 +1070,7 @@ class ColetorEcosistemas:
         logger.info(f"Resultados salvos em Excel: {excel_path}")
         
         # Contar e logar os tipos de estudo
-        estudos = {"EIA/RIMA": 0, "RCA": 0, "Não identificado": 0, "EIA/RIMA (inferido pela atividade)": 0, "A determinar": 0}
-        for resultado in resultados:
-            tipo_estudo = resultado.get('tipo_de_estudo', 'Não identificado')
-            tipo_base = tipo_estudo.split('(')[0].strip()  # Pegar apenas a parte inicial antes de parênteses
-            
-            # Verificar em qual categoria se encaixa
-            if tipo_base == "EIA/RIMA":
-                estudos["EIA/RIMA"] += 1
-            elif tipo_base == "RCA":
-                estudos["RCA"] += 1
-            elif "inferido pela atividade" in tipo_estudo:
-                estudos["EIA/RIMA (inferido pela atividade)"] += 1
-            elif tipo_estudo == "A determinar":
-                estudos["A determinar"] += 1
-            else:
-                estudos["Não identificado"] += 1
+        estudos = resumo_estudos(resultados)
         
         logger.info("=== RESUMO DOS TIPOS DE ESTUDOS ENCONTRADOS ===")
         for estudo, quantidade in estudos.items():
@@ -1329,31 +1078,452 @@ class ColetorEcosistemas:
                 logger.info(f"- {estudo}: {quantidade}")
         logger.info("============================================")
     
-    def salvar_resultados_incrementais(self, resultados, filename="ecosistemas_resultados_incrementais.csv"):
+    @cronometrar(SALVAMENTO_INCREMENTAL)
+    def salvar_resultados_incrementais(self, resultados, filename=None):
         """
         Salva resultados de forma incremental, para não perder dados em caso de falha
+        
+        O arquivo é mantido aberto por uma SaidaIncremental, que deduplica pelo número do processo
+        e mantém um esquema de colunas estável (arquivo padrão: arquivo_incremental)
+        """
+        filename = filename or self.arquivo_incremental
+        with _lock_incremental:
+            saida = self.saidas_incrementais.get(filename)
+            if saida is None:
+                saida = SaidaIncremental(filename, flush_a_cada=self.flush_incremental, fsync=self.fsync_incremental)
+                self.saidas_incrementais[filename] = saida
+        
+        # Processos já gravados são atualizados em vez de repetidos
+        novos, atualizados = saida.gravar(resultados)
+        logger.info(f"Resultados incrementais em {filename}: {novos} novos, {atualizados} atualizados")
+    
+    def fechar_saidas_incrementais(self):
+        """
+        Grava as pendências e fecha os arquivos incrementais
+        """
+        with _lock_incremental:
+            for saida in self.saidas_incrementais.values():
+                saida.fechar()
+            self.saidas_incrementais = {}
+    
+    def enriquecer_registro(self, resultado, i, contador_paginas):
+        """
+        Acessa a página de detalhes de um registro da tabela e une os dados detalhados
+        
+        Args:
+            resultado (dict): Registro extraído da tabela de resultados
+            i (int): Posição do registro na página (a partir de 0)
+            contador_paginas (int): Número da página atual
+            
+        Returns:
+            dict: Dados da tabela unidos aos dados detalhados
+        """
+        # Página e processo entram no contexto dos logs (também nas threads do pool de detalhes)
+        with contexto_log(pagina=contador_paginas, registro=resultado.get("processo") or f"linha {i + 1}"):
+            return self._enriquecer_registro(resultado, i, contador_paginas)
+    
+    def _enriquecer_registro(self, resultado, i, contador_paginas):
+        # Unir dados básicos da tabela
+        dados_completos = resultado.copy()
+        
+        # Verificar se tem link para detalhes
+        if "link_detalhes" in resultado and resultado["link_detalhes"]:
+            # Verificar se o link é válido
+            link = resultado["link_detalhes"]
+            if not link.startswith("http"):
+                # Tentar construir o link completo (a partir do endereço do portal)
+                base_url = "/".join(self.base_url.split("/")[:3])
+                if link.startswith("/"):
+                    link = f"{base_url}{link}"
+                else:
+                    link = f"{base_url}/{link}"
+                logger.debug("Link ajustado para: %s", link)
+            
+            # Acessar página de detalhes
+            if self.acessar_proximo_registro(link):
+                # Verificar se estamos em uma página válida
+                try:
+                    # Verificar se a página carregou corretamente verificando algum elemento esperado
+                    WebDriverWait(self.driver, 5).until(
+                        EC.visibility_of_element_located((By.TAG_NAME, "table"))
+                    )
+                    
+                    # Extrair dados detalhados
+                    dados_detalhados = self.extrair_dados_detalhados()
+                    
+                    # Unir dados
+                    dados_completos.update(dados_detalhados)
+                    
+                    # Garantir que o tipo de estudo seja incluído
+                    if "Tipo de Estudo" in dados_detalhados:
+                        # Atualizar o campo tipo_de_estudo com o valor detalhado
+                        dados_completos["tipo_de_estudo"] = dados_detalhados["Tipo de Estudo"]
+                    
+                    logger.info(f"Dados detalhados extraídos com sucesso para o registro {i+1}")
+                except (TimeoutException, NoSuchElementException) as e:
+                    logger.warning(f"Página de detalhes inválida ou vazia: {str(e)}")
+                    self.limitador.registrar_falha("página de detalhes sem conteúdo")
+                    # Tirar screenshot da página para análise posterior
+                    self.artefatos.registrar_erro(self.driver, "pagina_invalida")
+                finally:
+                    # Fechar aba de detalhes independentemente do resultado
+                    self.fechar_aba_detalhes()
+            else:
+                logger.warning(f"Não foi possível acessar os detalhes do registro {i+1} na página {contador_paginas}")
+        else:
+            logger.warning(f"O registro {i+1} na página {contador_paginas} não possui link para detalhes")
+            # Garantir que tenha um tipo de estudo mesmo sem acessar detalhes
+            dados_completos["tipo_de_estudo"] = tipo_estudo_registro(dados_completos)
+        
+        return dados_completos
+    
+    @property
+    def tamanho_pagina(self):
+        """Registros por página segundo o plano de paginação (None se desconhecido)"""
+        return self.plano.tamanho_pagina if self.plano else None
+    
+    def plano_paginacao(self):
+        """
+        Lê o indicador "x - y de N Registros" da página atual
+        
+        Returns:
+            PlanoPaginacao: Situação atual da pesquisa, ou None se o indicador não foi encontrado
+        """
+        return interpretar_indicador(self.esperas.texto_indicador(), self.tamanho_pagina)
+    
+    def maximizar_tamanho_pagina(self):
+        """
+        Ajusta a grade de resultados para o maior tamanho de página oferecido pelo portal
+        (select nativo ou componente do paginador), reduzindo o número de páginas da coleta
+        
+        Returns:
+            int: Novo tamanho de página, ou None se não há seletor ou não foi possível alterá-lo
+        """
+        try:
+            texto_anterior = self.esperas.texto_indicador()
+            
+            resultado = self.driver.execute_script(JS_MAIOR_TAMANHO_PAGINA)
+            if not resultado:
+                logger.info("Seletor de tamanho de página não encontrado. Mantendo o tamanho padrão.")
+                return None
+            
+            atual = resultado.get("atual")
+            novo = resultado.get("novo")
+            if resultado.get("tipo") == "componente":
+                # As opções do componente aparecem em um overlay depois do clique
+                escolha = self.esperas.esperar(lambda d: d.execute_script(JS_ESCOLHER_MAIOR_OPCAO),
+                                               timeout=5, descricao="opções de tamanho de página")
+                novo = escolha.valor if escolha else None
+            
+            if not novo:
+                logger.warning("Não foi possível escolher o tamanho de página")
+                return None
+            if novo == atual:
+                logger.info(f"A grade já exibe o maior tamanho de página ({novo} registros)")
+                return novo
+            
+            # A primeira linha continua a mesma; só o indicador ("1 - 100 de N") mostra a troca
+            self.esperas.indicador_mudou(texto_anterior, timeout=10)
+            self.esperas.pagina_ociosa(timeout=5)
+            logger.info(f"Tamanho de página ajustado de {atual} para {novo} registros")
+            self.rede.medir(f"página 1 com {novo} registros")
+            return novo
+        except Exception as e:
+            logger.warning(f"Erro ao ajustar o tamanho de página: {str(e)}")
+            return None
+    
+    def preparar_paginacao(self):
+        """
+        Ajusta o tamanho de página (se habilitado) e planeja a paginação pelo indicador de registros
+        
+        Returns:
+            PlanoPaginacao: Plano da pesquisa, ou None se o indicador não foi encontrado
+        """
+        self.plano = None
+        if self.maximizar_pagina:
+            self.maximizar_tamanho_pagina()
+        
+        self.plano = self.plano_paginacao()
+        if self.plano:
+            logger.info(f"Plano de paginação: {self.plano}")
+        else:
+            logger.warning("Indicador de registros não encontrado. A paginação seguirá até não haver próxima página.")
+        return self.plano
+    
+    def saltar_para_pagina(self, numero_pagina):
+        """
+        Salta direto para a página indicada pelo paginador (campo de página ou botão numerado)
+        ou pelo parâmetro de página da URL, sem passar pelas páginas intermediárias
+        
+        Se o botão da página não estiver visível, clica no maior número visível antes dela
+        e repete a partir dali.
+        
+        Args:
+            numero_pagina (int): Página de destino (a partir de 1)
+            
+        Returns:
+            bool: True se o indicador de registros confirma que a página exibida é a solicitada
+        """
+        if not self.plano:
+            return False
+        
+        esperado = self.plano.primeiro_registro(numero_pagina)
+        pagina_anterior = None
+        for _ in range(self.plano.total_paginas):
+            atual = self.plano_paginacao()
+            if atual and atual.inicio == esperado:
+                return True
+            
+            pagina_atual = atual.pagina_atual if atual else 1
+            if pagina_atual == pagina_anterior:
+                logger.info(f"O salto não avançou além da página {pagina_atual}")
+                return False
+            pagina_anterior = pagina_atual
+            
+            texto_anterior = self.esperas.texto_indicador()
+            assinatura_anterior = self.esperas.assinatura_tabela()
+            try:
+                salto = self.driver.execute_script(JS_IR_PARA_PAGINA, numero_pagina, pagina_atual)
+            except Exception as e:
+                logger.debug(f"Erro ao usar o paginador: {str(e)}")
+                salto = None
+            
+            if not salto:
+                # Estado da paginação na URL (ex: ?pagina=2), quando o portal o expõe
+                url_atual = self.driver.current_url
+                nova_url = url_da_pagina(url_atual, numero_pagina, self.tamanho_pagina)
+                if not nova_url or nova_url == url_atual:
+                    return False
+                self.driver.get(nova_url)
+                salto = {"modo": "url", "pagina": numero_pagina}
+            
+            logger.info(f"Saltando da página {pagina_atual} para a página {salto['pagina']} ({salto['modo']})")
+            if not self.esperas.nova_pagina(texto_anterior, assinatura_anterior, timeout=10):
+                return False
+            self.esperas.pagina_ociosa(timeout=5)
+            
+            novo = self.plano_paginacao()
+            if salto["modo"] == "url" and (not novo or novo.total_registros != self.plano.total_registros):
+                # A URL não preservou o filtro da pesquisa: voltar ao estado anterior
+                logger.warning("A navegação pela URL alterou a pesquisa. Voltando à página anterior.")
+                self.driver.back()
+                self.esperas.pagina_ociosa(timeout=5)
+                return False
+        
+        return False
+    
+    def registrar_resumo_paginacao(self):
+        """Registra no log a taxa de acerto e o tempo médio de cada estratégia de paginação e o tráfego de rede"""
+        for linha in self.estrategias.resumo():
+            logger.info(f"Estratégias de paginação - {linha}")
+        if self.medir_rede:
+            logger.info(self.rede.resumo())
+    
+    def saltar_registrando(self, numero_pagina):
+        """
+        Executa saltar_para_pagina e registra o resultado e o tempo no cache de estratégias
+        
+        Returns:
+            bool: True se chegou à página indicada
+        """
+        if not self.plano:
+            return False
+        preferida = self.estrategias.preferida
+        inicio = time.perf_counter()
+        sucesso = self.saltar_para_pagina(numero_pagina)
+        self.estrategias.registrar(SALTO_DIRETO, None, sucesso, time.perf_counter() - inicio,
+                                   do_cache=bool(preferida and preferida[0] == SALTO_DIRETO))
+        return sucesso
+    
+    def avancar_pagina(self, numero_pagina, max_tentativas=3):
+        """
+        Vai para a próxima página da coleta (ver _avancar_pagina) e registra o tráfego e o
+        tempo de carga da nova página
+        
+        Returns:
+            bool: True se a nova página foi carregada com resultados
+        """
+        self.aguardar_vez()
+        inicio = time.perf_counter()
+        sucesso = self._avancar_pagina(numero_pagina, max_tentativas)
+        if sucesso:
+            self.rede.medir(f"página {numero_pagina} de resultados", time.perf_counter() - inicio)
+            self.limitador.registrar_sucesso(time.perf_counter() - inicio)
+        else:
+            self.limitador.registrar_falha(f"falha ao carregar a página {numero_pagina} de resultados")
+        return sucesso
+    
+    @cronometrar(PAGINACAO)
+    def _avancar_pagina(self, numero_pagina, max_tentativas=3):
+        """
+        Vai para a próxima página da coleta: salto direto pelo paginador e, se não for
+        possível, as estratégias de navegar_proxima_pagina com novas tentativas
+        
+        O salto direto vem primeiro, a menos que outra estratégia esteja em cache ou que ele
+        nunca tenha funcionado neste portal; nesses casos, é tentado depois da primeira falha.
+        
+        Args:
+            numero_pagina (int): Página de destino (a seguinte à atual)
+            max_tentativas (int): Tentativas de navegar_proxima_pagina
+            
+        Returns:
+            bool: True se a nova página foi carregada com resultados
+        """
+        if self.plano and numero_pagina > self.plano.total_paginas:
+            logger.info(f"A página {numero_pagina} está além do total planejado ({self.plano.total_paginas} páginas)")
+            return False
+        
+        preferida = self.estrategias.preferida
+        salto_tentado = False
+        if (not preferida or preferida[0] == SALTO_DIRETO) and not self.estrategias.nunca_funcionou(SALTO_DIRETO):
+            salto_tentado = True
+            if self.saltar_registrando(numero_pagina):
+                logger.info(f"Navegado diretamente para a página {numero_pagina}")
+                return True
+        
+        tem_proxima_pagina = False
+        tentativas = 0
+        while tentativas < max_tentativas and not tem_proxima_pagina:
+            tentativas += 1
+            if tentativas > 1:
+                self.metricas.incrementar(TENTATIVAS, etapa=PAGINACAO)
+            if tentativas > 1 and not salto_tentado:
+                salto_tentado = True
+                if self.saltar_registrando(numero_pagina):
+                    logger.info(f"Navegado diretamente para a página {numero_pagina}")
+                    return True
+            
+            logger.info(f"Tentativa {tentativas} de {max_tentativas} para navegar para a próxima página")
+            
+            tem_proxima_pagina = self.navegar_proxima_pagina()
+            
+            if tem_proxima_pagina:
+                logger.info(f"Navegado com sucesso para a página {numero_pagina}")
+                
+                # Aguardar carregamento completo da nova página
+                try:
+                    # Esperar pela tabela ou mensagem de nenhum resultado
+                    elemento_carregado = WebDriverWait(self.driver, 10).until(
+                        EC.any_of(
+                            EC.presence_of_element_located((By.TAG_NAME, "table")),
+                            EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Nenhum registro encontrado')]"))
+                        )
+                    )
+                    
+                    # Se encontrou mensagem de nenhum registro, considerar fim da paginação
+                    if "Nenhum registro encontrado" in elemento_carregado.text:
+                        logger.info("Página sem resultados encontrada. Finalizando coleta.")
+                        return False
+                except TimeoutException:
+                    logger.warning("Timeout esperando carregamento da nova página. Tentando continuar mesmo assim.")
+            elif tentativas < max_tentativas:
+                logger.warning(f"Falha na tentativa {tentativas}. Aguardando antes de tentar novamente...")
+                self.esperas.pagina_ociosa(timeout=5)  # Aguardar antes de tentar novamente
+        
+        return tem_proxima_pagina
+    
+    @cronometrar(PAGINACAO)
+    def ir_para_pagina(self, numero_pagina):
         """
-        # Criar o arquivo se não existir
-        if not os.path.exists(filename):
-            with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-                if resultados and len(resultados) > 0:
-                    fieldnames = resultados[0].keys()
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-        
-        # Adicionar novos resultados
-        with open(filename, 'a', newline='', encoding='utf-8-sig') as csvfile:
-            if resultados and len(resultados) > 0:
-                fieldnames = resultados[0].keys()
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                for resultado in resultados:
-                    writer.writerow(resultado)
-        
-        logger.info(f"Salvos {len(resultados)} resultados incrementais em {filename}")
+        Leva a pesquisa até a página indicada, sem extrair dados: salto direto quando o
+        paginador permite, ou avanço página a página a partir da página 1
+        
+        Args:
+            numero_pagina (int): Página de destino (a partir de 1)
+            
+        Returns:
+            bool: True se chegou à página indicada
+        """
+        if numero_pagina <= 1:
+            return True
+        if self.plano and numero_pagina > self.plano.total_paginas:
+            logger.info(f"A página {numero_pagina} está além do total planejado ({self.plano.total_paginas} páginas)")
+            return False
+        if self.saltar_registrando(numero_pagina):
+            logger.info(f"Pesquisa posicionada diretamente na página {numero_pagina}")
+            return True
+        
+        for pagina in range(1, numero_pagina):
+            logger.info(f"Avançando da página {pagina} para a página {pagina + 1}")
+            if not self.navegar_proxima_pagina():
+                logger.warning(f"Não foi possível avançar além da página {pagina}")
+                return False
+        return True
     
-    def coletar_dados(self, max_paginas=100):
+    def preparar_retomada(self, checkpoint, retomar=False, max_tentativas=3):
         """
-        Coleta dados do sistema ecosistemas aplicando filtro de Classe 6
+        Prepara o início da coleta a partir do checkpoint
+        
+        Com retomar=True, carrega os registros já coletados e avança até a página seguinte
+        à última concluída. Caso contrário, reinicia o checkpoint do filtro.
+        
+        Args:
+            checkpoint (CheckpointColeta): Progresso da coleta (None começa da página 1)
+            retomar (bool): Se True, continua a partir do checkpoint
+            max_tentativas (int): Tentativas de chegar à página seguinte à última concluída
+        
+        Returns:
+            tuple: (página inicial, resultados já coletados, processos já enriquecidos); a página
+                inicial é None se o plano de paginação mostra que não há páginas além da última
+                concluída
+        
+        Raises:
+            RuntimeError: Se não foi possível chegar à página seguinte à última concluída
+        """
+        if not checkpoint:
+            return 1, [], set()
+        
+        if not retomar:
+            checkpoint.limpar()
+            return 1, [], set()
+        
+        ultima_pagina = checkpoint.ultima_pagina()
+        tamanho_anterior = checkpoint.tamanho_pagina()
+        if tamanho_anterior and self.tamanho_pagina and tamanho_anterior != self.tamanho_pagina:
+            # Páginas concluídas com outro tamanho: recomeçar pela página que contém o primeiro
+            # registro não concluído (os já enriquecidos são ignorados pela chave do processo)
+            ultima_pagina = ultima_pagina * tamanho_anterior // self.tamanho_pagina
+            logger.info(f"Tamanho de página mudou de {tamanho_anterior} para {self.tamanho_pagina} registros; "
+                        f"retomando após a página {ultima_pagina} no novo tamanho")
+        todos_resultados = checkpoint.carregar_resultados()
+        concluidos = checkpoint.processos_concluidos()
+        logger.info(f"Retomando coleta após a página {ultima_pagina} ({len(concluidos)} registros já coletados)")
+        
+        pagina_inicial = ultima_pagina + 1
+        if pagina_inicial == 1:
+            return pagina_inicial, todos_resultados, concluidos
+        if self.plano and pagina_inicial > self.plano.total_paginas:
+            # Não há páginas além da última concluída
+            return None, todos_resultados, concluidos
+        
+        if not self.ir_para_pagina(pagina_inicial):
+            # Falha de clique ou de espera: novas tentativas pelo salto direto, que parte da página
+            # exibida; sem confirmação, a retomada falha em vez de dar a coleta por concluída
+            for tentativa in range(2, max_tentativas + 1):
+                logger.warning(f"Não foi possível chegar à página {pagina_inicial}; tentativa {tentativa} de {max_tentativas}")
+                self.esperas.pagina_ociosa(timeout=5)
+                if self.saltar_registrando(pagina_inicial):
+                    break
+            else:
+                raise RuntimeError(f"Não foi possível retomar a coleta na página {pagina_inicial}")
+        
+        return pagina_inicial, todos_resultados, concluidos
+    
+    def coletar_dados(self, max_paginas=100, num_workers=1, checkpoint=None, retomar=False, conhecidos=None,
+                      filtro=None):
+        """
+        Coleta dados do sistema ecosistemas aplicando o filtro (padrão: Classe 6)
+        
+        Args:
+            max_paginas (int): Número máximo de páginas a processar
+            num_workers (int): Número de navegadores usados em paralelo para as páginas de detalhes
+                (1 mantém o processamento sequencial nesta mesma sessão)
+            checkpoint (CheckpointColeta): Onde registrar o progresso (páginas e registros concluídos)
+            retomar (bool): Se True, continua a partir do checkpoint em vez de começar da página 1
+            conhecidos (ProcessosConhecidos): Modo delta - processos de coletas anteriores. Apenas
+                processos novos ou alterados são enriquecidos e retornados, e a paginação termina
+                na primeira página em que todos os processos já são conhecidos
+            filtro (FiltroPesquisa): Filtro da pesquisa, com no máximo um valor por campo (padrão: Classe 6)
         """
         logger.info("Iniciando coleta de dados do sistema ecosistemas")
         
@@ -1362,21 +1532,37 @@ class ColetorEcosistemas:
             logger.error("Falha ao acessar o site. Encerrando coleta.")
             return []
         
-        # Aplicar filtro de Classe 6
-        if not self.aplicar_filtro_classe_6():
-            logger.error("Falha ao aplicar filtro de Classe 6. Encerrando coleta.")
+        # Aplicar filtro (Classe 6, se não informado)
+        if not self.aplicar_filtro(filtro):
+            logger.error("Falha ao aplicar o filtro. Encerrando coleta.")
             return []
         
-        todos_resultados = []
-        contador_paginas = 1
+        # Maior tamanho de página e número exato de páginas pelo indicador de registros
+        if self.preparar_paginacao() and self.plano.total_paginas < max_paginas:
+            max_paginas = self.plano.total_paginas
+        
+        contador_paginas, todos_resultados, concluidos = self.preparar_retomada(checkpoint, retomar)
+        if contador_paginas is None:
+            logger.info("Todas as páginas já foram coletadas segundo o checkpoint.")
+            self.salvar_resultados(todos_resultados)
+            return todos_resultados
+        
+        pool = None
+        if num_workers > 1:
+            from pool_detalhes import PoolDetalhes
+            pool = PoolDetalhes(num_workers=num_workers, modo_headless=self.modo_headless,
+                                parser_html=self.parser_html, artefatos=self.artefatos,
+                                perfil_navegador=self.perfil_navegador, limitador=self.limitador,
+                                metricas=self.metricas, gravador=self.gravador, base_url=self.base_url)
         
         try:
             # Loop de paginação
             while contador_paginas <= max_paginas:
+                definir_contexto(pagina=contador_paginas)
                 logger.info(f"Processando página {contador_paginas} de até {max_paginas}")
                 
                 # Extrair dados da tabela
-                resultados_tabela = self.extrair_dados_tabela()
+                resultados_tabela = self.extrair_dados_tabela(contador_paginas)
                 
                 if not resultados_tabela or len(resultados_tabela) == 0:
                     logger.warning(f"Nenhum resultado encontrado na página {contador_paginas}. Encerrando coleta.")
@@ -1384,121 +1570,66 @@ class ColetorEcosistemas:
                 
                 logger.info(f"Encontrados {len(resultados_tabela)} registros na página {contador_paginas}")
                 
+                # Ignorar registros já enriquecidos em uma execução anterior
+                pagina = contador_paginas
+                pendentes = [
+                    (i, resultado) for i, resultado in enumerate(resultados_tabela)
+                    if chave_registro(resultado, pagina, i) not in concluidos
+                ]
+                if len(pendentes) < len(resultados_tabela):
+                    logger.info(f"{len(resultados_tabela) - len(pendentes)} registros da página {pagina} já coletados anteriormente")
+                
+                # Modo delta: enriquecer apenas processos novos ou alterados
+                pagina_conhecida = False
+                if conhecidos is not None:
+                    situacoes = [conhecidos.situacao(resultado) for resultado in resultados_tabela]
+                    pagina_conhecida = conhecidos.pagina_conhecida(resultados_tabela, situacoes)
+                    pendentes = [(i, resultado) for i, resultado in pendentes if situacoes[i] != CONHECIDO]
+                    logger.info(f"Modo delta: {situacoes.count(NOVO)} novos, {situacoes.count(ALTERADO)} alterados, "
+                                f"{situacoes.count(CONHECIDO)} conhecidos na página {pagina}")
+                
+                def registrar(dados_completos, i):
+                    # Salvar de forma incremental e no checkpoint a cada registro
+                    self.metricas.incrementar(REGISTROS)
+                    self.salvar_resultados_incrementais([dados_completos])
+                    if checkpoint:
+                        checkpoint.registrar_registro(chave_registro(dados_completos, pagina, i), pagina, dados_completos)
+                
                 # Para cada registro, acessar detalhes
                 resultados_pagina = []
-                for i, resultado in enumerate(resultados_tabela):
-                    logger.info(f"Processando registro {i+1} de {len(resultados_tabela)} na página {contador_paginas}")
-                    
-                    # Unir dados básicos da tabela
-                    dados_completos = resultado.copy()
-                    
-                    # Verificar se tem link para detalhes
-                    if "link_detalhes" in resultado and resultado["link_detalhes"]:
-                        # Verificar se o link é válido
-                        link = resultado["link_detalhes"]
-                        if not link.startswith("http"):
-                            # Tentar construir o link completo
-                            base_url = "https://ecosistemas.meioambiente.mg.gov.br"
-                            if link.startswith("/"):
-                                link = f"{base_url}{link}"
-                            else:
-                                link = f"{base_url}/{link}"
-                            logger.info(f"Link ajustado para: {link}")
+                if pool:
+                    # Workers em paralelo; o salvamento incremental segue a ordem da tabela
+                    posicoes = iter([i for i, _ in pendentes])
+                    resultados_pagina = pool.processar(
+                        [resultado for _, resultado in pendentes], contador_paginas,
+                        ao_concluir=lambda dados: registrar(dados, next(posicoes))
+                    )
+                else:
+                    for i, resultado in pendentes:
+                        logger.debug("Processando registro %d de %d na página %d", i + 1, len(resultados_tabela),
+                                     contador_paginas)
                         
-                        # Acessar página de detalhes
-                        if self.acessar_proximo_registro(link):
-                            # Verificar se estamos em uma página válida
-                            try:
-                                # Verificar se a página carregou corretamente verificando algum elemento esperado
-                                WebDriverWait(self.driver, 5).until(
-                                    EC.visibility_of_element_located((By.TAG_NAME, "table"))
-                                )
-                                
-                                # Extrair dados detalhados
-                                dados_detalhados = self.extrair_dados_detalhados()
-                                
-                                # Unir dados
-                                dados_completos.update(dados_detalhados)
-                                
-                                # Garantir que o tipo de estudo seja incluído
-                                if "Tipo de Estudo" in dados_detalhados:
-                                    # Atualizar o campo tipo_de_estudo com o valor detalhado
-                                    dados_completos["tipo_de_estudo"] = dados_detalhados["Tipo de Estudo"]
-                                
-                                logger.info(f"Dados detalhados extraídos com sucesso para o registro {i+1}")
-                            except (TimeoutException, NoSuchElementException) as e:
-                                logger.warning(f"Página de detalhes inválida ou vazia: {str(e)}")
-                                # Tirar screenshot da página para análise posterior
-                                screenshot_path = f"pagina_invalida_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-                                self.driver.save_screenshot(screenshot_path)
-                                logger.info(f"Screenshot da página inválida salvo em {screenshot_path}")
-                            finally:
-                                # Fechar aba de detalhes independentemente do resultado
-                                self.fechar_aba_detalhes()
-                        else:
-                            logger.warning(f"Não foi possível acessar os detalhes do registro {i+1} na página {contador_paginas}")
-                    else:
-                        logger.warning(f"O registro {i+1} na página {contador_paginas} não possui link para detalhes")
-                        # Garantir que tenha um tipo de estudo mesmo sem acessar detalhes
-                        if "tipo_de_estudo" not in dados_completos or dados_completos["tipo_de_estudo"] == "A determinar":
-                            atividade_principal = dados_completos.get("atividade_principal", "")
-                            if any(cod in atividade_principal for cod in ["A-05-02-0", "A-05-03-7", "A-05-04-5", "A-05-05-3"]):
-                                dados_completos["tipo_de_estudo"] = "EIA/RIMA (inferido pela atividade)"
-                            else:
-                                dados_completos["tipo_de_estudo"] = "A determinar"
-                    
-                    resultados_pagina.append(dados_completos)
-                    
-                    # Salvar de forma incremental a cada registro
-                    self.salvar_resultados_incrementais([dados_completos])
-                    
-                    # Pausa entre registros
-                    time.sleep(1)
+                        dados_completos = self.enriquecer_registro(resultado, i, contador_paginas)
+                        
+                        resultados_pagina.append(dados_completos)
+                        registrar(dados_completos, i)
                 
                 # Adicionar resultados da página aos resultados totais
                 todos_resultados.extend(resultados_pagina)
+                if checkpoint:
+                    checkpoint.registrar_pagina(contador_paginas, self.tamanho_pagina)
                 
-                # Verificar se já atingimos o limite máximo de registros para coletar
-                if len(todos_resultados) >= 137:
-                    logger.info(f"Atingido limite máximo de 137 registros. Finalizando coleta.")
+                if pagina_conhecida:
+                    logger.info(f"Todos os processos da página {contador_paginas} já são conhecidos. Finalizando coleta delta.")
                     break
                 
-                # Tentar navegar para a próxima página com mais tentativas
-                tentativas = 0
-                max_tentativas = 3
-                tem_proxima_pagina = False
+                # Verificar se a página planejada pelo indicador de registros foi a última
+                if self.plano and contador_paginas >= self.plano.total_paginas:
+                    logger.info(f"Última página planejada ({self.plano.total_paginas}) processada. Finalizando coleta.")
+                    break
                 
-                while tentativas < max_tentativas and not tem_proxima_pagina:
-                    tentativas += 1
-                    logger.info(f"Tentativa {tentativas} de {max_tentativas} para navegar para a próxima página")
-                    
-                    tem_proxima_pagina = self.navegar_proxima_pagina()
-                    
-                    if tem_proxima_pagina:
-                        logger.info(f"Navegado com sucesso para a página {contador_paginas + 1}")
-                        
-                        # Aguardar carregamento completo da nova página
-                        try:
-                            # Esperar pela tabela ou mensagem de nenhum resultado
-                            elemento_carregado = WebDriverWait(self.driver, 10).until(
-                                EC.any_of(
-                                    EC.presence_of_element_located((By.TAG_NAME, "table")),
-                                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Nenhum registro encontrado')]"))
-                                )
-                            )
-                            
-                            # Se encontrou mensagem de nenhum registro, considerar fim da paginação
-                            if "Nenhum registro encontrado" in elemento_carregado.text:
-                                logger.info("Página sem resultados encontrada. Finalizando coleta.")
-                                tem_proxima_pagina = False
-                                break
-                        except TimeoutException:
-                            logger.warning("Timeout esperando carregamento da nova página. Tentando continuar mesmo assim.")
-                        
-                        break
-                    elif tentativas < max_tentativas:
-                        logger.warning(f"Falha na tentativa {tentativas}. Aguardando antes de tentar novamente...")
-                        time.sleep(3)  # Aguardar antes de tentar novamente
+                # Navegar para a próxima página (salto direto ou estratégias com novas tentativas)
+                tem_proxima_pagina = self.avancar_pagina(contador_paginas + 1)
                 
                 if not tem_proxima_pagina:
                     logger.info("Chegou à última página ou falhou em navegar. Finalizando coleta.")
@@ -1506,12 +1637,20 @@ class ColetorEcosistemas:
                 
                 contador_paginas += 1
 
-                # Pausa entre páginas para garantir carregamento
-                time.sleep(5)
+                # Aguardar requisições pendentes da nova página
+                self.esperas.pagina_ociosa()
         except Exception as e:
             logger.error(f"Erro durante a coleta: {str(e)}")
             logger.error(traceback.format_exc())  # Registrar o traceback completo
+            self.artefatos.registrar_erro(self.driver, "erro_coleta")
         finally:
+            # Encerrar os workers de detalhes
+            if pool:
+                pool.fechar()
+            
+            self.fechar_saidas_incrementais()
+            self.artefatos.fechar()
+            
             # Salvar todos os resultados
             self.salvar_resultados(todos_resultados)
             
@@ -1522,19 +1661,26 @@ class ColetorEcosistemas:
             except:
                 pass
         
+        definir_contexto(pagina=None)
+        self.registrar_resumo_paginacao()
+        logger.info(self.limitador.resumo())
+        if self.gravador:
+            logger.info(self.gravador.resumo())
         logger.info(f"Coleta concluída. Total de {len(todos_resultados)} registros coletados.")
         return todos_resultados
 
 if __name__ == "__main__":
     # Configurações
     MAX_PAGINAS = 20  # Limite de páginas a serem processadas
+    configurar_logs(arquivo=f"ecosistemas_coleta_{datetime.now().strftime('%Y%m%d_%H%M')}.log")
     
     logger.info("=" * 50)
     logger.info("INICIANDO COLETA DE LICENÇAS AMBIENTAIS - ECOSISTEMAS")
     logger.info("=" * 50)
     
     coletor = ColetorEcosistemas()
-    resultados = coletor.coletar_dados(max_paginas=MAX_PAGINAS)
+    resultados = coletor.coletar_dados(max_paginas=MAX_PAGINAS, checkpoint=CheckpointColeta())
+    coletor.metricas.registrar_resumo()
     
     logger.info("=" * 50)
     logger.info(f"COLETA FINALIZADA: {len(resultados)} REGISTROS")
@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Coletor HTTP do sistema Ecosistemas MG.
+Consulta diretamente os endpoints JSON usados pela página de acesso de visitante
+(/sla/#/acesso-visitante), sem abrir um navegador.
+
+Os registros retornados têm o mesmo formato de ColetorEcosistemas.extrair_dados_tabela
+e ColetorEcosistemas.extrair_dados_detalhados.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from classificacao_estudos import identificar_tipo_estudo, tipo_estudo_registro
+from filtros import FiltroPesquisa
+from logs_estruturados import contexto_log, definir_contexto
+from metricas import MetricasColeta, ESPERA_TAXA, TABELA, NAVEGACAO_DETALHES, PARSE_DETALHES, REGISTROS, TENTATIVAS
+from processos_conhecidos import CONHECIDO
+
+logger = logging.getLogger("coletor_ecosistemas.http")
+
+# Respostas de limite de taxa ou de erro do servidor: repetidas pelo coletor depois de passar
+# pelo limitador de taxa (e não pela sessão). Um 429 reduz a taxa na hora; um erro 5xx só a reduz
+# se as novas tentativas também falharem
+STATUS_NOVA_TENTATIVA = (429, 500, 502, 503, 504)
+STATUS_LIMITE_TAXA = 429
+# Espera antes da primeira nova tentativa, em segundos (dobra a cada tentativa)
+ESPERA_NOVA_TENTATIVA = 0.5
+
+# Campos da tabela de resultados e os nomes correspondentes no JSON da API
+# (o primeiro nome encontrado no registro é usado)
+CAMPOS_TABELA = {
+    "processo": ["numeroProcesso", "processo", "numero"],
+    "pessoa_física/jurídica": ["pessoaFisicaJuridica", "nomeRazaoSocial", "requerente"],
+    "empreendimento": ["empreendimento", "nomeEmpreendimento"],
+    "modalidade": ["modalidade", "modalidadeLicenciamento"],
+    "cpf/cnpj": ["cpfCnpj", "documento"],
+    "atividade_principal": ["atividadePrincipal", "atividade"],
+    "município_da_solicitação": ["municipio", "municipioSolicitacao"],
+}
+
+# Rótulos da página de detalhes e os nomes correspondentes no JSON da API
+CAMPOS_DETALHE = {
+    "CPF/CNPJ": ["cpfCnpj", "documento"],
+    "Pessoa Física/Jurídica": ["pessoaFisicaJuridica", "nomeRazaoSocial", "requerente"],
+    "Nome Fantasia": ["nomeFantasia"],
+    "Empreendimento": ["empreendimento", "nomeEmpreendimento"],
+    "Município da Solicitação": ["municipio", "municipioSolicitacao"],
+    "Número do Processo": ["numeroProcesso", "processo", "numero"],
+    "Classe predominante": ["classePredominante", "classe"],
+    "Fator locacional": ["fatorLocacional"],
+    "Modalidade licenciamento": ["modalidade", "modalidadeLicenciamento"],
+    "Fase do licenciamento": ["faseLicenciamento", "fase"],
+    "Tipo solicitação": ["tipoSolicitacao"],
+    "Atividade Principal": ["atividadePrincipal", "atividade"],
+}
+
+
+def _obter_campo(registro, nomes):
+    """Retorna o primeiro valor não vazio entre os nomes possíveis de um campo"""
+    for nome in nomes:
+        valor = registro.get(nome)
+        if valor not in (None, ""):
+            return str(valor).strip()
+    return ""
+
+
+class ColetorEcosistemasHTTP:
+    # Rotas da API consultada pela página de acesso de visitante
+    ENDPOINT_PESQUISA = "/sla/api/acesso-visitante/processos"
+    ENDPOINT_DETALHE = "/sla/api/acesso-visitante/processos/{id}"
+
+    def __init__(self, base_url="https://ecosistemas.meioambiente.mg.gov.br", tamanho_pagina=100,
+                 timeout=30, max_conexoes=8, max_tentativas=3, limitador=None,
+                 metricas=None):
+        """
+        Inicializa o coletor HTTP
+
+        Args:
+            base_url (str): Endereço do portal (ou de um portal simulado local)
+            tamanho_pagina (int): Quantidade de registros solicitados por página
+            timeout (int): Tempo máximo, em segundos, de cada requisição
+            max_conexoes (int): Tamanho do pool de conexões e de consultas simultâneas de detalhes
+            max_tentativas (int): Número de novas tentativas em falhas de conexão e em respostas 429 ou 5xx
+            limitador (LimitadorTaxa): Limitador de taxa compartilhado pelas consultas simultâneas
+                (None não limita as requisições); a rajada do limitador é ampliada para max_conexoes
+            metricas (MetricasColeta): Onde registrar a duração das consultas e a contagem de registros
+        """
+        self.base_url = base_url.rstrip("/")
+        self.tamanho_pagina = tamanho_pagina
+        self.timeout = timeout
+        self.max_conexoes = max_conexoes
+        self.max_tentativas = max_tentativas
+        self.limitador = limitador
+        if limitador is not None:
+            limitador.ampliar_capacidade(max_conexoes)
+        self.metricas = metricas or MetricasColeta()
+        self.setup_sessao()
+
+    def setup_sessao(self):
+        """
+        Configura a sessão HTTP com keep-alive, pool de conexões e novas tentativas em falhas de
+        conexão e de leitura (respostas 429 e 5xx são repetidas em _get_json)
+        """
+        self.sessao = requests.Session()
+        self.sessao.headers.update({
+            "Accept": "application/json",
+            "User-Agent": "Mozilla/5.0 (coletor-licencas-ambientais)",
+        })
+
+        retry = Retry(
+            total=self.max_tentativas,
+            backoff_factor=0.5,
+            allowed_methods=frozenset(["GET"])
+        )
+        adaptador = HTTPAdapter(pool_connections=self.max_conexoes, pool_maxsize=self.max_conexoes, max_retries=retry)
+        self.sessao.mount("http://", adaptador)
+        self.sessao.mount("https://", adaptador)
+
+        logger.info(f"Sessão HTTP configurada para {self.base_url}")
+
+    def _get_json(self, url, params=None, etapa=None):
+        """
+        Consulta um endpoint JSON, com novas tentativas em respostas 429 e 5xx
+
+        Args:
+            url (str): Endereço consultado
+            params (dict): Parâmetros da consulta
+            etapa (str): Etapa das métricas em que cada requisição é cronometrada (a espera pelo
+                limitador de taxa é cronometrada à parte, em ESPERA_TAXA)
+
+        Returns:
+            Resposta JSON decodificada
+        """
+        tentativa = 0
+        while True:
+            if self.limitador is not None:
+                with self.metricas.medir(ESPERA_TAXA):
+                    self.limitador.aguardar()
+            inicio = time.perf_counter()
+            try:
+                with self.metricas.medir(etapa) if etapa else nullcontext():
+                    dados = self._requisitar(url, params)
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                repetir = status in STATUS_NOVA_TENTATIVA and tentativa < self.max_tentativas
+                if self.limitador is not None and (status == STATUS_LIMITE_TAXA or not repetir):
+                    self.limitador.registrar_falha(f"GET {url}: {e}")
+                if not repetir:
+                    raise
+                tentativa += 1
+                self.metricas.incrementar(TENTATIVAS, status=str(status))
+                logger.debug("Resposta %s em %s; nova tentativa %d de %d", status, url, tentativa,
+                             self.max_tentativas)
+                time.sleep(ESPERA_NOVA_TENTATIVA * 2 ** (tentativa - 1))
+                continue
+            except Exception as e:
+                # Timeouts e falhas de conexão (já repetidas pela sessão) reduzem a taxa
+                if self.limitador is not None:
+                    self.limitador.registrar_falha(f"GET {url}: {e}")
+                raise
+            if self.limitador is not None:
+                self.limitador.registrar_sucesso(time.perf_counter() - inicio)
+            return dados
+
+    def _requisitar(self, url, params=None):
+        resposta = self.sessao.get(url, params=params, timeout=self.timeout)
+        resposta.raise_for_status()
+        return resposta.json()
+
+    def pesquisar(self, classe=6, pagina=0, filtro=None):
+        """
+        Consulta uma página da pesquisa de processos
+
+        Args:
+            classe (int): Classe predominante usada como filtro
+            pagina (int): Índice da página (começando em 0)
+            filtro (FiltroPesquisa): Filtro completo da pesquisa; se informado, substitui classe
+
+        Returns:
+            tuple: (lista de registros JSON, total de registros)
+        """
+        parametros = filtro.parametros_api() if filtro is not None else {"classe": classe}
+        parametros.update({"pagina": pagina, "tamanho": self.tamanho_pagina})
+        dados = self._get_json(f"{self.base_url}{self.ENDPOINT_PESQUISA}", params=parametros, etapa=TABELA)
+
+        if isinstance(dados, list):
+            return dados, len(dados)
+
+        registros = dados.get("content") or dados.get("conteudo") or dados.get("registros") or []
+        total = dados.get("totalElements", dados.get("total", len(registros)))
+        return registros, int(total)
+
+    def converter_registro_tabela(self, registro):
+        """
+        Converte um registro JSON da pesquisa para o formato de extrair_dados_tabela
+        """
+        resultado = {chave: _obter_campo(registro, nomes) for chave, nomes in CAMPOS_TABELA.items()}
+        resultado["ações"] = ""
+
+        identificador = registro.get("id")
+        if identificador is not None:
+            resultado["link_detalhes"] = f"{self.base_url}{self.ENDPOINT_DETALHE.format(id=identificador)}"
+
+        # Tipo de estudo pela atividade principal, até a consulta ao detalhe
+        resultado["tipo_de_estudo"] = tipo_estudo_registro(resultado)
+
+        return resultado
+
+    def extrair_dados_tabela(self, pagina=0, classe=6, filtro=None):
+        """
+        Extrai os registros de uma página da pesquisa
+
+        Returns:
+            list: Registros no mesmo formato de ColetorEcosistemas.extrair_dados_tabela
+        """
+        try:
+            registros, _ = self.pesquisar(classe, pagina, filtro)
+            resultados = [self.converter_registro_tabela(registro) for registro in registros]
+            logger.info(f"Total de {len(resultados)} resultados extraídos da página {pagina + 1}")
+            return resultados
+        except Exception as e:
+            logger.error(f"Erro ao extrair dados da página {pagina + 1}: {str(e)}")
+            return []
+
+    def extrair_dados_detalhados(self, link_detalhes):
+        """
+        Extrai os dados detalhados de um processo a partir do endpoint de detalhe
+
+        Args:
+            link_detalhes (str): URL do detalhe (campo link_detalhes do registro da tabela)
+
+        Returns:
+            dict: Dados no mesmo formato de ColetorEcosistemas.extrair_dados_detalhados
+        """
+        try:
+            registro = self._get_json(link_detalhes, etapa=NAVEGACAO_DETALHES)
+
+            with self.metricas.medir(PARSE_DETALHES):
+                return self._converter_detalhe(registro)
+        except Exception as e:
+            logger.error(f"Erro ao extrair dados detalhados de {link_detalhes}: {str(e)}")
+            return {"Tipo de Estudo": "Erro ao identificar"}
+
+    def _converter_detalhe(self, registro):
+        """Converte o JSON do endpoint de detalhe para os rótulos da página de detalhes"""
+        dados_detalhados = {}
+        for label, nomes in CAMPOS_DETALHE.items():
+            valor = _obter_campo(registro, nomes)
+            if valor:
+                dados_detalhados[label] = valor
+
+        documentos = []
+        links_documentos = []
+        for documento in registro.get("documentos") or []:
+            nome = (documento.get("nome") or documento.get("descricao") or "").strip()
+            url = documento.get("url") or documento.get("link") or ""
+            if nome and url:
+                documentos.append(nome)
+                links_documentos.append(url if url.startswith("http") else f"{self.base_url}{url}")
+
+        dados_detalhados["Documentos"] = documentos
+        dados_detalhados["Links_Documentos"] = links_documentos
+
+        tipo_estudo, motivo_estudo = identificar_tipo_estudo(
+            documentos,
+            " ".join(str(valor) for valor in dados_detalhados.values() if isinstance(valor, str)),
+            dados_detalhados.get("Atividade Principal", ""),
+            dados_detalhados.get("Classe predominante", "")
+        )
+        dados_detalhados["Tipo de Estudo"] = tipo_estudo
+        dados_detalhados["motivo_estudo"] = motivo_estudo
+
+        return dados_detalhados
+
+    def enriquecer_registro(self, resultado):
+        """Une ao registro da tabela os dados do endpoint de detalhe"""
+        dados_completos = resultado.copy()
+        if resultado.get("link_detalhes"):
+            with contexto_log(registro=resultado.get("processo") or resultado["link_detalhes"]):
+                dados_detalhados = self.extrair_dados_detalhados(resultado["link_detalhes"])
+            dados_completos.update(dados_detalhados)
+            if "Tipo de Estudo" in dados_detalhados:
+                dados_completos["tipo_de_estudo"] = dados_detalhados["Tipo de Estudo"]
+        return dados_completos
+
+    def coletar_dados(self, max_paginas=100, classe=6, detalhar=True, conhecidos=None, filtro=None):
+        """
+        Coleta todos os processos da classe (ou do filtro) informada, com os detalhes de cada um
+
+        Args:
+            max_paginas (int): Número máximo de páginas consultadas
+            classe (int): Classe predominante usada como filtro
+            filtro (FiltroPesquisa): Filtro completo da pesquisa; se informado, substitui classe
+            detalhar (bool): Se True, consulta o endpoint de detalhe de cada processo
+            conhecidos (ProcessosConhecidos): Modo delta - retorna apenas processos novos ou alterados
+                e termina na primeira página em que todos já são conhecidos
+
+        Returns:
+            list: Registros coletados, na ordem da pesquisa
+        """
+        filtro = filtro if filtro is not None else FiltroPesquisa(classes=(classe,))
+        logger.info(f"Iniciando coleta HTTP: {filtro.descrever()}")
+        inicio = time.perf_counter()
+        todos_resultados = []
+
+        try:
+            registros, total = self.pesquisar(pagina=0, filtro=filtro)
+            total_paginas = min(max_paginas, max(1, -(-total // self.tamanho_pagina)))
+            logger.info(f"{total} registros encontrados em {total_paginas} páginas de até {self.tamanho_pagina}")
+
+            with ThreadPoolExecutor(max_workers=self.max_conexoes) as executor:
+                for pagina in range(total_paginas):
+                    definir_contexto(pagina=pagina + 1)
+                    if pagina > 0:
+                        registros, _ = self.pesquisar(pagina=pagina, filtro=filtro)
+                    if not registros:
+                        logger.warning(f"Nenhum resultado encontrado na página {pagina + 1}. Encerrando coleta.")
+                        break
+
+                    resultados_pagina = [self.converter_registro_tabela(registro) for registro in registros]
+                    pagina_conhecida = False
+                    if conhecidos is not None:
+                        situacoes = [conhecidos.situacao(resultado) for resultado in resultados_pagina]
+                        pagina_conhecida = conhecidos.pagina_conhecida(resultados_pagina, situacoes)
+                        resultados_pagina = [r for r, situacao in zip(resultados_pagina, situacoes) if situacao != CONHECIDO]
+                    
+                    if detalhar:
+                        # map preserva a ordem da tabela
+                        resultados_pagina = list(executor.map(self.enriquecer_registro, resultados_pagina))
+
+                    todos_resultados.extend(resultados_pagina)
+                    self.metricas.incrementar(REGISTROS, len(resultados_pagina))
+                    logger.info(f"Página {pagina + 1} de {total_paginas}: {len(resultados_pagina)} registros")
+                    
+                    if pagina_conhecida:
+                        logger.info(f"Todos os processos da página {pagina + 1} já são conhecidos. Finalizando coleta delta.")
+                        break
+        except Exception as e:
+            logger.error(f"Erro durante a coleta HTTP: {str(e)}")
+        definir_contexto(pagina=None)
+
+        if self.limitador is not None:
+            logger.info(self.limitador.resumo())
+        logger.info(f"Coleta HTTP concluída. {len(todos_resultados)} registros em {time.perf_counter() - inicio:.2f}s")
+        return todos_resultados
+
+    def fechar(self):
+        """Encerra a sessão HTTP e libera as conexões do pool"""
+        self.sessao.close()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Esperas orientadas a eventos para o coletor Ecosistemas.
+Substitui pausas fixas (time.sleep) por esperas que terminam assim que a página sinaliza
+que está pronta: tabela carregada, indicador de registros atualizado, Angular/XHR ociosos.
+"""
+
+import logging
+import re
+import time
+
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger("coletor_ecosistemas.esperas")
+
+# Instala um contador de requisições XHR/fetch pendentes na página (idempotente)
+JS_INSTALAR_MONITOR_XHR = """
+if (!window.__coletorXhr) {
+    window.__coletorXhr = {pendentes: 0};
+    const enviar = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        window.__coletorXhr.pendentes++;
+        this.addEventListener('loadend', function() { window.__coletorXhr.pendentes--; });
+        return enviar.apply(this, arguments);
+    };
+    if (window.fetch) {
+        const buscar = window.fetch;
+        window.fetch = function() {
+            window.__coletorXhr.pendentes++;
+            return buscar.apply(this, arguments).finally(function() { window.__coletorXhr.pendentes--; });
+        };
+    }
+}
+return true;
+"""
+
+# Verdadeiro quando o documento terminou de carregar, o Angular está estável e não há XHR pendente
+JS_PAGINA_OCIOSA = """
+if (document.readyState !== 'complete') return false;
+if (window.__coletorXhr && window.__coletorXhr.pendentes > 0) return false;
+if (window.getAllAngularTestabilities) {
+    const testabilidades = window.getAllAngularTestabilities();
+    if (!testabilidades.every(function(t) { return t.isStable(); })) return false;
+}
+return true;
+"""
+
+# Hash do texto visível da página, usado para detectar troca de conteúdo em rotas do Angular
+JS_ASSINATURA_CONTEUDO = """
+const texto = document.body ? document.body.innerText : '';
+let hash = 0;
+for (let i = 0; i < texto.length; i++) {
+    hash = ((hash << 5) - hash + texto.charCodeAt(i)) | 0;
+}
+return texto.length + ':' + hash;
+"""
+
+PADRAO_INDICADOR = re.compile(r'(\d+)\s*-\s*(\d+)\s*de\s*(\d+)')
+
+
+class ResultadoEspera:
+    """Resultado de uma espera: se a condição foi atendida, o valor retornado e o tempo gasto"""
+
+    def __init__(self, sucesso, tempo, descricao, valor=None):
+        self.sucesso = sucesso
+        self.tempo = tempo
+        self.descricao = descricao
+        self.valor = valor
+
+    def __bool__(self):
+        return self.sucesso
+
+    def __repr__(self):
+        return f"ResultadoEspera({self.descricao!r}, sucesso={self.sucesso}, tempo={self.tempo:.2f}s)"
+
+
+class MotorEspera:
+    def __init__(self, driver, timeout_padrao=15, intervalo=0.1):
+        """
+        Inicializa o motor de esperas
+
+        Args:
+            driver: WebDriver do Selenium
+            timeout_padrao (float): Tempo máximo de espera, em segundos, quando não informado
+            intervalo (float): Intervalo entre verificações da condição, em segundos
+        """
+        self.driver = driver
+        self.timeout_padrao = timeout_padrao
+        self.intervalo = intervalo
+
+    def esperar(self, condicao, timeout=None, descricao="condição"):
+        """
+        Aguarda até que a condição retorne um valor verdadeiro ou o tempo se esgote
+
+        Args:
+            condicao (callable): Função que recebe o driver e retorna um valor verdadeiro quando pronta
+            timeout (float): Tempo máximo de espera em segundos
+            descricao (str): Descrição usada nos logs
+
+        Returns:
+            ResultadoEspera: Indica sucesso, valor retornado pela condição e tempo efetivamente aguardado
+        """
+        timeout = self.timeout_padrao if timeout is None else timeout
+        inicio = time.perf_counter()
+        try:
+            valor = WebDriverWait(
+                self.driver, timeout, poll_frequency=self.intervalo,
+                ignored_exceptions=(StaleElementReferenceException,)
+            ).until(condicao)
+            resultado = ResultadoEspera(True, time.perf_counter() - inicio, descricao, valor)
+            logger.debug("Espera por %s concluída em %.2fs", descricao, resultado.tempo)
+        except TimeoutException:
+            resultado = ResultadoEspera(False, time.perf_counter() - inicio, descricao)
+            logger.warning(f"Tempo esgotado ({timeout}s) aguardando {descricao}")
+        return resultado
+
+    # Sinais de prontidão
+
+    def instalar_monitor_xhr(self):
+        """Instala na página o contador de requisições XHR/fetch pendentes"""
+        try:
+            self.driver.execute_script(JS_INSTALAR_MONITOR_XHR)
+        except WebDriverException as e:
+            logger.debug(f"Não foi possível instalar o monitor de XHR: {str(e)}")
+
+    def pagina_ociosa(self, timeout=None):
+        """Aguarda o documento carregado, o Angular estável e nenhum XHR pendente"""
+        self.instalar_monitor_xhr()
+        return self.esperar(lambda d: d.execute_script(JS_PAGINA_OCIOSA), timeout, "página ociosa (Angular/XHR)")
+
+    def elemento_presente(self, by, seletor, timeout=None, descricao=None):
+        """Aguarda um elemento existir e o retorna em ResultadoEspera.valor"""
+        def condicao(driver):
+            elementos = driver.find_elements(by, seletor)
+            return elementos[0] if elementos else False
+        return self.esperar(condicao, timeout, descricao or f"elemento {seletor}")
+
+    def resultados_pesquisa(self, timeout=None):
+        """Aguarda a tabela de resultados com linhas ou a mensagem de nenhum resultado"""
+        def condicao(driver):
+            if self.contagem_linhas() > 1:
+                return "tabela"
+            if driver.find_elements(By.XPATH, "//*[contains(text(), 'Nenhum resultado') or contains(text(), 'Nenhum registro encontrado')]"):
+                return "vazio"
+            return False
+        return self.esperar(condicao, timeout, "resultados da pesquisa")
+
+    def contagem_linhas(self):
+        """Retorna o número atual de linhas da tabela de resultados"""
+        return len(self.driver.find_elements(By.XPATH, "//table//tr"))
+
+    def texto_indicador(self):
+        """Retorna o texto do indicador "x - y de N Registros" (ou string vazia)"""
+        for elemento in self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Registros')]"):
+            try:
+                texto = elemento.text.strip()
+            except StaleElementReferenceException:
+                continue
+            if PADRAO_INDICADOR.search(texto):
+                return texto
+        return ""
+
+    def indicador_mudou(self, texto_anterior, timeout=None):
+        """
+        Aguarda o indicador "x - y de N Registros" mudar em relação ao texto anterior (ex: troca do
+        tamanho de página, em que a primeira linha da tabela continua a mesma)
+        """
+        def condicao(driver):
+            texto = self.texto_indicador()
+            return texto if texto and texto != texto_anterior else False
+        return self.esperar(condicao, timeout, "atualização do indicador de registros")
+
+    def assinatura_tabela(self):
+        """Retorna o texto da primeira linha de dados, usado para detectar troca de página"""
+        linhas = self.driver.find_elements(By.XPATH, "//table//tr[td]")
+        try:
+            return linhas[0].text if linhas else ""
+        except StaleElementReferenceException:
+            return ""
+
+    def assinatura_conteudo(self):
+        """Retorna uma assinatura (tamanho e hash) do texto visível da página"""
+        try:
+            return self.driver.execute_script(JS_ASSINATURA_CONTEUDO)
+        except WebDriverException:
+            return ""
+
+    def conteudo_mudou(self, assinatura_anterior, timeout=None):
+        """Aguarda o texto visível da página mudar (ex: troca de rota do Angular sem recarregar)"""
+        def condicao(driver):
+            assinatura = self.assinatura_conteudo()
+            return assinatura if assinatura and assinatura != assinatura_anterior else False
+        return self.esperar(condicao, timeout, "novo conteúdo da página")
+
+    def nova_pagina(self, texto_indicador_anterior, assinatura_anterior, timeout=None):
+        """Aguarda o indicador de registros ou o conteúdo da tabela mudar após uma navegação"""
+        def condicao(driver):
+            texto = self.texto_indicador()
+            if texto and texto != texto_indicador_anterior:
+                return texto
+            assinatura = self.assinatura_tabela()
+            if assinatura and assinatura != assinatura_anterior:
+                return assinatura
+            return False
+        return self.esperar(condicao, timeout, "nova página de resultados")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache das estratégias de paginação que funcionaram no portal Ecosistemas.
+Registra qual estratégia (e qual seletor) conseguiu trocar de página, para que ela seja
+tentada primeiro nas próximas páginas e nas próximas execuções, e mantém a taxa de acerto
+e o tempo médio de cada estratégia. O conteúdo é persistido em JSON.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+
+logger = logging.getLogger("coletor_ecosistemas.paginacao")
+
+ARQUIVO_PADRAO = "ecosistemas_estrategias_paginacao.json"
+
+# Estratégias, na ordem da busca completa
+SALTO_DIRETO = "salto_direto"
+TEXTO_PROXIMA = "texto_proxima"
+REGIAO_VISIVEL = "regiao_visivel"
+HREF_PAGINA = "href_pagina"
+CANDIDATO = "candidato"
+INJECAO = "injecao"
+URL_PAGINA = "url_pagina"
+TECLADO = "teclado"
+
+ESTRATEGIAS = [TEXTO_PROXIMA, REGIAO_VISIVEL, HREF_PAGINA, CANDIDATO, INJECAO, URL_PAGINA, TECLADO]
+
+
+class CacheEstrategias:
+    def __init__(self, caminho=ARQUIVO_PADRAO):
+        """
+        Abre o cache de estratégias (um arquivo inexistente equivale a um cache vazio)
+
+        Args:
+            caminho (str): Arquivo JSON do cache; None mantém o cache apenas em memória
+        """
+        self.caminho = caminho
+        self.preferida = None
+        self.estatisticas = {}
+        self.acertos_cache = 0
+        self.falhas_cache = 0
+        self._carregar()
+
+    def _carregar(self):
+        if not self.caminho or not os.path.exists(self.caminho):
+            return
+        try:
+            with open(self.caminho, encoding='utf-8') as arquivo:
+                dados = json.load(arquivo)
+            preferida = dados.get("preferida")
+            if preferida:
+                self.preferida = (preferida["estrategia"], preferida.get("seletor"))
+            self.estatisticas = dados.get("estatisticas", {})
+            if self.preferida:
+                logger.info(f"Estratégia de paginação em cache: {self.descrever(*self.preferida)}")
+        except Exception as e:
+            logger.warning(f"Não foi possível ler o cache de estratégias {self.caminho}: {str(e)}")
+
+    def salvar(self):
+        """Grava o cache no disco (troca atômica do arquivo)"""
+        if not self.caminho:
+            return
+        dados = {
+            "atualizado_em": datetime.now().isoformat(timespec="seconds"),
+            "preferida": (
+                {"estrategia": self.preferida[0], "seletor": self.preferida[1]} if self.preferida else None
+            ),
+            "estatisticas": self.estatisticas,
+        }
+        try:
+            # Arquivo temporário por processo: coletas particionadas compartilham o cache
+            temporario = f"{self.caminho}.{os.getpid()}.tmp"
+            with open(temporario, 'w', encoding='utf-8') as arquivo:
+                json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+            os.replace(temporario, self.caminho)
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar o cache de estratégias {self.caminho}: {str(e)}")
+
+    @staticmethod
+    def descrever(estrategia, seletor=None):
+        return f"{estrategia} ({seletor})" if seletor else estrategia
+
+    def registrar(self, estrategia, seletor, sucesso, tempo, do_cache=False):
+        """
+        Registra uma tentativa de navegação
+
+        Args:
+            estrategia (str): Nome da estratégia (ESTRATEGIAS ou SALTO_DIRETO)
+            seletor (str): Seletor ou variante que foi usada, se houver
+            sucesso (bool): Se a página realmente mudou
+            tempo (float): Duração da tentativa, incluindo a confirmação, em segundos
+            do_cache (bool): Se a tentativa usou a estratégia em cache
+        """
+        estatistica = self.estatisticas.setdefault(estrategia, {"tentativas": 0, "sucessos": 0, "tempo_total": 0.0})
+        estatistica["tentativas"] += 1
+        estatistica["sucessos"] += int(bool(sucesso))
+        estatistica["tempo_total"] = round(estatistica["tempo_total"] + tempo, 3)
+
+        if do_cache:
+            if sucesso:
+                self.acertos_cache += 1
+            else:
+                self.falhas_cache += 1
+
+        situacao = "sucesso" if sucesso else "falha"
+        origem = " [cache]" if do_cache else ""
+        logger.info(f"Paginação por {self.descrever(estrategia, seletor)}{origem}: {situacao} em {tempo:.2f}s "
+                    f"(taxa de acerto {estatistica['sucessos']}/{estatistica['tentativas']})")
+
+        if sucesso and self.preferida != (estrategia, seletor):
+            self.preferida = (estrategia, seletor)
+            logger.info(f"Estratégia de paginação preferida: {self.descrever(estrategia, seletor)}")
+        self.salvar()
+
+    def nunca_funcionou(self, estrategia, minimo_tentativas=3):
+        """Indica se a estratégia já foi tentada várias vezes sem nenhum sucesso"""
+        estatistica = self.estatisticas.get(estrategia)
+        return bool(estatistica) and estatistica["tentativas"] >= minimo_tentativas and not estatistica["sucessos"]
+
+    def resumo(self):
+        """
+        Returns:
+            list: Linhas com a taxa de acerto e o tempo médio de cada estratégia e do cache
+        """
+        linhas = []
+        for estrategia in [SALTO_DIRETO] + ESTRATEGIAS:
+            estatistica = self.estatisticas.get(estrategia)
+            if not estatistica or not estatistica["tentativas"]:
+                continue
+            taxa = estatistica["sucessos"] / estatistica["tentativas"]
+            medio = estatistica["tempo_total"] / estatistica["tentativas"]
+            linhas.append(f"{estrategia}: {estatistica['sucessos']}/{estatistica['tentativas']} "
+                          f"({taxa:.0%}), {medio:.2f}s em média")
+        usos_cache = self.acertos_cache + self.falhas_cache
+        if usos_cache:
+            linhas.append(f"cache: {self.acertos_cache}/{usos_cache} acertos nesta execução")
+        return linhas
@@ -10,7 +10,6 @@ import argparse
 import logging
 import os
 import sys
-import time
 from datetime import datetime
 import json
 from selenium.webdriver.support.ui import WebDriverWait
@@ -27,9 +26,307 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 import pandas as pd
 
+def opcoes_limitador(args):
+    """
+    Taxas do limitador de taxa: pela linha de comando ou, na falta delas, padrões do backend
+    (a API JSON tolera mais requisições por segundo que o navegador)
+    """
+    taxa_inicial, taxa_maxima = (10.0, 50.0) if args.backend == 'http' else (1.0, 5.0)
+    return {"taxa_inicial": args.taxa_inicial or taxa_inicial, "taxa_maxima": args.taxa_maxima or taxa_maxima}
+
+def criar_limitador(args):
+    """Cria o limitador de taxa adaptativo compartilhado pelos workers"""
+    from limitador_taxa import LimitadorTaxa
+    return LimitadorTaxa(**opcoes_limitador(args))
+
+def coletar_com_navegador(args, logger, conhecidos=None, filtro=None, metricas=None):
+    """
+    Executa a coleta pelo navegador (Selenium), com filtro automático ou manual
+    
+    Args:
+        conhecidos (ProcessosConhecidos): Processos de coletas anteriores (modo delta)
+        filtro (FiltroPesquisa): Filtro da pesquisa, com no máximo um valor por campo (padrão: Classe 6)
+        metricas (MetricasColeta): Onde registrar a duração das etapas e os contadores da coleta
+    
+    Returns:
+        list: Registros coletados, ou None se não foi possível iniciar a coleta
+    """
+    # Inicializar o coletor (sem interface, a menos que solicitada ou no modo manual)
+    from coletor_ecosistemas import ColetorEcosistemas
+    from checkpoint import CheckpointColeta, chave_registro
+    from processos_conhecidos import CONHECIDO
+    from classificacao_estudos import TIPOS_CONFIRMADOS
+    from artefatos_depuracao import ArtefatosDepuracao
+    from filtros import FILTRO_CLASSE_6
+    from metricas import REGISTROS
+    from logs_estruturados import definir_contexto
+    filtro = filtro or FILTRO_CLASSE_6
+    artefatos = ArtefatosDepuracao(nivel=args.artefatos, diretorio=args.diretorio_artefatos,
+                                   limite_mb=args.limite_artefatos_mb)
+    gravador = None
+    if args.reproduzir:
+        # Páginas gravadas em vez do navegador; o checkpoint fica em memória para não
+        # misturar a reprodução com as coletas reais
+        from gravacao_paginas import ColetorReproducao
+        coletor = ColetorReproducao(args.reproduzir, parser_html=args.parser, limitador=criar_limitador(args),
+                                    metricas=metricas)
+        checkpoint = CheckpointColeta(":memory:", filtro=filtro.identificacao())
+    else:
+        if args.gravar:
+            from gravacao_paginas import GravadorPaginas
+            gravador = GravadorPaginas(args.gravar)
+        modo_headless = not (args.com_interface or args.modo_manual)
+        coletor = ColetorEcosistemas(modo_headless=modo_headless, parser_html=args.parser, artefatos=artefatos,
+                                     perfil_navegador=args.perfil, medir_rede=not args.sem_medicao_rede,
+                                     maximizar_pagina=not args.manter_tamanho_pagina,
+                                     arquivo_estrategias=args.estrategias_paginacao, limitador=criar_limitador(args),
+                                     metricas=metricas, gravador=gravador)
+        checkpoint = CheckpointColeta(args.checkpoint, filtro=filtro.identificacao())
+    
+    # Navegadores adicionais para as páginas de detalhes
+    pool = None
+    if args.workers > 1 and not args.reproduzir:
+        from pool_detalhes import PoolDetalhes
+        pool = PoolDetalhes(num_workers=args.workers, parser_html=args.parser, artefatos=artefatos,
+                            perfil_navegador=args.perfil, limitador=coletor.limitador, metricas=coletor.metricas,
+                            gravador=gravador, base_url=coletor.base_url)
+    
+    try:
+        # Acessar o site
+        if not coletor.acessar_site():
+            logger.error("Erro ao acessar o site. Verifique sua conexão.")
+            return None
+        
+        # Se modo manual, deixar usuário aplicar filtros
+        if args.modo_manual:
+            print("\n" + "=" * 80)
+            print("INSTRUÇÕES PARA MODO MANUAL:")
+            print(f"1. No navegador que se abriu, aplique o filtro: {filtro.descrever()}")
+            print("2. Clique em Pesquisar para exibir os resultados")
+            print("3. NÃO FECHE O NAVEGADOR! O script fará a coleta automaticamente")
+            print("4. Quando estiver pronto, pressione Enter para continuar...")
+            print("=" * 80 + "\n")
+            
+            # Aguardar entrada do usuário
+            input("Pressione Enter quando estiver pronto para iniciar a coleta...")
+        else:
+            # Modo automático - tentar aplicar filtro
+            if not coletor.aplicar_filtro(filtro):
+                logger.error(f"Erro ao aplicar o filtro ({filtro.descrever()}). Tente usar o modo manual.")
+                return None
+        
+        # Maior tamanho de página e número exato de páginas pelo indicador de registros
+        max_paginas = args.max_paginas
+        if coletor.preparar_paginacao() and coletor.plano.total_paginas < max_paginas:
+            max_paginas = coletor.plano.total_paginas
+        
+        # Coletar dados das páginas (retomando do checkpoint, se solicitado)
+        contador_paginas, todos_resultados, concluidos = coletor.preparar_retomada(checkpoint, args.resume)
+        if contador_paginas is None:
+            logger.info("Todas as páginas já foram coletadas segundo o checkpoint.")
+            return todos_resultados
+        
+        while contador_paginas <= max_paginas:
+            definir_contexto(pagina=contador_paginas)
+            logger.info(f"Processando página {contador_paginas}")
+            
+            # Extrair dados da tabela atual
+            resultados_tabela = coletor.extrair_dados_tabela(contador_paginas)
+            
+            if not resultados_tabela:
+                logger.warning(f"Nenhum resultado encontrado na página {contador_paginas}")
+                break
+            
+            logger.info(f"Encontrados {len(resultados_tabela)} registros na página {contador_paginas}")
+            
+            # Ignorar registros já coletados em uma execução anterior
+            chaves = [chave_registro(r, contador_paginas, i) for i, r in enumerate(resultados_tabela)]
+            resultados_tabela = [r for r, chave in zip(resultados_tabela, chaves) if chave not in concluidos]
+            chaves = [chave for chave in chaves if chave not in concluidos]
+            
+            # Modo delta: manter apenas processos novos ou alterados
+            pagina_conhecida = False
+            if conhecidos is not None:
+                situacoes = [conhecidos.situacao(r) for r in resultados_tabela]
+                pagina_conhecida = conhecidos.pagina_conhecida(resultados_tabela, situacoes)
+                resultados_tabela = [r for r, situacao in zip(resultados_tabela, situacoes) if situacao != CONHECIDO]
+                chaves = [chave for chave, situacao in zip(chaves, situacoes) if situacao != CONHECIDO]
+                logger.info(f"Modo delta: {len(resultados_tabela)} registros novos ou alterados na página {contador_paginas}")
+            
+            if pool:
+                # Buscar em paralelo os detalhes dos registros ainda sem tipo de estudo, na ordem da tabela
+                pendentes = [r for r in resultados_tabela
+                             if r.get("tipo_de_estudo", "") not in TIPOS_CONFIRMADOS and "link_detalhes" in r]
+                for resultado, dados_completos in zip(pendentes, pool.processar(pendentes, contador_paginas)):
+                    if "Tipo de Estudo" in dados_completos:
+                        resultado["tipo_de_estudo"] = dados_completos["Tipo de Estudo"]
+                todos_resultados.extend(resultados_tabela)
+                coletor.metricas.incrementar(REGISTROS, len(resultados_tabela))
+                for resultado, chave in zip(resultados_tabela, chaves):
+                    checkpoint.registrar_registro(chave, contador_paginas, resultado)
+            else:
+                # Para cada registro, processar detalhes
+                for i, resultado in enumerate(resultados_tabela):
+                    definir_contexto(registro=resultado.get("processo") or f"linha {i + 1}")
+                    logger.debug("Processando registro %d de %d na página %d", i + 1, len(resultados_tabela),
+                                 contador_paginas)
+                    
+                    # Verificar se já podemos identificar o tipo de estudo
+                    tipo_estudo = resultado.get("tipo_de_estudo", "")
+                    if tipo_estudo not in TIPOS_CONFIRMADOS and "link_detalhes" in resultado:
+                        # Se não temos o tipo de estudo identificado, acessar detalhes
+                        if coletor.acessar_proximo_registro(resultado["link_detalhes"]):
+                            # Extrair dados detalhados
+                            dados_detalhados = coletor.extrair_dados_detalhados()
+                            
+                            # Atualizar o tipo de estudo
+                            if "Tipo de Estudo" in dados_detalhados:
+                                resultado["tipo_de_estudo"] = dados_detalhados["Tipo de Estudo"]
+                            
+                            # Fechar aba de detalhes
+                            coletor.fechar_aba_detalhes()
+                    
+                    todos_resultados.append(resultado)
+                    coletor.metricas.incrementar(REGISTROS)
+                    checkpoint.registrar_registro(chaves[i], contador_paginas, resultado)
+                definir_contexto(registro=None)
+            
+            checkpoint.registrar_pagina(contador_paginas, coletor.tamanho_pagina)
+            
+            if pagina_conhecida:
+                logger.info("Todos os processos da página já são conhecidos. Finalizando coleta delta.")
+                break
+            
+            # Tentar navegar para a próxima página (salto direto pelo paginador ou estratégias)
+            if not coletor.avancar_pagina(contador_paginas + 1):
+                logger.info("Não há mais páginas disponíveis.")
+                break
+            
+            contador_paginas += 1
+            coletor.esperas.pagina_ociosa()  # Aguardar requisições pendentes da nova página
+        
+        return todos_resultados
+    finally:
+        checkpoint.fechar()
+        coletor.registrar_resumo_paginacao()
+        logger.info(coletor.limitador.resumo())
+        if gravador:
+            logger.info(gravador.resumo())
+        
+        if pool:
+            pool.fechar()
+        artefatos.fechar()
+        
+        # Fechar o navegador
+        try:
+            coletor.driver.quit()
+            logger.info("Navegador fechado com sucesso.")
+        except:
+            pass
+
+def coletar_particionado(args, particoes, conhecidos=None, metricas=None):
+    """
+    Coleta as partições do filtro em processos paralelos (um navegador ou sessão HTTP por processo)
+    
+    Returns:
+        list: Registros de todas as partições, sem processos repetidos
+    """
+    from coleta_particionada import coletar_particoes
+    if args.backend == 'http':
+        return coletar_particoes(
+            particoes, num_processos=args.processos, backend='http',
+            opcoes_coletor={"base_url": args.base_url},
+            opcoes_coleta={"max_paginas": args.max_paginas, "conhecidos": conhecidos},
+            opcoes_limitador=opcoes_limitador(args), metricas=metricas
+        )
+    return coletar_particoes(
+        particoes, num_processos=args.processos, backend='selenium',
+        opcoes_coletor={
+            "modo_headless": not args.com_interface, "parser_html": args.parser,
+            "perfil_navegador": args.perfil, "medir_rede": not args.sem_medicao_rede,
+            "maximizar_pagina": not args.manter_tamanho_pagina,
+            "arquivo_estrategias": args.estrategias_paginacao, "prefixo_saida": args.output_prefix,
+        },
+        opcoes_coleta={
+            "max_paginas": args.max_paginas, "num_workers": args.workers, "checkpoint": args.checkpoint,
+            "retomar": args.resume, "conhecidos": conhecidos,
+        },
+        opcoes_artefatos={"nivel": args.artefatos, "diretorio": args.diretorio_artefatos,
+                          "limite_mb": args.limite_artefatos_mb},
+        opcoes_limitador=opcoes_limitador(args), metricas=metricas
+    )
+
+def criar_executor(args, metricas=None):
+    """
+    Cria o executor das tarefas da coleta distribuída (navegador ou API JSON), com as opções da linha de comando
+    """
+    from coleta_distribuida import ExecutorNavegador, ExecutorHTTP
+    if args.backend == 'http':
+        from coletor_http import ColetorEcosistemasHTTP
+        return ExecutorHTTP(ColetorEcosistemasHTTP(base_url=args.base_url, limitador=criar_limitador(args),
+                                                   metricas=metricas))
+    
+    from coletor_ecosistemas import ColetorEcosistemas
+    from artefatos_depuracao import ArtefatosDepuracao
+    artefatos = ArtefatosDepuracao(nivel=args.artefatos, diretorio=args.diretorio_artefatos,
+                                   limite_mb=args.limite_artefatos_mb)
+    return ExecutorNavegador(ColetorEcosistemas(
+        modo_headless=not args.com_interface, parser_html=args.parser, artefatos=artefatos,
+        perfil_navegador=args.perfil, medir_rede=not args.sem_medicao_rede,
+        maximizar_pagina=not args.manter_tamanho_pagina, arquivo_estrategias=args.estrategias_paginacao,
+        limitador=criar_limitador(args), metricas=metricas
+    ))
+
+def coletar_distribuido(args, particoes, logger, metricas=None):
+    """
+    Coleta distribuída por uma fila de tarefas
+    
+    O coordenador enfileira as faixas de páginas, aguarda os workers (desta ou de outras máquinas)
+    e reúne os resultados; o worker processa tarefas até a fila ser concluída.
+    
+    Returns:
+        list: Registros reunidos pelo coordenador (None no worker)
+    """
+    from fila_distribuida import abrir_fila, ServidorFila
+    from coleta_distribuida import WorkerColeta, enfileirar_coleta, aguardar_conclusao, reunir_resultados
+    
+    fila = abrir_fila(args.fila)
+    servidor = None
+    executor = None
+    try:
+        if args.distribuido == 'worker':
+            executor = criar_executor(args, metricas)
+            WorkerColeta(fila, executor, duracao_arrendamento=args.arrendamento).executar()
+            return None
+        
+        # Coordenador: opcionalmente servir a fila por TCP para workers de outras máquinas
+        if args.servir_fila:
+            host, _, porta = args.servir_fila.rpartition(":")
+            servidor = ServidorFila(fila, host=host or "0.0.0.0", porta=int(porta))
+            servidor.iniciar()
+        
+        executor = criar_executor(args, metricas)
+        enfileirar_coleta(fila, particoes, executor, max_paginas=args.max_paginas,
+                          paginas_por_tarefa=args.paginas_por_tarefa)
+        executor.fechar()
+        executor = None
+        
+        logger.info("Aguardando os workers concluírem a fila...")
+        aguardar_conclusao(fila)
+        return reunir_resultados(fila)
+    finally:
+        if executor is not None:
+            executor.fechar()
+        if servidor is not None:
+            servidor.parar()
+        fila.fechar()
+
 def main():
     """Função principal que configura e executa o coletor"""
     
+    from motores_html import MOTORES, MOTOR_PADRAO
+    from filtros import FiltroPesquisa, interpretar_classes, interpretar_lista, interpretar_periodo, planejar_particoes
+    
     # Configurar parser de argumentos
     parser = argparse.ArgumentParser(description='Coleta de Licenças Ambientais - Sistema Ecosistemas MG')
     
@@ -43,24 +340,151 @@ def main():
                         help='Executar em modo manual, onde o usuário fará a interação inicial com a página')
     
     parser.add_argument('--verbose', action='store_true',
-                        help='Exibir logs detalhados')
+                        help='Exibir logs detalhados (DEBUG em todas as etapas)')
+    
+    parser.add_argument('--log-niveis', type=str, default=None,
+                        help='Nível de log por etapa ou módulo, separado por vírgulas '
+                             '(ex: paginacao=DEBUG,esperas=DEBUG,navegacao_detalhes=WARNING)')
+    
+    parser.add_argument('--log-formato', choices=['json', 'texto'], default='json',
+                        help='Formato do arquivo de log: uma linha JSON por mensagem (padrão) ou texto')
+    
+    parser.add_argument('--backend', choices=['selenium', 'http'], default='selenium',
+                        help='Forma de coleta: navegador (selenium) ou API JSON do portal (http) (padrão: selenium)')
+    
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Número de navegadores em paralelo para as páginas de detalhes (padrão: 1)')
+    
+    parser.add_argument('--resume', action='store_true',
+                        help='Retomar a coleta a partir do checkpoint, pulando páginas e registros já concluídos')
+    
+    parser.add_argument('--checkpoint', type=str, default='ecosistemas_checkpoint.db',
+                        help='Arquivo SQLite de checkpoint (padrão: ecosistemas_checkpoint.db)')
+    
+    parser.add_argument('--delta', action='store_true',
+                        help='Coletar apenas processos novos ou alterados em relação às saídas anteriores '
+                             '(<output-prefix>_*.csv e CSV incremental), parando na primeira página já conhecida')
+    
+    parser.add_argument('--parser', choices=list(MOTORES), default=MOTOR_PADRAO,
+                        help='Motor de análise HTML das páginas de detalhes e da tabela '
+                             f'(padrão: {MOTOR_PADRAO}; lxml e selectolax são mais rápidos)')
+    
+    parser.add_argument('--manter-tamanho-pagina', action='store_true',
+                        help='Não ajustar a grade para o maior tamanho de página oferecido pelo portal')
+    
+    parser.add_argument('--estrategias-paginacao', type=str, default='ecosistemas_estrategias_paginacao.json',
+                        help='Arquivo com as estratégias de paginação aprendidas, tentadas primeiro nas '
+                             'próximas páginas e execuções (padrão: ecosistemas_estrategias_paginacao.json)')
+    
+    parser.add_argument('--artefatos', choices=['off', 'on-error', 'always'], default='on-error',
+                        help='Screenshots de depuração: nunca (off), só quando ocorre um erro, com as últimas '
+                             'capturas mantidas em memória (on-error), ou todos (always) (padrão: on-error)')
+    
+    parser.add_argument('--diretorio-artefatos', type=str, default='depuracao',
+                        help='Diretório dos screenshots de depuração, com um subdiretório por execução (padrão: depuracao)')
+    
+    parser.add_argument('--limite-artefatos-mb', type=float, default=50,
+                        help='Espaço máximo em disco dos screenshots de cada execução, em MB (padrão: 50)')
+    
+    parser.add_argument('--perfil', choices=['padrao', 'enxuto'], default='enxuto',
+                        help='Perfil do navegador: enxuto bloqueia imagens, fontes, mídia e hosts de terceiros '
+                             'e desativa extensões; padrao carrega a página completa (padrão: enxuto)')
+    
+    parser.add_argument('--com-interface', action='store_true',
+                        help='Exibir a janela do navegador (por padrão roda sem interface; o modo manual sempre a exibe)')
+    
+    parser.add_argument('--sem-medicao-rede', action='store_true',
+                        help='Não registrar bytes transferidos e tempo de carga de cada página')
+    
+    parser.add_argument('--classes', type=interpretar_classes, default='6',
+                        help='Classes predominantes, com vírgulas e intervalos (ex: 6, 3-6, 3,5-6) (padrão: 6)')
+    
+    parser.add_argument('--municipios', type=interpretar_lista, default='',
+                        help='Municípios da solicitação, separados por vírgula (padrão: todos)')
+    
+    parser.add_argument('--regionais', type=interpretar_lista, default='',
+                        help='Regionais (Supram), separadas por vírgula (padrão: todas)')
+    
+    parser.add_argument('--modalidades', type=interpretar_lista, default='',
+                        help='Modalidades de licenciamento, separadas por vírgula (ex: LAC1,LAC2) (padrão: todas)')
+    
+    parser.add_argument('--periodo', type=interpretar_periodo, default=None,
+                        help='Período: ano (2021), anos (2019-2024) ou datas (01/03/2020-30/06/2021) (padrão: todo)')
+    
+    parser.add_argument('--processos', type=int, default=1,
+                        help='Processos em paralelo para a coleta particionada: o filtro é dividido em uma '
+                             'partição por combinação de valores (e por ano do período) (padrão: 1)')
+    
+    parser.add_argument('--distribuido', choices=['coordenador', 'worker'], default=None,
+                        help='Coleta distribuída: o coordenador enfileira faixas de páginas e reúne os resultados; '
+                             'workers (nesta ou em outras máquinas) arrendam e processam as tarefas da fila')
+    
+    parser.add_argument('--fila', type=str, default='sqlite:///ecosistemas_fila.db',
+                        help='Fila da coleta distribuída: sqlite:///arquivo.db ou tcp://host:porta '
+                             '(padrão: sqlite:///ecosistemas_fila.db)')
+    
+    parser.add_argument('--servir-fila', type=str, default=None,
+                        help='Coordenador: servir a fila por TCP em [host:]porta para workers de outras máquinas')
+    
+    parser.add_argument('--paginas-por-tarefa', type=int, default=5,
+                        help='Páginas em cada faixa arrendada por um worker (padrão: 5)')
+    
+    parser.add_argument('--arrendamento', type=float, default=300,
+                        help='Segundos de um arrendamento sem renovação antes de a tarefa voltar para a fila (padrão: 300)')
+    
+    parser.add_argument('--taxa-inicial', type=float, default=None,
+                        help='Páginas ou requisições por segundo no início da coleta, ajustadas conforme as '
+                             'respostas do portal (padrão: 1 no navegador, 10 no backend http)')
+    
+    parser.add_argument('--taxa-maxima', type=float, default=None,
+                        help='Limite da taxa adaptativa, em páginas ou requisições por segundo '
+                             '(padrão: 5 no navegador, 50 no backend http)')
+    
+    parser.add_argument('--metricas-arquivo', type=str, default=None,
+                        help='Arquivo .prom onde gravar, ao final, as métricas das etapas no formato do Prometheus')
+    
+    parser.add_argument('--metricas-porta', type=int, default=None,
+                        help='Porta local em que as métricas ficam disponíveis em /metrics durante a coleta')
+    
+    parser.add_argument('--profile', action='store_true',
+                        help='Perfila a coleta: tempo de relógio e de CPU por etapa, pilhas dobradas para '
+                             'flame graph, perfil do cProfile e relatório de hotspots ao final')
+    
+    parser.add_argument('--profile-intervalo', type=float, default=5,
+                        help='Intervalo entre amostras da pilha no modo --profile, em milissegundos (padrão: 5)')
+    
+    parser.add_argument('--profile-top', type=int, default=25,
+                        help='Número de funções no relatório de hotspots do modo --profile (padrão: 25)')
+    
+    parser.add_argument('--gravar', type=str, default=None,
+                        help='Diretório onde arquivar as páginas de resultados e de detalhes vistas pelo '
+                             'navegador, para reprodução sem rede')
+    
+    parser.add_argument('--reproduzir', type=str, default=None,
+                        help='Diretório de uma gravação (--gravar) a reproduzir no lugar do navegador')
+    
+    parser.add_argument('--base-url', type=str, default='https://ecosistemas.meioambiente.mg.gov.br',
+                        help='Endereço do portal usado pelo backend http (ex: portal simulado local)')
     
     # Analisar argumentos da linha de comando
     args = parser.parse_args()
+    if (args.gravar or args.reproduzir) and (args.backend == 'http' or args.distribuido or args.modo_manual
+                                             or args.processos > 1):
+        parser.error("--gravar e --reproduzir valem para a coleta pelo navegador em um só processo, "
+                     "sem modo manual")
     
     # Configurar nivel de log
     log_level = logging.DEBUG if args.verbose else logging.INFO
     
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(f"ecosistemas_coleta_{datetime.now().strftime('%Y%m%d_%H%M')}.log"),
-            logging.StreamHandler()
-        ]
-    )
+    from logs_estruturados import configurar_logs, interpretar_niveis
+    try:
+        niveis_etapas = interpretar_niveis(args.log_niveis)
+    except ValueError as e:
+        parser.error(str(e))
+    configurar_logs(nivel=log_level, niveis_etapas=niveis_etapas, formato=args.log_formato,
+                    arquivo=f"ecosistemas_coleta_{datetime.now().strftime('%Y%m%d_%H%M')}.log")
     
-    logger = logging.getLogger(__name__)
+    logger = logging.getLogger("coletor_ecosistemas.executar")
     
     # Exibir parâmetros de execução
     logger.info("=" * 50)
@@ -71,92 +495,91 @@ def main():
     logger.info(f"- Prefixo de saída: {args.output_prefix}")
     logger.info(f"- Modo manual: {args.modo_manual}")
     logger.info(f"- Modo verbose: {args.verbose}")
+    logger.info(f"- Backend: {args.backend}")
+    logger.info(f"- Workers de detalhes: {args.workers}")
+    logger.info(f"- Retomar do checkpoint: {args.resume} ({args.checkpoint})")
+    logger.info(f"- Modo delta: {args.delta}")
+    logger.info(f"- Motor HTML: {args.parser}")
+    logger.info(f"- Maior tamanho de página: {not args.manter_tamanho_pagina}")
+    logger.info(f"- Perfil do navegador: {args.perfil} ({'com interface' if args.com_interface or args.modo_manual else 'headless'})")
+    data_inicio, data_fim = args.periodo or (None, None)
+    filtro = FiltroPesquisa(classes=args.classes, municipios=args.municipios, regionais=args.regionais,
+                            modalidades=args.modalidades, data_inicio=data_inicio, data_fim=data_fim)
+    logger.info(f"- Filtro: {filtro.descrever()}")
+    logger.info(f"- Processos em paralelo: {args.processos}")
+    logger.info(f"- Coleta distribuída: {args.distribuido or 'não'}{f' ({args.fila})' if args.distribuido else ''}")
+    logger.info(f"- Screenshots de depuração: {args.artefatos} (até {args.limite_artefatos_mb:g} MB em {args.diretorio_artefatos})")
+    logger.info(f"- Perfilamento: {args.profile}")
+    if args.gravar or args.reproduzir:
+        logger.info(f"- {'Gravação' if args.gravar else 'Reprodução'} de páginas: {args.gravar or args.reproduzir}")
     logger.info("=" * 50)
     
+    # Duração de cada etapa e contadores de registros, novas tentativas e fallbacks
+    from metricas import MetricasColeta, SALVAMENTO
+    metricas = MetricasColeta()
+    servidor_metricas = None
+    perfilador = None
+    
     try:
-        # Inicializar o coletor (sempre com interface visível para facilitar depuração)
-        from coletor_ecosistemas import ColetorEcosistemas
-        coletor = ColetorEcosistemas(modo_headless=False)
+        if args.metricas_porta:
+            servidor_metricas = metricas.servir(args.metricas_porta)
         
-        # Acessar o site
-        if not coletor.acessar_site():
-            logger.error("Erro ao acessar o site. Verifique sua conexão.")
+        # Perfilamento da coleta neste processo (processos das partições e workers distribuídos
+        # não são perfilados; use --processos 1 para perfilar a coleta inteira)
+        if args.profile:
+            from perfilamento import PerfiladorColeta
+            perfilador = PerfiladorColeta(metricas, prefixo=f"{args.output_prefix}_perfil_{datetime.now().strftime('%Y%m%d_%H%M')}",
+                                          intervalo=args.profile_intervalo / 1000, top=args.profile_top)
+            perfilador.iniciar()
+        
+        # Um valor por campo em cada pesquisa: filtros com vários valores são divididos em partições
+        # (e, com vários processos, o período também é dividido por ano)
+        particoes = planejar_particoes(filtro, dividir_por_ano=args.processos > 1 or bool(args.distribuido))
+        if len(particoes) > 1 and args.modo_manual:
+            logger.error("O modo manual aceita um valor por campo do filtro. Reduza o filtro ou use o modo automático.")
+            return 1
+        if len(particoes) > 1 and (args.gravar or args.reproduzir):
+            logger.error("A gravação e a reprodução aceitam um valor por campo do filtro. Reduza o filtro.")
+            return 1
+        if args.backend == 'http' and (args.resume or args.checkpoint != parser.get_default('checkpoint')):
+            logger.error("O backend http não usa checkpoint (--checkpoint e --resume). Use o backend selenium "
+                         "para retomar coletas.")
             return 1
         
-        # Se modo manual, deixar usuário aplicar filtros
-        if args.modo_manual:
-            print("\n" + "=" * 80)
-            print("INSTRUÇÕES PARA MODO MANUAL:")
-            print("1. No navegador que se abriu, aplique o filtro para Classe 6")
-            print("2. Clique em Pesquisar para exibir os resultados")
-            print("3. NÃO FECHE O NAVEGADOR! O script fará a coleta automaticamente")
-            print("4. Quando estiver pronto, pressione Enter para continuar...")
-            print("=" * 80 + "\n")
-            
-            # Aguardar entrada do usuário
-            input("Pressione Enter quando estiver pronto para iniciar a coleta...")
+        # Modo delta: processos já coletados em execuções anteriores
+        conhecidos = None
+        if args.delta:
+            from processos_conhecidos import ProcessosConhecidos
+            conhecidos = ProcessosConhecidos.de_saidas_anteriores(args.output_prefix)
+        
+        coletor = None
+        if args.distribuido == 'worker':
+            coletar_distribuido(args, particoes, logger, metricas)
+            logger.info("Worker da coleta distribuída finalizado")
+            return 0
+        elif args.distribuido == 'coordenador':
+            # Faixas de páginas processadas pelos workers e reunidas sem processos repetidos
+            todos_resultados = coletar_distribuido(args, particoes, logger, metricas)
+        elif len(particoes) > 1:
+            # Partições em processos paralelos, mescladas sem processos repetidos
+            todos_resultados = coletar_particionado(args, particoes, conhecidos, metricas)
+        elif args.backend == 'http':
+            # Coleta direta pela API JSON, sem navegador
+            from coletor_http import ColetorEcosistemasHTTP
+            coletor = ColetorEcosistemasHTTP(base_url=args.base_url, limitador=criar_limitador(args),
+                                             metricas=metricas)
+            todos_resultados = coletor.coletar_dados(max_paginas=args.max_paginas, conhecidos=conhecidos,
+                                                     filtro=particoes[0])
         else:
-            # Modo automático - tentar aplicar filtro
-            if not coletor.aplicar_filtro_classe_6():
-                logger.error("Erro ao aplicar filtro de Classe 6. Tente usar o modo manual.")
+            todos_resultados = coletar_com_navegador(args, logger, conhecidos, particoes[0], metricas)
+            if todos_resultados is None:
                 return 1
         
-        # Coletar dados das páginas
-        todos_resultados = []
-        contador_paginas = 1
-        
-        while contador_paginas <= args.max_paginas:
-            logger.info(f"Processando página {contador_paginas}")
-            
-            # Extrair dados da tabela atual
-            resultados_tabela = coletor.extrair_dados_tabela()
-            
-            if not resultados_tabela:
-                logger.warning(f"Nenhum resultado encontrado na página {contador_paginas}")
-                break
-            
-            logger.info(f"Encontrados {len(resultados_tabela)} registros na página {contador_paginas}")
-            
-            # Para cada registro, processar detalhes
-            for i, resultado in enumerate(resultados_tabela):
-                logger.info(f"Processando registro {i+1} de {len(resultados_tabela)} na página {contador_paginas}")
-                
-                # Verificar se já podemos identificar o tipo de estudo
-                tipo_estudo = resultado.get("tipo_de_estudo", "")
-                if tipo_estudo not in ["EIA/RIMA", "RCA"] and "link_detalhes" in resultado:
-                    # Se não temos o tipo de estudo identificado, acessar detalhes
-                    if coletor.acessar_proximo_registro(resultado["link_detalhes"]):
-                        # Extrair dados detalhados
-                        dados_detalhados = coletor.extrair_dados_detalhados()
-                        
-                        # Atualizar o tipo de estudo
-                        if "Tipo de Estudo" in dados_detalhados:
-                            resultado["tipo_de_estudo"] = dados_detalhados["Tipo de Estudo"]
-                        
-                        # Fechar aba de detalhes
-                        coletor.fechar_aba_detalhes()
-                
-                todos_resultados.append(resultado)
-            
-            # Tentar navegar para a próxima página
-            if not coletor.navegar_proxima_pagina():
-                logger.info("Não há mais páginas disponíveis.")
-                break
-            
-            contador_paginas += 1
-            time.sleep(3)  # Aguardar um pouco entre páginas
-        
         # Salvar resultados
         if todos_resultados:
             # Resumo dos tipos de estudo
-            estudos = {"EIA/RIMA": 0, "RCA": 0, "EIA/RIMA e RCA": 0, "EIA/RIMA (inferido pela atividade)": 0, "RCA (inferido pela atividade)": 0, "A determinar": 0}
-            
-            for resultado in todos_resultados:
-                tipo = resultado.get("tipo_de_estudo", "A determinar")
-                if tipo in estudos:
-                    estudos[tipo] += 1
-                else:
-                    estudos[tipo] = 1
+            from classificacao_estudos import resumo_estudos
+            estudos = resumo_estudos(todos_resultados)
             
             # Salvar resultados em Excel
             timestamp = datetime.now().strftime("%Y%m%d_%H%M")
@@ -181,15 +604,16 @@ def main():
             colunas_existentes = [col for col in colunas_ordem if col in df.columns]
             df = df[colunas_existentes]
             
-            # Salvar como Excel
-            arquivo_excel = f"{args.output_prefix}_{timestamp}.xlsx"
-            df.to_excel(arquivo_excel, index=False)
-            logger.info(f"Resultados salvos em Excel: {arquivo_excel}")
-            
-            # Salvar como CSV
-            arquivo_csv = f"{args.output_prefix}_{timestamp}.csv"
-            df.to_csv(arquivo_csv, index=False, encoding="utf-8-sig")
-            logger.info(f"Resultados salvos em CSV: {arquivo_csv}")
+            with metricas.medir(SALVAMENTO):
+                # Salvar como Excel
+                arquivo_excel = f"{args.output_prefix}_{timestamp}.xlsx"
+                df.to_excel(arquivo_excel, index=False)
+                logger.info(f"Resultados salvos em Excel: {arquivo_excel}")
+                
+                # Salvar como CSV
+                arquivo_csv = f"{args.output_prefix}_{timestamp}.csv"
+                df.to_csv(arquivo_csv, index=False, encoding="utf-8-sig")
+                logger.info(f"Resultados salvos em CSV: {arquivo_csv}")
             
             # Exibir resumo para o usuário
             print("\n" + "=" * 80)
@@ -207,16 +631,23 @@ def main():
         else:
             logger.warning("Nenhum resultado coletado.")
         
-        # Fechar o navegador
-        try:
-            coletor.driver.quit()
-            logger.info("Navegador fechado com sucesso.")
-        except:
-            pass
+        # Fechar a sessão HTTP (os navegadores são fechados pela própria coleta)
+        if coletor is not None:
+            coletor.fechar()
             
     except Exception as e:
         logger.error(f"Erro durante a execução: {str(e)}", exc_info=True)
         return 1
+    finally:
+        if perfilador is not None:
+            perfilador.parar()
+            perfilador.salvar()
+        # Onde foi o tempo da coleta: resumo por etapa no log e, se solicitado, arquivo .prom
+        metricas.registrar_resumo()
+        if args.metricas_arquivo:
+            metricas.salvar(args.metricas_arquivo)
+        if servidor_metricas is not None:
+            servidor_metricas.parar()
     
     logger.info("=" * 50)
     logger.info("COLETA FINALIZADA")
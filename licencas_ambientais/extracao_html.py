@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Extração de dados a partir do HTML das páginas do sistema Ecosistemas MG.
+Funções independentes do navegador: recebem o HTML (ex: driver.page_source) e devolvem dicionários.
+"""
+
+import logging
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+from classificacao_estudos import identificar_tipo_estudo, tipo_estudo_registro
+
+logger = logging.getLogger("coletor_ecosistemas")
+
+# Rótulos procurados na página de detalhes de um processo
+LABELS_DETALHE = [
+    'CPF/CNPJ', 'Pessoa Física/Jurídica', 'Nome Fantasia',
+    'Empreendimento', 'Município da Solicitação', 'Número do Processo',
+    'Classe predominante', 'Fator locacional', 'Modalidade licenciamento',
+    'Fase do licenciamento', 'Tipo solicitação', 'Atividade Principal'
+]
+
+# Extrai a primeira tabela da página direto do DOM, no mesmo formato de estrutura_tabela_html.
+# O texto de cada célula segue get_text(strip=True): nós de texto aparados e concatenados.
+JS_EXTRAIR_TABELA = """
+var tabela = document.querySelector('table');
+if (!tabela) { return null; }
+
+function texto(elem) {
+    var partes = [];
+    var walker = document.createTreeWalker(elem, NodeFilter.SHOW_TEXT, null);
+    var no;
+    while ((no = walker.nextNode())) {
+        var pai = no.parentNode ? no.parentNode.nodeName : '';
+        if (pai === 'SCRIPT' || pai === 'STYLE') { continue; }
+        var t = no.nodeValue.trim();
+        if (t) { partes.push(t); }
+    }
+    return partes.join('');
+}
+
+function link(elem) {
+    var links = elem.querySelectorAll('a');
+    for (var i = 0; i < links.length; i++) {
+        var href = links[i].getAttribute('href');
+        if (href) { return href; }
+    }
+    return null;
+}
+
+var linhas = tabela.querySelectorAll('tr');
+var elemsCabecalho = tabela.querySelectorAll('th');
+if (!elemsCabecalho.length && linhas.length) {
+    elemsCabecalho = linhas[0].querySelectorAll('th, td');
+}
+
+var cabecalhos = [];
+for (var i = 0; i < elemsCabecalho.length; i++) {
+    cabecalhos.push(texto(elemsCabecalho[i]));
+}
+
+var resultado = [];
+for (var j = 0; j < linhas.length; j++) {
+    var celulas = linhas[j].querySelectorAll('td, th');
+    var linha = [];
+    for (var k = 0; k < celulas.length; k++) {
+        linha.push({texto: texto(celulas[k]), href: link(celulas[k])});
+    }
+    resultado.push(linha);
+}
+
+return {
+    cabecalhos: cabecalhos,
+    linhas: resultado,
+    primeira_linha_cabecalho: linhas.length > 0 && linhas[0].querySelectorAll('th').length > 0
+};
+"""
+
+
+def _texto_unico(elem):
+    """Texto do elemento quando ele tem um único filho de texto (equivalente a elem.string)"""
+    texto = elem.string
+    return str(texto) if texto is not None else None
+
+
+def indexar_rotulos(soup, labels=LABELS_DETALHE):
+    """
+    Monta o índice rótulo -> valor percorrendo o documento uma única vez
+
+    Para cada rótulo, os valores são procurados, em ordem de prioridade:
+    1. texto logo após um elemento <strong> com o rótulo
+    2. próxima célula <td> após um <th> com o rótulo
+    3. texto "rótulo: valor" em qualquer nó de texto
+    Em cada abordagem vale a primeira ocorrência no documento.
+
+    Args:
+        soup (BeautifulSoup): Documento já analisado
+        labels (list): Rótulos procurados
+
+    Returns:
+        dict: Rótulos encontrados e seus valores
+    """
+    por_strong = {}
+    por_th = {}
+    por_texto = {}
+    th_pendentes = []  # rótulos de <th> aguardando a próxima célula <td>
+    rotulos_texto = [(label, f"{label}:") for label in labels]
+
+    for no in soup.descendants:
+        if isinstance(no, Tag):
+            if no.name == 'td' and th_pendentes:
+                valor = no.get_text(strip=True)
+                for label in th_pendentes:
+                    por_th[label] = valor
+                th_pendentes = []
+
+            if no.name in ('strong', 'th'):
+                texto = _texto_unico(no)
+                if not texto:
+                    continue
+                for label in labels:
+                    if label not in texto:
+                        continue
+                    if no.name == 'strong' and label not in por_strong:
+                        irmao = no.next_sibling
+                        por_strong[label] = irmao.strip() if isinstance(irmao, NavigableString) else ""
+                    elif no.name == 'th' and label not in por_th and label not in th_pendentes:
+                        th_pendentes.append(label)
+
+        elif isinstance(no, NavigableString) and ':' in no:
+            for label, rotulo in rotulos_texto:
+                if label not in por_texto and rotulo in no:
+                    partes = no.strip().split(':', 1)
+                    por_texto[label] = partes[1].strip() if len(partes) > 1 else ""
+
+    indice = {}
+    for label in labels:
+        for abordagem in (por_strong, por_th, por_texto):
+            valor = abordagem.get(label)
+            if valor:
+                indice[label] = valor
+                break
+    return indice
+
+
+def analisar_detalhes_html(html, parser='html.parser'):
+    """
+    Analisa o HTML da página de detalhes com BeautifulSoup
+
+    Args:
+        html (str): HTML da página de detalhes
+        parser (str): Parser usado pelo BeautifulSoup
+
+    Returns:
+        tuple: (dados detalhados com 'Documentos' e 'Links_Documentos', texto completo da página)
+    """
+    soup = BeautifulSoup(html, parser)
+
+    # 1. Buscar rótulos específicos em uma única passagem pelo documento
+    dados_detalhados = indexar_rotulos(soup)
+
+    # 2. Buscar atividade principal especificamente (comum em processos de licenciamento)
+    if 'Atividade Principal' not in dados_detalhados:
+        # Procurar em tabelas de atividades
+        tabela_atividades = soup.find('table', class_=lambda c: 'atividade' in c.lower() if c else False)
+        if not tabela_atividades:
+            # Tentar encontrar qualquer tabela que pareça conter atividades
+            tabelas = soup.find_all('table')
+            for tabela in tabelas:
+                if tabela.find(string=lambda t: 'atividade' in t.lower() if t else False):
+                    tabela_atividades = tabela
+                    break
+
+        if tabela_atividades:
+            # Pegar a primeira linha de dados (presumindo que a primeira é cabeçalho)
+            linhas = tabela_atividades.find_all('tr')
+            if len(linhas) > 1:
+                colunas = linhas[1].find_all('td')
+                if colunas:
+                    # Geralmente a primeira coluna contém a descrição da atividade
+                    dados_detalhados['Atividade Principal'] = colunas[0].get_text(strip=True)
+
+    # 3. Extrair documentos (para avaliar EIA/RIMA ou RCA)
+    documentos = []
+    links_documentos = []
+
+    # Procurar seção de documentos pelo título explícito; sem título, considerar todos os links
+    titulo_docs = soup.find(['h2', 'h3', 'h4', 'div'], string=lambda t: 'documentos' in t.lower() if t else False)
+    secao_documentos = titulo_docs.parent if titulo_docs else soup
+
+    for link in secao_documentos.find_all('a'):
+        href = link.get('href')
+        texto = link.get_text(strip=True)
+
+        if texto and href:
+            documentos.append(texto)
+            links_documentos.append(href)
+
+    dados_detalhados["Documentos"] = documentos
+    dados_detalhados["Links_Documentos"] = links_documentos
+    return dados_detalhados, soup.get_text()
+
+
+def completar_detalhes(dados_detalhados, texto_pagina):
+    """
+    Acrescenta aos dados detalhados o tipo de estudo e o motivo, pelos documentos e pelo texto da página
+    """
+    tipo_estudo, motivo_estudo = identificar_tipo_estudo(
+        dados_detalhados["Documentos"],
+        texto_pagina,
+        dados_detalhados.get("Atividade Principal", ""),
+        dados_detalhados.get("Classe predominante", "")
+    )
+
+    dados_detalhados["Tipo de Estudo"] = tipo_estudo
+    dados_detalhados["motivo_estudo"] = motivo_estudo
+    return dados_detalhados
+
+
+def extrair_detalhes_html(html, parser='html.parser', motor=None):
+    """
+    Extrai os dados detalhados de um processo a partir do HTML da página de detalhes
+
+    Args:
+        html (str): HTML da página de detalhes
+        parser (str): Parser usado pelo BeautifulSoup
+        motor (MotorHTML): Motor de análise HTML (motores_html); se informado, substitui o BeautifulSoup
+
+    Returns:
+        dict: Dados detalhados, incluindo documentos, 'Tipo de Estudo' e 'motivo_estudo'
+    """
+    if motor is not None:
+        dados_detalhados, texto_pagina = motor.analisar_detalhes(html)
+    else:
+        dados_detalhados, texto_pagina = analisar_detalhes_html(html, parser)
+    return completar_detalhes(dados_detalhados, texto_pagina)
+
+
+def _primeiro_link(elem):
+    """Retorna o primeiro href não vazio dentro do elemento"""
+    for link in elem.find_all('a'):
+        href = link.get('href')
+        if href:
+            return href
+    return None
+
+
+def estrutura_tabela_html(html, parser='html.parser'):
+    """
+    Extrai cabeçalhos e células da primeira tabela do HTML
+
+    Formato equivalente ao retornado por JS_EXTRAIR_TABELA no navegador.
+
+    Args:
+        html (str): HTML da página de resultados
+        parser (str): Parser usado pelo BeautifulSoup
+
+    Returns:
+        dict: {'cabecalhos': [...], 'linhas': [[{'texto', 'href'}, ...], ...], 'primeira_linha_cabecalho': bool}
+              ou None se a página não tiver tabela
+    """
+    soup = BeautifulSoup(html, parser)
+    tabela = soup.find('table')
+    if not tabela:
+        return None
+
+    linhas = tabela.find_all('tr')
+    cabecalhos_elem = tabela.find_all('th')
+    if not cabecalhos_elem and linhas:
+        cabecalhos_elem = linhas[0].find_all(['th', 'td'])
+
+    return {
+        "cabecalhos": [elem.get_text(strip=True) for elem in cabecalhos_elem],
+        "linhas": [
+            [{"texto": celula.get_text(strip=True), "href": _primeiro_link(celula)}
+             for celula in linha.find_all(['td', 'th'])]
+            for linha in linhas
+        ],
+        "primeira_linha_cabecalho": bool(linhas) and bool(linhas[0].find_all('th')),
+    }
+
+
+def registros_tabela(estrutura):
+    """
+    Converte a estrutura da tabela de resultados em registros
+
+    Args:
+        estrutura (dict): Saída de JS_EXTRAIR_TABELA ou de estrutura_tabela_html
+
+    Returns:
+        list: Registros (dicts) com as colunas da tabela, link_detalhes e tipo_de_estudo
+    """
+    resultados = []
+
+    cabecalhos = []
+    for texto in estrutura["cabecalhos"]:
+        cabecalhos.append(texto if texto else f"coluna_{len(cabecalhos)}")
+
+    linhas = estrutura["linhas"]
+
+    # Se não encontrou cabeçalhos, criar genéricos
+    if not cabecalhos:
+        logger.warning("Cabeçalhos não encontrados, criando genéricos")
+        max_cols = max((len(celulas) for celulas in linhas), default=0)
+        cabecalhos = [f"coluna_{i}" for i in range(max_cols)]
+
+    logger.debug("Cabeçalhos extraídos: %s", cabecalhos)
+
+    # Determinar qual linha começar (pular cabeçalho se existir)
+    inicio = 1 if estrutura["primeira_linha_cabecalho"] else 0
+
+    if len(linhas) <= inicio:
+        logger.warning("Nenhuma linha de dados encontrada na tabela")
+        return []
+
+    for i, colunas in enumerate(linhas[inicio:], 1):
+        # Se a linha não tem colunas, pular
+        if not colunas:
+            continue
+
+        if len(colunas) == 1 and len(cabecalhos) > 1:
+            # Formato irregular: uma única célula com a classe/tipo de estudo
+            resultado = {"classe_predominante": colunas[0]["texto"]}
+            if colunas[0]["href"]:
+                resultado["link_detalhes"] = colunas[0]["href"]
+        else:
+            resultado = {}
+            for j, coluna in enumerate(colunas):
+                # Obter chave do cabeçalho (ou usar índice se não houver chave correspondente)
+                chave = cabecalhos[j].replace(' ', '_').lower() if j < len(cabecalhos) else f"coluna_{j}"
+                resultado[chave] = coluna["texto"]
+                if coluna["href"]:
+                    resultado["link_detalhes"] = coluna["href"]
+
+        # Identificar o tipo de estudo pelo texto da classe ou pela atividade principal
+        resultado["tipo_de_estudo"] = tipo_estudo_registro(resultado)
+
+        logger.debug("Dados extraídos da linha %d: %s", i, list(resultado))
+        resultados.append(resultado)
+
+    return resultados
@@ -0,0 +1,448 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Fila de tarefas da coleta distribuída Ecosistemas.
+O coordenador enfileira tarefas (faixas de páginas e links de detalhes) e os workers, em uma ou
+várias máquinas, as arrendam por um tempo limitado, processam e confirmam. Um arrendamento que
+expira sem confirmação volta para a fila. Cada tarefa tem uma chave única, então enfileirar de
+novo a mesma faixa ou o mesmo processo não gera trabalho repetido.
+
+Backends:
+    - FilaSQLite: banco SQLite local (um host, vários processos)
+    - ServidorFila / FilaTCP: a mesma fila servida por TCP para workers de outras máquinas
+      (e usada nos testes como substituto local de um serviço de filas)
+
+Use abrir_fila("sqlite:///caminho.db") ou abrir_fila("tcp://host:porta").
+"""
+
+import json
+import logging
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+logger = logging.getLogger("coletor_ecosistemas.fila")
+
+PENDENTE = "pendente"
+ARRENDADA = "arrendada"
+CONCLUIDA = "concluida"
+FALHOU = "falhou"
+ESTADOS = [PENDENTE, ARRENDADA, CONCLUIDA, FALHOU]
+
+# Tipos de tarefa
+PAGINAS = "paginas"
+DETALHE = "detalhe"
+
+DURACAO_ARRENDAMENTO = 300
+MAX_TENTATIVAS = 3
+
+
+class Tarefa(namedtuple("Tarefa", "id tipo chave carga tentativas")):
+    """Tarefa arrendada: carga é o dicionário enfileirado pelo coordenador"""
+
+
+class FilaSQLite:
+    def __init__(self, caminho="ecosistemas_fila.db", max_tentativas=MAX_TENTATIVAS):
+        """
+        Abre (ou cria) a fila em um banco SQLite
+
+        Args:
+            caminho (str): Arquivo SQLite da fila
+            max_tentativas (int): Arrendamentos de uma tarefa antes de ela ser marcada como falha
+        """
+        self.caminho = caminho
+        self.max_tentativas = max_tentativas
+        # isolation_level=None: as transações são abertas com BEGIN IMMEDIATE, para que dois
+        # workers nunca arrendem a mesma tarefa
+        self.conexao = sqlite3.connect(caminho, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS tarefas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tipo TEXT NOT NULL,
+                chave TEXT NOT NULL UNIQUE,
+                carga TEXT NOT NULL,
+                estado TEXT NOT NULL DEFAULT 'pendente',
+                tentativas INTEGER NOT NULL DEFAULT 0,
+                arrendatario TEXT,
+                expira_em REAL,
+                resultado TEXT,
+                erro TEXT,
+                atualizado_em REAL
+            );
+            CREATE INDEX IF NOT EXISTS tarefas_estado ON tarefas (estado, tipo, id);
+            CREATE TABLE IF NOT EXISTS controle (
+                nome TEXT PRIMARY KEY,
+                valor TEXT
+            );
+        """)
+
+    def _transacao(self, funcao):
+        with self._lock:
+            self.conexao.execute("BEGIN IMMEDIATE")
+            try:
+                resultado = funcao(self.conexao)
+                self.conexao.execute("COMMIT")
+                return resultado
+            except Exception:
+                self.conexao.execute("ROLLBACK")
+                raise
+
+    def enfileirar(self, tipo, chave, carga):
+        """
+        Enfileira uma tarefa, se a chave ainda não estiver na fila
+
+        Args:
+            tipo (str): Tipo da tarefa (ex: "paginas", "detalhe")
+            chave (str): Identificação única (ex: "detalhe:1234/2021")
+            carga (dict): Dados da tarefa (serializáveis em JSON)
+
+        Returns:
+            bool: True se a tarefa foi enfileirada, False se a chave já existia
+        """
+        def inserir(conexao):
+            cursor = conexao.execute(
+                "INSERT OR IGNORE INTO tarefas (tipo, chave, carga, atualizado_em) VALUES (?, ?, ?, ?)",
+                (tipo, chave, json.dumps(carga, ensure_ascii=False, default=str), time.time())
+            )
+            return cursor.rowcount > 0
+        return self._transacao(inserir)
+
+    def arrendar(self, arrendatario, duracao=DURACAO_ARRENDAMENTO, tipos=None):
+        """
+        Arrenda a próxima tarefa disponível: pendente ou com arrendamento expirado
+
+        Tarefas de detalhe são preferidas às de páginas, para que os registros já listados sejam
+        concluídos antes de novas páginas serem abertas.
+
+        Args:
+            arrendatario (str): Identificação do worker (ex: "host:pid")
+            duracao (float): Segundos até o arrendamento expirar sem confirmação
+            tipos (list): Tipos aceitos pelo worker (padrão: todos)
+
+        Returns:
+            Tarefa: Tarefa arrendada, ou None se não houver tarefa disponível
+        """
+        def arrendar(conexao):
+            agora = time.time()
+            # Arrendamentos expirados de tarefas que já esgotaram as tentativas viram falha
+            conexao.execute(
+                "UPDATE tarefas SET estado = ?, erro = 'arrendamento expirado', atualizado_em = ? "
+                "WHERE estado = ? AND expira_em < ? AND tentativas >= ?",
+                (FALHOU, agora, ARRENDADA, agora, self.max_tentativas)
+            )
+            consulta = ("SELECT id, tipo, chave, carga, tentativas FROM tarefas "
+                        "WHERE (estado = ? OR (estado = ? AND expira_em < ?))")
+            parametros = [PENDENTE, ARRENDADA, agora]
+            if tipos:
+                consulta += f" AND tipo IN ({', '.join('?' for _ in tipos)})"
+                parametros.extend(tipos)
+            consulta += " ORDER BY CASE tipo WHEN ? THEN 0 ELSE 1 END, id LIMIT 1"
+            linha = conexao.execute(consulta, parametros + [DETALHE]).fetchone()
+            if linha is None:
+                return None
+            identificador, tipo, chave, carga, tentativas = linha
+            conexao.execute(
+                "UPDATE tarefas SET estado = ?, arrendatario = ?, expira_em = ?, tentativas = tentativas + 1, "
+                "atualizado_em = ? WHERE id = ?",
+                (ARRENDADA, arrendatario, agora + duracao, agora, identificador)
+            )
+            return Tarefa(identificador, tipo, chave, json.loads(carga), tentativas + 1)
+        return self._transacao(arrendar)
+
+    def renovar(self, tarefa_id, arrendatario, duracao=DURACAO_ARRENDAMENTO):
+        """
+        Prorroga o arrendamento de uma tarefa longa
+
+        Returns:
+            bool: False se o arrendamento já expirou e a tarefa foi arrendada por outro worker
+        """
+        def renovar(conexao):
+            cursor = conexao.execute(
+                "UPDATE tarefas SET expira_em = ?, atualizado_em = ? WHERE id = ? AND estado = ? AND arrendatario = ?",
+                (time.time() + duracao, time.time(), tarefa_id, ARRENDADA, arrendatario)
+            )
+            return cursor.rowcount > 0
+        return self._transacao(renovar)
+
+    def confirmar(self, tarefa_id, arrendatario, resultado=None):
+        """
+        Confirma a conclusão de uma tarefa e guarda o resultado
+
+        Returns:
+            bool: False se o arrendamento não pertence mais ao worker (o resultado é descartado)
+        """
+        def confirmar(conexao):
+            cursor = conexao.execute(
+                "UPDATE tarefas SET estado = ?, resultado = ?, expira_em = NULL, atualizado_em = ? "
+                "WHERE id = ? AND estado = ? AND arrendatario = ?",
+                (CONCLUIDA, json.dumps(resultado, ensure_ascii=False, default=str), time.time(),
+                 tarefa_id, ARRENDADA, arrendatario)
+            )
+            return cursor.rowcount > 0
+        confirmada = self._transacao(confirmar)
+        if not confirmada:
+            logger.warning(f"Confirmação da tarefa {tarefa_id} ignorada: o arrendamento de {arrendatario} expirou")
+        return confirmada
+
+    def falhar(self, tarefa_id, arrendatario, erro=""):
+        """
+        Devolve uma tarefa que falhou: volta para a fila ou, esgotadas as tentativas, fica como falha
+
+        Returns:
+            bool: False se o arrendamento não pertence mais ao worker
+        """
+        def falhar(conexao):
+            cursor = conexao.execute(
+                "UPDATE tarefas SET estado = CASE WHEN tentativas >= ? THEN ? ELSE ? END, erro = ?, "
+                "arrendatario = NULL, expira_em = NULL, atualizado_em = ? WHERE id = ? AND estado = ? AND arrendatario = ?",
+                (self.max_tentativas, FALHOU, PENDENTE, str(erro), time.time(), tarefa_id, ARRENDADA, arrendatario)
+            )
+            return cursor.rowcount > 0
+        return self._transacao(falhar)
+
+    def fechar_enfileiramento(self):
+        """Marca que o coordenador terminou de enfileirar as tarefas iniciais"""
+        self._transacao(lambda conexao: conexao.execute(
+            "INSERT OR REPLACE INTO controle (nome, valor) VALUES ('enfileiramento_fechado', '1')"
+        ))
+
+    def contagem(self):
+        """
+        Returns:
+            dict: Número de tarefas por estado (arrendamentos expirados contam como pendentes)
+        """
+        with self._lock:
+            agora = time.time()
+            contagem = dict.fromkeys(ESTADOS, 0)
+            for estado, expirada, quantidade in self.conexao.execute(
+                "SELECT estado, estado = ? AND expira_em < ?, COUNT(*) FROM tarefas GROUP BY 1, 2", (ARRENDADA, agora)
+            ):
+                contagem[PENDENTE if expirada else estado] += quantidade
+            return contagem
+
+    def concluida(self):
+        """Indica se o enfileiramento foi fechado e não há tarefas pendentes nem arrendadas"""
+        with self._lock:
+            fechado = self.conexao.execute(
+                "SELECT valor FROM controle WHERE nome = 'enfileiramento_fechado'"
+            ).fetchone()
+        if not fechado:
+            return False
+        contagem = self.contagem()
+        return contagem[PENDENTE] == 0 and contagem[ARRENDADA] == 0
+
+    def resultados(self, tipo):
+        """
+        Returns:
+            list: Pares (carga, resultado) das tarefas concluídas do tipo, na ordem de enfileiramento
+        """
+        with self._lock:
+            linhas = self.conexao.execute(
+                "SELECT carga, resultado FROM tarefas WHERE tipo = ? AND estado = ? ORDER BY id", (tipo, CONCLUIDA)
+            ).fetchall()
+        return [(json.loads(carga), json.loads(resultado)) for carga, resultado in linhas]
+
+    def falhas(self):
+        """
+        Returns:
+            list: Pares (chave, erro) das tarefas que esgotaram as tentativas
+        """
+        with self._lock:
+            return [tuple(linha) for linha in self.conexao.execute(
+                "SELECT chave, erro FROM tarefas WHERE estado = ? ORDER BY id", (FALHOU,)
+            )]
+
+    def fechar(self):
+        self.conexao.close()
+
+
+# Métodos da fila disponíveis para os clientes TCP
+METODOS_REMOTOS = ["enfileirar", "arrendar", "renovar", "confirmar", "falhar", "fechar_enfileiramento",
+                   "contagem", "concluida", "resultados", "falhas"]
+
+
+class _ManipuladorFila(socketserver.StreamRequestHandler):
+    """Atende um cliente: uma requisição JSON por linha e uma resposta JSON por linha"""
+
+    def handle(self):
+        for linha in self.rfile:
+            try:
+                requisicao = json.loads(linha)
+                metodo = requisicao.get("metodo")
+                if metodo not in METODOS_REMOTOS:
+                    raise ValueError(f"Método desconhecido: {metodo}")
+                resultado = getattr(self.server.fila, metodo)(**requisicao.get("argumentos", {}))
+                resposta = {"ok": True, "resultado": resultado}
+            except Exception as e:
+                resposta = {"ok": False, "erro": str(e)}
+            self.wfile.write((json.dumps(resposta, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class _ServidorTCP(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ServidorFila:
+    """
+    Servidor TCP de uma fila (FilaSQLite), executado em uma thread separada
+
+    Pode ser usado como gerenciador de contexto:
+
+        with ServidorFila(FilaSQLite("fila.db"), porta=8766) as servidor:
+            fila = FilaTCP(servidor.endereco)
+    """
+
+    def __init__(self, fila, host="127.0.0.1", porta=0):
+        """
+        Args:
+            fila (FilaSQLite): Fila servida
+            host (str): Endereço de escuta ("0.0.0.0" para aceitar workers de outras máquinas)
+            porta (int): Porta de escuta (0 escolhe uma porta livre)
+        """
+        self.fila = fila
+        self.servidor = _ServidorTCP((host, porta), _ManipuladorFila)
+        self.servidor.fila = fila
+        self.thread = None
+
+    @property
+    def endereco(self):
+        host, porta = self.servidor.server_address[:2]
+        return f"tcp://{host}:{porta}"
+
+    def iniciar(self):
+        """Inicia o servidor em segundo plano e retorna o endereço da fila"""
+        self.thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Fila disponível em {self.endereco}")
+        return self.endereco
+
+    def parar(self):
+        """Encerra o servidor (a fila continua aberta)"""
+        self.servidor.shutdown()
+        self.servidor.server_close()
+        logger.info("Servidor da fila encerrado")
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.parar()
+        return False
+
+
+class FilaTCP:
+    def __init__(self, endereco, timeout=60, max_tentativas_conexao=3):
+        """
+        Cliente de uma fila servida por ServidorFila, com a mesma interface de FilaSQLite
+
+        Args:
+            endereco (str): "tcp://host:porta" ou "host:porta"
+            timeout (float): Tempo máximo de cada chamada, em segundos
+            max_tentativas_conexao (int): Tentativas de reconectar quando a conexão cai
+        """
+        host, _, porta = endereco.replace("tcp://", "").rpartition(":")
+        self.endereco = (host, int(porta))
+        self.timeout = timeout
+        self.max_tentativas_conexao = max_tentativas_conexao
+        self._lock = threading.Lock()
+        self._socket = None
+        self._arquivo = None
+
+    def _conectar(self):
+        self._socket = socket.create_connection(self.endereco, timeout=self.timeout)
+        self._arquivo = self._socket.makefile("rwb")
+
+    def _desconectar(self):
+        for recurso in (self._arquivo, self._socket):
+            try:
+                if recurso:
+                    recurso.close()
+            except Exception:
+                pass
+        self._socket = self._arquivo = None
+
+    def _chamar(self, metodo, **argumentos):
+        requisicao = (json.dumps({"metodo": metodo, "argumentos": argumentos}, ensure_ascii=False,
+                                 default=str) + "\n").encode("utf-8")
+        with self._lock:
+            for tentativa in range(1, self.max_tentativas_conexao + 1):
+                try:
+                    if self._socket is None:
+                        self._conectar()
+                    self._arquivo.write(requisicao)
+                    self._arquivo.flush()
+                    linha = self._arquivo.readline()
+                    if not linha:
+                        raise ConnectionError("conexão encerrada pelo servidor da fila")
+                    break
+                except (OSError, ConnectionError) as e:
+                    self._desconectar()
+                    if tentativa == self.max_tentativas_conexao:
+                        raise
+                    logger.warning(f"Falha na conexão com a fila ({str(e)}). Reconectando...")
+                    time.sleep(tentativa)
+        resposta = json.loads(linha)
+        if not resposta.get("ok"):
+            raise RuntimeError(f"Erro na fila ({metodo}): {resposta.get('erro')}")
+        return resposta.get("resultado")
+
+    def enfileirar(self, tipo, chave, carga):
+        return self._chamar("enfileirar", tipo=tipo, chave=chave, carga=carga)
+
+    def arrendar(self, arrendatario, duracao=DURACAO_ARRENDAMENTO, tipos=None):
+        tarefa = self._chamar("arrendar", arrendatario=arrendatario, duracao=duracao, tipos=tipos)
+        return Tarefa(*tarefa) if tarefa else None
+
+    def renovar(self, tarefa_id, arrendatario, duracao=DURACAO_ARRENDAMENTO):
+        return self._chamar("renovar", tarefa_id=tarefa_id, arrendatario=arrendatario, duracao=duracao)
+
+    def confirmar(self, tarefa_id, arrendatario, resultado=None):
+        return self._chamar("confirmar", tarefa_id=tarefa_id, arrendatario=arrendatario, resultado=resultado)
+
+    def falhar(self, tarefa_id, arrendatario, erro=""):
+        return self._chamar("falhar", tarefa_id=tarefa_id, arrendatario=arrendatario, erro=str(erro))
+
+    def fechar_enfileiramento(self):
+        return self._chamar("fechar_enfileiramento")
+
+    def contagem(self):
+        return self._chamar("contagem")
+
+    def concluida(self):
+        return self._chamar("concluida")
+
+    def resultados(self, tipo):
+        return [tuple(par) for par in self._chamar("resultados", tipo=tipo)]
+
+    def falhas(self):
+        return [tuple(par) for par in self._chamar("falhas")]
+
+    def fechar(self):
+        with self._lock:
+            self._desconectar()
+
+
+def abrir_fila(endereco, max_tentativas=MAX_TENTATIVAS):
+    """
+    Abre a fila pelo endereço
+
+    Args:
+        endereco (str): "sqlite:///caminho.db" (ou apenas o caminho) ou "tcp://host:porta"
+        max_tentativas (int): Arrendamentos de uma tarefa antes da falha (fila SQLite)
+
+    Returns:
+        FilaSQLite ou FilaTCP
+    """
+    if endereco.startswith("tcp://"):
+        return FilaTCP(endereco)
+    caminho = endereco[len("sqlite:///"):] if endereco.startswith("sqlite:///") else endereco
+    return FilaSQLite(caminho, max_tentativas=max_tentativas)
@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Filtros da pesquisa Ecosistemas.
+Um FiltroPesquisa descreve a pesquisa por classe predominante, município, regional, modalidade
+e período. O formulário do portal aceita um valor por campo, então filtros com vários valores
+(ex: classes 3 a 6 em vários municípios) são divididos por planejar_particoes em partições
+independentes, uma por combinação de valores (e por ano, no caso de períodos longos), que podem
+ser coletadas em paralelo (ver coleta_particionada.py).
+"""
+
+import itertools
+import logging
+import re
+import unicodedata
+from collections import namedtuple
+from datetime import date
+
+logger = logging.getLogger("coletor_ecosistemas.filtros")
+
+CLASSES = range(1, 7)
+
+# Campos do formulário de pesquisa: rótulos procurados nos <label> e trechos procurados em
+# placeholder, name, id, formcontrolname e aria-label do campo (sem acentos, em minúsculas)
+CAMPOS_FORMULARIO = {
+    "classe": (["Classe predominante", "Classe"], ["classe"]),
+    "municipio": (["Município"], ["municipio"]),
+    "regional": (["Regional", "Supram", "Unidade regional"], ["regional", "supram"]),
+    "modalidade": (["Modalidade"], ["modalidade"]),
+    "data_inicio": (["Data inicial", "Data de início", "Data início", "Período de"],
+                    ["datainicio", "datainicial", "dtinicio", "periodoinicio"]),
+    "data_fim": (["Data final", "Data de fim", "Data fim", "Período até"],
+                 ["datafim", "datafinal", "dtfim", "periodofim"]),
+}
+
+# Localiza o campo do formulário pelo rótulo e, se não houver rótulo, pelos atributos do campo
+JS_CAMPO_FILTRO = """
+const rotulos = arguments[0], chaves = arguments[1];
+const normalizar = t => (t || '').normalize('NFD').replace(/[\\u0300-\\u036f]/g, '').toLowerCase().replace(/\\s+/g, ' ').trim();
+const CAMPOS = 'input:not([type=hidden]):not([type=checkbox]):not([type=radio]):not([type=button]):not([type=submit]), select';
+for (const rotulo of rotulos.map(normalizar)) {
+    for (const label of document.querySelectorAll('label')) {
+        if (!normalizar(label.textContent).includes(rotulo)) continue;
+        let campo = label.htmlFor ? document.getElementById(label.htmlFor) : null;
+        if (!campo || !campo.matches(CAMPOS)) campo = label.querySelector(CAMPOS);
+        for (let irmao = label.nextElementSibling; !campo && irmao && irmao.tagName !== 'LABEL'; irmao = irmao.nextElementSibling) {
+            campo = irmao.matches(CAMPOS) ? irmao : irmao.querySelector(CAMPOS);
+        }
+        if (campo) return campo;
+    }
+}
+for (const campo of document.querySelectorAll(CAMPOS)) {
+    const atributos = normalizar([campo.placeholder, campo.name, campo.id, campo.getAttribute('formcontrolname'),
+                                  campo.getAttribute('aria-label')].join(' ')).replace(/[\\s_-]/g, '');
+    if (chaves.some(chave => atributos.includes(chave))) return campo;
+}
+return null;
+"""
+
+# Escolhe a opção de um <select> nativo pelo texto (ou valor) e avisa o Angular da mudança
+JS_ESCOLHER_OPCAO_SELECT = """
+const campo = arguments[0];
+const normalizar = t => (t || '').normalize('NFD').replace(/[\\u0300-\\u036f]/g, '').toLowerCase().replace(/\\s+/g, ' ').trim();
+const alvo = normalizar(arguments[1]);
+const opcoes = Array.from(campo.options);
+const opcao = opcoes.find(o => normalizar(o.text) === alvo || normalizar(o.value) === alvo)
+    || opcoes.find(o => normalizar(o.text).includes(alvo));
+if (!opcao) return false;
+campo.value = opcao.value;
+campo.dispatchEvent(new Event('change', {bubbles: true}));
+return true;
+"""
+
+# Clica na opção correspondente de uma lista suspensa/autocomplete aberta após digitar o valor.
+# Valores numéricos (ex: classe) só aceitam a opção exata, para "1" não escolher "10".
+JS_SELECIONAR_OPCAO = """
+const normalizar = t => (t || '').normalize('NFD').replace(/[\\u0300-\\u036f]/g, '').toLowerCase().replace(/\\s+/g, ' ').trim();
+const alvo = normalizar(arguments[0]);
+const exato = /^\\d+$/.test(alvo);
+const opcoes = Array.from(document.querySelectorAll(
+    "mat-option, [role='option'], .p-autocomplete-item, .p-dropdown-item, .ng-option, .dropdown-item, .autocomplete-item"
+)).filter(el => el.offsetParent !== null);
+const texto = el => normalizar(el.textContent);
+const opcao = opcoes.find(el => texto(el) === alvo)
+    || (exato ? null : opcoes.find(el => texto(el).startsWith(alvo)) || opcoes.find(el => texto(el).includes(alvo)));
+if (!opcao) return false;
+opcao.scrollIntoView({block: 'center'});
+opcao.click();
+return true;
+"""
+
+_PADRAO_DATA = re.compile(r'^\s*(\d{1,2})/(\d{1,2})/(\d{4})\s*$')
+_PADRAO_ANO = re.compile(r'^\s*(\d{4})\s*$')
+
+
+def _sem_acentos(texto):
+    return unicodedata.normalize("NFD", texto).encode("ascii", "ignore").decode("ascii")
+
+
+def _trecho_arquivo(texto):
+    """Trecho de nome de arquivo: sem acentos, em minúsculas, apenas letras, números e '-'"""
+    return re.sub(r'[^a-z0-9]+', '-', _sem_acentos(str(texto)).lower()).strip('-')
+
+
+class FiltroPesquisa(namedtuple("FiltroPesquisa", "classes municipios regionais modalidades data_inicio data_fim",
+                                defaults=((), (), (), (), None, None))):
+    """
+    Filtro da pesquisa de processos
+
+    classes, municipios, regionais e modalidades são tuplas (vazias = sem filtro no campo);
+    data_inicio e data_fim são datas (date) ou None.
+    """
+
+    @property
+    def particao_unica(self):
+        """Indica se o filtro tem no máximo um valor por campo (pode ser aplicado direto no formulário)"""
+        return all(len(valores) <= 1 for valores in (self.classes, self.municipios, self.regionais, self.modalidades))
+
+    def identificacao(self):
+        """
+        Identificação estável do filtro, usada como chave do checkpoint
+
+        O filtro só de Classe 6 mantém a identificação das coletas anteriores ("classe_predominante=6").
+        """
+        partes = []
+        for nome, valores in (("classe_predominante", self.classes), ("municipio", self.municipios),
+                              ("regional", self.regionais), ("modalidade", self.modalidades)):
+            if valores:
+                partes.append(f"{nome}={','.join(str(valor) for valor in valores)}")
+        if self.data_inicio:
+            partes.append(f"data_inicio={self.data_inicio.isoformat()}")
+        if self.data_fim:
+            partes.append(f"data_fim={self.data_fim.isoformat()}")
+        return "&".join(partes) or "sem_filtro"
+
+    def sufixo_arquivo(self):
+        """Trecho curto para nomes de arquivo da partição (ex: "classe6_itabira_2021")"""
+        partes = []
+        if self.classes:
+            partes.append("classe" + "-".join(str(classe) for classe in self.classes))
+        partes.extend(_trecho_arquivo(valor) for valor in self.municipios + self.regionais + self.modalidades)
+        if self.data_inicio or self.data_fim:
+            inicio, fim = self.data_inicio, self.data_fim
+            if (inicio and fim and inicio.year == fim.year and (inicio.month, inicio.day) == (1, 1)
+                    and (fim.month, fim.day) == (12, 31)):
+                partes.append(str(inicio.year))
+            else:
+                partes.append(f"{inicio.strftime('%Y%m%d') if inicio else ''}-{fim.strftime('%Y%m%d') if fim else ''}")
+        return "_".join(partes) or "todos"
+
+    def descrever(self):
+        """Descrição legível do filtro (ex: "Classe 6, município Itabira, de 01/01/2021 a 31/12/2021")"""
+        partes = []
+        if self.classes:
+            rotulo = "Classe" if len(self.classes) == 1 else "Classes"
+            partes.append(f"{rotulo} {', '.join(str(classe) for classe in self.classes)}")
+        for rotulo, valores in (("município", self.municipios), ("regional", self.regionais),
+                                ("modalidade", self.modalidades)):
+            if valores:
+                partes.append(f"{rotulo} {', '.join(valores)}")
+        periodo = []
+        if self.data_inicio:
+            periodo.append(f"de {self.data_inicio.strftime('%d/%m/%Y')}")
+        if self.data_fim:
+            periodo.append(f"{'a' if self.data_inicio else 'até'} {self.data_fim.strftime('%d/%m/%Y')}")
+        if periodo:
+            partes.append(" ".join(periodo))
+        return ", ".join(partes) or "sem filtro"
+
+    def campos_formulario(self):
+        """
+        Valores a preencher no formulário de pesquisa
+
+        Returns:
+            list: Pares (campo de CAMPOS_FORMULARIO, texto a digitar)
+
+        Raises:
+            ValueError: Se algum campo tiver mais de um valor (use planejar_particoes)
+        """
+        if not self.particao_unica:
+            raise ValueError(f"O formulário aceita um valor por campo: divida o filtro ({self.descrever()}) "
+                             f"com planejar_particoes")
+        campos = []
+        for campo, valores in (("classe", self.classes), ("municipio", self.municipios),
+                               ("regional", self.regionais), ("modalidade", self.modalidades)):
+            if valores:
+                campos.append((campo, str(valores[0])))
+        if self.data_inicio:
+            campos.append(("data_inicio", self.data_inicio.strftime('%d/%m/%Y')))
+        if self.data_fim:
+            campos.append(("data_fim", self.data_fim.strftime('%d/%m/%Y')))
+        return campos
+
+    def parametros_api(self):
+        """Parâmetros da pesquisa na API de acesso de visitante (campos com vários valores viram listas)"""
+        parametros = {}
+        for nome, valores in (("classe", self.classes), ("municipio", self.municipios),
+                              ("regional", self.regionais), ("modalidade", self.modalidades)):
+            if valores:
+                parametros[nome] = str(valores[0]) if len(valores) == 1 else [str(valor) for valor in valores]
+        if self.data_inicio:
+            parametros["dataInicio"] = self.data_inicio.isoformat()
+        if self.data_fim:
+            parametros["dataFim"] = self.data_fim.isoformat()
+        return parametros
+
+    def como_dicionario(self):
+        """Dicionário serializável em JSON (ex: carga de uma tarefa da fila distribuída)"""
+        dados = {campo: list(valores) for campo, valores in zip(self._fields[:4], self[:4])}
+        dados["data_inicio"] = self.data_inicio.isoformat() if self.data_inicio else None
+        dados["data_fim"] = self.data_fim.isoformat() if self.data_fim else None
+        return dados
+
+    @classmethod
+    def de_dicionario(cls, dados):
+        """Reconstrói o filtro a partir de como_dicionario"""
+        datas = [date.fromisoformat(dados[campo]) if dados.get(campo) else None for campo in ("data_inicio", "data_fim")]
+        return cls(*(tuple(dados.get(campo) or ()) for campo in cls._fields[:4]), *datas)
+
+
+FILTRO_CLASSE_6 = FiltroPesquisa(classes=(6,))
+
+
+def interpretar_classes(texto):
+    """
+    Interpreta a lista de classes da linha de comando
+
+    Args:
+        texto (str): Classes e intervalos separados por vírgula (ex: "6", "3-6", "3,5-6")
+
+    Returns:
+        tuple: Classes em ordem crescente, sem repetição
+    """
+    classes = set()
+    for parte in str(texto).split(","):
+        parte = parte.strip()
+        if not parte:
+            continue
+        inicio, _, fim = parte.partition("-")
+        inicio = int(inicio)
+        fim = int(fim) if fim else inicio
+        if inicio > fim or inicio not in CLASSES or fim not in CLASSES:
+            raise ValueError(f"Classe inválida: {parte} (use valores de {CLASSES.start} a {CLASSES.stop - 1})")
+        classes.update(range(inicio, fim + 1))
+    return tuple(sorted(classes))
+
+
+def interpretar_lista(texto):
+    """Interpreta uma lista separada por vírgulas (ex: "Itabira, Mariana"), sem itens vazios ou repetidos"""
+    valores = []
+    for parte in str(texto or "").split(","):
+        parte = " ".join(parte.split())
+        if parte and parte not in valores:
+            valores.append(parte)
+    return tuple(valores)
+
+
+def _interpretar_data(texto, fim_do_ano=False):
+    match = _PADRAO_ANO.match(texto)
+    if match:
+        return date(int(match.group(1)), 12, 31) if fim_do_ano else date(int(match.group(1)), 1, 1)
+    match = _PADRAO_DATA.match(texto)
+    if match:
+        dia, mes, ano = (int(grupo) for grupo in match.groups())
+        return date(ano, mes, dia)
+    raise ValueError(f"Data inválida: {texto} (use AAAA ou DD/MM/AAAA)")
+
+
+def interpretar_periodo(texto):
+    """
+    Interpreta um período da linha de comando
+
+    Args:
+        texto (str): Ano ("2021"), intervalo de anos ("2019-2024") ou de datas ("01/03/2020-30/06/2021")
+
+    Returns:
+        tuple: (data_inicio, data_fim)
+    """
+    inicio, separador, fim = str(texto).partition("-")
+    data_inicio = _interpretar_data(inicio)
+    data_fim = _interpretar_data(fim if separador else inicio, fim_do_ano=True)
+    if data_fim < data_inicio:
+        raise ValueError(f"Período inválido: {texto} (o fim é anterior ao início)")
+    return data_inicio, data_fim
+
+
+def _anos(data_inicio, data_fim):
+    """Divide o período em intervalos de um ano-calendário"""
+    for ano in range(data_inicio.year, data_fim.year + 1):
+        yield max(data_inicio, date(ano, 1, 1)), min(data_fim, date(ano, 12, 31))
+
+
+def planejar_particoes(filtro, dividir_por_ano=True):
+    """
+    Divide o filtro em partições independentes, com no máximo um valor por campo
+
+    Cada combinação de classe, município, regional e modalidade vira uma partição; com
+    dividir_por_ano, um período com início e fim é dividido também em anos-calendário.
+    As partições não se sobrepõem, exceto por processos que aparecem em mais de uma pesquisa
+    do portal, removidos na mescla (coleta_particionada.mesclar_resultados).
+
+    Args:
+        filtro (FiltroPesquisa): Filtro completo da coleta
+        dividir_por_ano (bool): Se True, cria uma partição por ano do período
+
+    Returns:
+        list: Filtros (FiltroPesquisa) das partições, na ordem de coleta
+    """
+    periodos = [(filtro.data_inicio, filtro.data_fim)]
+    if dividir_por_ano and filtro.data_inicio and filtro.data_fim:
+        periodos = list(_anos(filtro.data_inicio, filtro.data_fim))
+
+    combinacoes = itertools.product(
+        [(classe,) for classe in filtro.classes] or [()],
+        [(municipio,) for municipio in filtro.municipios] or [()],
+        [(regional,) for regional in filtro.regionais] or [()],
+        [(modalidade,) for modalidade in filtro.modalidades] or [()],
+        periodos,
+    )
+    particoes = [
+        FiltroPesquisa(classe, municipio, regional, modalidade, data_inicio, data_fim)
+        for classe, municipio, regional, modalidade, (data_inicio, data_fim) in combinacoes
+    ]
+    logger.info(f"Filtro ({filtro.descrever()}) dividido em {len(particoes)} partições")
+    return particoes
@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Gravação e reprodução das páginas da coleta Ecosistemas.
+
+No modo de gravação, cada página de resultados e cada página de detalhes vista pelo coletor é
+arquivada como HTML comprimido (gzip), com os metadados em um índice JSON Lines; nas páginas de
+resultados também é guardada a estrutura da tabela devolvida pelo navegador (JS_EXTRAIR_TABELA).
+
+No modo de reprodução, ColetorReproducao oferece a mesma interface de ColetorEcosistemas, mas
+serve as páginas gravadas em vez de abrir o Chrome: extrair_dados_tabela, extrair_dados_detalhados,
+a classificação dos estudos e o salvamento rodam sem rede, sem esperas e de forma determinística,
+para testar e medir mudanças no parser e no pipeline.
+
+Uso:
+
+    python licencas_ambientais/executar_ecosistemas.py --max-paginas 5 --gravar gravacao_classe6
+    python licencas_ambientais/executar_ecosistemas.py --reproduzir gravacao_classe6 --parser lxml
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from artefatos_depuracao import ArtefatosDepuracao, DESLIGADO
+from coletor_ecosistemas import ColetorEcosistemas
+from extracao_html import JS_EXTRAIR_TABELA
+from metricas import cronometrar, ACESSO, NAVEGACAO_DETALHES, PAGINACAO
+from perfil_navegador import MedidorRede
+
+logger = logging.getLogger("coletor_ecosistemas.gravacao")
+
+TABELA = "tabela"
+DETALHE = "detalhe"
+
+ARQUIVO_INDICE = "indice.jsonl"
+
+
+def rota_pagina(url):
+    """Rota de uma URL da aplicação (parte após '#', ou o caminho), usada para localizar páginas gravadas"""
+    documento, separador, rota = (url or "").partition("#")
+    return rota if separador else documento.split("://", 1)[-1].partition("/")[2]
+
+
+class GravadorPaginas:
+    def __init__(self, diretorio="gravacao"):
+        """
+        Inicializa a gravação das páginas vistas pelo coletor
+
+        Args:
+            diretorio (str): Diretório da gravação (criado se não existir); páginas gravadas de
+                novo substituem as anteriores na reprodução
+        """
+        self.diretorio = diretorio
+        self.tabelas = 0
+        self.detalhes = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(diretorio, "paginas"), exist_ok=True)
+        logger.info(f"Gravando as páginas da coleta em {diretorio}")
+
+    def _gravar(self, nome, conteudo):
+        caminho = os.path.join("paginas", nome)
+        with gzip.open(os.path.join(self.diretorio, caminho), "wt", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+        return caminho
+
+    def _indexar(self, metadados):
+        metadados["gravado_em"] = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            with open(os.path.join(self.diretorio, ARQUIVO_INDICE), "a", encoding="utf-8") as arquivo:
+                arquivo.write(json.dumps(metadados, ensure_ascii=False) + "\n")
+
+    def gravar_tabela(self, pagina, html, estrutura=None, url=None):
+        """
+        Grava uma página de resultados
+
+        Args:
+            pagina (int): Número da página (None: a seguinte à última página gravada)
+            html (str): HTML da página (page_source)
+            estrutura (dict): Estrutura da tabela devolvida pelo navegador (None se veio do page_source)
+            url (str): URL da página
+        """
+        try:
+            with self._lock:
+                self.tabelas += 1
+                self.bytes += len(html)
+                pagina = pagina or self.tabelas
+            metadados = {"tipo": TABELA, "pagina": pagina, "url": url, "bytes": len(html),
+                         "arquivo": self._gravar(f"tabela_{pagina:04d}.html.gz", html)}
+            if estrutura:
+                metadados["estrutura"] = self._gravar(f"tabela_{pagina:04d}.estrutura.json.gz",
+                                                      json.dumps(estrutura, ensure_ascii=False))
+            self._indexar(metadados)
+        except Exception as e:
+            logger.warning(f"Erro ao gravar a página {pagina} de resultados: {str(e)}")
+
+    def gravar_detalhe(self, url, html):
+        """
+        Grava uma página de detalhes
+
+        Args:
+            url (str): URL da página de detalhes
+            html (str): HTML da página (page_source)
+        """
+        try:
+            with self._lock:
+                self.detalhes += 1
+                self.bytes += len(html)
+            nome = f"detalhe_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.html.gz"
+            self._indexar({"tipo": DETALHE, "url": url, "bytes": len(html), "arquivo": self._gravar(nome, html)})
+        except Exception as e:
+            logger.warning(f"Erro ao gravar a página de detalhes {url}: {str(e)}")
+
+    def resumo(self):
+        """Retorna uma linha com as páginas gravadas"""
+        return (f"Gravação: {self.tabelas} páginas de resultados e {self.detalhes} páginas de detalhes "
+                f"({self.bytes / 1024 / 1024:.1f} MB de HTML) em {self.diretorio}")
+
+
+class GravacaoPaginas:
+    def __init__(self, diretorio):
+        """
+        Abre uma gravação feita por GravadorPaginas
+
+        Args:
+            diretorio (str): Diretório da gravação
+        """
+        self.diretorio = diretorio
+        self.tabelas = {}
+        self.detalhes = {}
+        self.rotas = {}
+        caminho = os.path.join(diretorio, ARQUIVO_INDICE)
+        if not os.path.exists(caminho):
+            raise FileNotFoundError(f"Gravação não encontrada: {caminho}")
+        with open(caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                if not linha.strip():
+                    continue
+                metadados = json.loads(linha)
+                if metadados["tipo"] == TABELA:
+                    self.tabelas[metadados["pagina"]] = metadados
+                else:
+                    self.detalhes[metadados["url"]] = metadados
+                    self.rotas[rota_pagina(metadados["url"])] = metadados
+        logger.info(f"Gravação {diretorio}: {len(self.tabelas)} páginas de resultados e "
+                    f"{len(self.detalhes)} páginas de detalhes")
+
+    def _ler(self, caminho):
+        with gzip.open(os.path.join(self.diretorio, caminho), "rt", encoding="utf-8") as arquivo:
+            return arquivo.read()
+
+    def tabela(self, pagina):
+        """
+        Página de resultados gravada
+
+        Returns:
+            tuple: (HTML, estrutura da tabela do navegador ou None), ou None se a página não foi gravada
+        """
+        metadados = self.tabelas.get(pagina)
+        if metadados is None:
+            return None
+        estrutura = json.loads(self._ler(metadados["estrutura"])) if metadados.get("estrutura") else None
+        return self._ler(metadados["arquivo"]), estrutura
+
+    def detalhe(self, url):
+        """
+        HTML de uma página de detalhes gravada, procurada pela URL ou, na falta dela, pela rota
+
+        Returns:
+            str: HTML da página, ou None se a página não foi gravada
+        """
+        metadados = self.detalhes.get(url) or self.rotas.get(rota_pagina(url))
+        return self._ler(metadados["arquivo"]) if metadados else None
+
+
+class _ElementoReproducao:
+    def is_displayed(self):
+        return True
+
+
+class _EsperasReproducao:
+    """As páginas gravadas já estão completas: não há o que esperar"""
+
+    def pagina_ociosa(self, *args, **kwargs):
+        return True
+
+
+class DriverReproducao:
+    """
+    Substituto do WebDriver que exibe as páginas gravadas
+
+    Implementa apenas o que o coletor usa sobre uma página já carregada: page_source,
+    current_url, a extração da tabela (estrutura gravada do navegador) e a busca de elementos
+    por tag.
+    """
+
+    def __init__(self, gravacao, usar_estrutura_gravada=True):
+        self.gravacao = gravacao
+        self.usar_estrutura_gravada = usar_estrutura_gravada
+        self.page_source = ""
+        self.current_url = ""
+        self.estrutura = None
+
+    def exibir_tabela(self, pagina):
+        """Exibe a página de resultados gravada; retorna False se ela não foi gravada"""
+        gravada = self.gravacao.tabela(pagina)
+        if gravada is None:
+            return False
+        self.page_source, self.estrutura = gravada
+        self.current_url = self.gravacao.tabelas[pagina].get("url") or ""
+        return True
+
+    def get(self, url):
+        html = self.gravacao.detalhe(url)
+        if html is None:
+            raise WebDriverException(f"Página não gravada: {url}")
+        self.page_source, self.estrutura, self.current_url = html, None, url
+
+    def execute_script(self, script, *args):
+        if script == JS_EXTRAIR_TABELA and self.estrutura and self.usar_estrutura_gravada:
+            return self.estrutura
+        raise WebDriverException("Script indisponível na reprodução de páginas gravadas")
+
+    def find_element(self, by, valor):
+        if by == By.TAG_NAME and f"<{valor}" in self.page_source.lower():
+            return _ElementoReproducao()
+        raise NoSuchElementException(f"{by}={valor} não encontrado na página gravada")
+
+    def find_elements(self, by, valor):
+        try:
+            return [self.find_element(by, valor)]
+        except NoSuchElementException:
+            return []
+
+    def get_screenshot_as_base64(self):
+        raise WebDriverException("Screenshots indisponíveis na reprodução de páginas gravadas")
+
+    def quit(self):
+        pass
+
+
+class ColetorReproducao(ColetorEcosistemas):
+    def __init__(self, diretorio, usar_estrutura_gravada=True, paginas_comparacao=None, **kwargs):
+        """
+        Coletor que reproduz uma gravação, com a mesma interface de ColetorEcosistemas
+
+        Args:
+            diretorio (str): Diretório da gravação (ver GravadorPaginas)
+            usar_estrutura_gravada (bool): Se True, extrair_dados_tabela recebe a estrutura da tabela
+                gravada do navegador; se False, analisa o HTML gravado com o motor HTML
+            paginas_comparacao (int): Páginas em que a estrutura do navegador é comparada com a
+                análise do HTML pelo motor (padrão: todas)
+            **kwargs: Demais argumentos de ColetorEcosistemas (ex: parser_html, prefixo_saida, metricas)
+        """
+        self.gravacao = GravacaoPaginas(diretorio)
+        self.usar_estrutura_gravada = usar_estrutura_gravada
+        kwargs.setdefault("artefatos", ArtefatosDepuracao(nivel=DESLIGADO))
+        kwargs.setdefault("arquivo_estrategias", None)
+        kwargs.setdefault("maximizar_pagina", False)
+        kwargs.setdefault("medir_rede", False)
+        super().__init__(paginas_comparacao=len(self.gravacao.tabelas) if paginas_comparacao is None
+                         else paginas_comparacao, **kwargs)
+
+    def setup_driver(self):
+        """Usa o driver de reprodução no lugar do Chrome"""
+        self.driver = DriverReproducao(self.gravacao, self.usar_estrutura_gravada)
+        self.aba_principal = "reproducao"
+        self.rede = MedidorRede(self.driver, ativo=False)
+        self.wait = None
+        self.esperas = _EsperasReproducao()
+        logger.info(f"Reproduzindo a gravação {self.gravacao.diretorio} (sem navegador)")
+
+    @cronometrar(ACESSO)
+    def acessar_site(self):
+        """Exibe a primeira página de resultados gravada"""
+        if not self.driver.exibir_tabela(min(self.gravacao.tabelas, default=1)):
+            logger.error(f"A gravação {self.gravacao.diretorio} não tem páginas de resultados")
+            return False
+        return True
+
+    def aplicar_filtro(self, filtro=None):
+        """As páginas gravadas já são o resultado da pesquisa"""
+        return True
+
+    def preparar_paginacao(self):
+        """A reprodução segue as páginas de resultados gravadas, sem plano de paginação"""
+        self.plano = None
+        return None
+
+    @cronometrar(NAVEGACAO_DETALHES)
+    def acessar_proximo_registro(self, link_detalhes):
+        """Exibe a página de detalhes gravada do link"""
+        try:
+            self.driver.get(link_detalhes)
+            return True
+        except WebDriverException as e:
+            logger.warning(str(e))
+            return False
+
+    def fechar_aba_detalhes(self):
+        pass
+
+    def descartar_aba_detalhes(self):
+        pass
+
+    @cronometrar(PAGINACAO)
+    def avancar_pagina(self, numero_pagina, max_tentativas=3):
+        """Exibe a página de resultados gravada; retorna False se ela não foi gravada"""
+        return self.driver.exibir_tabela(numero_pagina)
+
+    def ir_para_pagina(self, numero_pagina):
+        """Exibe a página de resultados gravada; retorna False se ela não foi gravada"""
+        return self.driver.exibir_tabela(numero_pagina)
+
+    def coletar_dados(self, max_paginas=100, num_workers=1, **kwargs):
+        """Reproduz a coleta (sempre sequencial: as páginas gravadas não dependem de navegadores)"""
+        return super().coletar_dados(max_paginas=max_paginas, num_workers=1, **kwargs)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Limitador de taxa adaptativo das requisições ao portal Ecosistemas.
+Um balde de fichas (token bucket) controla quantas páginas ou requisições são feitas por segundo,
+e a taxa se ajusta no estilo AIMD: cresce a cada janela de tempo em que as respostas chegam
+rápidas e sem erros (em proporção à taxa atual, para que taxas altas não levem minutos para ser
+alcançadas) e cai pela metade a cada timeout, tabela vazia ou erro HTTP, com uma pausa que dobra
+a cada falha seguida. Uma mesma instância é compartilhada por todos os workers (threads) da coleta.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger("coletor_ecosistemas.taxa")
+
+
+class LimitadorTaxa:
+    def __init__(self, taxa_inicial=1.0, taxa_minima=0.1, taxa_maxima=5.0, incremento=0.5, janela=0.5,
+                 fator_reducao=0.5, latencia_alvo=3.0, pausa_base=2.0, pausa_maxima=120.0, capacidade=None):
+        """
+        Inicializa o limitador
+
+        Args:
+            taxa_inicial (float): Requisições por segundo no início da coleta
+            taxa_minima (float): Menor taxa após reduções
+            taxa_maxima (float): Maior taxa após aumentos
+            incremento (float): Aumento da taxa, como fração da taxa atual, a cada janela com
+                respostas rápidas e sem erro
+            janela (float): Intervalo mínimo, em segundos, entre dois aumentos da taxa
+            fator_reducao (float): Fator aplicado à taxa a cada falha (redução multiplicativa)
+            latencia_alvo (float): Respostas mais lentas que isso, em segundos, não aumentam a taxa
+            pausa_base (float): Pausa após a primeira falha seguida, em segundos (dobra a cada nova falha)
+            pausa_maxima (float): Maior pausa após falhas seguidas, em segundos
+            capacidade (float): Fichas acumuladas no máximo, ou seja, a rajada permitida (padrão: 1;
+                ver ampliar_capacidade)
+        """
+        self.taxa_minima = taxa_minima
+        self.taxa_maxima = taxa_maxima
+        self.taxa = min(max(taxa_inicial, taxa_minima), taxa_maxima)
+        self.incremento = incremento
+        self.janela = janela
+        self.fator_reducao = fator_reducao
+        self.latencia_alvo = latencia_alvo
+        self.pausa_base = pausa_base
+        self.pausa_maxima = pausa_maxima
+        self.capacidade = capacidade or 1.0
+        self.fichas = self.capacidade
+        self.falhas_seguidas = 0
+        self.sucessos = 0
+        self.falhas = 0
+        self.tempo_espera = 0.0
+        self._ultima_recarga = time.monotonic()
+        self._ultimo_aumento = self._ultima_recarga
+        self._pausa_ate = 0.0
+        self._lock = threading.Lock()
+
+    def _recarregar(self, agora):
+        self.fichas = min(self.capacidade, self.fichas + (agora - self._ultima_recarga) * self.taxa)
+        self._ultima_recarga = agora
+
+    def ampliar_capacidade(self, capacidade):
+        """
+        Garante uma rajada de pelo menos `capacidade` fichas, para que requisições simultâneas
+        (conexões do pool HTTP ou workers de detalhes) não esperem umas pelas outras
+
+        Args:
+            capacidade (float): Rajada mínima, em geral o número de requisições simultâneas
+        """
+        with self._lock:
+            if capacidade > self.capacidade:
+                self.capacidade = float(capacidade)
+
+    def aguardar(self):
+        """
+        Aguarda a vez da próxima requisição (reserva uma ficha do balde)
+
+        Returns:
+            float: Tempo aguardado, em segundos
+        """
+        with self._lock:
+            agora = time.monotonic()
+            self._recarregar(agora)
+            # A ficha é reservada agora e a espera acontece fora do lock, então threads
+            # concorrentes formam fila sem ultrapassar a taxa
+            self.fichas -= 1
+            espera = max(-self.fichas / self.taxa, self._pausa_ate - agora, 0.0)
+            self.tempo_espera += espera
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    def registrar_sucesso(self, latencia=None):
+        """
+        Registra uma resposta sem erro; se foi rápida e a última mudança da taxa foi há mais de
+        uma janela, aumenta a taxa
+
+        Args:
+            latencia (float): Duração da requisição ou do carregamento da página, em segundos
+        """
+        with self._lock:
+            self.sucessos += 1
+            self.falhas_seguidas = 0
+            agora = time.monotonic()
+            if (latencia is None or latencia <= self.latencia_alvo) and agora - self._ultimo_aumento >= self.janela:
+                self.taxa = min(self.taxa_maxima, self.taxa * (1 + self.incremento))
+                self._ultimo_aumento = agora
+            relatar = self.sucessos % 50 == 0
+        if relatar:
+            logger.info(self.resumo())
+
+    def registrar_falha(self, motivo):
+        """
+        Registra um timeout, tabela vazia ou erro HTTP: reduz a taxa pela metade (redução
+        multiplicativa) e pausa as próximas requisições, com pausa que dobra a cada falha seguida
+
+        Args:
+            motivo (str): Descrição da falha, para o log
+        """
+        with self._lock:
+            self.falhas += 1
+            self.falhas_seguidas += 1
+            self.taxa = max(self.taxa_minima, self.taxa * self.fator_reducao)
+            pausa = min(self.pausa_maxima, self.pausa_base * 2 ** (self.falhas_seguidas - 1))
+            agora = time.monotonic()
+            self._pausa_ate = max(self._pausa_ate, agora + pausa)
+            # A próxima janela de aumento começa depois da falha
+            self._ultimo_aumento = agora
+            self.fichas = min(self.fichas, 0.0)
+            taxa, falhas_seguidas = self.taxa, self.falhas_seguidas
+        logger.warning(f"Limitador de taxa: {motivo}. Taxa reduzida para {taxa:.2f} req/s, "
+                       f"pausa de {pausa:.1f}s ({falhas_seguidas} falhas seguidas)")
+
+    def medir(self, descricao=None):
+        """
+        Gerenciador de contexto que aguarda a vez, mede a duração do bloco e registra o resultado
+
+        Exceções no bloco são registradas como falha e propagadas:
+
+            with limitador.medir("detalhes do processo"):
+                driver.get(link)
+        """
+        return _Medicao(self, descricao)
+
+    def resumo(self):
+        """Retorna uma linha com a taxa atual e as contagens"""
+        return (f"Limitador de taxa: {self.taxa:.2f} req/s (entre {self.taxa_minima:g} e {self.taxa_maxima:g}), "
+                f"{self.sucessos} sucessos, {self.falhas} falhas, {self.tempo_espera:.1f}s de espera")
+
+
+class _Medicao:
+    def __init__(self, limitador, descricao):
+        self.limitador = limitador
+        self.descricao = descricao
+        self.inicio = None
+
+    def __enter__(self):
+        self.limitador.aguardar()
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, excecao, rastreamento):
+        if excecao is None:
+            self.limitador.registrar_sucesso(time.perf_counter() - self.inicio)
+        else:
+            self.limitador.registrar_falha(f"{self.descricao or 'requisição'}: {excecao}")
+        return False
@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Logs estruturados da coleta Ecosistemas.
+Cada linha do arquivo de log é um objeto JSON com a execução, o processo, a thread e o contexto
+da coleta (página, registro e etapa). Os registros de log passam por uma fila: quem registra
+apenas enfileira, e uma thread em segundo plano formata e grava (arquivo e console), então a
+coleta não espera pelo disco. O nível de cada etapa pode ser ajustado separadamente (ex: DEBUG
+só na paginação), e mensagens abaixo do nível de todas as etapas nem chegam a ser formatadas.
+
+Uso:
+
+    configurar_logs(arquivo="coleta.log", niveis_etapas={"paginacao": logging.DEBUG})
+    with contexto_log(pagina=3, registro="1370.01.0001/2023"):
+        logger.info("...")
+    encerrar_logs()
+"""
+
+import atexit
+import contextlib
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import uuid
+from datetime import datetime
+
+# Campos de contexto acrescentados a cada registro de log
+CAMPOS_CONTEXTO = ("pagina", "registro", "etapa")
+_contexto = {campo: contextvars.ContextVar(f"log_{campo}", default=None) for campo in CAMPOS_CONTEXTO}
+
+JSON = "json"
+TEXTO = "texto"
+FORMATOS = (JSON, TEXTO)
+
+# Loggers do coletor (o nível das etapas não se aplica a bibliotecas como selenium e urllib3)
+LOGGER_RAIZ = "coletor_ecosistemas"
+
+FORMATO_TEXTO = "%(asctime)s - %(name)s - %(levelname)s - %(contexto)s%(message)s"
+
+_estado = {"pid": None, "listener": None, "handler": None, "filtro": None, "configuracao": None, "execucao": None}
+_lock = threading.Lock()
+
+
+def definir_contexto(**campos):
+    """
+    Define campos de contexto (pagina, registro, etapa) para os próximos logs desta thread
+
+    Returns:
+        dict: Tokens para restaurar_contexto
+    """
+    return {campo: _contexto[campo].set(valor) for campo, valor in campos.items()}
+
+
+def restaurar_contexto(tokens):
+    """Restaura os campos de contexto alterados por definir_contexto"""
+    for campo, token in tokens.items():
+        _contexto[campo].reset(token)
+
+
+@contextlib.contextmanager
+def contexto_log(**campos):
+    """Gerenciador de contexto que define campos de contexto (pagina, registro, etapa) durante o bloco"""
+    tokens = definir_contexto(**campos)
+    try:
+        yield
+    finally:
+        restaurar_contexto(tokens)
+
+
+def contexto_atual():
+    """Campos de contexto definidos nesta thread"""
+    return {campo: variavel.get() for campo, variavel in _contexto.items() if variavel.get() is not None}
+
+
+def registrando(logger, nivel=logging.DEBUG):
+    """
+    Indica se um log do nível seria gravado na etapa atual; use para evitar trabalho caro
+    (ex: consultas ao navegador) que só serve para montar mensagens de depuração
+
+    Returns:
+        bool: True se o logger e o nível da etapa atual aceitam o nível
+    """
+    if not logger.isEnabledFor(nivel):
+        return False
+    filtro = _estado["filtro"]
+    return filtro is None or nivel >= filtro.nivel_minimo(logger.name, _contexto["etapa"].get())
+
+
+def interpretar_niveis(texto):
+    """
+    Interpreta níveis por etapa ou módulo, no formato "paginacao=DEBUG,esperas=WARNING"
+
+    Returns:
+        dict: Nome da etapa (ver metricas.ETAPAS) ou do módulo (sufixo do logger) -> nível
+    """
+    niveis = {}
+    for item in (texto or "").split(","):
+        if not item.strip():
+            continue
+        nome, separador, nivel = item.partition("=")
+        numero = logging.getLevelName(nivel.strip().upper())
+        if not separador or not isinstance(numero, int):
+            raise ValueError(f"Nível inválido: {item.strip()} (use etapa=NIVEL, ex: paginacao=DEBUG)")
+        niveis[nome.strip()] = numero
+    return niveis
+
+
+class FiltroContexto(logging.Filter):
+    """
+    Acrescenta execução e contexto ao registro e aplica o nível da etapa ou do módulo
+
+    Executado na thread que registra o log, onde o contexto (contextvars) está definido.
+    """
+
+    def __init__(self, nivel, niveis_etapas, execucao):
+        super().__init__()
+        self.nivel = nivel
+        self.niveis_etapas = dict(niveis_etapas or {})
+        self.execucao = execucao
+
+    def nivel_minimo(self, nome_logger, etapa):
+        """Nível a partir do qual os logs do logger são gravados na etapa"""
+        if not self.niveis_etapas:
+            return self.nivel
+        modulo = nome_logger.rpartition(".")[2]
+        return self.niveis_etapas.get(modulo, self.niveis_etapas.get(etapa, self.nivel))
+
+    def filter(self, record):
+        for campo, variavel in _contexto.items():
+            setattr(record, campo, variavel.get())
+        record.execucao = self.execucao
+        return record.levelno >= self.nivel_minimo(record.name, record.etapa)
+
+
+class HandlerFila(logging.handlers.QueueHandler):
+    """
+    QueueHandler que adia a formatação para a thread de gravação
+
+    A mensagem só é montada (msg % args) na hora de gravar, a menos que os argumentos sejam
+    objetos mutáveis, que poderiam mudar até lá.
+    """
+
+    def prepare(self, record):
+        if record.args and not all(isinstance(arg, (str, int, float, bool, type(None))) for arg in
+                                   (record.args if isinstance(record.args, tuple) else ())):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por registro de log"""
+
+    def format(self, record):
+        dados = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "execucao": getattr(record, "execucao", None),
+            "pid": record.process,
+            "thread": record.threadName,
+        }
+        for campo in CAMPOS_CONTEXTO:
+            valor = getattr(record, campo, None)
+            if valor is not None:
+                dados[campo] = valor
+        if record.exc_info:
+            dados["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class FormatadorTexto(logging.Formatter):
+    """Formato de texto do console, com o contexto entre colchetes (ex: "[pág. 3 | paginacao] ")"""
+
+    def __init__(self):
+        super().__init__(FORMATO_TEXTO)
+
+    def format(self, record):
+        partes = []
+        if getattr(record, "pagina", None) is not None:
+            partes.append(f"pág. {record.pagina}")
+        if getattr(record, "registro", None) is not None:
+            partes.append(f"reg. {record.registro}")
+        if getattr(record, "etapa", None) is not None:
+            partes.append(record.etapa)
+        record.contexto = f"[{' | '.join(partes)}] " if partes else ""
+        return super().format(record)
+
+
+def configurar_logs(nivel=logging.INFO, niveis_etapas=None, arquivo=None, formato=JSON, console=True,
+                    execucao=None):
+    """
+    Configura os logs da coleta (substitui uma configuração anterior deste processo)
+
+    Args:
+        nivel (int): Nível padrão das etapas e módulos do coletor
+        niveis_etapas (dict): Níveis por etapa (ex: {"paginacao": logging.DEBUG}) ou por módulo
+            (sufixo do logger, ex: {"esperas": logging.WARNING}); ver interpretar_niveis
+        arquivo (str): Arquivo de log (None: apenas console)
+        formato (str): Formato do arquivo: "json" (uma linha JSON por registro) ou "texto"
+        console (bool): Se True, também exibe os logs no console (em texto)
+        execucao (str): Identificação da execução (padrão: data, hora e um sufixo aleatório)
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de log desconhecido: {formato} (use {JSON} ou {TEXTO})")
+    niveis_etapas = dict(niveis_etapas or {})
+    execucao = execucao or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+    with _lock:
+        _desativar()
+
+        destinos = []
+        if arquivo:
+            handler_arquivo = logging.FileHandler(arquivo, encoding="utf-8")
+            handler_arquivo.setFormatter(FormatadorJSON() if formato == JSON else FormatadorTexto())
+            destinos.append(handler_arquivo)
+        if console:
+            handler_console = logging.StreamHandler()
+            handler_console.setFormatter(FormatadorTexto())
+            destinos.append(handler_console)
+
+        fila = queue.SimpleQueue()
+        handler = HandlerFila(fila)
+        filtro = FiltroContexto(nivel, niveis_etapas, execucao)
+        handler.addFilter(filtro)
+        listener = logging.handlers.QueueListener(fila, *destinos, respect_handler_level=True)
+        listener.start()
+
+        # Bibliotecas ficam no nível padrão; os loggers do coletor descem até o menor nível pedido,
+        # e o filtro de contexto descarta o que estiver abaixo do nível da etapa
+        raiz = logging.getLogger()
+        raiz.addHandler(handler)
+        raiz.setLevel(nivel)
+        logging.getLogger(LOGGER_RAIZ).setLevel(min([nivel] + list(niveis_etapas.values())))
+
+        _estado.update(pid=os.getpid(), listener=listener, handler=handler, filtro=filtro, execucao=execucao,
+                       configuracao={"nivel": nivel, "niveis_etapas": niveis_etapas, "arquivo": arquivo,
+                                     "formato": formato, "console": console, "execucao": execucao})
+
+
+def _desativar():
+    handler = _estado["handler"]
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+    # Após um fork, a thread de gravação do processo pai não existe no filho
+    if _estado["listener"] is not None and _estado["pid"] == os.getpid():
+        _estado["listener"].stop()
+        for destino in _estado["listener"].handlers:
+            destino.close()
+    _estado.update(pid=None, listener=None, handler=None, filtro=None)
+
+
+def configuracao_logs():
+    """
+    Configuração atual (argumentos de configurar_logs), para repetir em processos filhos
+
+    Returns:
+        dict: Argumentos de configurar_logs, ou None se os logs não foram configurados
+    """
+    return dict(_estado["configuracao"]) if _estado["configuracao"] else None
+
+
+def configurar_no_processo(configuracao):
+    """
+    Repete a configuração do processo pai em um processo filho (ex: partições da coleta
+    particionada), com a mesma execução e o mesmo arquivo; não faz nada se o processo já
+    tem seus próprios logs configurados
+    """
+    if configuracao and _estado["pid"] != os.getpid():
+        configurar_logs(**configuracao)
+
+
+def encerrar_logs():
+    """Grava os registros pendentes na fila e fecha os arquivos de log"""
+    with _lock:
+        _desativar()
+
+
+atexit.register(encerrar_logs)
@@ -0,0 +1,409 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Métricas de desempenho da coleta Ecosistemas.
+Cada etapa (acesso ao site, filtro, extração da tabela, navegação e análise dos detalhes,
+paginação, salvamento e espera pelo limitador de taxa) é cronometrada em um histograma de durações, e contadores registram
+registros coletados, novas tentativas e fallbacks. As métricas podem ser gravadas em um arquivo
+no formato texto do Prometheus (ex: para o textfile collector do node_exporter), servidas por
+HTTP em /metrics e resumidas no log ao final da coleta.
+"""
+
+import functools
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from logs_estruturados import definir_contexto, restaurar_contexto
+
+logger = logging.getLogger("coletor_ecosistemas.metricas")
+
+# Etapas cronometradas
+ACESSO = "acessar_site"
+FILTRO = "filtro"
+TABELA = "extracao_tabela"
+NAVEGACAO_DETALHES = "navegacao_detalhes"
+PARSE_DETALHES = "parse_detalhes"
+PAGINACAO = "paginacao"
+SALVAMENTO = "salvamento"
+SALVAMENTO_INCREMENTAL = "salvamento_incremental"
+# Espera pela vez no limitador de taxa, fora das etapas de navegação e paginação
+ESPERA_TAXA = "espera_limitador"
+ETAPAS = (ACESSO, FILTRO, TABELA, NAVEGACAO_DETALHES, PARSE_DETALHES, PAGINACAO, SALVAMENTO, SALVAMENTO_INCREMENTAL,
+          ESPERA_TAXA)
+
+# Resultado de cada execução de uma etapa
+OK = "ok"
+FALHA = "falha"
+ERRO = "erro"
+
+# Contadores
+REGISTROS = "registros"
+TENTATIVAS = "tentativas"
+FALLBACKS = "fallbacks"
+
+# Limites (em segundos) dos buckets dos histogramas de duração
+LIMITES_PADRAO = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histograma:
+    def __init__(self, limites=LIMITES_PADRAO):
+        self.limites = tuple(sorted(limites))
+        self.buckets = [0] * len(self.limites)
+        self.contagem = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def observar(self, valor):
+        for n, limite in enumerate(self.limites):
+            if valor <= limite:
+                self.buckets[n] += 1
+                break
+        self.contagem += 1
+        self.soma += valor
+        self.maximo = max(self.maximo, valor)
+
+    def combinar(self, estado):
+        """Soma ao histograma o estado de outro (ver como_dicionario), com os mesmos limites"""
+        for n, quantidade in enumerate(estado["buckets"]):
+            self.buckets[n] += quantidade
+        self.contagem += estado["contagem"]
+        self.soma += estado["soma"]
+        self.maximo = max(self.maximo, estado["maximo"])
+
+    def como_dicionario(self):
+        return {"buckets": list(self.buckets), "contagem": self.contagem, "soma": self.soma, "maximo": self.maximo}
+
+    def acumulados(self):
+        """Contagens acumuladas por limite (le), como nos buckets do Prometheus"""
+        total = 0
+        for limite, quantidade in zip(self.limites, self.buckets):
+            total += quantidade
+            yield limite, total
+
+
+class MetricasColeta:
+    def __init__(self, prefixo="ecosistemas", limites=LIMITES_PADRAO):
+        """
+        Inicializa o registro de métricas (compartilhado entre coletores e threads)
+
+        Args:
+            prefixo (str): Prefixo dos nomes das métricas exportadas
+            limites (tuple): Limites, em segundos, dos buckets dos histogramas de duração
+        """
+        self.prefixo = prefixo
+        self.limites = tuple(limites)
+        self.duracoes = {}
+        self.execucoes = {}
+        self.cpu = {}
+        self.contadores = {}
+        self.inicio = time.time()
+        self._etapas_ativas = {}
+        self._lock = threading.Lock()
+
+    def observar(self, etapa, duracao, resultado=OK, cpu=None):
+        """
+        Registra uma execução de uma etapa
+
+        Args:
+            etapa (str): Nome da etapa (ver ETAPAS)
+            duracao (float): Duração (tempo de relógio) em segundos
+            resultado (str): OK, FALHA (a etapa retornou sem sucesso) ou ERRO (exceção)
+            cpu (float): Tempo de CPU da thread durante a etapa, em segundos; a diferença para a
+                duração é espera (navegador, rede, disco ou pausas)
+        """
+        with self._lock:
+            if etapa not in self.duracoes:
+                self.duracoes[etapa] = Histograma(self.limites)
+            self.duracoes[etapa].observar(duracao)
+            chave = (etapa, resultado)
+            self.execucoes[chave] = self.execucoes.get(chave, 0) + 1
+            if cpu is not None:
+                self.cpu[etapa] = self.cpu.get(etapa, 0.0) + cpu
+
+    def etapa_atual(self, id_thread):
+        """
+        Etapa em execução em uma thread (usada pelo perfilador por amostragem)
+
+        Args:
+            id_thread (int): Identificador da thread (threading.get_ident)
+
+        Returns:
+            str: Etapa mais interna em execução na thread, ou None
+        """
+        try:
+            return self._etapas_ativas[id_thread][-1]
+        except (KeyError, IndexError):
+            return None
+
+    def incrementar(self, nome, valor=1, **rotulos):
+        """
+        Incrementa um contador (ex: incrementar(FALLBACKS, tipo="tabela_page_source"))
+
+        Args:
+            nome (str): Nome do contador (REGISTROS, TENTATIVAS, FALLBACKS ou outro)
+            valor (int): Incremento
+            rotulos: Rótulos do contador no Prometheus
+        """
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self._lock:
+            self.contadores[chave] = self.contadores.get(chave, 0) + valor
+
+    def medir(self, etapa):
+        """
+        Gerenciador de contexto que cronometra uma etapa; exceções são registradas como ERRO e propagadas
+
+            with metricas.medir(PARSE_DETALHES):
+                dados = extrair_detalhes_html(html)
+        """
+        return _Cronometro(self, etapa)
+
+    def total(self, nome):
+        """Soma de um contador em todos os rótulos"""
+        with self._lock:
+            return sum(valor for (contador, _), valor in self.contadores.items() if contador == nome)
+
+    def como_dicionario(self):
+        """Estado das métricas em tipos simples, para combinar métricas de outros processos"""
+        with self._lock:
+            return {
+                "limites": list(self.limites),
+                "duracoes": {etapa: histograma.como_dicionario() for etapa, histograma in self.duracoes.items()},
+                "execucoes": [[etapa, resultado, valor] for (etapa, resultado), valor in self.execucoes.items()],
+                "cpu": dict(self.cpu),
+                "contadores": [[nome, [list(par) for par in rotulos], valor]
+                               for (nome, rotulos), valor in self.contadores.items()],
+            }
+
+    def combinar(self, estado):
+        """
+        Soma as métricas de outro processo (ex: uma partição da coleta particionada)
+
+        Args:
+            estado (dict): Resultado de como_dicionario do outro processo, com os mesmos limites
+        """
+        if tuple(estado["limites"]) != self.limites:
+            raise ValueError("Métricas com limites de histograma diferentes não podem ser combinadas")
+        with self._lock:
+            for etapa, histograma in estado["duracoes"].items():
+                if etapa not in self.duracoes:
+                    self.duracoes[etapa] = Histograma(self.limites)
+                self.duracoes[etapa].combinar(histograma)
+            for etapa, resultado, valor in estado["execucoes"]:
+                self.execucoes[(etapa, resultado)] = self.execucoes.get((etapa, resultado), 0) + valor
+            for etapa, valor in estado.get("cpu", {}).items():
+                self.cpu[etapa] = self.cpu.get(etapa, 0.0) + valor
+            for nome, rotulos, valor in estado["contadores"]:
+                chave = (nome, tuple(tuple(par) for par in rotulos))
+                self.contadores[chave] = self.contadores.get(chave, 0) + valor
+
+    def exportar(self):
+        """
+        Gera as métricas no formato texto do Prometheus
+
+        Returns:
+            str: Texto com histogramas de duração por etapa, execuções por resultado e contadores
+        """
+        p = self.prefixo
+        linhas = []
+        with self._lock:
+            linhas.append(f"# HELP {p}_etapa_duracao_segundos Duração de cada execução de uma etapa da coleta")
+            linhas.append(f"# TYPE {p}_etapa_duracao_segundos histogram")
+            for etapa in sorted(self.duracoes):
+                histograma = self.duracoes[etapa]
+                for limite, acumulado in histograma.acumulados():
+                    linhas.append(f'{p}_etapa_duracao_segundos_bucket{{etapa="{etapa}",le="{limite:g}"}} {acumulado}')
+                linhas.append(f'{p}_etapa_duracao_segundos_bucket{{etapa="{etapa}",le="+Inf"}} {histograma.contagem}')
+                linhas.append(f'{p}_etapa_duracao_segundos_sum{{etapa="{etapa}"}} {histograma.soma:.6f}')
+                linhas.append(f'{p}_etapa_duracao_segundos_count{{etapa="{etapa}"}} {histograma.contagem}')
+
+            linhas.append(f"# HELP {p}_etapa_execucoes_total Execuções de cada etapa por resultado (ok, falha, erro)")
+            linhas.append(f"# TYPE {p}_etapa_execucoes_total counter")
+            for (etapa, resultado), valor in sorted(self.execucoes.items()):
+                linhas.append(f'{p}_etapa_execucoes_total{{etapa="{etapa}",resultado="{resultado}"}} {valor}')
+
+            linhas.append(f"# HELP {p}_etapa_cpu_segundos_total Tempo de CPU das threads durante cada etapa")
+            linhas.append(f"# TYPE {p}_etapa_cpu_segundos_total counter")
+            for etapa, valor in sorted(self.cpu.items()):
+                linhas.append(f'{p}_etapa_cpu_segundos_total{{etapa="{etapa}"}} {valor:.6f}')
+
+            for nome in sorted({nome for nome, _ in self.contadores}):
+                linhas.append(f"# TYPE {p}_{nome}_total counter")
+                for (contador, rotulos), valor in sorted(self.contadores.items()):
+                    if contador != nome:
+                        continue
+                    texto_rotulos = ",".join(f'{chave}="{_escapar(valor_rotulo)}"' for chave, valor_rotulo in rotulos)
+                    linhas.append(f"{p}_{nome}_total{{{texto_rotulos}}} {valor}" if texto_rotulos
+                                  else f"{p}_{nome}_total {valor}")
+
+        linhas.append(f"# HELP {p}_inicio_coleta_timestamp_segundos Início da coleta (Unix)")
+        linhas.append(f"# TYPE {p}_inicio_coleta_timestamp_segundos gauge")
+        linhas.append(f"{p}_inicio_coleta_timestamp_segundos {self.inicio:.3f}")
+        return "\n".join(linhas) + "\n"
+
+    def salvar(self, caminho):
+        """
+        Grava as métricas em um arquivo .prom (substituição atômica, para leitores concorrentes)
+
+        Returns:
+            bool: True se o arquivo foi gravado
+        """
+        try:
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                arquivo.write(self.exportar())
+            os.replace(temporario, caminho)
+            logger.info(f"Métricas salvas em {caminho}")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao salvar as métricas em {caminho}: {str(e)}")
+            return False
+
+    def servir(self, porta, host="127.0.0.1"):
+        """
+        Serve as métricas em http://host:porta/metrics, em uma thread em segundo plano
+
+        Returns:
+            ServidorMetricas: Servidor iniciado (encerrar com parar())
+        """
+        servidor = ServidorMetricas(self, host, porta)
+        servidor.iniciar()
+        return servidor
+
+    def resumo(self):
+        """
+        Tempo somado, número de execuções, média e máximo de cada etapa, com a parcela do tempo
+        de coleta, seguidos dos contadores
+
+        Returns:
+            list: Linhas do resumo
+        """
+        decorrido = max(time.time() - self.inicio, 1e-9)
+        linhas = []
+        with self._lock:
+            for etapa in sorted(self.duracoes, key=lambda etapa: -self.duracoes[etapa].soma):
+                histograma = self.duracoes[etapa]
+                falhas = sum(valor for (nome, resultado), valor in self.execucoes.items()
+                             if nome == etapa and resultado != OK)
+                # Etapas executadas por vários workers ao mesmo tempo podem somar mais que 100%
+                paralelo = ", execuções simultâneas" if histograma.soma > decorrido else ""
+                linhas.append(
+                    f"{etapa}: {histograma.soma:.1f}s somados ({100 * histograma.soma / decorrido:.0f}% do tempo "
+                    f"da coleta{paralelo}), {self.cpu.get(etapa, 0.0):.1f}s de CPU, em {histograma.contagem} "
+                    f"execuções, média {histograma.soma / histograma.contagem:.3f}s, máximo {histograma.maximo:.3f}s, "
+                    f"{falhas} sem sucesso"
+                )
+            for (nome, rotulos), valor in sorted(self.contadores.items()):
+                descricao = ", ".join(f"{chave}={valor_rotulo}" for chave, valor_rotulo in rotulos)
+                linhas.append(f"{nome}{f' ({descricao})' if descricao else ''}: {valor}")
+        linhas.append(f"Tempo total da coleta: {decorrido:.1f}s")
+        return linhas
+
+    def registrar_resumo(self):
+        """Registra o resumo das métricas no log (uma vez por execução, pelo script que a conduz)"""
+        for linha in self.resumo():
+            logger.info(f"Métricas - {linha}")
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _resultado(retorno):
+    # False e listas vazias indicam etapa sem sucesso
+    return FALHA if retorno is False or retorno == [] else OK
+
+
+class _Cronometro:
+    def __init__(self, metricas, etapa):
+        self.metricas = metricas
+        self.etapa = etapa
+        self.inicio = None
+        self.inicio_cpu = None
+        self.resultado = OK
+        self.tokens = None
+
+    def __enter__(self):
+        # A etapa também entra no contexto dos logs (e define o nível de log da etapa)
+        self.tokens = definir_contexto(etapa=self.etapa)
+        self.metricas._etapas_ativas.setdefault(threading.get_ident(), []).append(self.etapa)
+        self.inicio = time.perf_counter()
+        self.inicio_cpu = time.thread_time()
+        return self
+
+    def __exit__(self, tipo, excecao, rastreamento):
+        resultado = ERRO if excecao is not None else self.resultado
+        self.metricas.observar(self.etapa, time.perf_counter() - self.inicio, resultado,
+                               cpu=time.thread_time() - self.inicio_cpu)
+        ativas = self.metricas._etapas_ativas.get(threading.get_ident())
+        if ativas:
+            ativas.pop()
+        restaurar_contexto(self.tokens)
+        return False
+
+
+def cronometrar(etapa):
+    """
+    Decorador de métodos de coletores que têm o atributo metricas (MetricasColeta): cronometra
+    cada chamada como uma execução da etapa. Retornos False ou lista vazia contam como FALHA.
+    """
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltorio(self, *args, **kwargs):
+            with self.metricas.medir(etapa) as cronometro:
+                retorno = metodo(self, *args, **kwargs)
+                cronometro.resultado = _resultado(retorno)
+                return retorno
+        return envoltorio
+    return decorador
+
+
+class _TratadorMetricas(BaseHTTPRequestHandler):
+    metricas = None
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        corpo = self.metricas.exportar().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        logger.debug(f"Métricas: {self.address_string()} - {formato % args}")
+
+
+class ServidorMetricas:
+    def __init__(self, metricas, host="127.0.0.1", porta=9464):
+        """
+        Endpoint HTTP das métricas no formato do Prometheus
+
+        Args:
+            metricas (MetricasColeta): Métricas servidas
+            host (str): Interface de escuta (padrão: apenas local)
+            porta (int): Porta de escuta (0 escolhe uma porta livre)
+        """
+        tratador = type("TratadorMetricas", (_TratadorMetricas,), {"metricas": metricas})
+        self.servidor = ThreadingHTTPServer((host, porta), tratador)
+        self.servidor.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, porta = self.servidor.server_address[:2]
+        return f"http://{host}:{porta}/metrics"
+
+    def iniciar(self):
+        self.thread = threading.Thread(target=self.servidor.serve_forever, name="servidor-metricas", daemon=True)
+        self.thread.start()
+        logger.info(f"Métricas disponíveis em {self.url}")
+
+    def parar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
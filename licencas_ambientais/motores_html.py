@@ -0,0 +1,445 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Motores de análise HTML usados na extração da tabela de resultados e da página de detalhes.
+
+Todos os motores devolvem exatamente o mesmo formato de extracao_html:
+- estrutura_tabela(html): {'cabecalhos', 'linhas', 'primeira_linha_cabecalho'} ou None
+- analisar_detalhes(html): (dados detalhados com documentos, texto completo da página)
+
+Motores disponíveis (MOTORES):
+- html.parser: BeautifulSoup com o parser puro Python (padrão, compatibilidade)
+- bs4-lxml:    BeautifulSoup com o construtor de árvore do lxml
+- lxml:        lxml.html direto, sem BeautifulSoup
+- selectolax:  selectolax (Lexbor), sem BeautifulSoup
+
+lxml e selectolax são dependências opcionais; se não estiverem instaladas, obter_motor
+volta para o BeautifulSoup com html.parser.
+"""
+
+import importlib.util
+import logging
+
+from extracao_html import LABELS_DETALHE, analisar_detalhes_html, estrutura_tabela_html
+
+logger = logging.getLogger("coletor_ecosistemas")
+
+MOTOR_PADRAO = "html.parser"
+
+# Elementos cujo conteúdo não entra no texto da página (mesmo critério do get_text do BeautifulSoup)
+_SEM_TEXTO = frozenset(["script", "style", "template"])
+
+
+class _IndiceRotulos:
+    """
+    Índice rótulo -> valor montado em uma única passagem, com a mesma lógica de
+    extracao_html.indexar_rotulos, mas independente da biblioteca que percorre o documento
+    """
+
+    def __init__(self, labels, texto_unico, texto_irmao, texto_celula):
+        """
+        Args:
+            labels (list): Rótulos procurados
+            texto_unico (callable): Texto do elemento quando ele tem um único filho de texto
+            texto_irmao (callable): Texto logo após o elemento ("" se o próximo nó não for texto)
+            texto_celula (callable): Texto completo, aparado, de uma célula
+        """
+        self.labels = labels
+        self.rotulos_texto = [(label, f"{label}:") for label in labels]
+        self.texto_unico = texto_unico
+        self.texto_irmao = texto_irmao
+        self.texto_celula = texto_celula
+        self.por_strong = {}
+        self.por_th = {}
+        self.por_texto = {}
+        self.th_pendentes = []
+
+    def elemento(self, nome, no):
+        if nome == 'td' and self.th_pendentes:
+            valor = self.texto_celula(no)
+            for label in self.th_pendentes:
+                self.por_th[label] = valor
+            self.th_pendentes = []
+
+        if nome == 'strong' or nome == 'th':
+            texto = self.texto_unico(no)
+            if not texto:
+                return
+            for label in self.labels:
+                if label not in texto:
+                    continue
+                if nome == 'strong' and label not in self.por_strong:
+                    self.por_strong[label] = self.texto_irmao(no)
+                elif nome == 'th' and label not in self.por_th and label not in self.th_pendentes:
+                    self.th_pendentes.append(label)
+
+    def texto(self, texto):
+        if ':' not in texto:
+            return
+        for label, rotulo in self.rotulos_texto:
+            if label not in self.por_texto and rotulo in texto:
+                partes = texto.strip().split(':', 1)
+                self.por_texto[label] = partes[1].strip() if len(partes) > 1 else ""
+
+    def indice(self):
+        indice = {}
+        for label in self.labels:
+            for abordagem in (self.por_strong, self.por_th, self.por_texto):
+                valor = abordagem.get(label)
+                if valor:
+                    indice[label] = valor
+                    break
+        return indice
+
+
+class MotorBeautifulSoup:
+    """Motor de compatibilidade: a implementação original com BeautifulSoup"""
+
+    def __init__(self, parser="html.parser"):
+        """
+        Args:
+            parser (str): Construtor de árvore do BeautifulSoup ('html.parser' ou 'lxml')
+        """
+        # Falhar cedo (ImportError, como nos outros motores) se o lxml não estiver instalado
+        if parser == "lxml" and importlib.util.find_spec("lxml") is None:
+            raise ImportError("No module named 'lxml'")
+        self.parser = parser
+        self.nome = MOTOR_PADRAO if parser == "html.parser" else f"bs4-{parser}"
+
+    def estrutura_tabela(self, html):
+        return estrutura_tabela_html(html, self.parser)
+
+    def analisar_detalhes(self, html, labels=LABELS_DETALHE):
+        return analisar_detalhes_html(html, self.parser)
+
+
+class MotorLxml:
+    """Motor baseado em lxml.html, sem BeautifulSoup"""
+
+    nome = "lxml"
+
+    def __init__(self):
+        from lxml import etree, html as lxml_html
+        self._etree = etree
+        self._html = lxml_html
+
+    def _documento(self, html):
+        if not html or not html.strip():
+            html = "<html></html>"
+        return self._html.document_fromstring(html)
+
+    @staticmethod
+    def _partes_texto(no, partes):
+        if not isinstance(no.tag, str) or no.tag in _SEM_TEXTO:
+            return
+        if no.text:
+            partes.append(no.text)
+        for filho in no:
+            MotorLxml._partes_texto(filho, partes)
+            if filho.tail:
+                partes.append(filho.tail)
+
+    @staticmethod
+    def texto(no, strip=False):
+        """Equivalente a get_text() / get_text(strip=True) do BeautifulSoup"""
+        partes = []
+        MotorLxml._partes_texto(no, partes)
+        if strip:
+            return "".join(parte.strip() for parte in partes)
+        return "".join(partes)
+
+    @staticmethod
+    def texto_unico(no):
+        """Equivalente a .string do BeautifulSoup"""
+        if len(no) == 0:
+            return no.text
+        if len(no) == 1 and not no.text:
+            filho = no[0]
+            if filho.tail:
+                return None
+            if isinstance(filho.tag, str):
+                return MotorLxml.texto_unico(filho)
+            return filho.text
+        return None
+
+    @staticmethod
+    def _texto_irmao(no):
+        return no.tail.strip() if no.tail else ""
+
+    @staticmethod
+    def _todas_strings(no):
+        """Todos os textos dentro do elemento, inclusive comentários e scripts"""
+        for descendente in no.iter():
+            if descendente.text:
+                yield descendente.text
+            if descendente is not no and descendente.tail:
+                yield descendente.tail
+
+    @staticmethod
+    def _primeiro_link(celula):
+        for link in celula.iter('a'):
+            href = link.get('href')
+            if href:
+                return href
+        return None
+
+    def estrutura_tabela(self, html):
+        doc = self._documento(html)
+        tabela = next(doc.iter('table'), None)
+        if tabela is None:
+            return None
+
+        linhas = list(tabela.iter('tr'))
+        cabecalhos_elem = list(tabela.iter('th'))
+        if not cabecalhos_elem and linhas:
+            cabecalhos_elem = list(linhas[0].iter('th', 'td'))
+
+        return {
+            "cabecalhos": [self.texto(elem, strip=True) for elem in cabecalhos_elem],
+            "linhas": [
+                [{"texto": self.texto(celula, strip=True), "href": self._primeiro_link(celula)}
+                 for celula in linha.iter('td', 'th')]
+                for linha in linhas
+            ],
+            "primeira_linha_cabecalho": bool(linhas) and next(linhas[0].iter('th'), None) is not None,
+        }
+
+    def analisar_detalhes(self, html, labels=LABELS_DETALHE):
+        doc = self._documento(html)
+
+        # 1. Rótulos em uma única passagem (textos na ordem do documento)
+        indice = _IndiceRotulos(labels, self.texto_unico, self._texto_irmao,
+                                lambda no: self.texto(no, strip=True))
+        for evento, no in self._etree.iterwalk(doc, events=("start", "end", "comment")):
+            if evento == "start":
+                indice.elemento(no.tag, no)
+                if no.text:
+                    indice.texto(no.text)
+            elif evento == "comment":
+                if no.text:
+                    indice.texto(no.text)
+                if no.tail:
+                    indice.texto(no.tail)
+            elif no is not doc and no.tail:
+                indice.texto(no.tail)
+        dados_detalhados = indice.indice()
+
+        # 2. Atividade principal na tabela de atividades
+        if 'Atividade Principal' not in dados_detalhados:
+            tabelas = list(doc.iter('table'))
+            tabela_atividades = next((t for t in tabelas if 'atividade' in (t.get('class') or '').lower()), None)
+            if tabela_atividades is None:
+                tabela_atividades = next(
+                    (t for t in tabelas if any('atividade' in s.lower() for s in self._todas_strings(t))), None
+                )
+            if tabela_atividades is not None:
+                linhas = list(tabela_atividades.iter('tr'))
+                if len(linhas) > 1:
+                    colunas = list(linhas[1].iter('td'))
+                    if colunas:
+                        dados_detalhados['Atividade Principal'] = self.texto(colunas[0], strip=True)
+
+        # 3. Documentos
+        secao_documentos = doc
+        for elem in doc.iter('h2', 'h3', 'h4', 'div'):
+            texto = self.texto_unico(elem)
+            if texto and 'documentos' in texto.lower():
+                pai = elem.getparent()
+                secao_documentos = pai if pai is not None else doc
+                break
+
+        documentos = []
+        links_documentos = []
+        for link in secao_documentos.iter('a'):
+            if link is secao_documentos:
+                continue
+            href = link.get('href')
+            texto = self.texto(link, strip=True)
+            if texto and href:
+                documentos.append(texto)
+                links_documentos.append(href)
+
+        dados_detalhados["Documentos"] = documentos
+        dados_detalhados["Links_Documentos"] = links_documentos
+        return dados_detalhados, self.texto(doc)
+
+
+class MotorSelectolax:
+    """Motor baseado em selectolax (Lexbor), sem BeautifulSoup"""
+
+    nome = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    @staticmethod
+    def _filhos(no):
+        filho = no.child
+        while filho is not None:
+            yield filho
+            filho = filho.next
+
+    @staticmethod
+    def _partes_texto(no, partes):
+        for filho in MotorSelectolax._filhos(no):
+            tag = filho.tag
+            if tag == '-text':
+                partes.append(filho.text_content)
+            elif tag[0] != '-' and tag not in _SEM_TEXTO:
+                MotorSelectolax._partes_texto(filho, partes)
+
+    @staticmethod
+    def texto(no, strip=False):
+        """Equivalente a get_text() / get_text(strip=True) do BeautifulSoup"""
+        partes = []
+        MotorSelectolax._partes_texto(no, partes)
+        if strip:
+            return "".join(parte.strip() for parte in partes)
+        return "".join(partes)
+
+    @staticmethod
+    def _texto_no(no):
+        if no.tag == '-text':
+            return no.text_content
+        if no.tag == '-comment':
+            return no.comment_content
+        return None
+
+    @staticmethod
+    def texto_unico(no):
+        """Equivalente a .string do BeautifulSoup"""
+        filho = no.child
+        if filho is None or filho.next is not None:
+            return None
+        if filho.tag[0] == '-':
+            return MotorSelectolax._texto_no(filho)
+        return MotorSelectolax.texto_unico(filho)
+
+    @staticmethod
+    def _texto_irmao(no):
+        irmao = no.next
+        if irmao is not None and irmao.tag == '-text':
+            return irmao.text_content.strip()
+        return ""
+
+    @staticmethod
+    def _descendentes(no, seletor):
+        """Resultado de no.css(seletor) sem o próprio nó"""
+        return [elem for elem in no.css(seletor) if elem.mem_id != no.mem_id]
+
+    @staticmethod
+    def _primeiro_link(celula):
+        for link in MotorSelectolax._descendentes(celula, 'a'):
+            href = link.attributes.get('href')
+            if href:
+                return href
+        return None
+
+    def estrutura_tabela(self, html):
+        doc = self._parser(html or "")
+        tabela = doc.css_first('table')
+        if tabela is None:
+            return None
+
+        linhas = self._descendentes(tabela, 'tr')
+        cabecalhos_elem = self._descendentes(tabela, 'th')
+        if not cabecalhos_elem and linhas:
+            cabecalhos_elem = self._descendentes(linhas[0], 'th, td')
+
+        return {
+            "cabecalhos": [self.texto(elem, strip=True) for elem in cabecalhos_elem],
+            "linhas": [
+                [{"texto": self.texto(celula, strip=True), "href": self._primeiro_link(celula)}
+                 for celula in self._descendentes(linha, 'td, th')]
+                for linha in linhas
+            ],
+            "primeira_linha_cabecalho": bool(linhas) and bool(self._descendentes(linhas[0], 'th')),
+        }
+
+    def analisar_detalhes(self, html, labels=LABELS_DETALHE):
+        doc = self._parser(html or "")
+        raiz = doc.root
+
+        # 1. Rótulos em uma única passagem (nós de texto já vêm na ordem do documento)
+        indice = _IndiceRotulos(labels, self.texto_unico, self._texto_irmao,
+                                lambda no: self.texto(no, strip=True))
+        for no in raiz.traverse(include_text=True):
+            tag = no.tag
+            if tag[0] == '-':
+                texto = self._texto_no(no)
+                if texto:
+                    indice.texto(texto)
+            else:
+                indice.elemento(tag, no)
+        dados_detalhados = indice.indice()
+
+        # 2. Atividade principal na tabela de atividades
+        if 'Atividade Principal' not in dados_detalhados:
+            tabelas = doc.css('table')
+            tabela_atividades = next(
+                (t for t in tabelas if 'atividade' in (t.attributes.get('class') or '').lower()), None
+            )
+            if tabela_atividades is None:
+                for tabela in tabelas:
+                    textos = (self._texto_no(no) for no in tabela.traverse(include_text=True) if no.tag[0] == '-')
+                    if any(texto and 'atividade' in texto.lower() for texto in textos):
+                        tabela_atividades = tabela
+                        break
+            if tabela_atividades is not None:
+                linhas = self._descendentes(tabela_atividades, 'tr')
+                if len(linhas) > 1:
+                    colunas = self._descendentes(linhas[1], 'td')
+                    if colunas:
+                        dados_detalhados['Atividade Principal'] = self.texto(colunas[0], strip=True)
+
+        # 3. Documentos
+        secao_documentos = raiz
+        for elem in doc.css('h2, h3, h4, div'):
+            texto = self.texto_unico(elem)
+            if texto and 'documentos' in texto.lower():
+                secao_documentos = elem.parent if elem.parent is not None else raiz
+                break
+
+        documentos = []
+        links_documentos = []
+        for link in self._descendentes(secao_documentos, 'a'):
+            href = link.attributes.get('href')
+            texto = self.texto(link, strip=True)
+            if texto and href:
+                documentos.append(texto)
+                links_documentos.append(href)
+
+        dados_detalhados["Documentos"] = documentos
+        dados_detalhados["Links_Documentos"] = links_documentos
+        return dados_detalhados, self.texto(raiz)
+
+
+MOTORES = {
+    "html.parser": lambda: MotorBeautifulSoup("html.parser"),
+    "bs4-lxml": lambda: MotorBeautifulSoup("lxml"),
+    "lxml": MotorLxml,
+    "selectolax": MotorSelectolax,
+}
+
+
+def obter_motor(nome=MOTOR_PADRAO):
+    """
+    Cria o motor de análise HTML indicado
+
+    Args:
+        nome (str): Nome do motor (chave de MOTORES)
+
+    Returns:
+        Motor de análise; se a biblioteca do motor não estiver instalada, o motor padrão (html.parser)
+    """
+    if nome not in MOTORES:
+        raise ValueError(f"Motor de análise HTML desconhecido: {nome} (opções: {', '.join(MOTORES)})")
+    try:
+        motor = MOTORES[nome]()
+    except ImportError as e:
+        logger.warning(f"Motor de análise HTML '{nome}' indisponível ({str(e)}). Usando {MOTOR_PADRAO}.")
+        motor = MOTORES[MOTOR_PADRAO]()
+    logger.info(f"Motor de análise HTML: {motor.nome}")
+    return motor
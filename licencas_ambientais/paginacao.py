@@ -0,0 +1,404 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Paginação direta da pesquisa Ecosistemas.
+Ajusta a grade de resultados para o maior tamanho de página oferecido, planeja o número exato
+de páginas a partir do indicador "x - y de N Registros" e salta direto para a página N pelo
+paginador (campo de página ou botão numerado) ou pelo parâmetro de página da URL.
+Também reúne os seletores e scripts usados pelas estratégias de navegar_proxima_pagina.
+"""
+
+import logging
+import re
+from collections import namedtuple
+
+from esperas import PADRAO_INDICADOR
+
+logger = logging.getLogger("coletor_ecosistemas.paginacao")
+
+# Parâmetros de página reconhecidos na URL (query string ou rota do Angular após '#')
+PADRAO_PARAMETRO_PAGINA = re.compile(r'([?&;](?:page|pagina|pageIndex|p)=)(\d+)', re.IGNORECASE)
+
+# Seleciona a maior opção de um seletor nativo de tamanho de página (<select> só com opções numéricas).
+# Se o seletor for um componente (mat-select, p-dropdown, ng-select), apenas o abre: as opções
+# aparecem em um overlay e são escolhidas por JS_ESCOLHER_MAIOR_OPCAO.
+JS_MAIOR_TAMANHO_PAGINA = """
+function numero(texto) {
+    const m = (texto || '').trim().match(/^(\\d+)$/);
+    return m ? parseInt(m[1], 10) : null;
+}
+function seletorDePagina(select) {
+    // Evita os selects do formulário de filtros (ex: classe 1 a 6): só vale o que está no paginador
+    // ou junto a um rótulo de itens por página
+    if (select.closest('mat-paginator, .p-paginator, .ui-paginator, .pagination, [class*="paginat"], [class*="length"]')) {
+        return true;
+    }
+    const contexto = select.parentElement ? select.parentElement.textContent : '';
+    return /por p[áa]gina|itens|registros|exibir|mostrar|per page|show/i.test(contexto);
+}
+for (const select of document.querySelectorAll('select')) {
+    if (!seletorDePagina(select)) continue;
+    const opcoes = Array.from(select.options);
+    if (opcoes.length < 2 || !opcoes.every(o => numero(o.value) !== null || numero(o.text) !== null)) continue;
+    const valor = o => numero(o.text) !== null ? numero(o.text) : numero(o.value);
+    const maior = opcoes.reduce((a, b) => valor(b) > valor(a) ? b : a);
+    const atual = select.selectedIndex >= 0 ? valor(opcoes[select.selectedIndex]) : null;
+    if (atual === valor(maior)) return {tipo: 'select', atual: atual, novo: atual};
+    select.value = maior.value;
+    select.dispatchEvent(new Event('input', {bubbles: true}));
+    select.dispatchEvent(new Event('change', {bubbles: true}));
+    return {tipo: 'select', atual: atual, novo: valor(maior)};
+}
+const componente = document.querySelector(
+    'mat-paginator mat-select, .mat-paginator mat-select, .mat-mdc-paginator mat-select, ' +
+    '.p-paginator p-dropdown .p-dropdown, .ui-paginator p-dropdown .ui-dropdown, ' +
+    '[class*="paginat"] ng-select, [class*="paginat"] [role="combobox"]'
+);
+if (componente) {
+    const atual = numero(componente.textContent);
+    componente.scrollIntoView({block: 'center'});
+    componente.click();
+    return {tipo: 'componente', atual: atual, novo: null};
+}
+return null;
+"""
+
+# Escolhe a maior opção numérica do overlay aberto por JS_MAIOR_TAMANHO_PAGINA
+JS_ESCOLHER_MAIOR_OPCAO = """
+const opcoes = Array.from(document.querySelectorAll(
+    'mat-option, [role="option"], .p-dropdown-item, .ui-dropdown-item, .ng-option'
+)).filter(o => /^\\s*\\d+\\s*$/.test(o.textContent));
+if (!opcoes.length) return null;
+const maior = opcoes.reduce((a, b) => parseInt(b.textContent, 10) > parseInt(a.textContent, 10) ? b : a);
+maior.click();
+return parseInt(maior.textContent, 10);
+"""
+
+# Vai para a página arguments[0] pelo paginador: campo de número de página ou botão numerado.
+# Se o botão da página não estiver visível, clica no maior número visível antes dela (salto parcial).
+# Retorna {modo, pagina} com a página efetivamente solicitada, ou null.
+JS_IR_PARA_PAGINA = """
+const destino = arguments[0];
+const atual = arguments[1];
+function visivel(el) {
+    const r = el.getBoundingClientRect();
+    return r.width > 0 && r.height > 0;
+}
+function habilitado(el) {
+    return !el.disabled && el.getAttribute('aria-disabled') !== 'true' &&
+        !/disabled/.test((el.className || '') + ' ' + ((el.parentElement && el.parentElement.className) || ''));
+}
+const paginadores = Array.from(document.querySelectorAll(
+    'mat-paginator, .mat-paginator, .mat-mdc-paginator, .p-paginator, .ui-paginator, ngb-pagination, ' +
+    'pagination-controls, .pagination, [class*="paginat"], [class*="paginac"]'
+)).filter(p => !p.querySelector('table, form'));
+if (!paginadores.length) return null;
+
+for (const paginador of paginadores) {
+    const campo = paginador.querySelector(
+        'input[type="number"], input[aria-label*="ágina"], input[aria-label*="age"], input[name*="pag"]'
+    );
+    if (campo && visivel(campo)) {
+        campo.focus();
+        campo.value = String(destino);
+        campo.dispatchEvent(new Event('input', {bubbles: true}));
+        campo.dispatchEvent(new Event('change', {bubbles: true}));
+        campo.dispatchEvent(new KeyboardEvent('keydown', {key: 'Enter', keyCode: 13, bubbles: true}));
+        campo.dispatchEvent(new KeyboardEvent('keyup', {key: 'Enter', keyCode: 13, bubbles: true}));
+        return {modo: 'campo', pagina: destino};
+    }
+}
+
+let melhor = null;
+let melhorNumero = atual;
+for (const paginador of paginadores) {
+    for (const el of paginador.querySelectorAll('a, button, li, span[role="button"], [role="link"]')) {
+        const texto = el.textContent.trim();
+        if (!/^\\d+$/.test(texto) || !visivel(el) || !habilitado(el)) continue;
+        const numero = parseInt(texto, 10);
+        if (numero === destino) {
+            el.scrollIntoView({block: 'center'});
+            el.click();
+            return {modo: 'botao', pagina: numero};
+        }
+        if (numero > melhorNumero && numero < destino) {
+            melhor = el;
+            melhorNumero = numero;
+        }
+    }
+}
+if (melhor) {
+    melhor.scrollIntoView({block: 'center'});
+    melhor.click();
+    return {modo: 'botao', pagina: melhorNumero};
+}
+return null;
+"""
+
+
+class PlanoPaginacao(namedtuple("PlanoPaginacao", "inicio fim total_registros tamanho_pagina")):
+    """
+    Situação da pesquisa segundo o indicador "x - y de N Registros"
+
+    tamanho_pagina é o número de linhas por página (fim - inicio + 1, exceto na última página,
+    em que é informado pelo chamador).
+    """
+
+    @property
+    def pagina_atual(self):
+        if not self.tamanho_pagina:
+            return 1
+        return (self.inicio - 1) // self.tamanho_pagina + 1
+
+    @property
+    def total_paginas(self):
+        if not self.tamanho_pagina:
+            return 1
+        return max(1, -(-self.total_registros // self.tamanho_pagina))
+
+    def primeiro_registro(self, pagina):
+        """Posição (a partir de 1) do primeiro registro da página"""
+        return (pagina - 1) * self.tamanho_pagina + 1
+
+    def __str__(self):
+        return (f"{self.total_registros} registros em {self.total_paginas} páginas de até "
+                f"{self.tamanho_pagina} (página atual: {self.pagina_atual})")
+
+
+def interpretar_indicador(texto, tamanho_pagina=None):
+    """
+    Interpreta o indicador de registros
+
+    Args:
+        texto (str): Texto do indicador (ex: "1 - 10 de 137 Registros")
+        tamanho_pagina (int): Linhas por página já conhecidas; se omitido, é deduzido do indicador
+
+    Returns:
+        PlanoPaginacao: Plano da pesquisa, ou None se o texto não for um indicador
+    """
+    match = PADRAO_INDICADOR.search(texto or "")
+    if not match:
+        return None
+    inicio, fim, total = (int(grupo) for grupo in match.groups())
+    if not tamanho_pagina:
+        tamanho_pagina = max(1, fim - inicio + 1)
+    return PlanoPaginacao(inicio, fim, total, tamanho_pagina)
+
+
+def url_da_pagina(url, pagina, tamanho_pagina=None):
+    """
+    Retorna a URL com o parâmetro de página trocado, quando a URL já carrega o estado da paginação
+
+    pageIndex é contado a partir de 0; os demais parâmetros, a partir de 1.
+
+    Returns:
+        str: Nova URL, ou None se a URL não tiver parâmetro de página
+    """
+    match = PADRAO_PARAMETRO_PAGINA.search(url or "")
+    if not match:
+        return None
+    valor = pagina - 1 if match.group(1).lower().endswith("pageindex=") else pagina
+    nova = url[:match.start(2)] + str(valor) + url[match.end(2):]
+    if tamanho_pagina:
+        nova = re.sub(r'([?&;](?:size|tamanho|pageSize)=)\d+', rf'\g<1>{tamanho_pagina}', nova, flags=re.IGNORECASE)
+    return nova
+
+
+# Seletores XPath de possíveis controles de paginação, dos mais específicos aos mais gerais
+SELETORES_PAGINACAO = [
+    # Seletores específicos para paginação após a tabela
+    "//table/following-sibling::*//a[contains(text(), '>')]",  # Links com '>' após a tabela
+    "//table/following-sibling::*//button[contains(text(), '>')]",  # Botões com '>' após a tabela
+    "//table/following-sibling::*//*[contains(text(), '>')]",  # Qualquer elemento com '>' após a tabela
+    "//table/following-sibling::*//*[contains(@class, 'pagination')]//a",  # Links de paginação após a tabela
+
+    # Seletores específicos para a página 2
+    "//table/following-sibling::*//a[contains(text(), '2')]",  # Link para página 2 após a tabela
+    "//table/following-sibling::*//*[contains(text(), '2')]",  # Qualquer elemento com '2' após a tabela
+
+    # Seletores específicos para "próximo"
+    "//table/following-sibling::*//a[contains(text(), 'Próximo') or contains(text(), 'próximo') or contains(text(), 'Next')]",
+
+    # Seletores gerais para paginação em qualquer lugar
+    "//ul[contains(@class, 'pagination')]/li/a",  # Bootstrap padrão
+    "//div[contains(@class, 'pagination')]//a",   # Outro padrão comum
+    "//*[contains(@class, 'pagination')]//a",     # Genérico
+    "//a[contains(@class, 'page-link')]",         # Links de página
+    "//a[contains(@href, 'page=')]",              # Links com parâmetro page
+    "//a[contains(text(), '>')]",                 # Seta para direita
+    "//button[contains(text(), '>')]",           # Botão seta para direita
+    "//i[contains(@class, 'fa-chevron-right')]",  # Ícone FontAwesome
+    "//i[contains(@class, 'fa-arrow-right')]",    # Ícone FontAwesome
+    "//span[contains(@class, 'icon') and contains(text(), '>')]", # Ícones em spans
+    "//a[contains(text(), '2')]",                 # Número 2 (próxima página)
+    "//a[contains(text(), 'Próximo') or contains(text(), 'próximo') or contains(text(), 'Next')]", # Texto indicando próximo
+    "//button[contains(@aria-label, 'Next') or contains(@aria-label, 'Próximo')]", # Botões com aria-label
+    "//div[contains(@class, 'next') or contains(@class, 'proximo')]", # Divs com classe next
+    "//li[contains(@class, 'next') or contains(@class, 'pagination-next')]//a", # Elementos li com classe next
+    "//img[contains(@src, 'next') or contains(@src, 'arrow')]", # Imagens de seta
+    "//a/img[contains(@src, 'arrow') or contains(@src, 'next')]/parent::a" # Links com imagens de setas
+]
+
+# Identificador dos candidatos encontrados por JS_BOTOES_PAGINACAO (em vez de um seletor XPath)
+ORIGEM_JS = "js"
+
+# Elementos clicáveis com características de controles de paginação
+JS_BOTOES_PAGINACAO = """
+function encontrarBotoesPaginacao() {
+    const candidatos = [];
+
+    // Buscar elementos com características visuais de paginação
+    document.querySelectorAll('a, button, span, div, li').forEach(el => {
+        // Verificar se o elemento é visível
+        const rect = el.getBoundingClientRect();
+        if (rect.width === 0 || rect.height === 0) return;
+
+        const texto = el.textContent.trim();
+        const classes = (el.className || '').toLowerCase();
+
+        // Verificar texto que indica próxima página
+        if (texto === '>' || texto === '>>' || texto === '→' || texto === '2' ||
+            texto === 'Next' || texto === 'Próximo' || texto === 'próximo') {
+            candidatos.push(el);
+        }
+
+        // Verificar classes que sugerem paginação
+        if (classes.includes('next') || classes.includes('proximo') || 
+            classes.includes('próximo') || classes.includes('pagination')) {
+            candidatos.push(el);
+        }
+
+        // Verificar se é um elemento clicável (elemento a com href ou button)
+        if ((el.tagName === 'A' && el.hasAttribute('href')) || 
+            el.tagName === 'BUTTON' || 
+            el.onclick || 
+            el.getAttribute('role') === 'button') {
+
+            // Verificar se parece ser relacionado à paginação
+            if (texto.match(/^\\d+$/) || // Números isolados
+                texto.match(/[>»→]/) ||  // Símbolos de seta
+                classes.includes('page') || 
+                classes.includes('nav')) {
+                candidatos.push(el);
+            }
+        }
+
+        // Verificar se tem filhos que podem ser ícones
+        if (el.children.length > 0) {
+            for (const child of el.children) {
+                const childClasses = (child.className || '').toLowerCase();
+                if (childClasses.includes('icon') || childClasses.includes('fa-') || 
+                    childClasses.includes('arrow') || childClasses.includes('next')) {
+                    candidatos.push(el);
+                    break;
+                }
+            }
+        }
+    });
+
+    return candidatos;
+}
+
+return encontrarBotoesPaginacao();
+"""
+
+# Elementos clicáveis visíveis na parte inferior da janela, da esquerda para a direita
+JS_ELEMENTOS_VISIVEIS = """
+function encontrarElementosClicaveisVisiveis() {
+    // Obter as dimensões da janela
+    const windowHeight = window.innerHeight;
+    const windowWidth = window.innerWidth;
+
+    // Região onde provavelmente estão os controles de paginação (parte inferior da página)
+    const areaPaginacao = {
+        top: windowHeight * 0.7,  // Últimos 30% da altura da janela
+        bottom: windowHeight,
+        left: 0,
+        right: windowWidth
+    };
+
+    // Elementos a considerar
+    const elementos = document.querySelectorAll('a, button, span[role="button"], div[role="button"]');
+    const elementosVisiveis = [];
+
+    for (const el of elementos) {
+        const rect = el.getBoundingClientRect();
+
+        // Verificar se o elemento está visível
+        if (rect.width > 0 && rect.height > 0) {
+            // Verificar se o elemento está na região de paginação
+            const centro = {
+                x: rect.left + rect.width / 2,
+                y: rect.top + rect.height / 2
+            };
+
+            if (centro.y > areaPaginacao.top && centro.y < areaPaginacao.bottom &&
+                centro.x > areaPaginacao.left && centro.x < areaPaginacao.right) {
+
+                // Coletar informações sobre o elemento
+                elementosVisiveis.push({
+                    elemento: el,
+                    texto: el.textContent.trim(),
+                    x: centro.x,
+                    y: centro.y,
+                    width: rect.width,
+                    height: rect.height,
+                    tag: el.tagName.toLowerCase()
+                });
+            }
+        }
+    }
+
+    // Ordenar elementos da esquerda para a direita (para pegar o "próximo" que normalmente está à direita)
+    elementosVisiveis.sort((a, b) => a.x - b.x);
+
+    return elementosVisiveis;
+}
+
+return encontrarElementosClicaveisVisiveis();
+"""
+
+# Injeta após a tabela um botão que navega para a página arguments[0] pelo parâmetro page= da URL
+JS_INJETAR_BOTAO = """
+const proximaPagina = arguments[0];
+function injetarBotaoPaginacao() {
+    // Verificar se já existe o botão personalizado
+    if (document.getElementById('botao-pagina-injetado')) {
+        document.getElementById('botao-pagina-injetado').remove();
+    }
+
+    // Encontrar a tabela
+    const tabela = document.querySelector('table');
+    if (!tabela) return false;
+
+    // Criar o botão
+    const botao = document.createElement('button');
+    botao.id = 'botao-pagina-injetado';
+    botao.textContent = 'Próxima Página →';
+    botao.style.cssText = 'margin: 20px; padding: 10px 20px; background-color: #4CAF50; color: white; border: none; cursor: pointer; font-size: 16px;';
+
+    // Adicionar após a tabela
+    tabela.parentNode.insertBefore(botao, tabela.nextSibling);
+
+    // Configurar ação do botão para navegar para a próxima página
+    botao.onclick = function() {
+        let url = window.location.href;
+
+        if (url.includes('page=')) {
+            url = url.replace(/page=\\d+/, 'page=' + proximaPagina);
+        } else if (url.includes('?')) {
+            url += '&page=' + proximaPagina;
+        } else {
+            url += '?page=' + proximaPagina;
+        }
+
+        console.log('Navegando para:', url);
+        window.location.href = url;
+    };
+
+    return true;
+}
+
+return injetarBotaoPaginacao();
+"""
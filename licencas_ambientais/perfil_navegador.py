@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Perfis do navegador da coleta Ecosistemas e medição do tráfego de rede por página.
+O perfil "enxuto" roda sem interface, sem extensões e bloqueia, via CDP, imagens, fontes,
+mídia e hosts de terceiros (analytics, anúncios, CDNs de fontes). O MedidorRede lê o log de
+desempenho do Chrome para informar, por página, bytes transferidos, requisições e tempo de carga.
+"""
+
+import json
+import logging
+
+logger = logging.getLogger("coletor_ecosistemas.navegador")
+
+PADRAO = "padrao"
+ENXUTO = "enxuto"
+PERFIS = [PADRAO, ENXUTO]
+
+# Tipos de recurso bloqueados pelo perfil enxuto (padrões de Network.setBlockedURLs)
+EXTENSOES_BLOQUEADAS = [
+    # Imagens
+    "png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp", "avif",
+    # Fontes
+    "woff", "woff2", "ttf", "otf", "eot",
+    # Mídia
+    "mp4", "webm", "mp3", "ogg", "wav", "m4a", "avi", "mov",
+]
+
+# Hosts de terceiros bloqueados pelo perfil enxuto
+HOSTS_TERCEIROS = [
+    "google-analytics.com", "googletagmanager.com", "analytics.google.com", "doubleclick.net",
+    "googlesyndication.com", "googleadservices.com", "fonts.googleapis.com", "fonts.gstatic.com",
+    "facebook.net", "facebook.com", "connect.facebook.net", "hotjar.com", "clarity.ms",
+    "newrelic.com", "nr-data.net", "youtube.com", "ytimg.com", "vlibras.gov.br", "barra.sistema.gov.br",
+]
+
+# Argumentos do Chrome do perfil enxuto
+ARGUMENTOS_ENXUTO = [
+    "--disable-extensions",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--mute-audio",
+    "--no-first-run",
+    "--blink-settings=imagesEnabled=false",
+]
+
+
+def padroes_bloqueados(hosts_extras=()):
+    """Retorna os padrões de URL bloqueados pelo perfil enxuto"""
+    padroes = [f"*.{extensao}" for extensao in EXTENSOES_BLOQUEADAS]
+    padroes += [f"*.{extensao}?*" for extensao in EXTENSOES_BLOQUEADAS]
+    padroes += [f"*{host}*" for host in list(HOSTS_TERCEIROS) + list(hosts_extras)]
+    return padroes
+
+
+def configurar_opcoes(chrome_options, perfil=PADRAO, modo_headless=True, medir_rede=True):
+    """
+    Ajusta as opções do Chrome para o perfil
+
+    Args:
+        chrome_options (Options): Opções do Chrome a ajustar
+        perfil (str): "padrao" ou "enxuto"
+        modo_headless (bool): Se True, executa sem interface gráfica
+        medir_rede (bool): Se True, habilita o log de desempenho usado pelo MedidorRede
+    """
+    if perfil not in PERFIS:
+        raise ValueError(f"Perfil de navegador desconhecido: {perfil} (use {', '.join(PERFIS)})")
+
+    if modo_headless:
+        # O perfil enxuto usa o modo headless atual do Chrome, mais leve que o antigo
+        chrome_options.add_argument("--headless=new" if perfil == ENXUTO else "--headless")
+
+    if perfil == ENXUTO:
+        for argumento in ARGUMENTOS_ENXUTO:
+            chrome_options.add_argument(argumento)
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+
+    if medir_rede:
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def aplicar_bloqueios(driver, perfil=PADRAO, hosts_extras=()):
+    """
+    Bloqueia, via CDP, os recursos dispensáveis do perfil enxuto
+
+    Returns:
+        int: Número de padrões de URL bloqueados (0 no perfil padrão ou se o CDP falhar)
+    """
+    if perfil != ENXUTO:
+        return 0
+    padroes = padroes_bloqueados(hosts_extras)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": padroes})
+        logger.info(f"Perfil enxuto: {len(padroes)} padrões de URL bloqueados (imagens, fontes, mídia e terceiros)")
+        return len(padroes)
+    except Exception as e:
+        logger.warning(f"Não foi possível bloquear recursos via CDP: {str(e)}")
+        return 0
+
+
+# Tempo de carga da última navegação completa do documento (0 se ainda não terminou)
+JS_TEMPO_CARGA = """
+const nav = performance.getEntriesByType('navigation')[0];
+if (nav && nav.loadEventEnd > 0) return nav.loadEventEnd - nav.startTime;
+const t = performance.timing;
+return t && t.loadEventEnd > 0 ? t.loadEventEnd - t.navigationStart : 0;
+"""
+
+
+class MedidorRede:
+    def __init__(self, driver, ativo=True):
+        """
+        Args:
+            driver: WebDriver do Chrome com o log de desempenho habilitado
+            ativo (bool): Se False, as medições são ignoradas
+        """
+        self.driver = driver
+        self.ativo = ativo
+        self.paginas = 0
+        self.bytes_total = 0
+        self.requisicoes_total = 0
+        self.bloqueadas_total = 0
+        self.tempo_total = 0.0
+
+    def _ler_eventos(self):
+        """Lê (e esvazia) o log de desempenho, somando bytes, requisições e bloqueios"""
+        bytes_transferidos = 0
+        requisicoes = 0
+        bloqueadas = 0
+        for entrada in self.driver.get_log("performance"):
+            try:
+                mensagem = json.loads(entrada["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            metodo = mensagem.get("method")
+            if metodo == "Network.requestWillBeSent":
+                requisicoes += 1
+            elif metodo == "Network.loadingFinished":
+                bytes_transferidos += int(mensagem.get("params", {}).get("encodedDataLength", 0))
+            elif metodo == "Network.loadingFailed" and mensagem.get("params", {}).get("blockedReason"):
+                bloqueadas += 1
+        return bytes_transferidos, requisicoes, bloqueadas
+
+    def descartar(self):
+        """Descarta os eventos acumulados (ex: antes da primeira medição)"""
+        if not self.ativo:
+            return
+        try:
+            self.driver.get_log("performance")
+        except Exception:
+            pass
+
+    def medir(self, descricao, tempo=None, carga_completa=False):
+        """
+        Registra o tráfego desde a última medição
+
+        Args:
+            descricao (str): Página medida (ex: "página 2 de resultados")
+            tempo (float): Duração da navegação em segundos, medida pelo chamador
+            carga_completa (bool): Se True, usa o tempo de carga do documento (Navigation Timing)
+
+        Returns:
+            dict: bytes, requisicoes, bloqueadas e tempo da página (ou None se a medição estiver desativada)
+        """
+        if not self.ativo:
+            return None
+        try:
+            bytes_transferidos, requisicoes, bloqueadas = self._ler_eventos()
+            if carga_completa:
+                tempo_carga = self.driver.execute_script(JS_TEMPO_CARGA) or 0
+                if tempo_carga:
+                    tempo = tempo_carga / 1000
+        except Exception as e:
+            logger.debug(f"Não foi possível medir o tráfego de {descricao}: {str(e)}")
+            return None
+
+        tempo = tempo or 0.0
+        self.paginas += 1
+        self.bytes_total += bytes_transferidos
+        self.requisicoes_total += requisicoes
+        self.bloqueadas_total += bloqueadas
+        self.tempo_total += tempo
+        logger.info(f"Rede [{descricao}]: {bytes_transferidos / 1024:.1f} KB em {requisicoes} requisições "
+                    f"({bloqueadas} bloqueadas), carga em {tempo:.2f}s")
+        return {"bytes": bytes_transferidos, "requisicoes": requisicoes, "bloqueadas": bloqueadas, "tempo": tempo}
+
+    def resumo(self):
+        """Retorna uma linha com o total e a média por página"""
+        if not self.paginas:
+            return "Rede: nenhuma página medida"
+        return (f"Rede: {self.paginas} páginas, {self.bytes_total / (1024 * 1024):.2f} MB em "
+                f"{self.requisicoes_total} requisições ({self.bloqueadas_total} bloqueadas); média de "
+                f"{self.bytes_total / self.paginas / 1024:.1f} KB e {self.tempo_total / self.paginas:.2f}s por página")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Perfilamento das execuções da coleta Ecosistemas (opção --profile de executar_ecosistemas.py).
+
+Dois perfis são coletados juntos:
+
+- cProfile na thread principal: tempo de CPU por função (arquivo .pstats, para snakeviz ou
+  python -m pstats);
+- amostragem da pilha de chamadas de todas as threads da coleta (thread principal e workers
+  dentro de uma etapa), a cada poucos milissegundos. Cada amostra é rotulada com a etapa em
+  execução na thread (ver metricas.ETAPAS), então o tempo de relógio aparece também enquanto a
+  coleta espera pelo navegador, pela rede ou por pausas. As amostras são gravadas no formato
+  "pilhas dobradas" (etapa;arquivo.py:funcao;... contagem), aceito por flamegraph.pl, speedscope
+  e inferno.
+
+Ao final, um relatório de texto traz o tempo de relógio e de CPU da execução e de cada etapa e
+as funções com mais amostras (hotspots).
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+
+logger = logging.getLogger("coletor_ecosistemas.perfil")
+
+# Rótulo das amostras da thread principal fora de qualquer etapa medida
+FORA_DE_ETAPA = "fora_de_etapa"
+
+
+def _nome_quadro(quadro):
+    codigo = quadro.f_code
+    return f"{os.path.basename(codigo.co_filename)}:{codigo.co_name}"
+
+
+class PerfiladorColeta:
+    def __init__(self, metricas, prefixo="ecosistemas_perfil", intervalo=0.005, top=25):
+        """
+        Inicializa o perfilador
+
+        Args:
+            metricas (MetricasColeta): Métricas da coleta; indicam a etapa em execução em cada thread
+                e trazem o tempo de relógio e de CPU por etapa para o relatório
+            prefixo (str): Prefixo dos arquivos gerados (.folded, .pstats e .txt)
+            intervalo (float): Intervalo entre amostras da pilha, em segundos
+            top (int): Número de funções listadas no relatório de hotspots
+        """
+        self.metricas = metricas
+        self.prefixo = prefixo
+        self.intervalo = intervalo
+        self.top = top
+        self.pilhas = {}
+        self.proprias = {}
+        self.amostras = 0
+        self.tempo_relogio = 0.0
+        self.tempo_cpu = 0.0
+        self._perfil = None
+        self._thread = None
+        self._parar = threading.Event()
+        self._id_principal = None
+        self._inicio = None
+        self._inicio_cpu = None
+
+    def iniciar(self):
+        """Inicia o cProfile na thread atual e a amostragem em segundo plano"""
+        self._id_principal = threading.get_ident()
+        self._inicio = time.perf_counter()
+        self._inicio_cpu = time.process_time()
+        self._perfil = cProfile.Profile()
+        self._perfil.enable()
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._amostrar, name="perfilador", daemon=True)
+        self._thread.start()
+        logger.info(f"Perfilamento iniciado (amostras a cada {self.intervalo * 1000:.0f} ms)")
+
+    def parar(self):
+        """Encerra o cProfile e a amostragem"""
+        if self._perfil is None:
+            return
+        self._perfil.disable()
+        self._parar.set()
+        self._thread.join()
+        self.tempo_relogio = time.perf_counter() - self._inicio
+        self.tempo_cpu = time.process_time() - self._inicio_cpu
+
+    def _amostrar(self):
+        proprio = threading.get_ident()
+        while not self._parar.wait(self.intervalo):
+            for id_thread, quadro in sys._current_frames().items():
+                if id_thread == proprio:
+                    continue
+                etapa = self.metricas.etapa_atual(id_thread)
+                # Threads de bibliotecas (ex: servidor de métricas, gravação dos logs) ficam de fora
+                if etapa is None and id_thread != self._id_principal:
+                    continue
+                nomes = []
+                while quadro is not None:
+                    nomes.append(_nome_quadro(quadro))
+                    quadro = quadro.f_back
+                nomes.reverse()
+                pilha = (etapa or FORA_DE_ETAPA,) + tuple(nomes)
+                self.pilhas[pilha] = self.pilhas.get(pilha, 0) + 1
+                self.proprias[nomes[-1]] = self.proprias.get(nomes[-1], 0) + 1
+                self.amostras += 1
+
+    def relatorio(self):
+        """
+        Monta o relatório de texto: tempos da execução, tempos por etapa e hotspots
+
+        Returns:
+            str: Relatório
+        """
+        linhas = [
+            f"Execução: {self.tempo_relogio:.2f}s de relógio, {self.tempo_cpu:.2f}s de CPU do processo "
+            f"({100 * self.tempo_cpu / self.tempo_relogio if self.tempo_relogio else 0:.0f}%)",
+            "",
+            "Etapas (relógio somado, CPU somada, espera):",
+        ]
+        for etapa in sorted(self.metricas.duracoes, key=lambda etapa: -self.metricas.duracoes[etapa].soma):
+            relogio = self.metricas.duracoes[etapa].soma
+            cpu = self.metricas.cpu.get(etapa, 0.0)
+            linhas.append(f"  {etapa:<28} {relogio:9.2f}s {cpu:9.2f}s {max(relogio - cpu, 0.0):9.2f}s")
+
+        linhas += ["", f"Funções com mais amostras (tempo próprio, {self.amostras} amostras de "
+                       f"{self.intervalo * 1000:.0f} ms, todas as threads da coleta):"]
+        for nome, contagem in sorted(self.proprias.items(), key=lambda item: -item[1])[:self.top]:
+            linhas.append(f"  {100 * contagem / self.amostras:5.1f}%  {contagem:7d}  {nome}")
+
+        saida = io.StringIO()
+        estatisticas = pstats.Stats(self._perfil, stream=saida)
+        estatisticas.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        linhas += ["", "cProfile da thread principal (por tempo próprio):", saida.getvalue()]
+        return "\n".join(linhas)
+
+    def salvar(self):
+        """
+        Grava as pilhas dobradas, o perfil do cProfile e o relatório, e registra os hotspots no log
+
+        Returns:
+            dict: Caminhos dos arquivos gravados (folded, pstats e relatorio)
+        """
+        arquivos = {
+            "folded": f"{self.prefixo}.folded",
+            "pstats": f"{self.prefixo}.pstats",
+            "relatorio": f"{self.prefixo}.txt",
+        }
+        try:
+            with open(arquivos["folded"], "w", encoding="utf-8") as arquivo:
+                for pilha, contagem in sorted(self.pilhas.items()):
+                    arquivo.write(f"{';'.join(pilha)} {contagem}\n")
+            self._perfil.dump_stats(arquivos["pstats"])
+            relatorio = self.relatorio()
+            with open(arquivos["relatorio"], "w", encoding="utf-8") as arquivo:
+                arquivo.write(relatorio)
+        except Exception as e:
+            logger.error(f"Erro ao salvar o perfil da coleta: {str(e)}")
+            return {}
+
+        principais = sorted(self.proprias.items(), key=lambda item: -item[1])[:min(self.top, 10)]
+        logger.info(f"Perfil: {self.tempo_relogio:.1f}s de relógio, {self.tempo_cpu:.1f}s de CPU; funções com "
+                    f"mais amostras: " + ", ".join(f"{nome} ({100 * contagem / max(self.amostras, 1):.0f}%)"
+                                                    for nome, contagem in principais))
+        logger.info(f"Perfil salvo em {arquivos['relatorio']}, {arquivos['folded']} (flamegraph.pl, speedscope) "
+                    f"e {arquivos['pstats']} (snakeviz, python -m pstats)")
+        return arquivos
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pool de navegadores para acessar páginas de detalhes em paralelo.
+Cada worker mantém sua própria sessão do Selenium e consome registros de uma fila comum.
+"""
+
+import logging
+import queue
+import threading
+
+logger = logging.getLogger("coletor_ecosistemas.pool")
+
+
+class PoolDetalhes:
+    def __init__(self, num_workers=2, modo_headless=True, fabrica_coletor=None, parser_html="html.parser",
+                 artefatos=None, perfil_navegador="padrao", limitador=None,
+                 metricas=None, gravador=None, base_url=None):
+        """
+        Inicializa o pool de workers de detalhes
+
+        Args:
+            num_workers (int): Número de sessões de navegador independentes
+            modo_headless (bool): Se True, os navegadores dos workers rodam sem interface gráfica
+            fabrica_coletor (callable): Função que cria um coletor para cada worker
+                (padrão: ColetorEcosistemas com as opções abaixo)
+            parser_html (str): Motor de análise HTML usado pelos coletores dos workers
+            artefatos (ArtefatosDepuracao): Política de screenshots compartilhada pelos workers
+            perfil_navegador (str): Perfil dos navegadores dos workers ("padrao" ou "enxuto")
+            limitador (LimitadorTaxa): Limitador de taxa compartilhado pelos workers (padrão: um novo
+                limitador, comum a todos os workers do pool); a rajada é ampliada para num_workers
+            metricas (MetricasColeta): Métricas compartilhadas pelos workers (padrão: métricas próprias do pool)
+            gravador (GravadorPaginas): Gravação das páginas de detalhes, compartilhada pelos workers
+            base_url (str): Página de acesso de visitante dos coletores dos workers, usada para
+                completar os links de detalhes relativos (padrão: a do ColetorEcosistemas)
+        """
+        self.num_workers = max(1, num_workers)
+        self.modo_headless = modo_headless
+        self.parser_html = parser_html
+        self.artefatos = artefatos
+        self.perfil_navegador = perfil_navegador
+        if limitador is None:
+            from limitador_taxa import LimitadorTaxa
+            limitador = LimitadorTaxa()
+        limitador.ampliar_capacidade(self.num_workers)
+        self.limitador = limitador
+        if metricas is None:
+            from metricas import MetricasColeta
+            metricas = MetricasColeta()
+        self.metricas = metricas
+        self.gravador = gravador
+        self.base_url = base_url
+        self.fabrica_coletor = fabrica_coletor or self._criar_coletor
+        self.coletores = []
+        self._fila = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def _criar_coletor(self):
+        from coletor_ecosistemas import ColetorEcosistemas
+        opcoes = {"base_url": self.base_url} if self.base_url else {}
+        return ColetorEcosistemas(modo_headless=self.modo_headless, parser_html=self.parser_html,
+                                  artefatos=self.artefatos, perfil_navegador=self.perfil_navegador,
+                                  limitador=self.limitador, metricas=self.metricas, gravador=self.gravador,
+                                  **opcoes)
+
+    def iniciar(self):
+        """
+        Abre as sessões de navegador e inicia as threads dos workers
+        """
+        if self._threads:
+            return
+
+        for n in range(self.num_workers):
+            try:
+                self.coletores.append(self.fabrica_coletor())
+            except Exception as e:
+                logger.error(f"Erro ao iniciar o navegador do worker {n + 1}: {str(e)}")
+
+        if not self.coletores:
+            raise RuntimeError("Nenhum worker de detalhes pôde ser iniciado")
+
+        for n, coletor in enumerate(self.coletores):
+            thread = threading.Thread(target=self._executar_worker, args=(coletor,),
+                                      name=f"worker-detalhes-{n + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        logger.info(f"Pool de detalhes iniciado com {len(self.coletores)} workers")
+
+    def _executar_worker(self, coletor):
+        while True:
+            tarefa = self._fila.get()
+            if tarefa is None:
+                self._fila.task_done()
+                break
+
+            lote, i, resultado, contador_paginas = tarefa
+            try:
+                dados_completos = coletor.enriquecer_registro(resultado, i, contador_paginas)
+            except Exception as e:
+                logger.error(f"Erro no worker ao processar o registro {i+1} da página {contador_paginas}: {str(e)}")
+                dados_completos = resultado.copy()
+
+            lote.concluir(i, dados_completos)
+            self._fila.task_done()
+
+    def processar(self, resultados_tabela, contador_paginas, ao_concluir=None):
+        """
+        Enriquece os registros de uma página usando todos os workers
+
+        Args:
+            resultados_tabela (list): Registros extraídos da tabela
+            contador_paginas (int): Número da página atual
+            ao_concluir (callable): Chamada com cada registro enriquecido, na ordem da tabela
+                (usada para o salvamento incremental)
+
+        Returns:
+            list: Registros enriquecidos, na mesma ordem da tabela
+        """
+        self.iniciar()
+
+        lote = _Lote(len(resultados_tabela), ao_concluir, self._lock)
+        for i, resultado in enumerate(resultados_tabela):
+            self._fila.put((lote, i, resultado, contador_paginas))
+
+        lote.aguardar()
+        logger.info(f"{len(resultados_tabela)} registros da página {contador_paginas} processados por {len(self.coletores)} workers")
+        return lote.resultados
+
+    def fechar(self):
+        """
+        Encerra as threads e fecha os navegadores dos workers
+        """
+        for _ in self._threads:
+            self._fila.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+        for coletor in self.coletores:
+            try:
+                coletor.driver.quit()
+            except:
+                pass
+        self.coletores = []
+        logger.info("Pool de detalhes encerrado")
+
+
+class _Lote:
+    """
+    Registros de uma página em processamento.
+    Guarda os resultados por posição e os entrega em ordem à medida que ficam prontos.
+    """
+
+    def __init__(self, total, ao_concluir, lock):
+        self.resultados = [None] * total
+        self._prontos = [False] * total
+        self._proximo = 0
+        self._ao_concluir = ao_concluir
+        self._lock = lock
+        self._concluido = threading.Event()
+        if total == 0:
+            self._concluido.set()
+
+    def concluir(self, i, dados_completos):
+        with self._lock:
+            self.resultados[i] = dados_completos
+            self._prontos[i] = True
+
+            # Entregar o maior prefixo contínuo já concluído
+            while self._proximo < len(self.resultados) and self._prontos[self._proximo]:
+                if self._ao_concluir:
+                    try:
+                        self._ao_concluir(self.resultados[self._proximo])
+                    except Exception as e:
+                        logger.error(f"Erro ao salvar o registro {self._proximo + 1}: {str(e)}")
+                self._proximo += 1
+
+            if self._proximo == len(self.resultados):
+                self._concluido.set()
+
+    def aguardar(self):
+        self._concluido.wait()
@@ -0,0 +1,538 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Servidor local que simula o sistema Ecosistemas MG: a API de acesso de visitante (coletor HTTP)
+e a página de acesso de visitante em HTML, com formulário de pesquisa, tabela de resultados,
+paginador, páginas de detalhes e links de documentos (coletor pelo navegador).
+Permite testar os coletores sem acesso à internet e, com latência e erros injetados, medir a
+coleta em escala (ver teste_carga.py).
+
+Uso:
+    python licencas_ambientais/portal_simulado.py --porta 8765 --registros 137
+    python licencas_ambientais/portal_simulado.py --registros 20000 --latencia 150 --taxa-erros 0.02
+"""
+
+import argparse
+import html
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, urlencode
+
+logger = logging.getLogger("coletor_ecosistemas.portal_simulado")
+
+ROTA_PESQUISA = "/sla/api/acesso-visitante/processos"
+ROTA_VISITANTE = "/sla/acesso-visitante"
+ROTA_DETALHE = "/sla/acesso-visitante/processo/"
+ROTA_DOCUMENTOS = "/sla/documentos/"
+
+# Tamanhos de página oferecidos pelo paginador da página de visitante
+TAMANHOS_PAGINA = [10, 25, 50, 100]
+
+# Atividades de exemplo (código DN 217 e descrição)
+ATIVIDADES = [
+    "A-05-02-0 - Unidade de Tratamento de Minerais - UTM, com tratamento a úmido",
+    "A-05-03-7 - Barragem de contenção de rejeitos/resíduos",
+    "A-05-04-5 - Pilhas de rejeito/estéril",
+    "A-02-03-8 - Lavra a céu aberto - Minério de ferro",
+    "A-01-03-1 - Unidade de Tratamento de Minerais - UTM, com tratamento a seco",
+    "E-04-01-4 - Estação de tratamento de esgoto sanitário",
+    "C-04-01-4 - Fabricação de celulose",
+]
+
+MUNICIPIOS = [
+    "Ouro Preto", "Conceição do Mato Dentro", "Itabira", "Mariana", "Congonhas",
+    "Nova Lima", "Brumadinho", "Paracatu", "Belo Horizonte", "Itabirito",
+]
+
+# Regional (Supram) de cada município
+REGIONAIS = {
+    "Ouro Preto": "Central Metropolitana", "Itabira": "Central Metropolitana", "Mariana": "Central Metropolitana",
+    "Congonhas": "Central Metropolitana", "Nova Lima": "Central Metropolitana", "Brumadinho": "Central Metropolitana",
+    "Belo Horizonte": "Central Metropolitana", "Itabirito": "Central Metropolitana",
+    "Conceição do Mato Dentro": "Jequitinhonha", "Paracatu": "Noroeste de Minas",
+}
+
+EMPRESAS = ["VALE S.A.", "CSN MINERAÇÃO S.A.", "ANGLOGOLD ASHANTI", "GERDAU AÇOMINAS S.A.", "CEMIG"]
+
+MODALIDADES = ["LAT", "LAC1", "LAC2", "LAS"]
+
+FASES = ["LP+LI+LO", "LI+LO", "LO", "LP"]
+
+
+def gerar_processos(quantidade=137, semente=42):
+    """
+    Gera processos sintéticos no formato retornado pela API do portal
+
+    Args:
+        quantidade (int): Número de processos a gerar
+        semente (int): Semente para geração determinística
+
+    Returns:
+        list: Lista de dicionários com os processos
+    """
+    aleatorio = random.Random(semente)
+    processos = []
+
+    for i in range(quantidade):
+        atividade = aleatorio.choice(ATIVIDADES)
+        empresa = aleatorio.choice(EMPRESAS)
+        documentos = [{"nome": "Requerimento de licença", "url": f"/sla/documentos/{i + 1}/requerimento.pdf"}]
+        if atividade.startswith(("A-05-02-0", "A-05-03-7")):
+            documentos.append({
+                "nome": "EIA/RIMA - Estudo de Impacto Ambiental (Atividade listada na DN 217)",
+                "url": f"/sla/documentos/{i + 1}/eia_rima.pdf"
+            })
+        elif aleatorio.random() < 0.5:
+            documentos.append({
+                "nome": "RCA - Relatório de Controle Ambiental (Classe 6 sem EIA/RIMA)",
+                "url": f"/sla/documentos/{i + 1}/rca.pdf"
+            })
+
+        ano = aleatorio.randint(2019, 2024)
+        processos.append({
+            "id": i + 1,
+            "numeroProcesso": f"{1000 + i}/{ano}",
+            "pessoaFisicaJuridica": empresa,
+            "nomeFantasia": empresa.split(" ")[0],
+            "empreendimento": f"Empreendimento {i + 1}",
+            "modalidade": aleatorio.choice(MODALIDADES),
+            "cpfCnpj": f"{aleatorio.randint(10, 99)}.{aleatorio.randint(100, 999)}.{aleatorio.randint(100, 999)}/0001-{aleatorio.randint(10, 99)}",
+            "atividadePrincipal": atividade,
+            "municipio": aleatorio.choice(MUNICIPIOS),
+            "classePredominante": str(aleatorio.choice([5, 6, 6, 6])),
+            "fatorLocacional": str(aleatorio.randint(0, 2)),
+            "faseLicenciamento": aleatorio.choice(FASES),
+            "tipoSolicitacao": "Licenciamento",
+            "documentos": documentos,
+        })
+        # Campos derivados (sem novos sorteios, para manter os processos gerados por cada semente)
+        processos[-1]["regional"] = REGIONAIS[processos[-1]["municipio"]]
+        processos[-1]["dataFormalizacao"] = f"{ano}-{i % 12 + 1:02d}-{i % 28 + 1:02d}"
+
+    return processos
+
+
+def gerar_html_detalhe(processo, linhas_extras=0):
+    """
+    Gera o HTML da página de detalhes de um processo, no layout do portal
+
+    Args:
+        processo (dict): Processo no formato de gerar_processos
+        linhas_extras (int): Linhas adicionais no histórico de tramitação (aumenta o tamanho da página)
+
+    Returns:
+        str: HTML da página
+    """
+    e = html.escape
+    campos_strong = [
+        ("CPF/CNPJ", processo["cpfCnpj"]),
+        ("Pessoa Física/Jurídica", processo["pessoaFisicaJuridica"]),
+        ("Nome Fantasia", processo["nomeFantasia"]),
+        ("Empreendimento", processo["empreendimento"]),
+        ("Município da Solicitação", processo["municipio"]),
+        ("Número do Processo", processo["numeroProcesso"]),
+    ]
+    campos_th = [
+        ("Classe predominante", processo["classePredominante"]),
+        ("Fator locacional", processo["fatorLocacional"]),
+        ("Modalidade licenciamento", processo["modalidade"]),
+        ("Fase do licenciamento", processo["faseLicenciamento"]),
+        ("Tipo solicitação", processo["tipoSolicitacao"]),
+    ]
+
+    partes = [
+        "<html><head><title>SLA - Acesso Visitante</title>",
+        "<script>window.__config = {api: '/sla/api'};</script></head><body>",
+        "<nav class='navbar'><div class='navbar-header'>Sistema de Licenciamento Ambiental | Sisema</div></nav>",
+        "<app-root><div class='container'><div class='card'><div class='card-body'>",
+    ]
+    for label, valor in campos_strong:
+        partes.append(f"<p><strong>{e(label)}:</strong> {e(valor)}</p>")
+    partes.append("<table class='table'><tbody>")
+    for label, valor in campos_th:
+        partes.append(f"<tr><th>{e(label)}</th><td>{e(valor)}</td></tr>")
+    partes.append("</tbody></table>")
+    partes.append("<table class='table tabela-atividades'><tr><th>Atividade</th><th>Parâmetro</th></tr>")
+    partes.append(f"<tr><td>{e(processo['atividadePrincipal'])}</td><td>Capacidade instalada</td></tr></table>")
+    partes.append("<h4>Histórico</h4><table class='table'><tr><th>Data</th><th>Situação</th></tr>")
+    for n in range(linhas_extras):
+        partes.append(f"<tr><td>{(n % 28) + 1:02d}/0{(n % 9) + 1}/2023</td><td>Análise técnica em andamento</td></tr>")
+    partes.append("</table><div class='documentos'><h4>Documentos</h4><ul>")
+    for documento in processo["documentos"]:
+        partes.append(f"<li><a href='{e(documento['url'])}'>{e(documento['nome'])}</a></li>")
+    partes.append("</ul></div></div></div></div></app-root>")
+    partes.append("<footer><a href='/sla/ajuda'>Ajuda</a></footer></body></html>")
+    return "".join(partes)
+
+
+def gerar_html_tabela(processos, inicio=0, total=None, rota_detalhes="#/acesso-visitante/processo/{id}",
+                      paginador=None, linhas_irregulares=0):
+    """
+    Gera o HTML da página de resultados da pesquisa, no layout do portal
+
+    Args:
+        processos (list): Processos exibidos na página
+        inicio (int): Posição do primeiro processo no total de resultados
+        total (int): Total de resultados da pesquisa (padrão: len(processos))
+        rota_detalhes (str): Link de detalhes de cada processo, com {id}
+        paginador (str): HTML do paginador (padrão: indicador de registros e botão "Próximo")
+        linhas_irregulares (int): Se maior que zero, a cada N processos a linha é substituída pelo
+            formato irregular de célula única (classe predominante e link de detalhes)
+
+    Returns:
+        str: HTML da página
+    """
+    e = html.escape
+    total = len(processos) if total is None else total
+    cabecalhos = ["Processo", "Pessoa Física/Jurídica", "Empreendimento", "Modalidade", "CPF/CNPJ",
+                  "Atividade Principal", "Município da Solicitação", "Ações"]
+
+    partes = [
+        "<html><head><title>SLA - Acesso Visitante</title></head><body>",
+        "<nav class='navbar'><div class='navbar-header'>Sistema de Licenciamento Ambiental | Sisema</div></nav>",
+        "<app-root><div class='container'><table class='table table-striped'><thead><tr>",
+    ]
+    partes.extend(f"<th>{e(cabecalho)}</th>" for cabecalho in cabecalhos)
+    partes.append("</tr></thead><tbody>")
+    for posicao, processo in enumerate(processos, 1):
+        if linhas_irregulares and posicao % linhas_irregulares == 0:
+            partes.append(f"<tr><td colspan='{len(cabecalhos)}'><a href='{e(rota_detalhes.format(id=processo['id']))}'>"
+                          f"Classe {e(processo['classePredominante'])}</a></td></tr>")
+            continue
+        valores = [processo["numeroProcesso"], processo["pessoaFisicaJuridica"], processo["empreendimento"],
+                   processo["modalidade"], processo["cpfCnpj"], processo["atividadePrincipal"], processo["municipio"]]
+        partes.append("<tr>")
+        partes.extend(f"<td>{e(valor)}</td>" for valor in valores)
+        partes.append(f"<td><a href='{e(rota_detalhes.format(id=processo['id']))}' title='Visualizar'>"
+                      f"<i class='fa fa-eye'></i></a></td></tr>")
+    partes.append("</tbody></table>")
+    if paginador is None:
+        fim = inicio + len(processos)
+        paginador = (f"<div class='paginacao'><span>{inicio + 1 if processos else 0} - {fim} de {total} Registros</span>"
+                     "<button class='btn'>Próximo</button></div>")
+    partes.append(paginador)
+    partes.append("</div></app-root></body></html>")
+    return "".join(partes)
+
+
+def gerar_html_paginador(pagina, tamanho, total, parametros):
+    """
+    Gera o paginador da página de visitante: indicador de registros, tamanho de página, links
+    numerados (até duas páginas de cada lado da atual) e "Anterior"/"Próximo"
+
+    Args:
+        pagina (int): Página atual (a partir de 1)
+        tamanho (int): Registros por página
+        total (int): Total de resultados da pesquisa
+        parametros (dict): Parâmetros da pesquisa, repetidos nos links
+
+    Returns:
+        str: HTML do paginador
+    """
+    total_paginas = max(1, -(-total // tamanho))
+    inicio = (pagina - 1) * tamanho
+
+    def link(numero, texto, classe="page-link"):
+        consulta = urlencode({**parametros, "tamanho": tamanho, "pagina": numero}, doseq=True)
+        return f"<li class='page-item'><a class='{classe}' href='{ROTA_VISITANTE}?{html.escape(consulta)}'>{texto}</a></li>"
+
+    partes = [
+        "<div class='paginacao'>",
+        f"<span>{inicio + 1 if total else 0} - {min(inicio + tamanho, total)} de {total} Registros</span>",
+        "<label>Itens por página <select name='tamanho'>",
+    ]
+    partes.extend(f"<option value='{opcao}'{' selected' if opcao == tamanho else ''}>{opcao}</option>"
+                  for opcao in TAMANHOS_PAGINA)
+    partes.append("</select></label><ul class='pagination'>")
+    if pagina > 1:
+        partes.append(link(pagina - 1, "Anterior"))
+    for numero in range(max(1, pagina - 2), min(total_paginas, pagina + 2) + 1):
+        if numero == pagina:
+            partes.append(f"<li class='page-item active'><span class='page-link'>{numero}</span></li>")
+        else:
+            partes.append(link(numero, str(numero)))
+    if pagina < total_paginas:
+        partes.append(link(pagina + 1, "Próximo"))
+    partes.append("</ul></div>")
+    return "".join(partes)
+
+
+def gerar_html_visitante(parametros, resultados=None):
+    """
+    Gera a página de acesso de visitante: formulário de pesquisa e, após a pesquisa, os resultados
+
+    Args:
+        parametros (dict): Parâmetros da pesquisa (parse_qs da URL), repetidos no formulário
+        resultados (str): HTML da tabela de resultados e do paginador (None antes da pesquisa)
+
+    Returns:
+        str: HTML da página
+    """
+    e = html.escape
+
+    def valor(nome):
+        return e((parametros.get(nome) or [""])[0])
+
+    classe = valor("classe")
+    modalidade = valor("modalidade")
+    partes = [
+        "<html><head><title>SLA - Acesso Visitante</title></head><body>",
+        "<nav class='navbar'><div class='navbar-header'>Sistema de Licenciamento Ambiental | Sisema</div></nav>",
+        f"<app-root><div class='container'><form method='get' action='{ROTA_VISITANTE}'>",
+        "<label for='classe'>Classe predominante</label><select id='classe' name='classe'><option value=''></option>",
+    ]
+    partes.extend(f"<option value='{n}'{' selected' if classe == str(n) else ''}>{n}</option>" for n in range(1, 7))
+    partes.append("</select>")
+    partes.append(f"<label for='municipio'>Município</label><input id='municipio' name='municipio' value='{valor('municipio')}'>")
+    partes.append(f"<label for='regional'>Regional</label><input id='regional' name='regional' value='{valor('regional')}'>")
+    partes.append("<label for='modalidade'>Modalidade</label><select id='modalidade' name='modalidade'><option value=''></option>")
+    partes.extend(f"<option value='{m}'{' selected' if modalidade == m else ''}>{m}</option>" for m in MODALIDADES)
+    partes.append("</select>")
+    partes.append(f"<label for='dataInicio'>Data inicial</label><input id='dataInicio' name='dataInicio' "
+                  f"placeholder='dd/mm/aaaa' value='{valor('dataInicio')}'>")
+    partes.append(f"<label for='dataFim'>Data final</label><input id='dataFim' name='dataFim' "
+                  f"placeholder='dd/mm/aaaa' value='{valor('dataFim')}'>")
+    partes.append("<input type='hidden' name='pesquisar' value='1'><button type='submit' class='btn'>Pesquisar</button></form>")
+    if resultados is not None:
+        partes.append(resultados)
+    partes.append("</div></app-root></body></html>")
+    return "".join(partes)
+
+
+def _data_iso(texto):
+    """Data do formulário (dd/mm/aaaa) ou da API (aaaa-mm-dd) no formato aaaa-mm-dd"""
+    dia, separador, resto = texto.partition("/")
+    if not separador:
+        return texto
+    mes, _, ano = resto.partition("/")
+    return f"{ano}-{mes}-{dia}"
+
+
+def _atende_filtro(processo, parametros):
+    """Verifica se o processo atende aos parâmetros da pesquisa (campos com vários valores aceitam qualquer um)"""
+    for parametro, campo in (("classe", "classePredominante"), ("municipio", "municipio"),
+                             ("regional", "regional"), ("modalidade", "modalidade")):
+        valores = parametros.get(parametro)
+        if valores and processo[campo] not in valores:
+            return False
+    data_inicio = _data_iso(parametros.get("dataInicio", [""])[0])
+    data_fim = _data_iso(parametros.get("dataFim", [""])[0])
+    if data_inicio and processo["dataFormalizacao"] < data_inicio:
+        return False
+    if data_fim and processo["dataFormalizacao"] > data_fim:
+        return False
+    return True
+
+
+class _ManipuladorPortal(BaseHTTPRequestHandler):
+    """Responde às rotas da API simulada, da página de visitante, das páginas de detalhes e dos documentos"""
+
+    protocol_version = "HTTP/1.1"  # Manter conexões abertas (keep-alive)
+
+    def log_message(self, formato, *args):
+        logger.debug("%s - %s", self.address_string(), formato % args)
+
+    def _responder_json(self, status, conteudo):
+        corpo = json.dumps(conteudo, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _responder(self, status, corpo, tipo="text/html; charset=utf-8"):
+        if isinstance(corpo, str):
+            corpo = corpo.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parametros = parse_qs(url.query)
+        processos = self.server.processos
+
+        # Latência e erros injetados (ver PortalSimulado)
+        atraso, falhar = self.server.portal.sortear_resposta()
+        if atraso:
+            time.sleep(atraso)
+        if falhar:
+            self._responder_json(503, {"erro": "Serviço temporariamente indisponível (erro injetado)"})
+            return
+
+        if url.path.rstrip("/") == ROTA_PESQUISA:
+            pagina = int(parametros.get("pagina", ["0"])[0])
+            tamanho = int(parametros.get("tamanho", ["10"])[0])
+
+            filtrados = [p for p in processos if _atende_filtro(p, parametros)]
+            inicio = pagina * tamanho
+            conteudo = [
+                {chave: valor for chave, valor in p.items() if chave != "documentos"}
+                for p in filtrados[inicio:inicio + tamanho]
+            ]
+            self._responder_json(200, {
+                "content": conteudo,
+                "totalElements": len(filtrados),
+                "number": pagina,
+                "size": tamanho,
+            })
+            return
+
+        if url.path.startswith(ROTA_PESQUISA + "/"):
+            processo = self.server.portal.processo(url.path[len(ROTA_PESQUISA) + 1:].strip("/"))
+            if processo is not None:
+                self._responder_json(200, processo)
+                return
+
+        if url.path.rstrip("/") == ROTA_VISITANTE:
+            resultados = None
+            if parametros.get("pesquisar") or parametros.get("pagina"):
+                pagina = max(1, int(parametros.get("pagina", ["1"])[0]))
+                tamanho = int(parametros.get("tamanho", [str(TAMANHOS_PAGINA[0])])[0])
+                pesquisa = {chave: valores for chave, valores in parametros.items() if chave not in ("pagina", "tamanho")}
+                filtrados = [p for p in processos if _atende_filtro(p, parametros)]
+                inicio = (pagina - 1) * tamanho
+                if filtrados:
+                    resultados = gerar_html_tabela(filtrados[inicio:inicio + tamanho], inicio, len(filtrados),
+                                                   rota_detalhes=ROTA_DETALHE + "{id}",
+                                                   paginador=gerar_html_paginador(pagina, tamanho, len(filtrados), pesquisa))
+                else:
+                    resultados = "<div class='alert'>Nenhum resultado encontrado</div>"
+            self._responder(200, gerar_html_visitante(parametros, resultados))
+            return
+
+        if url.path.startswith(ROTA_DETALHE):
+            processo = self.server.portal.processo(url.path[len(ROTA_DETALHE):].strip("/"))
+            if processo is not None:
+                self._responder(200, gerar_html_detalhe(processo, self.server.portal.linhas_extras))
+                return
+
+        if url.path.startswith(ROTA_DOCUMENTOS):
+            self._responder(200, b"%PDF-1.4\n% documento simulado\n%%EOF\n", tipo="application/pdf")
+            return
+
+        self._responder_json(404, {"erro": "Recurso não encontrado"})
+
+
+class PortalSimulado:
+    """
+    Servidor HTTP local com a API e a página de visitante simuladas, executado em uma thread separada
+
+    Pode ser usado como gerenciador de contexto:
+
+        with PortalSimulado(gerar_processos(50)) as portal:
+            coletor = ColetorEcosistemasHTTP(base_url=portal.url)
+            coletor = ColetorEcosistemas(base_url=portal.url_visitante)
+    """
+
+    def __init__(self, processos=None, host="127.0.0.1", porta=0, latencia=0.0, variacao_latencia=0.0,
+                 taxa_erros=0.0, linhas_extras=0, semente=42):
+        """
+        Args:
+            processos (list): Processos servidos pela API (padrão: 137 sintéticos)
+            host (str): Endereço de escuta
+            porta (int): Porta de escuta (0 escolhe uma porta livre)
+            latencia (float): Atraso mínimo de cada resposta, em segundos
+            variacao_latencia (float): Atraso adicional sorteado entre 0 e este valor, em segundos
+            taxa_erros (float): Fração das requisições respondidas com erro 503 (entre 0 e 1)
+            linhas_extras (int): Linhas de histórico nas páginas de detalhes (ver gerar_html_detalhe)
+            semente (int): Semente do sorteio da latência e dos erros
+        """
+        self.processos = processos if processos is not None else gerar_processos()
+        self.por_id = {str(processo["id"]): processo for processo in self.processos}
+        self.latencia = latencia
+        self.variacao_latencia = variacao_latencia
+        self.taxa_erros = taxa_erros
+        self.linhas_extras = linhas_extras
+        self.requisicoes = 0
+        self.erros_injetados = 0
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.Lock()
+        self.servidor = ThreadingHTTPServer((host, porta), _ManipuladorPortal)
+        self.servidor.daemon_threads = True
+        self.servidor.processos = self.processos
+        self.servidor.portal = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, porta = self.servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    @property
+    def url_visitante(self):
+        """Endereço da página de acesso de visitante (base_url do coletor pelo navegador)"""
+        return f"{self.url}{ROTA_VISITANTE}"
+
+    def processo(self, identificador):
+        """Processo pelo id (None se não existir)"""
+        return self.por_id.get(identificador)
+
+    def sortear_resposta(self):
+        """
+        Sorteia o atraso e a falha injetados em uma requisição
+
+        Returns:
+            tuple: (atraso em segundos, True se a requisição deve falhar)
+        """
+        with self._lock:
+            self.requisicoes += 1
+            atraso = self.latencia + self._aleatorio.random() * self.variacao_latencia
+            falhar = self._aleatorio.random() < self.taxa_erros
+            if falhar:
+                self.erros_injetados += 1
+        return atraso, falhar
+
+    def iniciar(self):
+        """Inicia o servidor em segundo plano e retorna a URL base"""
+        self.thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Portal simulado disponível em {self.url}")
+        return self.url
+
+    def parar(self):
+        """Encerra o servidor"""
+        self.servidor.shutdown()
+        self.servidor.server_close()
+        logger.info("Portal simulado encerrado")
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.parar()
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Portal Ecosistemas simulado para testes offline')
+    parser.add_argument('--porta', type=int, default=8765,
+                        help='Porta de escuta (padrão: 8765)')
+    parser.add_argument('--registros', type=int, default=137,
+                        help='Número de processos sintéticos (padrão: 137)')
+    parser.add_argument('--latencia', type=float, default=0,
+                        help='Atraso mínimo de cada resposta, em milissegundos (padrão: 0)')
+    parser.add_argument('--variacao-latencia', type=float, default=0,
+                        help='Atraso adicional sorteado de até este valor, em milissegundos (padrão: 0)')
+    parser.add_argument('--taxa-erros', type=float, default=0,
+                        help='Fração das requisições respondidas com erro 503 (padrão: 0)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    portal = PortalSimulado(gerar_processos(args.registros), porta=args.porta, latencia=args.latencia / 1000,
+                            variacao_latencia=args.variacao_latencia / 1000, taxa_erros=args.taxa_erros)
+    logger.info(f"Servindo {args.registros} processos em {portal.url}{ROTA_PESQUISA} (API) "
+                f"e {portal.url_visitante} (página de visitante)")
+    try:
+        portal.servidor.serve_forever()
+    except KeyboardInterrupt:
+        portal.parar()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Índice de processos já coletados em execuções anteriores, usado pelo modo delta.
+Permite enriquecer apenas processos novos ou alterados e encerrar a paginação
+quando uma página inteira já é conhecida.
+"""
+
+import csv
+import glob
+import logging
+import os
+import re
+
+logger = logging.getLogger("coletor_ecosistemas.delta")
+
+# Colunas da tabela de resultados comparadas para detectar alterações em um processo
+CAMPOS_COMPARADOS = [
+    'pessoa_física/jurídica', 'empreendimento', 'modalidade', 'cpf/cnpj',
+    'atividade_principal', 'município_da_solicitação'
+]
+
+NOVO = "novo"
+ALTERADO = "alterado"
+CONHECIDO = "conhecido"
+
+
+def assinatura_registro(registro):
+    """Retorna os valores das colunas comparadas, normalizados, para detectar alterações"""
+    return tuple(" ".join(str(registro.get(campo) or "").split()) for campo in CAMPOS_COMPARADOS)
+
+
+class ProcessosConhecidos:
+    def __init__(self, registros=()):
+        """
+        Args:
+            registros (iterable): Registros já coletados (dicts com a coluna 'processo' ou, nas linhas
+                sem processo, 'link_detalhes')
+        """
+        self._assinaturas = {}
+        for registro in registros:
+            self.adicionar(registro)
+
+    @classmethod
+    def carregar(cls, arquivos):
+        """
+        Carrega os processos de arquivos CSV de saídas anteriores
+
+        Em caso de repetição, prevalece a ocorrência do arquivo mais recente.
+        """
+        conhecidos = cls()
+        for arquivo in sorted(arquivos, key=os.path.getmtime):
+            try:
+                with open(arquivo, newline='', encoding='utf-8-sig') as csvfile:
+                    for registro in csv.DictReader(csvfile):
+                        conhecidos.adicionar(registro)
+            except Exception as e:
+                logger.warning(f"Não foi possível ler {arquivo}: {str(e)}")
+        logger.info(f"{len(conhecidos)} processos conhecidos carregados de {len(arquivos)} arquivos")
+        return conhecidos
+
+    @classmethod
+    def de_saidas_anteriores(cls, prefixo="licencas_ecosistemas",
+                             incremental="ecosistemas_resultados_incrementais.csv"):
+        """
+        Carrega os processos das saídas finais com o prefixo informado ({prefixo}_AAAAMMDD_HHMM.csv,
+        como gravadas por salvar_resultados) e do CSV incremental
+
+        Outros CSVs com o mesmo prefixo (ex: saídas de partições, {prefixo}_{partição}_AAAAMMDD_HHMM.csv)
+        não são considerados.
+        """
+        padrao = re.compile(re.escape(os.path.basename(prefixo)) + r"_\d{8}_\d{4}\.csv")
+        arquivos = [arquivo for arquivo in glob.glob(f"{glob.escape(prefixo)}_*.csv")
+                    if padrao.fullmatch(os.path.basename(arquivo))]
+        if incremental and os.path.exists(incremental):
+            arquivos.append(incremental)
+        return cls.carregar(arquivos)
+
+    @staticmethod
+    def chave(registro):
+        """
+        Identificação do registro: o número do processo ou, nas linhas sem ele (formato irregular
+        de célula única da tabela), o link de detalhes
+        """
+        return (registro.get("processo") or "").strip() or (registro.get("link_detalhes") or "").strip()
+
+    def adicionar(self, registro):
+        chave = self.chave(registro)
+        if chave:
+            self._assinaturas[chave] = assinatura_registro(registro)
+
+    def situacao(self, registro):
+        """
+        Classifica um registro da tabela em relação às coletas anteriores
+
+        Returns:
+            str: NOVO, ALTERADO ou CONHECIDO
+        """
+        chave = self.chave(registro)
+        if not chave or chave not in self._assinaturas:
+            return NOVO
+        if self._assinaturas[chave] != assinatura_registro(registro):
+            return ALTERADO
+        return CONHECIDO
+
+    @staticmethod
+    def pagina_conhecida(registros, situacoes):
+        """
+        Indica se a página de resultados já é toda conhecida, o que encerra a coleta delta
+
+        Só os registros com número de processo decidem: as linhas de célula única não têm
+        processo e, se não foram gravadas com o link de detalhes, seriam sempre novas.
+
+        Args:
+            registros (list): Registros da página
+            situacoes (list): Situação de cada registro (ver situacao)
+
+        Returns:
+            bool: True se há processos na página e todos são CONHECIDO
+        """
+        com_processo = [situacao for registro, situacao in zip(registros, situacoes)
+                        if (registro.get("processo") or "").strip()]
+        return bool(com_processo) and all(situacao == CONHECIDO for situacao in com_processo)
+
+    def __contains__(self, processo):
+        return processo in self._assinaturas
+
+    def __len__(self):
+        return len(self._assinaturas)
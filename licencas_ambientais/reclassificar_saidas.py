@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Reclassifica saídas anteriores da coleta (CSV ou Excel) com a tabela de regras de atividades atual.
+Útil depois de atualizar regras_dn217.json, sem precisar repetir a coleta.
+
+Uso:
+    python licencas_ambientais/reclassificar_saidas.py licencas_ecosistemas_*.csv
+    python licencas_ambientais/reclassificar_saidas.py saida.xlsx --regras minhas_regras.json --sobrescrever
+"""
+
+import argparse
+import csv
+import glob
+import logging
+import os
+
+import pandas as pd
+
+from classificacao_estudos import ClassificadorEstudos, CLASSIFICADOR
+from regras_atividades import RegrasAtividades
+
+logger = logging.getLogger("coletor_ecosistemas")
+
+
+def ler_registros(caminho):
+    """
+    Lê os registros de um arquivo CSV ou Excel, mantendo todos os valores como texto
+
+    Returns:
+        tuple: (lista de registros, lista de colunas)
+    """
+    if caminho.lower().endswith((".xlsx", ".xls")):
+        df = pd.read_excel(caminho, dtype=str, keep_default_na=False)
+        return df.to_dict("records"), list(df.columns)
+
+    with open(caminho, newline='', encoding='utf-8-sig') as csvfile:
+        reader = csv.DictReader(csvfile)
+        return list(reader), list(reader.fieldnames or [])
+
+
+def gravar_registros(caminho, registros, colunas):
+    """Grava os registros no formato indicado pela extensão (troca atômica do arquivo)"""
+    temporario = f"{caminho}.tmp"
+    if caminho.lower().endswith((".xlsx", ".xls")):
+        pd.DataFrame(registros, columns=colunas).to_excel(temporario, index=False, engine="openpyxl")
+    else:
+        with open(temporario, 'w', newline='', encoding='utf-8-sig') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=colunas)
+            writer.writeheader()
+            writer.writerows(registros)
+    os.replace(temporario, caminho)
+
+
+def reclassificar_arquivo(caminho, classificador=CLASSIFICADOR, sobrescrever=False):
+    """
+    Reclassifica os registros de um arquivo de saída
+
+    Args:
+        caminho (str): Arquivo CSV ou Excel gerado pela coleta
+        classificador (ClassificadorEstudos): Classificador com as regras a aplicar
+        sobrescrever (bool): Se True, grava no próprio arquivo; senão, em <nome>_reclassificado.<ext>
+
+    Returns:
+        tuple: (arquivo gravado, total de registros, registros alterados)
+    """
+    registros, colunas = ler_registros(caminho)
+    if "tipo_de_estudo" not in colunas:
+        colunas.append("tipo_de_estudo")
+
+    alterados = classificador.reclassificar_registros(registros)
+
+    if sobrescrever:
+        destino = caminho
+    else:
+        base, extensao = os.path.splitext(caminho)
+        destino = f"{base}_reclassificado{extensao}"
+    gravar_registros(destino, registros, colunas)
+
+    logger.info(f"{caminho}: {alterados} de {len(registros)} registros reclassificados -> {destino}")
+    return destino, len(registros), alterados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Reclassifica saídas anteriores com as regras de atividades atuais')
+    parser.add_argument('arquivos', nargs='+',
+                        help='Arquivos CSV ou Excel gerados pela coleta (aceita padrões glob)')
+    parser.add_argument('--regras', default=None,
+                        help='Arquivo de regras de atividades (padrão: regras_dn217.json)')
+    parser.add_argument('--sobrescrever', action='store_true',
+                        help='Grava no próprio arquivo em vez de criar <nome>_reclassificado')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    classificador = CLASSIFICADOR
+    if args.regras:
+        classificador = ClassificadorEstudos(regras=RegrasAtividades.carregar(args.regras))
+
+    arquivos = []
+    for padrao in args.arquivos:
+        arquivos.extend(sorted(glob.glob(padrao)) or [padrao])
+
+    total_registros = 0
+    total_alterados = 0
+    for arquivo in arquivos:
+        if arquivo.endswith(("_reclassificado.csv", "_reclassificado.xlsx")) and not args.sobrescrever:
+            continue
+        try:
+            _, registros, alterados = reclassificar_arquivo(arquivo, classificador, args.sobrescrever)
+            total_registros += registros
+            total_alterados += alterados
+        except Exception as e:
+            logger.error(f"Erro ao reclassificar {arquivo}: {str(e)}")
+
+    print(f"\n{total_alterados} de {total_registros} registros reclassificados em {len(arquivos)} arquivos")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tabela de regras de atividades da DN COPAM 217/2017 usada para inferir o tipo de estudo.
+As regras ficam em um arquivo de dados versionado (regras_dn217.json) e são compiladas
+em um dicionário indexado pelo código da atividade, de modo que a inferência é O(1) por registro.
+"""
+
+import json
+import logging
+import os
+import re
+from collections import namedtuple
+
+logger = logging.getLogger("coletor_ecosistemas")
+
+ARQUIVO_REGRAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regras_dn217.json")
+
+# Código de atividade da DN 217 (ex: A-05-02-0), aceitando também a forma sem hífens (A05020)
+PADRAO_CODIGO = re.compile(r'(?<![A-Z0-9])([A-H])-?(\d{2})-?(\d{2})-?(\d)(?!\d)')
+
+# Classe de enquadramento (1 a 6) informada no registro
+PADRAO_CLASSE = re.compile(r'(?<!\d)([1-6])(?!\d)')
+
+RegraAtividade = namedtuple("RegraAtividade", ["codigo", "descricao", "tipo_estudo"])
+
+
+def normalizar_codigo(letra, divisao, grupo, digito):
+    """Monta o código no formato canônico X-00-00-0"""
+    return f"{letra}-{divisao}-{grupo}-{digito}"
+
+
+def extrair_codigos(atividade):
+    """
+    Retorna os códigos de atividade presentes no texto, no formato canônico
+
+    Args:
+        atividade (str): Texto da atividade principal (ex: "A-05-02-0 - Unidade de Tratamento...")
+
+    Returns:
+        list: Códigos encontrados, na ordem do texto
+    """
+    if not atividade:
+        return []
+    return [normalizar_codigo(*match.groups()) for match in PADRAO_CODIGO.finditer(atividade.upper())]
+
+
+class RegrasAtividades:
+    def __init__(self, atividades=(), classes=None, prioridade=("EIA/RIMA", "RCA"), versao="", fonte=""):
+        """
+        Args:
+            atividades (iterable): Regras por código (dicts com codigo, descricao e tipo_estudo)
+            classes (dict): Tipo de estudo exigido por classe de enquadramento (ex: {"6": "EIA/RIMA"})
+            prioridade (list): Ordem de precedência quando mais de uma regra se aplica
+            versao (str): Versão do arquivo de regras
+            fonte (str): Origem das regras
+        """
+        self.versao = versao
+        self.fonte = fonte
+        self.prioridade = list(prioridade)
+        self.classes = {str(classe): tipo for classe, tipo in (classes or {}).items()}
+        self.por_codigo = {}
+
+        for atividade in atividades:
+            codigos = extrair_codigos(atividade["codigo"])
+            if len(codigos) != 1:
+                raise ValueError(f"Código de atividade inválido nas regras: {atividade['codigo']}")
+            regra = RegraAtividade(codigos[0], atividade.get("descricao", ""), atividade["tipo_estudo"])
+            self.por_codigo[regra.codigo] = regra
+
+    @classmethod
+    def carregar(cls, caminho=ARQUIVO_REGRAS):
+        """
+        Carrega as regras de um arquivo JSON
+
+        Args:
+            caminho (str): Arquivo de regras (padrão: regras_dn217.json ao lado deste módulo)
+
+        Returns:
+            RegrasAtividades: Regras compiladas
+        """
+        with open(caminho, encoding='utf-8') as f:
+            dados = json.load(f)
+
+        regras = cls(
+            atividades=dados.get("atividades", []),
+            classes=dados.get("classes"),
+            prioridade=dados.get("prioridade", ("EIA/RIMA", "RCA")),
+            versao=dados.get("versao", ""),
+            fonte=dados.get("fonte", ""),
+        )
+        logger.info(f"Regras de atividades versão {regras.versao or '?'} carregadas: "
+                    f"{len(regras)} códigos, {len(regras.classes)} classes")
+        return regras
+
+    def __len__(self):
+        return len(self.por_codigo)
+
+    def __contains__(self, codigo):
+        return codigo in self.por_codigo
+
+    def regras_aplicaveis(self, atividade_principal="", classe_predominante=""):
+        """
+        Retorna os tipos de estudo indicados pela atividade e pela classe do registro
+
+        Returns:
+            list: Tipos de estudo das regras que se aplicam (pode conter repetições)
+        """
+        tipos = []
+        for codigo in extrair_codigos(atividade_principal):
+            regra = self.por_codigo.get(codigo)
+            if regra:
+                tipos.append(regra.tipo_estudo)
+
+        if classe_predominante and self.classes:
+            for match in PADRAO_CLASSE.finditer(str(classe_predominante)):
+                tipo = self.classes.get(match.group(1))
+                if tipo:
+                    tipos.append(tipo)
+        return tipos
+
+    def inferir(self, atividade_principal="", classe_predominante=""):
+        """
+        Infere o tipo de estudo exigido pela atividade principal e, opcionalmente, pela classe
+
+        Quando mais de uma regra se aplica, vale a ordem de 'prioridade' do arquivo de regras.
+
+        Returns:
+            str: Tipo de estudo (ex: "EIA/RIMA") ou None quando nenhuma regra se aplica
+        """
+        tipos = self.regras_aplicaveis(atividade_principal, classe_predominante)
+        if not tipos:
+            return None
+        for tipo in self.prioridade:
+            if tipo in tipos:
+                return tipo
+        return tipos[0]
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Saída incremental em CSV com deduplicação por número de processo.
+Mantém um índice em memória dos processos já gravados e usa um esquema de colunas estável,
+ampliado quando surge uma coluna nova. Atualizações de registros existentes são acrescentadas
+ao arquivo (a última ocorrência de cada processo prevalece) e o arquivo é compactado ao fechar.
+"""
+
+import csv
+import logging
+import os
+import threading
+
+logger = logging.getLogger("coletor_ecosistemas.saida")
+
+# Esquema padrão: colunas da tabela de resultados seguidas das colunas da página de detalhes
+CAMPOS_PADRAO = [
+    'processo', 'pessoa_física/jurídica', 'empreendimento', 'modalidade', 'cpf/cnpj',
+    'atividade_principal', 'município_da_solicitação', 'classe_predominante',
+    'tipo_de_estudo', 'motivo_estudo', 'ações',
+    'CPF/CNPJ', 'Pessoa Física/Jurídica', 'Nome Fantasia', 'Empreendimento',
+    'Município da Solicitação', 'Número do Processo', 'Classe predominante',
+    'Fator locacional', 'Modalidade licenciamento', 'Fase do licenciamento',
+    'Tipo solicitação', 'Atividade Principal', 'Tipo de Estudo',
+    'Documentos', 'Links_Documentos', 'link_detalhes'
+]
+
+
+def _normalizar_valor(valor):
+    """Converte listas em texto e None em string vazia, como gravado no CSV"""
+    if valor is None:
+        return ""
+    if isinstance(valor, (list, tuple)):
+        return "; ".join(str(item) for item in valor)
+    return str(valor)
+
+
+class SaidaIncremental:
+    def __init__(self, caminho="ecosistemas_resultados_incrementais.csv", campos=None,
+                 flush_a_cada=1, fsync=False, campo_chave="processo"):
+        """
+        Abre a saída incremental, carregando e deduplicando o arquivo existente
+
+        Args:
+            caminho (str): Arquivo CSV de saída
+            campos (list): Colunas do CSV (padrão: CAMPOS_PADRAO); colunas de registros ou do
+                arquivo existente fora dessa lista são acrescentadas ao final
+            flush_a_cada (int): Número de gravações entre cada flush do buffer (0 = só ao fechar)
+            fsync (bool): Se True, força a gravação em disco (os.fsync) a cada flush
+            campo_chave (str): Campo usado para identificar registros repetidos
+        """
+        self.caminho = caminho
+        self.campos = list(campos or CAMPOS_PADRAO)
+        self.flush_a_cada = flush_a_cada
+        self.fsync = fsync
+        self.campo_chave = campo_chave
+
+        self._indice = {}  # chave -> linha normalizada
+        self._lock = threading.Lock()
+        self._pendentes = 0
+        self._reescrever = False
+        self._obsoletas = 0  # linhas do arquivo substituídas por uma atualização posterior
+        self._arquivo = None
+        self._writer = None
+
+        self._carregar_existente()
+        self._abrir()
+
+    def _chave(self, linha):
+        chave = linha.get(self.campo_chave, "")
+        # Sem número de processo, a linha completa identifica o registro
+        return chave if chave else tuple(linha[campo] for campo in self.campos)
+
+    def _normalizar(self, registro):
+        return {campo: _normalizar_valor(registro.get(campo)) for campo in self.campos}
+
+    def _ampliar_esquema(self, campos):
+        """
+        Acrescenta ao esquema as colunas ainda desconhecidas
+
+        Returns:
+            list: Colunas acrescentadas
+        """
+        novos = [campo for campo in campos if campo and campo not in self.campos]
+        novos = list(dict.fromkeys(novos))
+        if novos:
+            self.campos.extend(novos)
+            for linha in self._indice.values():
+                for campo in novos:
+                    linha[campo] = ""
+            # Chaves de linhas sem número de processo dependem de todas as colunas
+            self._indice = {self._chave(linha): linha for linha in self._indice.values()}
+        return novos
+
+    def _carregar_existente(self):
+        if not os.path.exists(self.caminho) or os.path.getsize(self.caminho) == 0:
+            return
+
+        total = 0
+        with open(self.caminho, newline='', encoding='utf-8-sig') as csvfile:
+            reader = csv.DictReader(csvfile)
+            cabecalho = reader.fieldnames or []
+            self._ampliar_esquema(cabecalho)
+            for linha in reader:
+                total += 1
+                normalizada = self._normalizar(linha)
+                self._indice[self._chave(normalizada)] = normalizada
+
+        if cabecalho != self.campos or total != len(self._indice):
+            # Esquema diferente ou registros repetidos: reescrever o arquivo já deduplicado
+            self._reescrever = True
+        logger.info(f"{len(self._indice)} registros únicos carregados de {self.caminho} ({total} linhas)")
+
+    def _abrir(self):
+        if self._reescrever:
+            self._reescrever_arquivo()
+            return
+
+        novo = not os.path.exists(self.caminho) or os.path.getsize(self.caminho) == 0
+        self._arquivo = open(self.caminho, 'a', newline='', encoding='utf-8-sig', buffering=64 * 1024)
+        self._writer = csv.DictWriter(self._arquivo, fieldnames=self.campos)
+        if novo:
+            self._writer.writeheader()
+
+    def _reescrever_arquivo(self):
+        """Regrava o arquivo a partir do índice (troca atômica) e o reabre para acréscimo"""
+        if self._arquivo:
+            self._arquivo.close()
+
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, 'w', newline='', encoding='utf-8-sig') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=self.campos)
+            writer.writeheader()
+            writer.writerows(self._indice.values())
+            csvfile.flush()
+            os.fsync(csvfile.fileno())
+        os.replace(temporario, self.caminho)
+
+        self._reescrever = False
+        self._obsoletas = 0
+        self._arquivo = open(self.caminho, 'a', newline='', encoding='utf-8-sig', buffering=64 * 1024)
+        self._writer = csv.DictWriter(self._arquivo, fieldnames=self.campos)
+        logger.info(f"Arquivo incremental regravado com {len(self._indice)} registros únicos")
+
+    def __contains__(self, chave):
+        return chave in self._indice
+
+    def __len__(self):
+        return len(self._indice)
+
+    def chaves(self):
+        """Retorna o conjunto de chaves (processos) já gravados"""
+        with self._lock:
+            return set(self._indice)
+
+    def gravar(self, registros):
+        """
+        Grava (ou atualiza) registros
+
+        Registros novos e atualizações de registros existentes (dados diferentes) são
+        acrescentados ao arquivo; na leitura vale a última ocorrência de cada processo, e as
+        linhas substituídas são removidas ao fechar. Uma coluna nova amplia o esquema e regrava
+        o arquivo uma vez, com o cabeçalho ampliado.
+
+        Returns:
+            tuple: (novos, atualizados)
+        """
+        novos = 0
+        atualizados = 0
+        with self._lock:
+            for registro in registros:
+                novos_campos = self._ampliar_esquema(registro)
+                if novos_campos:
+                    logger.info(f"Novas colunas na saída incremental: {', '.join(novos_campos)}")
+                    self._reescrever_arquivo()
+                linha = self._normalizar(registro)
+                chave = self._chave(linha)
+                anterior = self._indice.get(chave)
+                if anterior is None:
+                    self._indice[chave] = linha
+                    self._writer.writerow(linha)
+                    novos += 1
+                elif anterior != linha:
+                    self._indice[chave] = linha
+                    self._writer.writerow(linha)
+                    self._obsoletas += 1
+                    atualizados += 1
+
+            self._pendentes += novos + atualizados
+            if self.flush_a_cada and self._pendentes >= self.flush_a_cada:
+                self._flush()
+        return novos, atualizados
+
+    def _flush(self):
+        if self._reescrever:
+            self._reescrever_arquivo()
+        else:
+            self._arquivo.flush()
+            if self.fsync:
+                os.fsync(self._arquivo.fileno())
+        self._pendentes = 0
+
+    def flush(self):
+        """Grava em disco o conteúdo do buffer"""
+        with self._lock:
+            self._flush()
+
+    def fechar(self):
+        """Grava as pendências, remove as linhas substituídas por atualizações e fecha o arquivo"""
+        with self._lock:
+            if self._arquivo and not self._arquivo.closed:
+                if self._obsoletas:
+                    self._reescrever = True
+                self._flush()
+                self._arquivo.close()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Teste de carga da coleta Ecosistemas contra o portal simulado (portal_simulado.py).
+O portal roda em um processo separado com N processos sintéticos, latência e erros injetados;
+o coletor inteiro (pesquisa, páginas de detalhes, classificação dos estudos e salvamento) roda
+neste processo, e ao final são informados registros por segundo, memória de pico, requisições
+atendidas pelo portal e erros injetados.
+
+Uso:
+    python licencas_ambientais/teste_carga.py --registros 20000 --latencia 50 --taxa-erros 0.01 --taxa-maxima 500
+    python licencas_ambientais/teste_carga.py --backend selenium --registros 500 --workers 3
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from filtros import FiltroPesquisa
+from limitador_taxa import LimitadorTaxa
+from logs_estruturados import configurar_logs
+from metricas import MetricasColeta, SALVAMENTO
+from portal_simulado import PortalSimulado, gerar_processos, ROTA_VISITANTE
+
+logger = logging.getLogger("coletor_ecosistemas.carga")
+
+SELENIUM = "selenium"
+HTTP = "http"
+
+
+def memoria_pico_mb():
+    """Maior memória residente (RSS) do processo até agora, em MB"""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é informado em KB no Linux e em bytes no macOS
+    return pico / 1024 / 1024 if sys.platform == "darwin" else pico / 1024
+
+
+def _executar_portal(conexao, registros, opcoes):
+    portal = PortalSimulado(gerar_processos(registros), **opcoes)
+    conexao.send(portal.iniciar())
+    conexao.recv()
+    conexao.send((portal.requisicoes, portal.erros_injetados))
+    portal.parar()
+
+
+class PortalEmProcesso:
+    """
+    Portal simulado em um processo separado, para não disputar a CPU (e o GIL) com o coletor medido
+
+        with PortalEmProcesso(20000, latencia=0.05) as portal:
+            coletor = ColetorEcosistemasHTTP(base_url=portal.url)
+    """
+
+    def __init__(self, registros, **opcoes):
+        """
+        Args:
+            registros (int): Número de processos sintéticos
+            **opcoes: Argumentos de PortalSimulado (latencia, variacao_latencia, taxa_erros, linhas_extras)
+        """
+        self.registros = registros
+        self.opcoes = opcoes
+        self.url = None
+        self.requisicoes = 0
+        self.erros_injetados = 0
+        self._conexao = None
+        self._processo = None
+
+    def __enter__(self):
+        self._conexao, conexao_filho = multiprocessing.Pipe()
+        self._processo = multiprocessing.Process(target=_executar_portal, name="portal-simulado",
+                                                 args=(conexao_filho, self.registros, self.opcoes), daemon=True)
+        self._processo.start()
+        self.url = self._conexao.recv()
+        return self
+
+    def __exit__(self, *exc):
+        self._conexao.send("parar")
+        self.requisicoes, self.erros_injetados = self._conexao.recv()
+        self._processo.join(timeout=10)
+        return False
+
+
+def _coletar_http(url, filtro, diretorio, metricas, limitador, args):
+    import pandas as pd
+    from coletor_http import ColetorEcosistemasHTTP
+    coletor = ColetorEcosistemasHTTP(base_url=url, tamanho_pagina=args.tamanho_pagina, max_conexoes=args.conexoes,
+                                     limitador=limitador, metricas=metricas)
+    try:
+        resultados = coletor.coletar_dados(max_paginas=args.max_paginas, filtro=filtro)
+    finally:
+        coletor.fechar()
+    # Mesmo salvamento do script de execução
+    if resultados:
+        with metricas.medir(SALVAMENTO):
+            pd.DataFrame(resultados).to_csv(os.path.join(diretorio, "carga.csv"), index=False, encoding="utf-8-sig")
+    return resultados
+
+
+def _coletar_navegador(url_visitante, filtro, diretorio, metricas, limitador, args):
+    from artefatos_depuracao import ArtefatosDepuracao, DESLIGADO
+    from coletor_ecosistemas import ColetorEcosistemas
+    coletor = ColetorEcosistemas(base_url=url_visitante, arquivo_estrategias=None, medir_rede=False,
+                                 artefatos=ArtefatosDepuracao(nivel=DESLIGADO),
+                                 prefixo_saida=os.path.join(diretorio, "carga"),
+                                 arquivo_incremental=os.path.join(diretorio, "carga_incremental.csv"),
+                                 limitador=limitador, metricas=metricas)
+    return coletor.coletar_dados(max_paginas=args.max_paginas, num_workers=args.workers, filtro=filtro)
+
+
+def executar_carga(args):
+    """
+    Executa o teste de carga
+
+    Args:
+        args: Opções da linha de comando (ver __main__)
+
+    Returns:
+        dict: Registros coletados, duração, registros por segundo, memória e requisições do portal
+    """
+    filtro = FiltroPesquisa(classes=args.classes)
+    metricas = MetricasColeta()
+    taxa_inicial, taxa_maxima = (10.0, 50.0) if args.backend == HTTP else (1.0, 5.0)
+    limitador = LimitadorTaxa(taxa_inicial=args.taxa_inicial or taxa_inicial,
+                              taxa_maxima=args.taxa_maxima or taxa_maxima)
+    opcoes_portal = {"latencia": args.latencia / 1000, "variacao_latencia": args.variacao_latencia / 1000,
+                     "taxa_erros": args.taxa_erros, "linhas_extras": args.linhas_extras}
+
+    memoria_inicial = memoria_pico_mb()
+    if args.tracemalloc:
+        tracemalloc.start()
+    with tempfile.TemporaryDirectory(prefix="teste_carga_") as diretorio:
+        with PortalEmProcesso(args.registros, **opcoes_portal) as portal:
+            logger.info(f"Portal simulado com {args.registros} processos em {portal.url} "
+                        f"(latência {args.latencia:g} ms + até {args.variacao_latencia:g} ms, "
+                        f"{args.taxa_erros:.1%} de erros)")
+            inicio = time.perf_counter()
+            if args.backend == HTTP:
+                resultados = _coletar_http(portal.url, filtro, diretorio, metricas, limitador, args)
+            else:
+                resultados = _coletar_navegador(f"{portal.url}{ROTA_VISITANTE}", filtro, diretorio, metricas,
+                                                limitador, args)
+            decorrido = time.perf_counter() - inicio
+    pico_python = tracemalloc.get_traced_memory()[1] / 1024 / 1024 if args.tracemalloc else None
+    if args.tracemalloc:
+        tracemalloc.stop()
+
+    detalhados = sum(1 for resultado in resultados if resultado.get("Documentos") is not None)
+    return {
+        "backend": args.backend,
+        "processos_portal": args.registros,
+        "registros": len(resultados),
+        "registros_detalhados": detalhados,
+        "segundos": round(decorrido, 3),
+        "registros_por_segundo": round(len(resultados) / decorrido, 2) if decorrido else None,
+        "memoria_inicial_mb": round(memoria_inicial, 1),
+        "memoria_pico_mb": round(memoria_pico_mb(), 1),
+        "memoria_python_pico_mb": round(pico_python, 1) if pico_python is not None else None,
+        "requisicoes_portal": portal.requisicoes,
+        "erros_injetados": portal.erros_injetados,
+        "limitador": limitador.resumo(),
+        "resumo_etapas": metricas.resumo(),
+        "metricas": metricas.como_dicionario(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Teste de carga da coleta contra o portal simulado')
+    parser.add_argument('--backend', choices=[HTTP, SELENIUM], default=HTTP,
+                        help='Coletor medido: http (API JSON) ou selenium (página de visitante; requer o Chrome)')
+    parser.add_argument('--registros', type=int, default=10000,
+                        help='Número de processos sintéticos do portal (padrão: 10000)')
+    parser.add_argument('--classes', type=lambda texto: [int(c) for c in texto.split(',')], default=[6],
+                        help='Classes pesquisadas, separadas por vírgula (padrão: 6)')
+    parser.add_argument('--max-paginas', type=int, default=100000,
+                        help='Número máximo de páginas coletadas (padrão: todas)')
+    parser.add_argument('--tamanho-pagina', type=int, default=100,
+                        help='Registros por página no backend http (padrão: 100)')
+    parser.add_argument('--conexoes', type=int, default=8,
+                        help='Consultas simultâneas de detalhes no backend http (padrão: 8)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Navegadores para as páginas de detalhes no backend selenium (padrão: 1)')
+    parser.add_argument('--latencia', type=float, default=0,
+                        help='Atraso mínimo de cada resposta do portal, em milissegundos (padrão: 0)')
+    parser.add_argument('--variacao-latencia', type=float, default=0,
+                        help='Atraso adicional sorteado de até este valor, em milissegundos (padrão: 0)')
+    parser.add_argument('--taxa-erros', type=float, default=0,
+                        help='Fração das requisições respondidas com erro 503 (padrão: 0)')
+    parser.add_argument('--linhas-extras', type=int, default=0,
+                        help='Linhas de histórico nas páginas de detalhes (padrão: 0)')
+    parser.add_argument('--taxa-inicial', type=float, default=None,
+                        help='Taxa inicial do limitador (padrão: a do backend no script de execução)')
+    parser.add_argument('--taxa-maxima', type=float, default=None,
+                        help='Limite da taxa adaptativa (padrão: o do backend no script de execução)')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='Mede também o pico de memória alocada pelo Python (torna a coleta mais lenta)')
+    parser.add_argument('--saida-json', type=str, default=None,
+                        help='Arquivo JSON onde gravar o relatório')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Exibe os logs de cada página e registro')
+    args = parser.parse_args()
+
+    configurar_logs(nivel=logging.INFO if args.verbose else logging.WARNING, formato="texto")
+    logger.setLevel(logging.INFO)
+
+    relatorio = executar_carga(args)
+
+    print(f"\nBackend: {relatorio['backend']} - {relatorio['processos_portal']} processos no portal")
+    print(f"Registros coletados: {relatorio['registros']} ({relatorio['registros_detalhados']} com detalhes) "
+          f"em {relatorio['segundos']:.1f}s")
+    print(f"Vazão: {relatorio['registros_por_segundo']} registros/s")
+    print(f"Memória (RSS): {relatorio['memoria_inicial_mb']} MB no início, pico de {relatorio['memoria_pico_mb']} MB")
+    if relatorio['memoria_python_pico_mb'] is not None:
+        print(f"Memória alocada pelo Python: pico de {relatorio['memoria_python_pico_mb']} MB")
+    print(f"Portal: {relatorio['requisicoes_portal']} requisições, {relatorio['erros_injetados']} erros injetados")
+    print(relatorio['limitador'])
+    for linha in relatorio['resumo_etapas']:
+        print(f"- {linha}")
+
+    if args.saida_json:
+        with open(args.saida_json, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+        print(f"Relatório salvo em {args.saida_json}")